@@ -79,6 +79,10 @@ class DataConfig:
 
     cache_duration: int = 300  # 5 minutes
     max_cache_size: int = 100
+    repository_cache_entries: int = 1000  # Per-repository memory cache bound
+    repository_cache_mb: float = 8.0  # Per-repository memory cache budget
+    repository_cache_sweep_interval: int = 0  # Seconds between expiry sweeps; 0 = on read only
+    repository_purge_interval: int = 3600  # Seconds between expired SQLite row purges
     data_directory: str = "data"
     favorites_file: str = "favorites.json"
     recent_searches_file: str = "recent_searches.json"
@@ -0,0 +1,202 @@
+"""Async SQLite Connections
+
+Persistent aiosqlite connections shared by the repositories. Each database file
+gets one connection per event loop; its dedicated thread executes queued
+statements so queries never block the loop, and the connection is opened and
+configured once instead of on every call.
+
+Connections are closed when their event loop shuts down, so a finished
+asyncio.run() leaves no worker thread or open file behind.
+
+Every task on a loop shares one connection, so an open transaction is visible
+to all of them. Reads therefore only see committed rows: a read made while
+another task holds the connection's write lock waits until that transaction
+commits or rolls back, and only the task holding the lock reads its own
+uncommitted writes. With no transaction open, reads skip the lock; statements
+run in queue order on the connection's thread, so such a read runs before
+the BEGIN of any transaction started after it.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+# Applied to every shared connection when it is opened. auto_vacuum only takes
+# effect on a new database and must be set before journal_mode writes its header.
+CONNECTION_PRAGMAS = {
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "busy_timeout": 30000,
+    "temp_store": "MEMORY",
+}
+
+
+class SharedConnection:
+    """A persistent connection and the lock serializing its write transactions."""
+
+    def __init__(self, db: aiosqlite.Connection):
+        self.db = db
+        self.write_lock = asyncio.Lock()
+        self._writer: Optional[asyncio.Task] = None
+
+    async def acquire_write(self) -> None:
+        """Take the write lock for the running task, for a transaction it opens."""
+        await self.write_lock.acquire()
+        self._writer = asyncio.current_task()
+
+    def release_write(self) -> None:
+        """Release the write lock taken with acquire_write()."""
+        self._writer = None
+        self.write_lock.release()
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Run statements as one committed unit, rolled back on error."""
+        await self.acquire_write()
+        try:
+            yield self.db
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            raise
+        finally:
+            self.release_write()
+
+    @asynccontextmanager
+    async def reading(self):
+        """Run queries that see no other task's uncommitted writes.
+
+        The statement must be issued without awaiting anything else first,
+        so it is queued before any transaction that starts meanwhile.
+        """
+        if not self.write_lock.locked() or self._writer is asyncio.current_task():
+            yield self.db
+            return
+        async with self.write_lock:
+            yield self.db
+
+
+class _LoopConnections:
+    """Connections opened on one event loop, keyed by resolved database path."""
+
+    def __init__(self):
+        self.tasks: Dict[str, "asyncio.Task[SharedConnection]"] = {}
+        self.closer: Optional[AsyncIterator[None]] = None
+
+
+_connections: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopConnections]" = (
+    weakref.WeakKeyDictionary()
+)
+_connections_lock = threading.Lock()
+
+
+def _resolve(db_path: str) -> str:
+    """Normalize a database path so aliases share one connection."""
+    return db_path if db_path == ":memory:" else str(Path(db_path).resolve())
+
+
+async def _open_connection(db_path: str) -> SharedConnection:
+    """Open and configure a connection."""
+    db = aiosqlite.connect(db_path)
+    db.daemon = True  # Never keep the interpreter alive for an idle connection
+    await db
+    for pragma, value in CONNECTION_PRAGMAS.items():
+        await db.execute(f"PRAGMA {pragma} = {value}")
+    logger.debug(f"Opened shared SQLite connection to {db_path}")
+    return SharedConnection(db)
+
+
+def _stop_connection(task: "asyncio.Task[SharedConnection]") -> None:
+    """Stop the worker thread of a connection whose event loop is already closed."""
+    if not task.done() or task.cancelled() or task.exception() is not None:
+        return
+    db = task.result().db
+    if hasattr(db, "stop"):
+        db.stop()
+    else:
+        db._running = False  # aiosqlite < 0.20 polls this flag in its worker thread
+
+
+def _evict_closed_loops() -> None:
+    """Stop and forget connections of loops closed without shutting down asyncgens."""
+    with _connections_lock:
+        closed = [loop for loop in list(_connections) if loop.is_closed()]
+        evicted = [_connections.pop(loop) for loop in closed]
+    for loop_connections in evicted:
+        for task in loop_connections.tasks.values():
+            _stop_connection(task)
+
+
+async def _close_on_shutdown() -> AsyncIterator[None]:
+    """Close the running loop's connections when it shuts down its async generators.
+
+    asyncio.run() finalizes pending async generators before closing the loop,
+    so the connections can still be closed cleanly from the finally block.
+    """
+    try:
+        yield
+    finally:
+        await close_shared_connections()
+        with _connections_lock:
+            _connections.pop(asyncio.get_running_loop(), None)
+
+
+async def _loop_connections() -> _LoopConnections:
+    """Get the connections of the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _connections_lock:
+        loop_connections = _connections.get(loop)
+        if loop_connections is not None:
+            return loop_connections
+        loop_connections = _LoopConnections()
+        _connections[loop] = loop_connections
+
+    _evict_closed_loops()
+    loop_connections.closer = _close_on_shutdown()
+    await loop_connections.closer.asend(None)
+    return loop_connections
+
+
+async def get_shared_connection(db_path: str) -> SharedConnection:
+    """Get the shared connection for a database on the running event loop."""
+    tasks = (await _loop_connections()).tasks
+    path = _resolve(db_path)
+    task = tasks.get(path)
+    if task is None or (task.done() and task.exception() is not None):
+        task = asyncio.ensure_future(_open_connection(db_path))
+        tasks[path] = task
+    return await asyncio.shield(task)
+
+
+async def close_shared_connections(db_path: Optional[str] = None) -> None:
+    """Close the shared connections of the running event loop.
+
+    Args:
+        db_path: Close only the connection to this database
+    """
+    with _connections_lock:
+        loop_connections = _connections.get(asyncio.get_running_loop())
+    if loop_connections is None:
+        return
+
+    tasks = loop_connections.tasks
+    paths = list(tasks) if db_path is None else [_resolve(db_path)]
+    for path in paths:
+        task = tasks.pop(path, None)
+        if task is None:
+            continue
+        try:
+            shared = await task
+            await shared.db.close()
+        except Exception as e:
+            logger.debug(f"Failed to close shared SQLite connection {path}: {e}")
@@ -1,10 +1,16 @@
 """Database Context Management
 
 Handles database connections, transactions, and connection pooling.
+
+Connections are the shared async connections of src/data/async_sqlite.py, so
+repositories created with a context and the context's transactions use the
+same connection per database.
 """
 
+import asyncio
 import sqlite3
 import threading
+import weakref
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
@@ -13,6 +19,10 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import aiosqlite
+
+from .async_sqlite import SharedConnection, close_shared_connections, get_shared_connection
+
 
 class DatabaseType(Enum):
     """Supported database types."""
@@ -76,7 +86,7 @@ class IDatabaseContext(ABC):
     """Abstract database context interface."""
 
     @abstractmethod
-    async def get_connection(self, database_name: str) -> sqlite3.Connection:
+    async def get_connection(self, database_name: str) -> SharedConnection:
         """Get database connection."""
 
     @abstractmethod
@@ -110,15 +120,19 @@ class DatabaseContext(IDatabaseContext):
         self.preferences_db_path = str(self.base_path / "preferences.db")
         self.activities_db_path = str(self.base_path / "activities.db")
 
-        # Connection management
-        self._connections: Dict[str, sqlite3.Connection] = {}
+        # Connection management: connections of each event loop by connection ID,
+        # dropped with the loop so a recycled loop id never maps to a dead connection
+        self._connections: "weakref.WeakKeyDictionary[Any, Dict[str, SharedConnection]]" = (
+            weakref.WeakKeyDictionary()
+        )
         self._connection_info: Dict[str, ConnectionInfo] = {}
-        self._transaction_connections: Dict[str, sqlite3.Connection] = {}
+        self._transaction_connections: Dict[str, SharedConnection] = {}
         self._lock = threading.RLock()
         self._transaction_lock = threading.RLock()
 
         # Transaction state
         self._current_transaction_id: Optional[str] = None
+        self._transaction_task: Optional[asyncio.Task] = None
         self._transaction_connections_map: Dict[str, List[str]] = {}
 
     @property
@@ -137,7 +151,7 @@ class DatabaseContext(IDatabaseContext):
             await self._ensure_database_exists(db_path)
             await self._configure_database(db_path)
 
-    async def get_connection(self, database_name: str) -> sqlite3.Connection:
+    async def get_connection(self, database_name: str) -> SharedConnection:
         """Get database connection for specified database."""
         db_path = self.database_paths.get(database_name)
         if not db_path:
@@ -145,27 +159,61 @@ class DatabaseContext(IDatabaseContext):
 
         return await self._get_or_create_connection(db_path)
 
-    async def get_connection_by_path(self, db_path: str) -> sqlite3.Connection:
+    async def get_connection_by_path(self, db_path: str) -> SharedConnection:
         """Get database connection by path."""
         return await self._get_or_create_connection(db_path)
 
-    async def _get_or_create_connection(self, db_path: str) -> sqlite3.Connection:
-        """Get existing connection or create new one."""
-        with self._lock:
-            connection_id = f"{db_path}_{threading.current_thread().ident}"
+    @staticmethod
+    def _connection_id(db_path: str) -> str:
+        """Identify the connection to a database on the running event loop."""
+        return f"{db_path}_{id(asyncio.get_running_loop())}"
 
-            if connection_id in self._connections:
-                conn = self._connections[connection_id]
+    def _evict_closed_loops(self):
+        """Forget connections of closed event loops and info of connections no loop holds."""
+        with self._lock:
+            for loop in [loop for loop in list(self._connections) if loop.is_closed()]:
+                del self._connections[loop]
+            live = {
+                connection_id
+                for connections in self._connections.values()
+                for connection_id in connections
+            }
+            for connection_id in [cid for cid in self._connection_info if cid not in live]:
+                del self._connection_info[connection_id]
+
+    async def _get_or_create_connection(self, db_path: str) -> SharedConnection:
+        """Get the configured connection to a database on the running event loop.
+
+        The shared connection is looked up on every call, so one closed
+        elsewhere is replaced (and configured) instead of being handed out again.
+        """
+        loop = asyncio.get_running_loop()
+        connection_id = self._connection_id(db_path)
+        try:
+            conn = await get_shared_connection(db_path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to create database connection to {db_path}: {str(e)}")
 
+        with self._lock:
+            connections = self._connections.get(loop)
+            if connections is None:
+                self._evict_closed_loops()
+                connections = self._connections.setdefault(loop, {})
+            if connections.get(connection_id) is conn:
                 # Update last used time
                 if connection_id in self._connection_info:
                     self._connection_info[connection_id].last_used = datetime.now()
 
                 return conn
 
-            # Create new connection
-            conn = await self._create_connection(db_path)
-            self._connections[connection_id] = conn
+        # New connection: apply this context's settings once
+        try:
+            await self._configure_connection(conn)
+        except Exception as e:
+            raise RuntimeError(f"Failed to create database connection to {db_path}: {str(e)}")
+
+        with self._lock:
+            connections[connection_id] = conn
 
             # Store connection info
             self._connection_info[connection_id] = ConnectionInfo(
@@ -176,35 +224,20 @@ class DatabaseContext(IDatabaseContext):
                 last_used=datetime.now(),
             )
 
-            return conn
-
-    async def _create_connection(self, db_path: str) -> sqlite3.Connection:
-        """Create new database connection."""
-        try:
-            # Create connection
-            conn = sqlite3.connect(
-                db_path, timeout=self.config.connection_timeout, check_same_thread=False
-            )
-
-            # Configure connection
-            await self._configure_connection(conn)
-
-            return conn
+        return conn
 
-        except Exception as e:
-            raise RuntimeError(f"Failed to create database connection to {db_path}: {str(e)}")
-
-    async def _configure_connection(self, conn: sqlite3.Connection):
+    async def _configure_connection(self, conn: SharedConnection):
         """Configure database connection with PRAGMA settings."""
         pragma_settings = self.config.get_pragma_settings()
 
-        for pragma, value in pragma_settings.items():
-            if value is not None:
-                conn.execute(f"PRAGMA {pragma} = {value}")
-            else:
-                conn.execute(f"PRAGMA {pragma}")
+        async with conn.write_lock:
+            for pragma, value in pragma_settings.items():
+                if value is not None:
+                    await conn.db.execute(f"PRAGMA {pragma} = {value}")
+                else:
+                    await conn.db.execute(f"PRAGMA {pragma}")
 
-        conn.commit()
+            await conn.db.commit()
 
     async def _ensure_database_exists(self, db_path: str):
         """Ensure database file exists."""
@@ -219,28 +252,45 @@ class DatabaseContext(IDatabaseContext):
         conn = await self._get_or_create_connection(db_path)
         await self._configure_connection(conn)
 
+    def owns_transaction(self) -> bool:
+        """Check if the running task began the active transaction.
+
+        Repositories created with this context write inside that transaction
+        instead of committing on their own.
+        """
+        return (
+            self._current_transaction_id is not None
+            and self._transaction_task is asyncio.current_task()
+        )
+
     async def begin_transaction(self) -> str:
-        """Begin transaction across all databases."""
+        """Begin transaction across all databases.
+
+        Holds each connection's write lock until commit or rollback, so other
+        writers wait instead of interleaving with the transaction.
+        """
         with self._transaction_lock:
             if self._current_transaction_id:
                 raise RuntimeError("Transaction already active")
 
             transaction_id = f"txn_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
             self._current_transaction_id = transaction_id
+            self._transaction_task = asyncio.current_task()
             self._transaction_connections_map[transaction_id] = []
 
             try:
                 # Begin transaction on all databases
                 for db_name, db_path in self.database_paths.items():
                     conn = await self._get_or_create_connection(db_path)
-                    conn.execute("BEGIN IMMEDIATE")
+                    await conn.acquire_write()
 
                     # Store transaction connection
-                    conn_id = f"{db_path}_{threading.current_thread().ident}"
+                    conn_id = self._connection_id(db_path)
                     self._transaction_connections[f"{transaction_id}_{conn_id}"] = conn
                     self._transaction_connections_map[transaction_id].append(
                         f"{transaction_id}_{conn_id}"
                     )
+                    await conn.db.execute("BEGIN IMMEDIATE")
 
                     # Update connection state
                     if conn_id in self._connection_info:
@@ -267,7 +317,7 @@ class DatabaseContext(IDatabaseContext):
                 for conn_key in self._transaction_connections_map.get(transaction_id, []):
                     if conn_key in self._transaction_connections:
                         conn = self._transaction_connections[conn_key]
-                        conn.commit()
+                        await conn.db.commit()
 
                 # Update connection states
                 await self._update_connection_states_after_transaction(
@@ -298,7 +348,7 @@ class DatabaseContext(IDatabaseContext):
                     if conn_key in self._transaction_connections:
                         conn = self._transaction_connections[conn_key]
                         try:
-                            conn.rollback()
+                            await conn.db.rollback()
                         except Exception:
                             # Continue with other connections
                             pass
@@ -331,10 +381,11 @@ class DatabaseContext(IDatabaseContext):
 
     async def _cleanup_transaction(self, transaction_id: str):
         """Clean up transaction resources."""
-        # Remove transaction connections
+        # Remove transaction connections and let other writers proceed
         for conn_key in self._transaction_connections_map.get(transaction_id, []):
-            if conn_key in self._transaction_connections:
-                del self._transaction_connections[conn_key]
+            conn = self._transaction_connections.pop(conn_key, None)
+            if conn is not None and conn.write_lock.locked():
+                conn.release_write()
 
         # Remove transaction mapping
         if transaction_id in self._transaction_connections_map:
@@ -342,6 +393,7 @@ class DatabaseContext(IDatabaseContext):
 
         # Clear current transaction
         self._current_transaction_id = None
+        self._transaction_task = None
 
     async def _cleanup_failed_transaction(self, transaction_id: str):
         """Clean up failed transaction."""
@@ -351,7 +403,7 @@ class DatabaseContext(IDatabaseContext):
                 if conn_key in self._transaction_connections:
                     conn = self._transaction_connections[conn_key]
                     try:
-                        conn.rollback()
+                        await conn.db.rollback()
                     except Exception:
                         pass
 
@@ -361,6 +413,7 @@ class DatabaseContext(IDatabaseContext):
         except Exception:
             # Force cleanup
             self._current_transaction_id = None
+            self._transaction_task = None
             if transaction_id in self._transaction_connections_map:
                 del self._transaction_connections_map[transaction_id]
 
@@ -388,17 +441,22 @@ class DatabaseContext(IDatabaseContext):
 
     async def execute_query(
         self, database_name: str, query: str, params: tuple = ()
-    ) -> sqlite3.Cursor:
+    ) -> aiosqlite.Cursor:
         """Execute query on specified database."""
         conn = await self.get_connection(database_name)
-        return conn.execute(query, params)
+        return await conn.db.execute(query, params)
 
     async def execute_many(
         self, database_name: str, query: str, params_list: List[tuple]
-    ) -> sqlite3.Cursor:
+    ) -> aiosqlite.Cursor:
         """Execute query with multiple parameter sets."""
         conn = await self.get_connection(database_name)
-        return conn.executemany(query, params_list)
+        return await conn.db.executemany(query, params_list)
+
+    def _connection_count(self) -> int:
+        """Count the connections held across event loops."""
+        with self._lock:
+            return sum(len(connections) for connections in self._connections.values())
 
     async def get_connection_info(self) -> List[ConnectionInfo]:
         """Get information about all connections."""
@@ -408,7 +466,7 @@ class DatabaseContext(IDatabaseContext):
     async def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
         stats = {
-            "total_connections": len(self._connections),
+            "total_connections": self._connection_count(),
             "active_transactions": 1 if self._current_transaction_id else 0,
             "databases": {},
         }
@@ -416,14 +474,9 @@ class DatabaseContext(IDatabaseContext):
         for db_name, db_path in self.database_paths.items():
             try:
                 conn = await self.get_connection(db_name)
-                cursor = conn.execute("PRAGMA page_count")
-                page_count = cursor.fetchone()[0]
-
-                cursor = conn.execute("PRAGMA page_size")
-                page_size = cursor.fetchone()[0]
-
-                cursor = conn.execute("PRAGMA freelist_count")
-                free_pages = cursor.fetchone()[0]
+                page_count = (await conn.db.execute_fetchall("PRAGMA page_count"))[0][0]
+                page_size = (await conn.db.execute_fetchall("PRAGMA page_size"))[0][0]
+                free_pages = (await conn.db.execute_fetchall("PRAGMA freelist_count"))[0][0]
 
                 stats["databases"][db_name] = {
                     "path": db_path,
@@ -445,8 +498,8 @@ class DatabaseContext(IDatabaseContext):
         for db_name, db_path in self.database_paths.items():
             try:
                 conn = await self.get_connection(db_name)
-                conn.execute("VACUUM")
-                conn.commit()
+                async with conn.write_lock:
+                    await conn.db.execute("VACUUM")
                 results[db_name] = True
             except Exception:
                 results[db_name] = False
@@ -460,8 +513,8 @@ class DatabaseContext(IDatabaseContext):
         for db_name, db_path in self.database_paths.items():
             try:
                 conn = await self.get_connection(db_name)
-                conn.execute("PRAGMA optimize")
-                conn.commit()
+                async with conn.write_lock:
+                    await conn.db.execute("PRAGMA optimize")
                 results[db_name] = True
             except Exception:
                 results[db_name] = False
@@ -474,38 +527,36 @@ class DatabaseContext(IDatabaseContext):
         if not db_path:
             return
 
+        connection_id = self._connection_id(db_path)
         with self._lock:
-            connection_id = f"{db_path}_{threading.current_thread().ident}"
-
-            if connection_id in self._connections:
-                conn = self._connections[connection_id]
-                try:
-                    conn.close()
-                except Exception:
-                    pass
+            connections = self._connections.get(asyncio.get_running_loop(), {})
+            conn = connections.pop(connection_id, None)
+            if conn is not None and connection_id in self._connection_info:
+                self._connection_info[connection_id].state = ConnectionState.CLOSED
 
-                del self._connections[connection_id]
-
-                if connection_id in self._connection_info:
-                    self._connection_info[connection_id].state = ConnectionState.CLOSED
+        if conn is not None:
+            await close_shared_connections(db_path)
 
     async def close(self):
         """Close all database connections."""
+        # Rollback any active transaction
+        if self._current_transaction_id:
+            try:
+                await self.rollback_transaction()
+            except Exception:
+                pass
+
         with self._lock:
-            # Rollback any active transaction
-            if self._current_transaction_id:
-                try:
-                    await self.rollback_transaction()
-                except Exception:
-                    pass
-
-            # Close all connections
-            for conn in self._connections.values():
-                try:
-                    conn.close()
-                except Exception:
-                    pass
+            db_paths = {info.database_path for info in self._connection_info.values()}
 
+        # Close all connections
+        for db_path in db_paths:
+            try:
+                await close_shared_connections(db_path)
+            except Exception:
+                pass
+
+        with self._lock:
             # Clear all connection data
             self._connections.clear()
             self._connection_info.clear()
@@ -517,15 +568,14 @@ class DatabaseContext(IDatabaseContext):
         health_status = {
             "overall_healthy": True,
             "databases": {},
-            "connections": len(self._connections),
+            "connections": self._connection_count(),
             "active_transaction": self._current_transaction_id is not None,
         }
 
         for db_name, db_path in self.database_paths.items():
             try:
                 conn = await self.get_connection(db_name)
-                cursor = conn.execute("SELECT 1")
-                cursor.fetchone()
+                await conn.db.execute_fetchall("SELECT 1")
 
                 health_status["databases"][db_name] = {"healthy": True, "path": db_path}
 
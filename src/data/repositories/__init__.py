@@ -13,7 +13,12 @@ from .activity_repository import (
     ActivityType,
     WeatherSuitability,
 )
-from .base_repository import BaseRepository, InMemoryRepository, ReadOnlyRepository
+from .base_repository import (
+    BaseRepository,
+    InMemoryRepository,
+    ReadOnlyRepository,
+    SQLiteRepository,
+)
 from .preference_repository import PreferenceRepository
 from .weather_repository import ForecastRepository, WeatherRepository
 
@@ -22,6 +27,7 @@ __all__ = [
     "BaseRepository",
     "ReadOnlyRepository",
     "InMemoryRepository",
+    "SQLiteRepository",
     # Weather Repositories
     "WeatherRepository",
     "ForecastRepository",
@@ -4,13 +4,17 @@ Handles data access operations for weather-related activities and recommendation
 """
 
 import json
-import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from .base_repository import BaseRepository
+import aiosqlite
+
+from .base_repository import SQLiteRepository
+
+if TYPE_CHECKING:
+    from ..database_context import DatabaseContext
 
 
 class ActivityType(Enum):
@@ -133,71 +137,81 @@ class ActivityRecommendation:
         )
 
 
-class ActivityRepository(BaseRepository[ActivityRecommendation, str]):
+class ActivityRepository(SQLiteRepository[ActivityRecommendation, str]):
     """Repository for activity recommendations and weather suitability data."""
 
-    def __init__(self, db_path: str = "activities.db"):
-        super().__init__()
-        self.db_path = db_path
-        self._init_database()
-
-    def _init_database(self):
+    _INSERT_SQL = """
+        INSERT INTO activity_recommendations (
+            id, activity_data, activity_type, suitability, confidence_score,
+            location, user_id, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _UPDATE_SQL = """
+        UPDATE activity_recommendations
+        SET activity_data = ?, activity_type = ?, suitability = ?, confidence_score = ?,
+            location = ?, user_id = ?
+        WHERE id = ?
+    """
+
+    def __init__(
+        self, db_path: str = "activities.db", db_context: Optional["DatabaseContext"] = None
+    ):
+        super().__init__(db_path, db_context)
+
+    async def _init_database(self, db: aiosqlite.Connection):
         """Initialize SQLite database for activity data."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS activity_recommendations (
-                    id TEXT PRIMARY KEY,
-                    activity_data TEXT NOT NULL,
-                    activity_type TEXT,
-                    suitability TEXT,
-                    confidence_score REAL,
-                    location TEXT,
-                    user_id TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+        await db.execute(
             """
+            CREATE TABLE IF NOT EXISTS activity_recommendations (
+                id TEXT PRIMARY KEY,
+                activity_data TEXT NOT NULL,
+                activity_type TEXT,
+                suitability TEXT,
+                confidence_score REAL,
+                location TEXT,
+                user_id TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
+        """
+        )
 
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS user_activity_preferences (
-                    user_id TEXT,
-                    activity_type TEXT,
-                    preference_score REAL,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (user_id, activity_type)
-                )
+        await db.execute(
             """
+            CREATE TABLE IF NOT EXISTS user_activity_preferences (
+                user_id TEXT,
+                activity_type TEXT,
+                preference_score REAL,
+                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, activity_type)
             )
+        """
+        )
 
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS activity_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT,
-                    activity_name TEXT,
-                    activity_type TEXT,
-                    weather_conditions TEXT,
-                    user_rating INTEGER,
-                    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+        await db.execute(
             """
+            CREATE TABLE IF NOT EXISTS activity_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT,
+                activity_name TEXT,
+                activity_type TEXT,
+                weather_conditions TEXT,
+                user_rating INTEGER,
+                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
+        """
+        )
 
-            # Create indexes for better performance
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_activity_type ON activity_recommendations(activity_type)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_activity_location ON activity_recommendations(location)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_activity_user ON activity_recommendations(user_id)"
-            )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_history_user ON activity_history(user_id)")
-
-            conn.commit()
+        # Create indexes for better performance
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_activity_type ON activity_recommendations(activity_type)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_activity_location ON activity_recommendations(location)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_activity_user ON activity_recommendations(user_id)"
+        )
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_history_user ON activity_history(user_id)")
 
     async def get_by_id(self, activity_id: str) -> Optional[ActivityRecommendation]:
         """Get activity recommendation by ID."""
@@ -206,17 +220,15 @@ class ActivityRepository(BaseRepository[ActivityRecommendation, str]):
         if cached:
             return cached
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT activity_data FROM activity_recommendations WHERE id = ?", (activity_id,)
-            )
-            row = cursor.fetchone()
+        row = await self._fetchone(
+            "SELECT activity_data FROM activity_recommendations WHERE id = ?", (activity_id,)
+        )
 
-            if row:
-                activity_dict = json.loads(row[0])
-                activity = ActivityRecommendation.from_dict(activity_dict)
-                self._set_cache(activity_id, activity)
-                return activity
+        if row:
+            activity_dict = json.loads(row[0])
+            activity = ActivityRecommendation.from_dict(activity_dict)
+            self._set_cache(activity_id, activity)
+            return activity
 
         return None
 
@@ -224,92 +236,117 @@ class ActivityRepository(BaseRepository[ActivityRecommendation, str]):
         self, limit: Optional[int] = None, offset: int = 0
     ) -> List[ActivityRecommendation]:
         """Get all activity recommendations with pagination."""
-        with sqlite3.connect(self.db_path) as conn:
-            query = "SELECT activity_data FROM activity_recommendations ORDER BY created_at DESC"
-            params = []
+        query = "SELECT activity_data FROM activity_recommendations ORDER BY created_at DESC"
+        params = []
 
-            if limit:
-                query += " LIMIT ? OFFSET ?"
-                params.extend([limit, offset])
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
 
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
+        rows = await self._fetchall(query, params)
 
-            return [ActivityRecommendation.from_dict(json.loads(row[0])) for row in rows]
+        return [ActivityRecommendation.from_dict(json.loads(row[0])) for row in rows]
 
-    async def create(self, entity: ActivityRecommendation) -> ActivityRecommendation:
-        """Create new activity recommendation."""
+    def _insert_params(self, entity: ActivityRecommendation, created_at: datetime) -> tuple:
+        """Assign ID and creation time, and build the INSERT parameters."""
         if not entity.id:
-            entity.id = f"activity_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(entity.activity_name) % 10000}"
+            timestamp = created_at.strftime("%Y%m%d_%H%M%S")
+            entity.id = f"activity_{timestamp}_{hash(entity.activity_name) % 10000}"
 
-        entity.created_at = datetime.now()
+        entity.created_at = created_at
         activity_dict = entity.to_dict()
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT INTO activity_recommendations (id, activity_data, activity_type, suitability, confidence_score, location, user_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    entity.id,
-                    json.dumps(activity_dict),
-                    entity.activity_type.value,
-                    entity.suitability.value,
-                    entity.confidence_score,
-                    entity.location,
-                    entity.user_id,
-                    entity.created_at.isoformat(),
-                ),
-            )
-            conn.commit()
+        return (
+            entity.id,
+            json.dumps(activity_dict),
+            entity.activity_type.value,
+            entity.suitability.value,
+            entity.confidence_score,
+            entity.location,
+            entity.user_id,
+            entity.created_at.isoformat(),
+        )
+
+    def _update_params(self, activity_id: str, entity: ActivityRecommendation) -> tuple:
+        """Build the UPDATE parameters for an activity recommendation."""
+        entity.id = activity_id
+        activity_dict = entity.to_dict()
+
+        return (
+            json.dumps(activity_dict),
+            entity.activity_type.value,
+            entity.suitability.value,
+            entity.confidence_score,
+            entity.location,
+            entity.user_id,
+            activity_id,
+        )
+
+    async def create(self, entity: ActivityRecommendation) -> ActivityRecommendation:
+        """Create new activity recommendation."""
+        await self._execute(self._INSERT_SQL, self._insert_params(entity, datetime.now()))
 
         self._set_cache(entity.id, entity)
         return entity
 
+    async def create_many(
+        self, entities: List[ActivityRecommendation], chunk_size: Optional[int] = None
+    ) -> List[ActivityRecommendation]:
+        """Create activity recommendations in one transaction with executemany."""
+        created_at = datetime.now()
+        rows = [self._insert_params(entity, created_at) for entity in entities]
+
+        async with self._transaction() as db:
+            await self._write_many(db, self._INSERT_SQL, rows, chunk_size)
+
+        self._set_cache_many({entity.id: entity for entity in entities})
+        return entities
+
     async def update(
         self, activity_id: str, entity: ActivityRecommendation
     ) -> Optional[ActivityRecommendation]:
         """Update existing activity recommendation."""
-        entity.id = activity_id
-        activity_dict = entity.to_dict()
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "UPDATE activity_recommendations SET activity_data = ?, activity_type = ?, suitability = ?, confidence_score = ?, location = ?, user_id = ? WHERE id = ?",
-                (
-                    json.dumps(activity_dict),
-                    entity.activity_type.value,
-                    entity.suitability.value,
-                    entity.confidence_score,
-                    entity.location,
-                    entity.user_id,
-                    activity_id,
-                ),
-            )
+        updated = await self._execute(self._UPDATE_SQL, self._update_params(activity_id, entity))
 
-            if cursor.rowcount > 0:
-                conn.commit()
-                self._set_cache(activity_id, entity)
-                return entity
+        if updated > 0:
+            self._set_cache(activity_id, entity)
+            return entity
 
         return None
 
+    async def update_many(
+        self, updates: Dict[str, ActivityRecommendation], chunk_size: Optional[int] = None
+    ) -> List[ActivityRecommendation]:
+        """Update existing activity recommendations in one transaction with executemany.
+
+        IDs without a stored recommendation are skipped, as in update().
+        """
+        async with self._transaction() as db:
+            existing = await self._existing_keys(
+                db, "activity_recommendations", "id", list(updates), chunk_size
+            )
+            updated = {key: entity for key, entity in updates.items() if key in existing}
+            rows = [self._update_params(key, entity) for key, entity in updated.items()]
+            await self._write_many(db, self._UPDATE_SQL, rows, chunk_size)
+
+        self._set_cache_many(updated)
+        return list(updated.values())
+
     async def delete(self, activity_id: str) -> bool:
         """Delete activity recommendation."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM activity_recommendations WHERE id = ?", (activity_id,)
-            )
-            conn.commit()
+        deleted = await self._execute(
+            "DELETE FROM activity_recommendations WHERE id = ?", (activity_id,)
+        )
 
-            self._invalidate_cache(activity_id)
-            return cursor.rowcount > 0
+        self._invalidate_cache(activity_id)
+        return deleted > 0
 
     async def exists(self, activity_id: str) -> bool:
         """Check if activity recommendation exists."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT 1 FROM activity_recommendations WHERE id = ?", (activity_id,)
-            )
-            return cursor.fetchone() is not None
+        row = await self._fetchone(
+            "SELECT 1 FROM activity_recommendations WHERE id = ?", (activity_id,)
+        )
+        return row is not None
 
     async def find_by_criteria(self, criteria: Dict[str, Any]) -> List[ActivityRecommendation]:
         """Find activities matching criteria."""
@@ -344,24 +381,20 @@ class ActivityRepository(BaseRepository[ActivityRecommendation, str]):
 
         query = " ".join(query_parts)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
+        rows = await self._fetchall(query, params)
 
-            return [ActivityRecommendation.from_dict(json.loads(row[0])) for row in rows]
+        return [ActivityRecommendation.from_dict(json.loads(row[0])) for row in rows]
 
     async def get_recommendations_for_weather(
         self, temperature: float, wind_speed: float, precipitation: float, visibility: float
     ) -> List[ActivityRecommendation]:
         """Get activity recommendations based on current weather conditions."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT activity_data FROM activity_recommendations WHERE (min_temperature IS NULL OR min_temperature <= ?) AND (max_temperature IS NULL OR max_temperature >= ?) AND (max_wind_speed IS NULL OR max_wind_speed >= ?) AND (max_precipitation IS NULL OR max_precipitation >= ?) AND (min_visibility IS NULL OR min_visibility <= ?) ORDER BY confidence_score DESC",
-                (temperature, temperature, wind_speed, precipitation, visibility),
-            )
-            rows = cursor.fetchall()
+        rows = await self._fetchall(
+            "SELECT activity_data FROM activity_recommendations WHERE (min_temperature IS NULL OR min_temperature <= ?) AND (max_temperature IS NULL OR max_temperature >= ?) AND (max_wind_speed IS NULL OR max_wind_speed >= ?) AND (max_precipitation IS NULL OR max_precipitation >= ?) AND (min_visibility IS NULL OR min_visibility <= ?) ORDER BY confidence_score DESC",
+            (temperature, temperature, wind_speed, precipitation, visibility),
+        )
 
-            return [ActivityRecommendation.from_dict(json.loads(row[0])) for row in rows]
+        return [ActivityRecommendation.from_dict(json.loads(row[0])) for row in rows]
 
     async def get_by_activity_type(
         self, activity_type: ActivityType, limit: int = 10
@@ -379,24 +412,20 @@ class ActivityRepository(BaseRepository[ActivityRecommendation, str]):
         self, user_id: str, activity_type: ActivityType, preference_score: float
     ) -> bool:
         """Set user preference score for activity type."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO user_activity_preferences (user_id, activity_type, preference_score, last_updated) VALUES (?, ?, ?, ?)",
-                (user_id, activity_type.value, preference_score, datetime.now().isoformat()),
-            )
-            conn.commit()
-            return True
+        await self._execute(
+            "INSERT OR REPLACE INTO user_activity_preferences (user_id, activity_type, preference_score, last_updated) VALUES (?, ?, ?, ?)",
+            (user_id, activity_type.value, preference_score, datetime.now().isoformat()),
+        )
+        return True
 
     async def get_user_activity_preferences(self, user_id: str) -> Dict[str, float]:
         """Get user activity preferences."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT activity_type, preference_score FROM user_activity_preferences WHERE user_id = ?",
-                (user_id,),
-            )
-            rows = cursor.fetchall()
+        rows = await self._fetchall(
+            "SELECT activity_type, preference_score FROM user_activity_preferences WHERE user_id = ?",
+            (user_id,),
+        )
 
-            return {row[0]: row[1] for row in rows}
+        return {row[0]: row[1] for row in rows}
 
     async def log_activity_completion(
         self,
@@ -407,39 +436,35 @@ class ActivityRepository(BaseRepository[ActivityRecommendation, str]):
         user_rating: int,
     ) -> bool:
         """Log completed activity for learning user preferences."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT INTO activity_history (user_id, activity_name, activity_type, weather_conditions, user_rating) VALUES (?, ?, ?, ?, ?)",
-                (
-                    user_id,
-                    activity_name,
-                    activity_type.value,
-                    json.dumps(weather_conditions),
-                    user_rating,
-                ),
-            )
-            conn.commit()
-            return True
+        await self._execute(
+            "INSERT INTO activity_history (user_id, activity_name, activity_type, weather_conditions, user_rating) VALUES (?, ?, ?, ?, ?)",
+            (
+                user_id,
+                activity_name,
+                activity_type.value,
+                json.dumps(weather_conditions),
+                user_rating,
+            ),
+        )
+        return True
 
     async def get_activity_history(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get user activity history."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT activity_name, activity_type, weather_conditions, user_rating, completed_at FROM activity_history WHERE user_id = ? ORDER BY completed_at DESC LIMIT ?",
-                (user_id, limit),
-            )
-            rows = cursor.fetchall()
-
-            return [
-                {
-                    "activity_name": row[0],
-                    "activity_type": row[1],
-                    "weather_conditions": json.loads(row[2]),
-                    "user_rating": row[3],
-                    "completed_at": row[4],
-                }
-                for row in rows
-            ]
+        rows = await self._fetchall(
+            "SELECT activity_name, activity_type, weather_conditions, user_rating, completed_at FROM activity_history WHERE user_id = ? ORDER BY completed_at DESC LIMIT ?",
+            (user_id, limit),
+        )
+
+        return [
+            {
+                "activity_name": row[0],
+                "activity_type": row[1],
+                "weather_conditions": json.loads(row[2]),
+                "user_rating": row[3],
+                "completed_at": row[4],
+            }
+            for row in rows
+        ]
 
     async def get_popular_activities(
         self, activity_type: Optional[ActivityType] = None, limit: int = 10
@@ -455,34 +480,29 @@ class ActivityRepository(BaseRepository[ActivityRecommendation, str]):
         query += " GROUP BY activity_name ORDER BY completion_count DESC, avg_rating DESC LIMIT ?"
         params.append(limit)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
+        rows = await self._fetchall(query, params)
 
-            return [(row[0], row[1], row[2]) for row in rows]
+        return [(row[0], row[1], row[2]) for row in rows]
 
     async def cleanup_old_recommendations(self, days_to_keep: int = 30) -> int:
         """Clean up old activity recommendations."""
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM activity_recommendations WHERE created_at < ?",
-                (cutoff_date.isoformat(),),
-            )
-            conn.commit()
+        deleted = await self._execute(
+            "DELETE FROM activity_recommendations WHERE created_at < ?",
+            (cutoff_date.isoformat(),),
+        )
 
-            # Clear related cache entries
-            self._clear_cache()
+        # Clear related cache entries
+        self._clear_cache()
 
-            return cursor.rowcount
+        return deleted
 
     async def count(self, criteria: Optional[Dict[str, Any]] = None) -> int:
         """Count activity recommendations."""
         if not criteria:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT COUNT(*) FROM activity_recommendations")
-                return cursor.fetchone()[0]
+            row = await self._fetchone("SELECT COUNT(*) FROM activity_recommendations")
+            return row[0]
 
         # Build count query with criteria
         query_parts = ["SELECT COUNT(*) FROM activity_recommendations WHERE 1=1"]
@@ -498,6 +518,5 @@ class ActivityRepository(BaseRepository[ActivityRecommendation, str]):
 
         query = " ".join(query_parts)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            return cursor.fetchone()[0]
+        row = await self._fetchone(query, params)
+        return row[0]
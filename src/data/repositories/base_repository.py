@@ -3,25 +3,60 @@
 Defines abstract base class for all repository implementations.
 """
 
+import asyncio
+import logging
+import time
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import aiosqlite
+
+from ...utils.cache_manager import CacheManager
+from ..async_sqlite import SharedConnection, get_shared_connection
+
+if TYPE_CHECKING:
+    from ..database_context import DatabaseContext
 
 # Generic type for entity models
 T = TypeVar("T")
 K = TypeVar("K")  # Key type (usually str or int)
 
+logger = logging.getLogger(__name__)
+
 
 class BaseRepository(ABC, Generic[T, K]):
     """Abstract base repository class defining common data access patterns."""
 
+    DEFAULT_CACHE_ENTRIES = 1000
+    DEFAULT_CACHE_MB = 8.0
+
     def __init__(self, connection=None):
         """Initialize repository with optional database connection."""
         self._connection = connection
-        self._cache = {}  # Simple in-memory cache
-        self._cache_ttl = {}  # Cache time-to-live tracking
         self._default_cache_duration = 300  # 5 minutes default
 
+        # Bounded in-memory LRU with per-entry TTL, one budget per repository
+        self._cache = CacheManager(
+            max_size_mb=self.DEFAULT_CACHE_MB,
+            max_entries=self.DEFAULT_CACHE_ENTRIES,
+            enable_compression=False,
+        ).namespace(self.__class__.__name__, default_ttl=self._default_cache_duration)
+
     @abstractmethod
     async def get_by_id(self, entity_id: K) -> Optional[T]:
         """Retrieve entity by ID."""
@@ -55,50 +90,70 @@ class BaseRepository(ABC, Generic[T, K]):
         return 0
 
     # Cache management methods
+    def configure_cache(self, cache_config: Dict[str, Any]) -> None:
+        """Apply settings from ConfigService.get_cache_config() to the memory cache.
+
+        Uses ttl_seconds as the default TTL, repository_max_entries and
+        repository_memory_mb as this repository's budget, and starts a
+        background expiry sweeper when repository_sweep_interval is set.
+        """
+        if cache_config.get("ttl_seconds"):
+            self._default_cache_duration = cache_config["ttl_seconds"]
+            self._cache.configure(default_ttl=self._default_cache_duration)
+
+        self._cache.manager.configure(
+            max_size_mb=cache_config.get("repository_memory_mb"),
+            max_entries=cache_config.get("repository_max_entries"),
+        )
+
+        sweep_interval = cache_config.get("repository_sweep_interval")
+        if sweep_interval:
+            self._cache.manager.start_sweeper(sweep_interval)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get memory cache statistics (hits, misses, evictions, expirations, size)."""
+        shared = self._cache.manager.get_stats()
+        return {
+            "entries": shared["memory_entries"],
+            "hits": shared["hits"],
+            "misses": shared["misses"],
+            "hit_rate": shared["hit_rate"],
+            "evictions": shared["evictions"],
+            "expirations": shared["expirations"],
+            "size_mb": shared["total_size_mb"],
+            "max_size_mb": shared["max_size_mb"],
+            "max_entries": self._cache.manager.max_entries,
+        }
+
     def _get_cache_key(self, key: Union[str, K]) -> str:
         """Generate cache key."""
         return f"{self.__class__.__name__}:{key}"
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached item is still valid."""
-        if cache_key not in self._cache_ttl:
-            return False
-        return datetime.now().timestamp() < self._cache_ttl[cache_key]
-
     def _get_from_cache(self, key: Union[str, K]) -> Optional[T]:
-        """Get item from cache if valid."""
-        cache_key = self._get_cache_key(key)
-        if cache_key in self._cache and self._is_cache_valid(cache_key):
-            return self._cache[cache_key]
-        return None
+        """Get item from cache if present and not expired."""
+        return self._cache.get(self._get_cache_key(key))
 
     def _set_cache(self, key: Union[str, K], value: T, ttl_seconds: Optional[int] = None) -> None:
-        """Set item in cache with TTL."""
-        cache_key = self._get_cache_key(key)
-        self._cache[cache_key] = value
+        """Set item in cache with TTL, evicting least recently used items over budget."""
+        self._cache.set(self._get_cache_key(key), value, ttl=ttl_seconds)
 
-        ttl = ttl_seconds or self._default_cache_duration
-        self._cache_ttl[cache_key] = datetime.now().timestamp() + ttl
+    def _set_cache_many(self, items: Dict[K, T], ttl_seconds: Optional[int] = None) -> None:
+        """Set many items in cache in one pass with a shared TTL."""
+        self._cache.bulk_set(
+            {self._get_cache_key(key): value for key, value in items.items()}, ttl=ttl_seconds
+        )
 
     def _invalidate_cache(self, key: Union[str, K]) -> None:
         """Remove item from cache."""
-        cache_key = self._get_cache_key(key)
-        self._cache.pop(cache_key, None)
-        self._cache_ttl.pop(cache_key, None)
+        self._cache.delete(self._get_cache_key(key))
 
     def _clear_cache(self) -> None:
         """Clear all cached items."""
         self._cache.clear()
-        self._cache_ttl.clear()
 
     def _cleanup_expired_cache(self) -> None:
         """Remove expired items from cache."""
-        current_time = datetime.now().timestamp()
-        expired_keys = [key for key, expiry in self._cache_ttl.items() if current_time >= expiry]
-
-        for key in expired_keys:
-            self._cache.pop(key, None)
-            self._cache_ttl.pop(key, None)
+        self._cache.cleanup_expired()
 
     # Batch operations
     async def create_many(self, entities: List[T]) -> List[T]:
@@ -145,6 +200,7 @@ class BaseRepository(ABC, Generic[T, K]):
     async def close(self):
         """Close repository and cleanup resources."""
         self._clear_cache()
+        self._cache.manager.stop_sweeper()
         if hasattr(self._connection, "close"):
             await self._connection.close()
 
@@ -177,6 +233,244 @@ class ReadOnlyRepository(BaseRepository[T, K]):
         raise NotImplementedError("Delete operations not supported in read-only repository")
 
 
+class SQLiteRepository(BaseRepository[T, K]):
+    """Repository base class for SQLite databases accessed without blocking.
+
+    Statements run on the database's shared async connection; writes commit
+    through its transaction lock so concurrent tasks never interleave them.
+    Repositories created with a DatabaseContext take their connection from it,
+    and writes made by the task that began the context's transaction join that
+    transaction instead of committing one by one. Reads wait for a transaction
+    another task holds open, so they never return or cache uncommitted rows.
+    """
+
+    bulk_chunk_size = 500  # Rows per executemany call in create_many/update_many
+    expiring_tables: Tuple[str, ...] = ()  # Tables with an expires_at column to purge
+    purge_batch_size = 500  # Expired rows deleted per purge transaction
+    vacuum_pages = 1024  # Free pages returned to the filesystem per purge
+
+    def __init__(self, db_path: str, db_context: Optional["DatabaseContext"] = None):
+        super().__init__()
+        self.db_path = db_path
+        self._db_context = db_context
+        self._schema_ready = False
+        self._purge_task: Optional[asyncio.Task] = None
+        self.last_purge: Optional[Dict[str, Any]] = None
+
+    async def _init_database(self, db: aiosqlite.Connection):
+        """Create or migrate this repository's tables. Override in concrete repositories."""
+
+    async def _get_connection(self) -> SharedConnection:
+        """Get the shared connection to this repository's database."""
+        if self._db_context is not None:
+            shared = await self._db_context._get_or_create_connection(self.db_path)
+        else:
+            shared = await get_shared_connection(self.db_path)
+
+        if not self._schema_ready:
+            await self._ensure_schema(shared)
+
+        return shared
+
+    async def _ensure_schema(self, shared: SharedConnection) -> None:
+        """Run _init_database once, as a single transaction.
+
+        Runs on the shared connection, since a transaction the context holds
+        open would block DDL from any other connection.
+        """
+        if self._db_context is not None and self._db_context.owns_transaction():
+            await self._init_database(shared.db)
+        else:
+            async with shared.transaction() as db:
+                if not db.in_transaction:
+                    # DDL does not open a transaction implicitly
+                    await db.execute("BEGIN IMMEDIATE")
+                await self._init_database(db)
+        self._schema_ready = True
+
+    async def _fetchone(self, query: str, params: Sequence[Any] = ()) -> Optional[tuple]:
+        """Run a query and return its first row (for single-row queries)."""
+        rows = await self._fetchall(query, params)
+        return rows[0] if rows else None
+
+    async def _fetchall(self, query: str, params: Sequence[Any] = ()) -> List[tuple]:
+        """Run a query and return all rows, waiting for another task's open transaction."""
+        shared = await self._get_connection()
+        async with shared.reading() as db:
+            return list(await db.execute_fetchall(query, params))
+
+    async def _execute(self, query: str, params: Sequence[Any] = ()) -> int:
+        """Run one write statement in its own transaction and return the affected row count."""
+        async with self._transaction() as db:
+            cursor = await db.execute(query, params)
+            return cursor.rowcount
+
+    def _chunks(
+        self, rows: Sequence[Any], chunk_size: Optional[int] = None
+    ) -> Iterable[Sequence[Any]]:
+        """Split rows into chunks of at most chunk_size (default bulk_chunk_size)."""
+        size = chunk_size or self.bulk_chunk_size
+        if size < 1:
+            raise ValueError("chunk_size must be positive")
+        for start in range(0, len(rows), size):
+            yield rows[start : start + size]
+
+    async def _write_many(
+        self,
+        db: aiosqlite.Connection,
+        query: str,
+        rows: Sequence[Sequence[Any]],
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        """Run one write statement over many parameter rows, chunk by chunk."""
+        for chunk in self._chunks(rows, chunk_size):
+            await db.executemany(query, chunk)
+
+    async def _existing_keys(
+        self,
+        db: aiosqlite.Connection,
+        table: str,
+        column: str,
+        keys: Sequence[K],
+        chunk_size: Optional[int] = None,
+    ) -> Set[K]:
+        """Get which of the keys already have a row in table."""
+        found = set()
+        for chunk in self._chunks(keys, chunk_size):
+            placeholders = ", ".join("?" * len(chunk))
+            rows = await db.execute_fetchall(
+                f"SELECT {column} FROM {table} WHERE {column} IN ({placeholders})", chunk
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    @asynccontextmanager
+    async def _transaction(self):
+        """Run several write statements as one committed unit.
+
+        Inside the context's transaction the statements join it, and the
+        context commits or rolls them back with everything else.
+        """
+        shared = await self._get_connection()
+        if self._db_context is not None and self._db_context.owns_transaction():
+            yield shared.db
+            return
+
+        async with shared.transaction() as db:
+            yield db
+
+    # Expired row maintenance
+    async def purge_expired(self, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Delete expired rows of expiring_tables in bounded batches, then vacuum.
+
+        Each batch commits on its own, so readers and other writers run
+        between batches instead of waiting for the whole purge.
+
+        Args:
+            batch_size: Rows deleted per transaction (default purge_batch_size)
+
+        Returns:
+            Rows removed per table and in total, pages freed and elapsed time
+        """
+        size = batch_size or self.purge_batch_size
+        start = time.perf_counter()
+        now = datetime.now().isoformat()
+
+        removed = {}
+        for table in self.expiring_tables:
+            removed[table] = 0
+            while True:
+                deleted = await self._execute(
+                    f"DELETE FROM {table} WHERE rowid IN "
+                    f"(SELECT rowid FROM {table} WHERE expires_at <= ? LIMIT ?)",
+                    (now, size),
+                )
+                removed[table] += deleted
+                if deleted < size:
+                    break
+
+        pages_freed = await self._incremental_vacuum()
+        self._cleanup_expired_cache()
+
+        stats = {
+            "removed": removed,
+            "rows_removed": sum(removed.values()),
+            "pages_freed": pages_freed,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+            "purged_at": datetime.now(),
+        }
+        self.last_purge = stats
+        logger.info(
+            f"🧹 Purged {stats['rows_removed']} expired rows from {self.db_path}, "
+            f"freed {pages_freed} pages in {stats['elapsed_ms']:.1f} ms"
+        )
+        return stats
+
+    async def _incremental_vacuum(self) -> int:
+        """Return up to vacuum_pages free pages to the filesystem.
+
+        Databases created before auto_vacuum was enabled on the shared
+        connections are switched to incremental mode with one full VACUUM.
+
+        Returns:
+            Number of pages freed
+        """
+        if self._db_context is not None and self._db_context.owns_transaction():
+            return 0  # Vacuuming cannot run inside the context's transaction
+
+        shared = await self._get_connection()
+        async with shared.write_lock:
+            db = shared.db
+            free_before = await self._pragma(db, "freelist_count")
+            if await self._pragma(db, "auto_vacuum") != 2:  # 2 = INCREMENTAL
+                await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                await db.execute("VACUUM")
+            elif free_before:
+                # execute() would step the pragma once and free a single page
+                await db.executescript(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+            return free_before - await self._pragma(db, "freelist_count")
+
+    @staticmethod
+    async def _pragma(db: aiosqlite.Connection, name: str) -> int:
+        """Read an integer PRAGMA value."""
+        rows = await db.execute_fetchall(f"PRAGMA {name}")
+        return rows[0][0]
+
+    def start_purge(self, interval: float) -> None:
+        """Run purge_expired every interval seconds on the running event loop."""
+        if self._purge_task is None or self._purge_task.done():
+            self._purge_task = asyncio.get_running_loop().create_task(self._purge_loop(interval))
+
+    def stop_purge(self) -> None:
+        """Stop the scheduled purge."""
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            self._purge_task = None
+
+    async def _purge_loop(self, interval: float):
+        """Background task for expired row maintenance."""
+        while True:
+            try:
+                await asyncio.sleep(interval)
+                await self.purge_expired()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error purging expired rows from {self.db_path}: {e}")
+
+    async def close(self):
+        """Stop the scheduled purge and cleanup resources."""
+        self.stop_purge()
+        await super().close()
+
+    async def health_check(self) -> bool:
+        """Check that the database answers queries."""
+        try:
+            return await self._fetchone("SELECT 1") is not None
+        except Exception:
+            return False
+
+
 class InMemoryRepository(BaseRepository[T, K]):
     """Simple in-memory repository implementation for testing and caching."""
 
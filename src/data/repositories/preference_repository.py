@@ -4,65 +4,80 @@ Handles data access operations for user preferences and settings.
 """
 
 import json
-import sqlite3
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import aiosqlite
 
 from ...models.user.preference_models import UserPreferences
-from .base_repository import BaseRepository
+from .base_repository import SQLiteRepository
+
+if TYPE_CHECKING:
+    from ..database_context import DatabaseContext
 
 
-class PreferenceRepository(BaseRepository[UserPreferences, str]):
+class PreferenceRepository(SQLiteRepository[UserPreferences, str]):
     """Repository for user preferences with SQLite persistence."""
 
-    def __init__(self, db_path: str = "user_preferences.db"):
-        super().__init__()
-        self.db_path = db_path
-        self._init_database()
+    _INSERT_SQL = """
+        INSERT INTO user_preferences (user_id, preferences_data, created_at, updated_at, version)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    _UPDATE_SQL = """
+        UPDATE user_preferences
+        SET preferences_data = ?, updated_at = ?, version = ?
+        WHERE user_id = ?
+    """
+    _HISTORY_SQL = """
+        INSERT INTO preference_history (user_id, change_type, old_value, new_value)
+        VALUES (?, ?, ?, ?)
+    """
+
+    def __init__(
+        self, db_path: str = "user_preferences.db", db_context: Optional["DatabaseContext"] = None
+    ):
+        super().__init__(db_path, db_context)
 
-    def _init_database(self):
+    async def _init_database(self, db: aiosqlite.Connection):
         """Initialize SQLite database for user preferences."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS user_preferences (
-                    user_id TEXT PRIMARY KEY,
-                    preferences_data TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    version TEXT DEFAULT '1.0'
-                )
+        await db.execute(
             """
+            CREATE TABLE IF NOT EXISTS user_preferences (
+                user_id TEXT PRIMARY KEY,
+                preferences_data TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                version TEXT DEFAULT '1.0'
             )
+        """
+        )
 
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS favorite_locations (
-                    user_id TEXT,
-                    location_name TEXT,
-                    location_data TEXT,
-                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (user_id, location_name),
-                    FOREIGN KEY (user_id) REFERENCES user_preferences(user_id)
-                )
+        await db.execute(
             """
+            CREATE TABLE IF NOT EXISTS favorite_locations (
+                user_id TEXT,
+                location_name TEXT,
+                location_data TEXT,
+                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, location_name),
+                FOREIGN KEY (user_id) REFERENCES user_preferences(user_id)
             )
+        """
+        )
 
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS preference_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT,
-                    change_type TEXT,
-                    old_value TEXT,
-                    new_value TEXT,
-                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES user_preferences(user_id)
-                )
+        await db.execute(
             """
+            CREATE TABLE IF NOT EXISTS preference_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT,
+                change_type TEXT,
+                old_value TEXT,
+                new_value TEXT,
+                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES user_preferences(user_id)
             )
-
-            conn.commit()
+        """
+        )
 
     async def get_by_id(self, user_id: str) -> Optional[UserPreferences]:
         """Get user preferences by user ID."""
@@ -72,37 +87,33 @@ class PreferenceRepository(BaseRepository[UserPreferences, str]):
             return cached
 
         # Check database
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT preferences_data FROM user_preferences WHERE user_id = ?", (user_id,)
-            )
-            row = cursor.fetchone()
+        row = await self._fetchone(
+            "SELECT preferences_data FROM user_preferences WHERE user_id = ?", (user_id,)
+        )
 
-            if row:
-                preferences_dict = json.loads(row[0])
-                preferences = UserPreferences.from_dict(preferences_dict)
-                self._set_cache(user_id, preferences)
-                return preferences
+        if row:
+            preferences_dict = json.loads(row[0])
+            preferences = UserPreferences.from_dict(preferences_dict)
+            self._set_cache(user_id, preferences)
+            return preferences
 
         return None
 
     async def get_all(self, limit: Optional[int] = None, offset: int = 0) -> List[UserPreferences]:
         """Get all user preferences with pagination."""
-        with sqlite3.connect(self.db_path) as conn:
-            query = "SELECT preferences_data FROM user_preferences ORDER BY updated_at DESC"
-            params = []
+        query = "SELECT preferences_data FROM user_preferences ORDER BY updated_at DESC"
+        params = []
 
-            if limit:
-                query += " LIMIT ? OFFSET ?"
-                params.extend([limit, offset])
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
 
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
+        rows = await self._fetchall(query, params)
 
-            return [UserPreferences.from_dict(json.loads(row[0])) for row in rows]
+        return [UserPreferences.from_dict(json.loads(row[0])) for row in rows]
 
-    async def create(self, entity: UserPreferences) -> UserPreferences:
-        """Create new user preferences."""
+    def _insert_params(self, entity: UserPreferences) -> tuple:
+        """Stamp new preferences and build the INSERT parameters."""
         if not entity.user_id:
             raise ValueError("User ID is required for creating preferences")
 
@@ -111,76 +122,120 @@ class PreferenceRepository(BaseRepository[UserPreferences, str]):
 
         preferences_dict = entity.to_dict()
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT INTO user_preferences (user_id, preferences_data, created_at, updated_at, version) VALUES (?, ?, ?, ?, ?)",
-                (
-                    entity.user_id,
-                    json.dumps(preferences_dict),
-                    entity.created_at.isoformat(),
-                    entity.updated_at.isoformat(),
-                    entity.version,
-                ),
-            )
-            conn.commit()
+        return (
+            entity.user_id,
+            json.dumps(preferences_dict),
+            entity.created_at.isoformat(),
+            entity.updated_at.isoformat(),
+            entity.version,
+        )
+
+    def _update_params(self, user_id: str, entity: UserPreferences) -> tuple:
+        """Stamp updated preferences and build the UPDATE parameters."""
+        entity.user_id = user_id
+        entity.update_timestamp()
+
+        preferences_dict = entity.to_dict()
+
+        return (
+            json.dumps(preferences_dict),
+            entity.updated_at.isoformat(),
+            entity.version,
+            user_id,
+        )
+
+    async def create(self, entity: UserPreferences) -> UserPreferences:
+        """Create new user preferences."""
+        await self._execute(self._INSERT_SQL, self._insert_params(entity))
 
         # Cache the new preferences
         self._set_cache(entity.user_id, entity)
         return entity
 
+    async def create_many(
+        self, entities: List[UserPreferences], chunk_size: Optional[int] = None
+    ) -> List[UserPreferences]:
+        """Create preferences for many users in one transaction with executemany."""
+        rows = [self._insert_params(entity) for entity in entities]
+
+        async with self._transaction() as db:
+            await self._write_many(db, self._INSERT_SQL, rows, chunk_size)
+
+        self._set_cache_many({entity.user_id: entity for entity in entities})
+        return entities
+
     async def update(self, user_id: str, entity: UserPreferences) -> Optional[UserPreferences]:
         """Update existing user preferences."""
         # Get current preferences for change tracking
         current_prefs = await self.get_by_id(user_id)
 
-        entity.user_id = user_id
-        entity.update_timestamp()
+        async with self._transaction() as db:
+            cursor = await db.execute(self._UPDATE_SQL, self._update_params(user_id, entity))
+            updated = cursor.rowcount > 0
 
-        preferences_dict = entity.to_dict()
+            # Log the change if we had previous preferences
+            if updated and current_prefs:
+                await self._log_preference_change(db, user_id, current_prefs, entity)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "UPDATE user_preferences SET preferences_data = ?, updated_at = ?, version = ? WHERE user_id = ?",
-                (
-                    json.dumps(preferences_dict),
-                    entity.updated_at.isoformat(),
-                    entity.version,
-                    user_id,
-                ),
-            )
+        if updated:
+            # Update cache
+            self._set_cache(user_id, entity)
+            return entity
+
+        return None
 
-            if cursor.rowcount > 0:
-                # Log the change if we had previous preferences
-                if current_prefs:
-                    await self._log_preference_change(user_id, current_prefs, entity)
+    async def update_many(
+        self, updates: Dict[str, UserPreferences], chunk_size: Optional[int] = None
+    ) -> List[UserPreferences]:
+        """Update preferences for many users in one transaction with executemany.
+
+        Users without stored preferences are skipped, as in update(), and
+        changes are logged to the preference history in the same transaction.
+        """
+        async with self._transaction() as db:
+            current = {}
+            for chunk in self._chunks(list(updates), chunk_size):
+                placeholders = ", ".join("?" * len(chunk))
+                rows = await db.execute_fetchall(
+                    "SELECT user_id, preferences_data FROM user_preferences "
+                    f"WHERE user_id IN ({placeholders})",
+                    chunk,
+                )
+                current.update(
+                    (row[0], UserPreferences.from_dict(json.loads(row[1]))) for row in rows
+                )
 
-                conn.commit()
+            updated = {key: entity for key, entity in updates.items() if key in current}
+            rows = [self._update_params(key, entity) for key, entity in updated.items()]
+            await self._write_many(db, self._UPDATE_SQL, rows, chunk_size)
 
-                # Update cache
-                self._set_cache(user_id, entity)
-                return entity
+            history = [
+                (user_id, *change)
+                for user_id, entity in updated.items()
+                for change in self._preference_changes(current[user_id], entity)
+            ]
+            await self._write_many(db, self._HISTORY_SQL, history, chunk_size)
 
-        return None
+        self._set_cache_many(updated)
+        return list(updated.values())
 
     async def delete(self, user_id: str) -> bool:
         """Delete user preferences."""
-        with sqlite3.connect(self.db_path) as conn:
+        async with self._transaction() as db:
             # Delete related data first
-            conn.execute("DELETE FROM favorite_locations WHERE user_id = ?", (user_id,))
-            conn.execute("DELETE FROM preference_history WHERE user_id = ?", (user_id,))
+            await db.execute("DELETE FROM favorite_locations WHERE user_id = ?", (user_id,))
+            await db.execute("DELETE FROM preference_history WHERE user_id = ?", (user_id,))
 
             # Delete main preferences
-            cursor = conn.execute("DELETE FROM user_preferences WHERE user_id = ?", (user_id,))
-            conn.commit()
+            cursor = await db.execute("DELETE FROM user_preferences WHERE user_id = ?", (user_id,))
 
-            self._invalidate_cache(user_id)
-            return cursor.rowcount > 0
+        self._invalidate_cache(user_id)
+        return cursor.rowcount > 0
 
     async def exists(self, user_id: str) -> bool:
         """Check if user preferences exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT 1 FROM user_preferences WHERE user_id = ?", (user_id,))
-            return cursor.fetchone() is not None
+        row = await self._fetchone("SELECT 1 FROM user_preferences WHERE user_id = ?", (user_id,))
+        return row is not None
 
     async def get_or_create_default(self, user_id: str) -> UserPreferences:
         """Get user preferences or create default ones if they don't exist."""
@@ -252,12 +307,10 @@ class PreferenceRepository(BaseRepository[UserPreferences, str]):
             await self.update(user_id, preferences)
 
         # Store detailed location data
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO favorite_locations (user_id, location_name, location_data) VALUES (?, ?, ?)",
-                (user_id, location_name, json.dumps(location_data)),
-            )
-            conn.commit()
+        await self._execute(
+            "INSERT OR REPLACE INTO favorite_locations (user_id, location_name, location_data) VALUES (?, ?, ?)",
+            (user_id, location_name, json.dumps(location_data)),
+        )
 
         return True
 
@@ -273,26 +326,20 @@ class PreferenceRepository(BaseRepository[UserPreferences, str]):
             await self.update(user_id, preferences)
 
         # Remove detailed location data
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM favorite_locations WHERE user_id = ? AND location_name = ?",
-                (user_id, location_name),
-            )
-            conn.commit()
-            return cursor.rowcount > 0
-
-        return False
+        deleted = await self._execute(
+            "DELETE FROM favorite_locations WHERE user_id = ? AND location_name = ?",
+            (user_id, location_name),
+        )
+        return deleted > 0
 
     async def get_favorite_locations(self, user_id: str) -> List[Dict[str, Any]]:
         """Get detailed favorite location data for user."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT location_name, location_data FROM favorite_locations WHERE user_id = ? ORDER BY added_at",
-                (user_id,),
-            )
-            rows = cursor.fetchall()
+        rows = await self._fetchall(
+            "SELECT location_name, location_data FROM favorite_locations WHERE user_id = ? ORDER BY added_at",
+            (user_id,),
+        )
 
-            return [{"name": row[0], "data": json.loads(row[1])} for row in rows]
+        return [{"name": row[0], "data": json.loads(row[1])} for row in rows]
 
     async def set_default_location(self, user_id: str, location_name: str) -> bool:
         """Set default location for user."""
@@ -306,27 +353,33 @@ class PreferenceRepository(BaseRepository[UserPreferences, str]):
 
     async def get_preference_history(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get preference change history for user."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT change_type, old_value, new_value, changed_at FROM preference_history WHERE user_id = ? ORDER BY changed_at DESC LIMIT ?",
-                (user_id, limit),
-            )
-            rows = cursor.fetchall()
-
-            return [
-                {
-                    "change_type": row[0],
-                    "old_value": row[1],
-                    "new_value": row[2],
-                    "changed_at": row[3],
-                }
-                for row in rows
-            ]
+        rows = await self._fetchall(
+            "SELECT change_type, old_value, new_value, changed_at FROM preference_history WHERE user_id = ? ORDER BY changed_at DESC LIMIT ?",
+            (user_id, limit),
+        )
+
+        return [
+            {
+                "change_type": row[0],
+                "old_value": row[1],
+                "new_value": row[2],
+                "changed_at": row[3],
+            }
+            for row in rows
+        ]
 
     async def _log_preference_change(
-        self, user_id: str, old_prefs: UserPreferences, new_prefs: UserPreferences
+        self, db, user_id: str, old_prefs: UserPreferences, new_prefs: UserPreferences
     ):
-        """Log preference changes for audit trail."""
+        """Log preference changes for audit trail (inside the caller's transaction)."""
+        changes = self._preference_changes(old_prefs, new_prefs)
+        if changes:
+            await db.executemany(self._HISTORY_SQL, [(user_id, *change) for change in changes])
+
+    def _preference_changes(
+        self, old_prefs: UserPreferences, new_prefs: UserPreferences
+    ) -> List[tuple]:
+        """Get (change_type, old_value, new_value) for each changed preference group."""
         changes = []
 
         # Compare units
@@ -369,30 +422,20 @@ class PreferenceRepository(BaseRepository[UserPreferences, str]):
                 }
             )
 
-        # Log changes
-        if changes:
-            with sqlite3.connect(self.db_path) as conn:
-                for change in changes:
-                    conn.execute(
-                        "INSERT INTO preference_history (user_id, change_type, old_value, new_value) VALUES (?, ?, ?, ?)",
-                        (user_id, change["change_type"], change["old_value"], change["new_value"]),
-                    )
-                conn.commit()
+        return [
+            (change["change_type"], change["old_value"], change["new_value"]) for change in changes
+        ]
 
     async def count(self, criteria: Optional[Dict[str, Any]] = None) -> int:
         """Count user preferences records."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM user_preferences")
-            return cursor.fetchone()[0]
+        row = await self._fetchone("SELECT COUNT(*) FROM user_preferences")
+        return row[0]
 
     async def cleanup_old_history(self, days_to_keep: int = 90) -> int:
         """Clean up old preference history records."""
         cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         cutoff_date = cutoff_date.replace(day=cutoff_date.day - days_to_keep)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM preference_history WHERE changed_at < ?", (cutoff_date.isoformat(),)
-            )
-            conn.commit()
-            return cursor.rowcount
+        return await self._execute(
+            "DELETE FROM preference_history WHERE changed_at < ?", (cutoff_date.isoformat(),)
+        )
@@ -1,67 +1,247 @@
 """Weather Data Repository
 
 Handles data access operations for weather information.
+
+Cached weather and forecasts are stored in typed columns (forecast entries in a
+child table), so rows are read without JSON decoding and single metrics can be
+queried directly. Databases written with the earlier one-JSON-blob-per-row
+layout are migrated in place on first use.
 """
 
 import json
-import sqlite3
+import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import aiosqlite
 
 from ...models.location.location_models import Location
 from ...models.weather.alert_models import WeatherAlert
-from ...models.weather.current_weather import WeatherData
-from ...models.weather.forecast_models import ForecastData
-from .base_repository import BaseRepository
+from ...models.weather.current_weather import WeatherCondition, WeatherData
+from ...models.weather.forecast_models import DailyForecast, ForecastData, ForecastEntry
+from .base_repository import SQLiteRepository
+
+if TYPE_CHECKING:
+    from ..database_context import DatabaseContext
+
+logger = logging.getLogger(__name__)
+
+# Column order of weather_cache rows (after location_key)
+WEATHER_FIELDS = (
+    "location_name",
+    "country",
+    "state",
+    "latitude",
+    "longitude",
+    "observed_at",
+    "condition",
+    "description",
+    "temperature",
+    "feels_like",
+    "humidity",
+    "pressure",
+    "visibility",
+    "uv_index",
+    "wind_speed",
+    "wind_direction",
+    "wind_gust",
+    "cloudiness",
+    "sunrise",
+    "sunset",
+    "alerts",
+)
+
+# Weather columns that can be read on their own with get_metric
+WEATHER_METRICS = (
+    "temperature",
+    "feels_like",
+    "humidity",
+    "pressure",
+    "visibility",
+    "uv_index",
+    "wind_speed",
+    "wind_direction",
+    "wind_gust",
+    "cloudiness",
+)
+
+# Column order of forecast_cache rows (after location_key)
+FORECAST_FIELDS = ("location_name", "country", "state", "latitude", "longitude", "issued_at")
+
+# Column order of forecast_entries rows (after location_key, kind, position)
+FORECAST_ENTRY_FIELDS = (
+    "valid_at",
+    "condition",
+    "description",
+    "temperature",
+    "feels_like",
+    "temp_min",
+    "temp_max",
+    "humidity",
+    "pressure",
+    "wind_speed",
+    "wind_direction",
+    "cloudiness",
+    "precipitation_probability",
+    "precipitation_amount",
+)
+
+# Forecast entry columns that can be read as a series with get_series
+FORECAST_METRICS = FORECAST_ENTRY_FIELDS[3:]
+
+HOURLY = "hourly"
+DAILY = "daily"
+
+
+def _insert_sql(table: str, columns: Sequence[str], verb: str = "INSERT OR REPLACE") -> str:
+    """Build an insert statement for the given columns."""
+    placeholders = ", ".join("?" * len(columns))
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    """Format an optional datetime for storage."""
+    return value.isoformat() if value else None
+
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parse an optional stored datetime."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _condition(value: Optional[str]) -> WeatherCondition:
+    """Parse a stored weather condition."""
+    try:
+        return WeatherCondition(value) if value else WeatherCondition.UNKNOWN
+    except ValueError:
+        return WeatherCondition.UNKNOWN
+
+
+def _condition_value(condition: Optional[WeatherCondition]) -> str:
+    """Get the stored value of a weather condition."""
+    return (condition or WeatherCondition.UNKNOWN).value
+
+
+def _location_columns(location: Location) -> tuple:
+    """Get the stored location columns."""
+    return (location.name, location.country, location.state, location.latitude, location.longitude)
+
+
+def _row_location(row: Sequence[Any]) -> Location:
+    """Build a Location from the first five stored columns."""
+    return Location(name=row[0], country=row[1], state=row[2], latitude=row[3], longitude=row[4])
+
+
+def _dict_location(data: Dict[str, Any]) -> Location:
+    """Build a Location from a dictionary of the JSON blob layout."""
+    return Location(
+        name=data["name"],
+        country=data["country"],
+        state=data.get("state"),
+        latitude=data["latitude"],
+        longitude=data["longitude"],
+    )
+
+
+async def _has_column(db: aiosqlite.Connection, table: str, column: str) -> bool:
+    """Check if a table exists with the given column."""
+    rows = await db.execute_fetchall(f"PRAGMA table_info({table})")
+    return any(row[1] == column for row in rows)
 
 
-class WeatherRepository(BaseRepository[WeatherData, str]):
+class WeatherRepository(SQLiteRepository[WeatherData, str]):
     """Repository for weather data with caching and persistence."""
 
-    def __init__(self, db_path: str = "weather_cache.db"):
-        super().__init__()
-        self.db_path = db_path
-        self._init_database()
+    expiring_tables = ("weather_cache", "alert_cache")
+    _UPSERT_SQL = _insert_sql("weather_cache", ("location_key", *WEATHER_FIELDS, "expires_at"))
+    _SELECT_SQL = f"SELECT {', '.join(WEATHER_FIELDS)} FROM weather_cache"
+
+    def __init__(
+        self, db_path: str = "weather_cache.db", db_context: Optional["DatabaseContext"] = None
+    ):
+        super().__init__(db_path, db_context)
 
-    def _init_database(self):
+    async def _init_database(self, db: aiosqlite.Connection):
         """Initialize SQLite database for weather caching."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS weather_cache (
-                    location_key TEXT PRIMARY KEY,
-                    weather_data TEXT NOT NULL,
-                    cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL
-                )
-            """
-            )
+        legacy = await _has_column(db, "weather_cache", "weather_data")
+        if legacy:
+            await db.execute("ALTER TABLE weather_cache RENAME TO weather_cache_blob")
 
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS forecast_cache (
-                    location_key TEXT PRIMARY KEY,
-                    forecast_data TEXT NOT NULL,
-                    cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL
-                )
+        await db.execute(
             """
+            CREATE TABLE IF NOT EXISTS weather_cache (
+                location_key TEXT PRIMARY KEY,
+                location_name TEXT NOT NULL,
+                country TEXT,
+                state TEXT,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL,
+                observed_at TIMESTAMP NOT NULL,
+                condition TEXT NOT NULL,
+                description TEXT,
+                temperature REAL,
+                feels_like REAL,
+                humidity INTEGER,
+                pressure REAL,
+                visibility REAL,
+                uv_index REAL,
+                wind_speed REAL,
+                wind_direction INTEGER,
+                wind_gust REAL,
+                cloudiness INTEGER,
+                sunrise TIMESTAMP,
+                sunset TIMESTAMP,
+                alerts TEXT,
+                cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL
             )
+        """
+        )
 
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS alert_cache (
-                    location_key TEXT,
-                    alert_id TEXT,
-                    alert_data TEXT NOT NULL,
-                    cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL,
-                    PRIMARY KEY (location_key, alert_id)
-                )
+        await db.execute(
             """
+            CREATE TABLE IF NOT EXISTS alert_cache (
+                location_key TEXT,
+                alert_id TEXT,
+                alert_data TEXT NOT NULL,
+                cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (location_key, alert_id)
             )
+        """
+        )
+
+        # Every read filters on expires_at, and purge_expired scans it
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_weather_cache_expires ON weather_cache(expires_at)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_alert_cache_expires ON alert_cache(expires_at)"
+        )
 
-            conn.commit()
+        if legacy:
+            await self._migrate_blob_rows(db)
+
+    async def _migrate_blob_rows(self, db: aiosqlite.Connection) -> None:
+        """Move rows of the JSON blob layout into the typed columns."""
+        rows = await db.execute_fetchall(
+            "SELECT location_key, weather_data, cached_at, expires_at FROM weather_cache_blob"
+        )
+
+        migrated = []
+        for location_key, weather_json, cached_at, expires_at in rows:
+            try:
+                weather_data = self._dict_to_weather_data(json.loads(weather_json))
+            except Exception as e:
+                logger.warning(f"Dropping unreadable cached weather for {location_key}: {e}")
+                continue
+            row = self._weather_row(location_key, weather_data, expires_at)
+            migrated.append(row + (cached_at,))
+
+        columns = ("location_key", *WEATHER_FIELDS, "expires_at", "cached_at")
+        await self._write_many(db, _insert_sql("weather_cache", columns), migrated)
+        await db.execute("DROP TABLE weather_cache_blob")
+        logger.info(f"Migrated {len(migrated)} cached weather rows to the columnar schema")
 
     def _get_location_key(self, location: Location) -> str:
         """Generate unique key for location."""
@@ -75,76 +255,117 @@ class WeatherRepository(BaseRepository[WeatherData, str]):
             return cached
 
         # Check database cache
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT weather_data FROM weather_cache WHERE location_key = ? AND expires_at > ?",
-                (location_key, datetime.now().isoformat()),
-            )
-            row = cursor.fetchone()
+        row = await self._fetchone(
+            f"{self._SELECT_SQL} WHERE location_key = ? AND expires_at > ?",
+            (location_key, datetime.now().isoformat()),
+        )
 
-            if row:
-                weather_dict = json.loads(row[0])
-                weather_data = self._dict_to_weather_data(weather_dict)
-                self._set_cache(location_key, weather_data)
-                return weather_data
+        if row:
+            weather_data = self._row_to_weather_data(row)
+            self._set_cache(location_key, weather_data)
+            return weather_data
 
         return None
 
     async def get_all(self, limit: Optional[int] = None, offset: int = 0) -> List[WeatherData]:
         """Get all cached weather data."""
-        with sqlite3.connect(self.db_path) as conn:
-            query = "SELECT weather_data FROM weather_cache WHERE expires_at > ? ORDER BY cached_at DESC"
-            params = [datetime.now().isoformat()]
-
-            if limit:
-                query += " LIMIT ? OFFSET ?"
-                params.extend([limit, offset])
-
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
-
-            return [self._dict_to_weather_data(json.loads(row[0])) for row in rows]
+        query = f"{self._SELECT_SQL} WHERE expires_at > ? ORDER BY cached_at DESC"
+        params = [datetime.now().isoformat()]
+
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+
+        rows = await self._fetchall(query, params)
+
+        return [self._row_to_weather_data(row) for row in rows]
+
+    async def get_metric(
+        self, metric: str, location_keys: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Read one metric of cached weather without loading whole records.
+
+        Args:
+            metric: Column to read, one of WEATHER_METRICS
+            location_keys: Restrict to these locations; all cached locations if omitted
+
+        Returns:
+            Mapping of location key to metric value
+        """
+        if metric not in WEATHER_METRICS:
+            raise ValueError(f"Unknown weather metric: {metric}")
+
+        query = f"SELECT location_key, {metric} FROM weather_cache WHERE expires_at > ?"
+        now = datetime.now().isoformat()
+        if location_keys is None:
+            return dict(await self._fetchall(query, (now,)))
+
+        values = {}
+        for chunk in self._chunks(list(location_keys)):
+            placeholders = ", ".join("?" * len(chunk))
+            rows = await self._fetchall(
+                f"{query} AND location_key IN ({placeholders})", (now, *chunk)
+            )
+            values.update(rows)
+        return values
 
     async def create(self, entity: WeatherData) -> WeatherData:
         """Cache weather data."""
         location_key = self._get_location_key(entity.location)
         return await self.update(location_key, entity)
 
+    async def create_many(
+        self, entities: List[WeatherData], chunk_size: Optional[int] = None
+    ) -> List[WeatherData]:
+        """Cache weather data for many locations in one transaction."""
+        updates = {self._get_location_key(entity.location): entity for entity in entities}
+        await self.update_many(updates, chunk_size)
+        return entities
+
     async def update(self, location_key: str, entity: WeatherData) -> Optional[WeatherData]:
         """Update cached weather data."""
         expires_at = datetime.now() + timedelta(minutes=10)  # 10-minute cache
-        weather_dict = self._weather_data_to_dict(entity)
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO weather_cache (location_key, weather_data, expires_at) VALUES (?, ?, ?)",
-                (location_key, json.dumps(weather_dict), expires_at.isoformat()),
-            )
-            conn.commit()
+        await self._execute(
+            self._UPSERT_SQL, self._weather_row(location_key, entity, expires_at.isoformat())
+        )
 
         # Update memory cache
         self._set_cache(location_key, entity, 600)  # 10 minutes
         return entity
 
+    async def update_many(
+        self, updates: Dict[str, WeatherData], chunk_size: Optional[int] = None
+    ) -> List[WeatherData]:
+        """Update cached weather data for many locations with executemany."""
+        expires_at = (datetime.now() + timedelta(minutes=10)).isoformat()  # 10-minute cache
+        rows = [
+            self._weather_row(location_key, entity, expires_at)
+            for location_key, entity in updates.items()
+        ]
+
+        async with self._transaction() as db:
+            await self._write_many(db, self._UPSERT_SQL, rows, chunk_size)
+
+        self._set_cache_many(updates, 600)  # 10 minutes
+        return list(updates.values())
+
     async def delete(self, location_key: str) -> bool:
         """Delete cached weather data."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM weather_cache WHERE location_key = ?", (location_key,)
-            )
-            conn.commit()
+        deleted = await self._execute(
+            "DELETE FROM weather_cache WHERE location_key = ?", (location_key,)
+        )
 
-            self._invalidate_cache(location_key)
-            return cursor.rowcount > 0
+        self._invalidate_cache(location_key)
+        return deleted > 0
 
     async def exists(self, location_key: str) -> bool:
         """Check if weather data exists in cache."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT 1 FROM weather_cache WHERE location_key = ? AND expires_at > ?",
-                (location_key, datetime.now().isoformat()),
-            )
-            return cursor.fetchone() is not None
+        row = await self._fetchone(
+            "SELECT 1 FROM weather_cache WHERE location_key = ? AND expires_at > ?",
+            (location_key, datetime.now().isoformat()),
+        )
+        return row is not None
 
     async def get_weather_by_location(self, location: Location) -> Optional[WeatherData]:
         """Get weather data for specific location."""
@@ -156,71 +377,75 @@ class WeatherRepository(BaseRepository[WeatherData, str]):
         location_key = self._get_location_key(location)
         return await self.update(location_key, weather_data)
 
-    def _weather_data_to_dict(self, weather_data: WeatherData) -> Dict[str, Any]:
-        """Convert WeatherData to dictionary for storage."""
-        return {
-            "temperature": weather_data.temperature,
-            "feels_like": weather_data.feels_like,
-            "humidity": weather_data.humidity,
-            "pressure": weather_data.pressure,
-            "wind_speed": weather_data.wind_speed,
-            "wind_direction": weather_data.wind_direction,
-            "visibility": weather_data.visibility,
-            "uv_index": weather_data.uv_index,
-            "condition": weather_data.condition.value if weather_data.condition else None,
-            "description": weather_data.description,
-            "icon": weather_data.icon,
-            "sunrise": weather_data.sunrise.isoformat() if weather_data.sunrise else None,
-            "sunset": weather_data.sunset.isoformat() if weather_data.sunset else None,
-            "timestamp": weather_data.timestamp.isoformat(),
-            "location": {
-                "name": weather_data.location.name,
-                "country": weather_data.location.country,
-                "state": weather_data.location.state,
-                "latitude": weather_data.location.latitude,
-                "longitude": weather_data.location.longitude,
-            },
-            "alerts": [self._alert_to_dict(alert) for alert in weather_data.alerts],
-        }
-
-    def _dict_to_weather_data(self, data: Dict[str, Any]) -> WeatherData:
-        """Convert dictionary to WeatherData object."""
-        from ...models.weather.current_weather import WeatherCondition
-
-        location_data = data["location"]
-        location = Location(
-            name=location_data["name"],
-            country=location_data["country"],
-            state=location_data.get("state"),
-            latitude=location_data["latitude"],
-            longitude=location_data["longitude"],
+    def _weather_row(self, location_key: str, weather_data: WeatherData, expires_at: str) -> tuple:
+        """Convert WeatherData to a weather_cache row."""
+        alerts = [self._alert_to_dict(alert) for alert in weather_data.alerts]
+        return (
+            location_key,
+            *_location_columns(weather_data.location),
+            weather_data.timestamp.isoformat(),
+            _condition_value(weather_data.condition),
+            weather_data.description,
+            weather_data.temperature,
+            weather_data.feels_like,
+            weather_data.humidity,
+            weather_data.pressure,
+            weather_data.visibility,
+            weather_data.uv_index,
+            weather_data.wind_speed,
+            weather_data.wind_direction,
+            weather_data.wind_gust,
+            weather_data.cloudiness,
+            _iso(weather_data.sunrise),
+            _iso(weather_data.sunset),
+            json.dumps(alerts) if alerts else None,
+            expires_at,
         )
 
-        condition = None
-        if data.get("condition"):
-            try:
-                condition = WeatherCondition(data["condition"])
-            except ValueError:
-                condition = WeatherCondition.UNKNOWN
+    def _row_to_weather_data(self, row: Sequence[Any]) -> WeatherData:
+        """Convert a weather_cache row (WEATHER_FIELDS order) to WeatherData."""
+        alerts = [self._dict_to_alert(alert) for alert in json.loads(row[20])] if row[20] else []
+        return WeatherData(
+            location=_row_location(row),
+            timestamp=datetime.fromisoformat(row[5]),
+            condition=_condition(row[6]),
+            description=row[7],
+            temperature=row[8],
+            feels_like=row[9],
+            humidity=row[10],
+            pressure=row[11],
+            visibility=row[12],
+            uv_index=row[13],
+            wind_speed=row[14],
+            wind_direction=row[15],
+            wind_gust=row[16],
+            cloudiness=row[17],
+            sunrise=_from_iso(row[18]),
+            sunset=_from_iso(row[19]),
+            alerts=alerts,
+        )
 
-        alerts = [self._dict_to_alert(alert_data) for alert_data in data.get("alerts", [])]
+    def _dict_to_weather_data(self, data: Dict[str, Any]) -> WeatherData:
+        """Convert a dictionary of the JSON blob layout to WeatherData."""
+        alerts = [self._dict_to_alert(alert_data) for alert_data in data.get("alerts") or []]
 
         return WeatherData(
             temperature=data["temperature"],
-            feels_like=data["feels_like"],
-            humidity=data["humidity"],
-            pressure=data["pressure"],
-            wind_speed=data["wind_speed"],
-            wind_direction=data["wind_direction"],
-            visibility=data["visibility"],
-            uv_index=data["uv_index"],
-            condition=condition,
-            description=data["description"],
-            icon=data["icon"],
-            sunrise=datetime.fromisoformat(data["sunrise"]) if data.get("sunrise") else None,
-            sunset=datetime.fromisoformat(data["sunset"]) if data.get("sunset") else None,
+            feels_like=data.get("feels_like"),
+            humidity=data.get("humidity"),
+            pressure=data.get("pressure"),
+            wind_speed=data.get("wind_speed"),
+            wind_direction=data.get("wind_direction"),
+            wind_gust=data.get("wind_gust"),
+            cloudiness=data.get("cloudiness"),
+            visibility=data.get("visibility"),
+            uv_index=data.get("uv_index"),
+            condition=_condition(data.get("condition")),
+            description=data.get("description", ""),
+            sunrise=_from_iso(data.get("sunrise")),
+            sunset=_from_iso(data.get("sunset")),
             timestamp=datetime.fromisoformat(data["timestamp"]),
-            location=location,
+            location=_dict_location(data["location"]),
             alerts=alerts,
         )
 
@@ -250,22 +475,108 @@ class WeatherRepository(BaseRepository[WeatherData, str]):
 
     async def cleanup_expired(self) -> int:
         """Remove expired cache entries."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM weather_cache WHERE expires_at <= ?", (datetime.now().isoformat(),)
+        stats = await self.purge_expired()
+        return stats["rows_removed"]
+
+
+class ForecastRepository(SQLiteRepository[ForecastData, str]):
+    """Repository for weather forecast data."""
+
+    expiring_tables = ("forecast_cache",)  # Entries are removed by ON DELETE CASCADE
+    _UPSERT_SQL = _insert_sql("forecast_cache", ("location_key", *FORECAST_FIELDS, "expires_at"))
+    _INSERT_ENTRY_SQL = _insert_sql(
+        "forecast_entries", ("location_key", "kind", "position", *FORECAST_ENTRY_FIELDS), "INSERT"
+    )
+    _DELETE_ENTRIES_SQL = "DELETE FROM forecast_entries WHERE location_key = ?"
+    _SELECT_SQL = f"SELECT location_key, {', '.join(FORECAST_FIELDS)} FROM forecast_cache"
+    _SELECT_ENTRIES_SQL = (
+        f"SELECT location_key, kind, {', '.join(FORECAST_ENTRY_FIELDS)} FROM forecast_entries"
+    )
+
+    def __init__(
+        self, db_path: str = "weather_cache.db", db_context: Optional["DatabaseContext"] = None
+    ):
+        super().__init__(db_path, db_context)
+
+    async def _init_database(self, db: aiosqlite.Connection):
+        """Initialize SQLite database for forecast caching."""
+        legacy = await _has_column(db, "forecast_cache", "forecast_data")
+        if legacy:
+            await db.execute("ALTER TABLE forecast_cache RENAME TO forecast_cache_blob")
+
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS forecast_cache (
+                location_key TEXT PRIMARY KEY,
+                location_name TEXT NOT NULL,
+                country TEXT,
+                state TEXT,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL,
+                issued_at TIMESTAMP NOT NULL,
+                cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL
             )
-            conn.commit()
+        """
+        )
 
-            self._cleanup_expired_cache()
-            return cursor.rowcount
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS forecast_entries (
+                location_key TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                valid_at TIMESTAMP NOT NULL,
+                condition TEXT NOT NULL,
+                description TEXT,
+                temperature REAL,
+                feels_like REAL,
+                temp_min REAL,
+                temp_max REAL,
+                humidity INTEGER,
+                pressure REAL,
+                wind_speed REAL,
+                wind_direction INTEGER,
+                cloudiness INTEGER,
+                precipitation_probability REAL,
+                precipitation_amount REAL,
+                PRIMARY KEY (location_key, kind, position),
+                FOREIGN KEY (location_key) REFERENCES forecast_cache(location_key)
+                    ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """
+        )
 
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_forecast_cache_expires ON forecast_cache(expires_at)"
+        )
 
-class ForecastRepository(BaseRepository[ForecastData, str]):
-    """Repository for weather forecast data."""
+        if legacy:
+            await self._migrate_blob_rows(db)
 
-    def __init__(self, db_path: str = "weather_cache.db"):
-        super().__init__()
-        self.db_path = db_path
+    async def _migrate_blob_rows(self, db: aiosqlite.Connection) -> None:
+        """Move rows of the JSON blob layout into the typed tables."""
+        rows = await db.execute_fetchall(
+            "SELECT location_key, forecast_data, cached_at, expires_at FROM forecast_cache_blob"
+        )
+
+        parents = []
+        entries = []
+        for location_key, forecast_json, cached_at, expires_at in rows:
+            try:
+                forecast_data = self._dict_to_forecast_data(json.loads(forecast_json))
+            except Exception as e:
+                logger.warning(f"Dropping unreadable cached forecast for {location_key}: {e}")
+                continue
+            row = self._forecast_row(location_key, forecast_data, expires_at)
+            parents.append(row + (cached_at,))
+            entries.extend(self._entry_rows(location_key, forecast_data))
+
+        columns = ("location_key", *FORECAST_FIELDS, "expires_at", "cached_at")
+        await self._write_many(db, _insert_sql("forecast_cache", columns), parents)
+        await self._write_many(db, self._INSERT_ENTRY_SQL, entries)
+        await db.execute("DROP TABLE forecast_cache_blob")
+        logger.info(f"Migrated {len(parents)} cached forecasts to the columnar schema")
 
     def _get_location_key(self, location: Location) -> str:
         """Generate unique key for location."""
@@ -277,186 +588,279 @@ class ForecastRepository(BaseRepository[ForecastData, str]):
         if cached:
             return cached
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT forecast_data FROM forecast_cache WHERE location_key = ? AND expires_at > ?",
-                (location_key, datetime.now().isoformat()),
-            )
-            row = cursor.fetchone()
+        forecasts = await self._load_forecasts(
+            f"{self._SELECT_SQL} WHERE location_key = ? AND expires_at > ?",
+            (location_key, datetime.now().isoformat()),
+        )
 
-            if row:
-                forecast_dict = json.loads(row[0])
-                forecast_data = self._dict_to_forecast_data(forecast_dict)
-                self._set_cache(location_key, forecast_data)
-                return forecast_data
+        if forecasts:
+            forecast_data = forecasts[0]
+            self._set_cache(location_key, forecast_data)
+            return forecast_data
 
         return None
 
     async def get_all(self, limit: Optional[int] = None, offset: int = 0) -> List[ForecastData]:
         """Get all cached forecast data."""
-        with sqlite3.connect(self.db_path) as conn:
-            query = "SELECT forecast_data FROM forecast_cache WHERE expires_at > ? ORDER BY cached_at DESC"
-            params = [datetime.now().isoformat()]
+        query = f"{self._SELECT_SQL} WHERE expires_at > ? ORDER BY cached_at DESC"
+        params = [datetime.now().isoformat()]
 
-            if limit:
-                query += " LIMIT ? OFFSET ?"
-                params.extend([limit, offset])
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
 
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
+        return await self._load_forecasts(query, params)
 
-            return [self._dict_to_forecast_data(json.loads(row[0])) for row in rows]
+    async def _load_forecasts(self, query: str, params: Sequence[Any]) -> List[ForecastData]:
+        """Load the forecasts a forecast_cache query selects, with their entries."""
+        rows = await self._fetchall(query, params)
+        if not rows:
+            return []
+
+        forecasts = {
+            row[0]: ForecastData(location=_row_location(row[1:]), timestamp=_from_iso(row[6]))
+            for row in rows
+        }
+        for chunk in self._chunks(list(forecasts)):
+            placeholders = ", ".join("?" * len(chunk))
+            entry_rows = await self._fetchall(
+                f"{self._SELECT_ENTRIES_SQL} WHERE location_key IN ({placeholders}) "
+                "ORDER BY location_key, kind, position",
+                chunk,
+            )
+            for entry_row in entry_rows:
+                forecast_data = forecasts[entry_row[0]]
+                if entry_row[1] == HOURLY:
+                    forecast_data.hourly_forecasts.append(self._row_to_entry(entry_row[2:]))
+                else:
+                    forecast_data.daily_forecasts.append(self._row_to_daily(entry_row[2:]))
+
+        return list(forecasts.values())
+
+    async def get_series(
+        self, location_key: str, metric: str = "temperature", kind: str = HOURLY
+    ) -> List[Tuple[datetime, Any]]:
+        """Read one metric of a cached forecast as a time series.
+
+        Args:
+            location_key: Location to read
+            metric: Column to read, one of FORECAST_METRICS
+            kind: "hourly" or "daily" entries
+
+        Returns:
+            (valid_at, value) pairs in forecast order
+        """
+        if metric not in FORECAST_METRICS:
+            raise ValueError(f"Unknown forecast metric: {metric}")
+
+        rows = await self._fetchall(
+            f"SELECT e.valid_at, e.{metric} FROM forecast_entries e "
+            "JOIN forecast_cache f ON f.location_key = e.location_key "
+            "WHERE e.location_key = ? AND e.kind = ? AND f.expires_at > ? ORDER BY e.position",
+            (location_key, kind, datetime.now().isoformat()),
+        )
+        return [(datetime.fromisoformat(valid_at), value) for valid_at, value in rows]
 
     async def create(self, entity: ForecastData) -> ForecastData:
         """Cache forecast data."""
         location_key = self._get_location_key(entity.location)
         return await self.update(location_key, entity)
 
+    async def create_many(
+        self, entities: List[ForecastData], chunk_size: Optional[int] = None
+    ) -> List[ForecastData]:
+        """Cache forecasts for many locations in one transaction."""
+        updates = {self._get_location_key(entity.location): entity for entity in entities}
+        await self.update_many(updates, chunk_size)
+        return entities
+
     async def update(self, location_key: str, entity: ForecastData) -> Optional[ForecastData]:
         """Update cached forecast data."""
-        expires_at = datetime.now() + timedelta(hours=1)  # 1-hour cache
-        forecast_dict = self._forecast_data_to_dict(entity)
-
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO forecast_cache (location_key, forecast_data, expires_at) VALUES (?, ?, ?)",
-                (location_key, json.dumps(forecast_dict), expires_at.isoformat()),
-            )
-            conn.commit()
-
-        self._set_cache(location_key, entity, 3600)  # 1 hour
+        await self.update_many({location_key: entity})
         return entity
 
+    async def update_many(
+        self, updates: Dict[str, ForecastData], chunk_size: Optional[int] = None
+    ) -> List[ForecastData]:
+        """Update cached forecasts for many locations with executemany."""
+        expires_at = (datetime.now() + timedelta(hours=1)).isoformat()  # 1-hour cache
+        rows = []
+        entries = []
+        for location_key, entity in updates.items():
+            rows.append(self._forecast_row(location_key, entity, expires_at))
+            entries.extend(self._entry_rows(location_key, entity))
+
+        async with self._transaction() as db:
+            keys = [(location_key,) for location_key in updates]
+            await self._write_many(db, self._DELETE_ENTRIES_SQL, keys, chunk_size)
+            await self._write_many(db, self._UPSERT_SQL, rows, chunk_size)
+            await self._write_many(db, self._INSERT_ENTRY_SQL, entries, chunk_size)
+
+        self._set_cache_many(updates, 3600)  # 1 hour
+        return list(updates.values())
+
     async def delete(self, location_key: str) -> bool:
         """Delete cached forecast data."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
+        async with self._transaction() as db:
+            await db.execute(self._DELETE_ENTRIES_SQL, (location_key,))
+            cursor = await db.execute(
                 "DELETE FROM forecast_cache WHERE location_key = ?", (location_key,)
             )
-            conn.commit()
 
-            self._invalidate_cache(location_key)
-            return cursor.rowcount > 0
+        self._invalidate_cache(location_key)
+        return cursor.rowcount > 0
 
     async def exists(self, location_key: str) -> bool:
         """Check if forecast data exists in cache."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT 1 FROM forecast_cache WHERE location_key = ? AND expires_at > ?",
-                (location_key, datetime.now().isoformat()),
-            )
-            return cursor.fetchone() is not None
+        row = await self._fetchone(
+            "SELECT 1 FROM forecast_cache WHERE location_key = ? AND expires_at > ?",
+            (location_key, datetime.now().isoformat()),
+        )
+        return row is not None
 
     async def get_forecast_by_location(self, location: Location) -> Optional[ForecastData]:
         """Get forecast data for specific location."""
         location_key = self._get_location_key(location)
         return await self.get_by_id(location_key)
 
-    def _forecast_data_to_dict(self, forecast_data: ForecastData) -> Dict[str, Any]:
-        """Convert ForecastData to dictionary for storage."""
-        return {
-            "location": {
-                "name": forecast_data.location.name,
-                "country": forecast_data.location.country,
-                "state": forecast_data.location.state,
-                "latitude": forecast_data.location.latitude,
-                "longitude": forecast_data.location.longitude,
-            },
-            "hourly_forecasts": [
-                {
-                    "datetime": entry.datetime.isoformat(),
-                    "temperature": entry.temperature,
-                    "feels_like": entry.feels_like,
-                    "humidity": entry.humidity,
-                    "wind_speed": entry.wind_speed,
-                    "wind_direction": entry.wind_direction,
-                    "precipitation_probability": entry.precipitation_probability,
-                    "condition": entry.condition.value if entry.condition else None,
-                    "description": entry.description,
-                    "icon": entry.icon,
-                }
-                for entry in forecast_data.hourly_forecasts
-            ],
-            "daily_forecasts": [
-                {
-                    "date": daily.date.isoformat(),
-                    "high_temp": daily.high_temp,
-                    "low_temp": daily.low_temp,
-                    "condition": daily.condition.value if daily.condition else None,
-                    "description": daily.description,
-                    "icon": daily.icon,
-                    "precipitation_probability": daily.precipitation_probability,
-                    "wind_speed": daily.wind_speed,
-                    "humidity": daily.humidity,
-                }
-                for daily in forecast_data.daily_forecasts
-            ],
-            "timestamp": forecast_data.timestamp.isoformat(),
-        }
-
-    def _dict_to_forecast_data(self, data: Dict[str, Any]) -> ForecastData:
-        """Convert dictionary to ForecastData object."""
-        from ...models.weather.current_weather import WeatherCondition
-        from ...models.weather.forecast_models import DailyForecast, ForecastEntry
-
-        location_data = data["location"]
-        location = Location(
-            name=location_data["name"],
-            country=location_data["country"],
-            state=location_data.get("state"),
-            latitude=location_data["latitude"],
-            longitude=location_data["longitude"],
+    async def cleanup_expired(self) -> int:
+        """Remove expired cache entries."""
+        stats = await self.purge_expired()
+        return stats["rows_removed"]
+
+    def _forecast_row(
+        self, location_key: str, forecast_data: ForecastData, expires_at: str
+    ) -> tuple:
+        """Convert ForecastData to a forecast_cache row."""
+        return (
+            location_key,
+            *_location_columns(forecast_data.location),
+            forecast_data.timestamp.isoformat(),
+            expires_at,
         )
 
-        hourly_forecasts = []
-        for entry_data in data.get("hourly_forecasts", []):
-            condition = None
-            if entry_data.get("condition"):
-                try:
-                    condition = WeatherCondition(entry_data["condition"])
-                except ValueError:
-                    condition = WeatherCondition.UNKNOWN
-
-            hourly_forecasts.append(
-                ForecastEntry(
-                    datetime=datetime.fromisoformat(entry_data["datetime"]),
-                    temperature=entry_data["temperature"],
-                    feels_like=entry_data["feels_like"],
-                    humidity=entry_data["humidity"],
-                    wind_speed=entry_data["wind_speed"],
-                    wind_direction=entry_data["wind_direction"],
-                    precipitation_probability=entry_data["precipitation_probability"],
-                    condition=condition,
-                    description=entry_data["description"],
-                    icon=entry_data["icon"],
-                )
+    def _entry_rows(self, location_key: str, forecast_data: ForecastData) -> List[tuple]:
+        """Convert the hourly and daily entries of a forecast to forecast_entries rows."""
+        rows = [
+            (
+                location_key,
+                HOURLY,
+                position,
+                entry.timestamp.isoformat(),
+                _condition_value(entry.condition),
+                entry.description,
+                entry.temperature,
+                entry.feels_like,
+                None,
+                None,
+                entry.humidity,
+                entry.pressure,
+                entry.wind_speed,
+                entry.wind_direction,
+                entry.cloudiness,
+                entry.precipitation_probability,
+                entry.precipitation_amount,
+            )
+            for position, entry in enumerate(forecast_data.hourly_forecasts)
+        ]
+        rows.extend(
+            (
+                location_key,
+                DAILY,
+                position,
+                daily.date.isoformat(),
+                _condition_value(daily.condition),
+                daily.description,
+                None,
+                None,
+                daily.temp_min,
+                daily.temp_max,
+                daily.humidity,
+                None,
+                daily.wind_speed,
+                None,
+                None,
+                daily.precipitation_probability,
+                daily.precipitation_amount,
             )
+            for position, daily in enumerate(forecast_data.daily_forecasts)
+        )
+        return rows
+
+    def _row_to_entry(self, row: Sequence[Any]) -> ForecastEntry:
+        """Convert a forecast_entries row (FORECAST_ENTRY_FIELDS order) to ForecastEntry."""
+        return ForecastEntry(
+            timestamp=datetime.fromisoformat(row[0]),
+            condition=_condition(row[1]),
+            description=row[2],
+            temperature=row[3],
+            feels_like=row[4],
+            humidity=row[7],
+            pressure=row[8],
+            wind_speed=row[9],
+            wind_direction=row[10],
+            cloudiness=row[11],
+            precipitation_probability=row[12],
+            precipitation_amount=row[13],
+        )
 
-        daily_forecasts = []
-        for daily_data in data.get("daily_forecasts", []):
-            condition = None
-            if daily_data.get("condition"):
-                try:
-                    condition = WeatherCondition(daily_data["condition"])
-                except ValueError:
-                    condition = WeatherCondition.UNKNOWN
-
-            daily_forecasts.append(
-                DailyForecast(
-                    date=datetime.fromisoformat(daily_data["date"]).date(),
-                    high_temp=daily_data["high_temp"],
-                    low_temp=daily_data["low_temp"],
-                    condition=condition,
-                    description=daily_data["description"],
-                    icon=daily_data["icon"],
-                    precipitation_probability=daily_data["precipitation_probability"],
-                    wind_speed=daily_data["wind_speed"],
-                    humidity=daily_data["humidity"],
-                )
+    def _row_to_daily(self, row: Sequence[Any]) -> DailyForecast:
+        """Convert a forecast_entries row (FORECAST_ENTRY_FIELDS order) to DailyForecast."""
+        return DailyForecast(
+            date=datetime.fromisoformat(row[0]),
+            condition=_condition(row[1]),
+            description=row[2],
+            temp_min=row[5],
+            temp_max=row[6],
+            humidity=row[7],
+            wind_speed=row[9],
+            precipitation_probability=row[12],
+            precipitation_amount=row[13],
+        )
+
+    def _dict_to_forecast_data(self, data: Dict[str, Any]) -> ForecastData:
+        """Convert a dictionary of the JSON blob layout to ForecastData.
+
+        Entries written as ``datetime``/``high_temp``/``low_temp`` are read as
+        ``timestamp``/``temp_max``/``temp_min``.
+        """
+        hourly_forecasts = [
+            ForecastEntry(
+                timestamp=datetime.fromisoformat(
+                    entry_data.get("timestamp") or entry_data["datetime"]
+                ),
+                condition=_condition(entry_data.get("condition")),
+                description=entry_data.get("description", ""),
+                temperature=entry_data["temperature"],
+                feels_like=entry_data.get("feels_like"),
+                humidity=entry_data.get("humidity"),
+                pressure=entry_data.get("pressure"),
+                wind_speed=entry_data.get("wind_speed"),
+                wind_direction=entry_data.get("wind_direction"),
+                cloudiness=entry_data.get("cloudiness"),
+                precipitation_probability=entry_data.get("precipitation_probability"),
+                precipitation_amount=entry_data.get("precipitation_amount"),
+            )
+            for entry_data in data.get("hourly_forecasts") or []
+        ]
+
+        daily_forecasts = [
+            DailyForecast(
+                date=datetime.fromisoformat(daily_data["date"]),
+                condition=_condition(daily_data.get("condition")),
+                description=daily_data.get("description", ""),
+                temp_min=daily_data.get("temp_min", daily_data.get("low_temp")),
+                temp_max=daily_data.get("temp_max", daily_data.get("high_temp")),
+                humidity=daily_data.get("humidity"),
+                wind_speed=daily_data.get("wind_speed"),
+                precipitation_probability=daily_data.get("precipitation_probability"),
+                precipitation_amount=daily_data.get("precipitation_amount"),
             )
+            for daily_data in data.get("daily_forecasts") or []
+        ]
 
         return ForecastData(
-            location=location,
+            location=_dict_location(data["location"]),
             hourly_forecasts=hourly_forecasts,
             daily_forecasts=daily_forecasts,
             timestamp=datetime.fromisoformat(data["timestamp"]),
@@ -1,6 +1,8 @@
 """Unit of Work Pattern Implementation
 
 Provides transaction management and coordination across multiple repositories.
+Repositories handed out by a unit of work share the DatabaseContext's
+connections, so all of their writes land in its single transaction.
 """
 
 from abc import ABC, abstractmethod
@@ -12,7 +14,7 @@ from typing import Any, Dict, List, Optional, Type, TypeVar
 
 from .database_context import DatabaseContext
 from .repositories.activity_repository import ActivityRepository
-from .repositories.base_repository import BaseRepository
+from .repositories.base_repository import BaseRepository, SQLiteRepository
 from .repositories.preference_repository import PreferenceRepository
 from .repositories.weather_repository import ForecastRepository, WeatherRepository
 
@@ -73,8 +75,11 @@ class IUnitOfWork(ABC):
 class UnitOfWork(IUnitOfWork):
     """Concrete Unit of Work implementation."""
 
-    def __init__(self, db_context: DatabaseContext):
+    def __init__(
+        self, db_context: DatabaseContext, cache_config: Optional[Dict[str, Any]] = None
+    ):
         self.db_context = db_context
+        self.cache_config = cache_config  # From ConfigService.get_cache_config()
         self._repositories: Dict[Type, BaseRepository] = {}
         self._transaction_info: Optional[TransactionInfo] = None
         self._is_active = False
@@ -90,30 +95,46 @@ class UnitOfWork(IUnitOfWork):
     def weather_repository(self) -> WeatherRepository:
         """Get weather repository."""
         if self._weather_repository is None:
-            self._weather_repository = WeatherRepository(self.db_context.weather_db_path)
+            self._weather_repository = self._configure_repository(
+                WeatherRepository(self.db_context.weather_db_path, db_context=self.db_context)
+            )
         return self._weather_repository
 
     @property
     def forecast_repository(self) -> ForecastRepository:
         """Get forecast repository."""
         if self._forecast_repository is None:
-            self._forecast_repository = ForecastRepository(self.db_context.forecast_db_path)
+            self._forecast_repository = self._configure_repository(
+                ForecastRepository(self.db_context.forecast_db_path, db_context=self.db_context)
+            )
         return self._forecast_repository
 
     @property
     def preference_repository(self) -> PreferenceRepository:
         """Get preference repository."""
         if self._preference_repository is None:
-            self._preference_repository = PreferenceRepository(self.db_context.preferences_db_path)
+            self._preference_repository = self._configure_repository(
+                PreferenceRepository(
+                    self.db_context.preferences_db_path, db_context=self.db_context
+                )
+            )
         return self._preference_repository
 
     @property
     def activity_repository(self) -> ActivityRepository:
         """Get activity repository."""
         if self._activity_repository is None:
-            self._activity_repository = ActivityRepository(self.db_context.activities_db_path)
+            self._activity_repository = self._configure_repository(
+                ActivityRepository(self.db_context.activities_db_path, db_context=self.db_context)
+            )
         return self._activity_repository
 
+    def _configure_repository(self, repository: BaseRepository) -> BaseRepository:
+        """Apply the cache configuration to a newly created repository."""
+        if self.cache_config:
+            repository.configure_cache(self.cache_config)
+        return repository
+
     @property
     def transaction_info(self) -> Optional[TransactionInfo]:
         """Get current transaction information."""
@@ -287,6 +308,10 @@ class UnitOfWork(IUnitOfWork):
                     # Repository doesn't have cache clearing method
                     pass
 
+                if isinstance(repo, SQLiteRepository):
+                    # Tables created inside the rolled back transaction are gone too
+                    repo._schema_ready = False
+
     async def save_changes(self) -> bool:
         """Save all pending changes without committing transaction."""
         if not self._is_active:
@@ -325,12 +350,41 @@ class UnitOfWork(IUnitOfWork):
 class UnitOfWorkFactory:
     """Factory for creating Unit of Work instances."""
 
-    def __init__(self, db_context: DatabaseContext):
+    def __init__(
+        self, db_context: DatabaseContext, cache_config: Optional[Dict[str, Any]] = None
+    ):
         self.db_context = db_context
+        self.cache_config = cache_config
+        self._purged_repositories: List[SQLiteRepository] = []
 
     def create(self) -> UnitOfWork:
         """Create a new Unit of Work instance."""
-        return UnitOfWork(self.db_context)
+        return UnitOfWork(self.db_context, self.cache_config)
+
+    def start_cache_purge(self, interval: Optional[float] = None) -> List[SQLiteRepository]:
+        """Purge expired weather and forecast cache rows on a schedule.
+
+        Args:
+            interval: Seconds between purges (default: cleanup_interval of the cache config)
+
+        Returns:
+            The repositories being purged; their last_purge holds the latest stats
+        """
+        interval = interval or (self.cache_config or {}).get("cleanup_interval", 3600)
+        if not self._purged_repositories:
+            self._purged_repositories = [
+                WeatherRepository(self.db_context.weather_db_path, db_context=self.db_context),
+                ForecastRepository(self.db_context.forecast_db_path, db_context=self.db_context),
+            ]
+        for repository in self._purged_repositories:
+            repository.start_purge(interval)
+        return self._purged_repositories
+
+    async def stop_cache_purge(self):
+        """Stop the scheduled cache purge."""
+        for repository in self._purged_repositories:
+            await repository.close()
+        self._purged_repositories = []
 
     @asynccontextmanager
     async def create_scope(self):
@@ -10,7 +10,7 @@ from .data_service import DataService
 
 # Managers
 from .database_manager import DatabaseManager
-from .export_import_manager import ConflictResolution, ExportImportManager
+from .export_import_manager import ConflictResolution, ExportFormat, ExportImportManager
 from .migration_manager import MigrationManager
 
 # Models
@@ -21,6 +21,9 @@ from .models import (
     JournalEntry,
     UserPreferences,
     WeatherHistory,
+    WeatherRollupDaily,
+    WeatherRollupHourly,
+    WeatherRollupMonthly,
 )
 
 # Repositories
@@ -31,11 +34,15 @@ from .repositories import (
     PreferencesRepository,
     WeatherRepository,
 )
+from .write_buffer import WeatherWriteBuffer
 
 __all__ = [
     # Models
     "Base",
     "WeatherHistory",
+    "WeatherRollupHourly",
+    "WeatherRollupDaily",
+    "WeatherRollupMonthly",
     "UserPreferences",
     "ActivityLog",
     "JournalEntry",
@@ -53,6 +60,8 @@ __all__ = [
     "CacheManager",
     "ExportImportManager",
     "ConflictResolution",
+    "ExportFormat",
+    "WeatherWriteBuffer",
     # Main service
     "DataService",
 ]
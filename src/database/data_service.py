@@ -10,10 +10,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from ..utils.cache_manager import get_cache_manager
 from .backup_manager import BackupManager
-from .cache_manager import CacheManager
 from .database_manager import DatabaseManager
-from .export_import_manager import ConflictResolution, ExportImportManager
+from .export_import_manager import ConflictResolution, ExportFormat, ExportImportManager
 from .migration_manager import MigrationManager
 from .repositories import (
     ActivityRepository,
@@ -21,6 +21,10 @@ from .repositories import (
     PreferencesRepository,
     WeatherRepository,
 )
+from .write_buffer import WeatherWriteBuffer
+
+# Cache tag of weather history results, cleared whenever new observations are written
+WEATHER_HISTORY_TAG = "weather_history"
 
 
 class DataService:
@@ -49,8 +53,11 @@ class DataService:
         # Initialize managers
         self._migration_manager = MigrationManager(self._db_manager)
         self._backup_manager = BackupManager(self._db_manager)
-        self._cache_manager = CacheManager()
+        self._cache_manager = get_cache_manager().namespace("data", default_ttl=3600)
         self._export_import_manager = ExportImportManager(self._db_manager)
+        self._weather_writer = WeatherWriteBuffer(
+            self._write_weather_batch, on_flush=self._on_weather_flush
+        )
 
         # Service state
         self._initialized = False
@@ -92,9 +99,6 @@ class DataService:
                 self._logger.error("Migration failed")
                 return False
 
-            # Initialize cache
-            await self._cache_manager.initialize()
-
             # Start background tasks
             await self._start_background_tasks()
 
@@ -111,6 +115,9 @@ class DataService:
         try:
             self._logger.info("Shutting down data service...")
 
+            # Write buffered weather observations
+            await self._weather_writer.close()
+
             # Cancel background tasks
             for task in self._background_tasks:
                 task.cancel()
@@ -118,8 +125,8 @@ class DataService:
             if self._background_tasks:
                 await asyncio.gather(*self._background_tasks, return_exceptions=True)
 
-            # Save cache
-            self._cache_manager.save_to_file()
+            # Persist queued cache writes
+            self._cache_manager.flush()
 
             # Close database connections
             await self._db_manager.close()
@@ -153,9 +160,10 @@ class DataService:
             try:
                 await asyncio.sleep(3600)  # Run every hour
 
-                # Clean old weather data (older than 1 year)
-                cutoff_date = datetime.now() - timedelta(days=365)
-                await self._weather_repo.cleanup_old_data(cutoff_date)
+                # Clean old weather data (older than 1 year) and expired rollup buckets
+                async with self._get_repositories() as (weather_repo, _, _, _):
+                    await weather_repo.cleanup_old_records(days_to_keep=365)
+                    await weather_repo.cleanup_rollups()
 
                 # Clean old activity logs (older than 6 months)
                 cutoff_date = datetime.now() - timedelta(days=180)
@@ -197,8 +205,8 @@ class DataService:
                 # Clean expired cache entries
                 self._cache_manager.cleanup_expired()
 
-                # Save cache periodically
-                await self._cache_manager.save_to_file()
+                # Persist queued cache writes
+                await asyncio.to_thread(self._cache_manager.flush)
 
             except asyncio.CancelledError:
                 break
@@ -209,7 +217,11 @@ class DataService:
     async def save_weather_data(
         self, location: str, temperature: float, conditions: str, **kwargs
     ) -> bool:
-        """Save weather data.
+        """Queue weather data to be saved with the next batch.
+
+        Observations are written by a background writer in batches (see
+        WeatherWriteBuffer); this waits only when the buffer is full. Use
+        flush_weather_data() to wait until they are committed.
 
         Args:
             location: Location name
@@ -218,47 +230,58 @@ class DataService:
             **kwargs: Additional weather data
 
         Returns:
-            bool: True if save was successful
+            bool: True if the observation was queued
         """
         try:
-            async with self._get_repositories() as (
-                weather_repo,
-                prefs_repo,
-                activity_repo,
-                journal_repo,
-            ):
-                weather_data = {
-                    "location": location,
-                    "temperature": temperature,
-                    "conditions": conditions,
-                    **kwargs,
-                }
-                await weather_repo.save_weather_data(weather_data)
-
-            # Invalidate related cache entries
-            cache_key = f"weather_history_{location}"
-            self._cache_manager.delete(cache_key)
-
+            weather_data = {
+                "location": location,
+                "temperature": temperature,
+                "condition": conditions,
+                **kwargs,
+            }
+            await self._weather_writer.put(weather_data)
             return True
 
         except Exception as e:
             self._logger.error(f"Failed to save weather data: {e}")
             return False
 
+    async def flush_weather_data(self) -> None:
+        """Write all queued weather observations and wait until they are committed."""
+        await self._weather_writer.flush()
+
+    async def _write_weather_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """Write a batch of queued weather observations in one transaction."""
+        async with self._get_repositories() as (weather_repo, _, _, _):
+            return await weather_repo.save_weather_batch(batch)
+
+    def _on_weather_flush(self, written: int) -> None:
+        """Invalidate cached weather history after new observations are written."""
+        self._cache_manager.clear_by_tags([WEATHER_HISTORY_TAG])
+
     async def get_weather_history(
-        self, location: str, days: int = 30, use_cache: bool = True
+        self,
+        location: str,
+        days: int = 30,
+        use_cache: bool = True,
+        resolution: Optional[str] = None,
     ) -> List[Dict]:
         """Get weather history for a location.
 
+        Spans longer than two days are answered from the hourly, daily or
+        monthly rollups (the finest one within 1000 points), whose records
+        carry averaged metrics plus temperature_min/max and record_count.
+
         Args:
             location: Location name
             days: Number of days to retrieve
             use_cache: Whether to use cache
+            resolution: Force "raw", "hourly", "daily" or "monthly" records
 
         Returns:
             List[Dict]: Weather history records
         """
-        cache_key = f"weather_history_{location}_{days}"
+        cache_key = f"weather_history_{location}_{days}_{resolution or 'auto'}"
 
         if use_cache:
             cached_data = self._cache_manager.get(cache_key)
@@ -266,16 +289,17 @@ class DataService:
                 return cached_data
 
         try:
-            start_date = datetime.now() - timedelta(days=days)
-            records = await self._weather_repo.get_location_history(
-                location=location, start_date=start_date
-            )
+            start_date = datetime.utcnow() - timedelta(days=days)
+            async with self._get_repositories() as (weather_repo, _, _, _):
+                records = await weather_repo.get_weather_series(
+                    location=location, start_date=start_date, resolution=resolution
+                )
 
             result = [record.to_dict() for record in records]
 
             if use_cache:
-                # Cache for 1 hour
-                self._cache_manager.set(cache_key, result, ttl=3600)
+                # Cache for 1 hour, or until new observations are written
+                self._cache_manager.set(cache_key, result, ttl=3600, tags=[WEATHER_HISTORY_TAG])
 
             return result
 
@@ -609,6 +633,8 @@ class DataService:
         user_id: Optional[str] = None,
         tables: Optional[List[str]] = None,
         date_range: Optional[Tuple[datetime, datetime]] = None,
+        export_format: str = ExportFormat.JSON,
+        compress: bool = False,
     ) -> bool:
         """Export data to file.
 
@@ -617,12 +643,19 @@ class DataService:
             user_id: Optional user ID filter
             tables: Optional table filter
             date_range: Optional date range filter
+            export_format: ExportFormat.JSON, NDJSON or CSV
+            compress: Whether to gzip the output
 
         Returns:
             bool: True if export was successful
         """
         return await self._export_import_manager.export_data(
-            export_file=export_file, tables=tables, date_range=date_range, user_id=user_id
+            export_file=export_file,
+            tables=tables,
+            date_range=date_range,
+            user_id=user_id,
+            export_format=export_format,
+            compress=compress,
         )
 
     async def import_data(
@@ -684,7 +717,15 @@ class DataService:
         Returns:
             Dict[str, Any]: Cache statistics
         """
-        return self._cache_manager.get_statistics()
+        return self._cache_manager.get_stats()
+
+    def get_write_buffer_statistics(self) -> Dict[str, Any]:
+        """Get weather write buffer statistics.
+
+        Returns:
+            Dict[str, Any]: Flush counts, sizes and latencies and queued writes
+        """
+        return self._weather_writer.get_stats()
 
     def clear_cache(self, pattern: Optional[str] = None):
         """Clear cache entries.
@@ -694,7 +735,7 @@ class DataService:
         """
         if pattern:
             # Clear matching keys
-            keys_to_delete = [key for key in self._cache_manager._cache.keys() if pattern in key]
+            keys_to_delete = [key for key in self._cache_manager.keys() if pattern in key]
             for key in keys_to_delete:
                 self._cache_manager.delete(key)
         else:
@@ -769,7 +810,7 @@ class DataService:
 
         try:
             # Check cache
-            cache_stats = self._cache_manager.get_statistics()
+            cache_stats = self._cache_manager.get_stats()
             health["components"]["cache"] = {
                 "status": "healthy",
                 "entries": cache_stats["entries"],
@@ -779,6 +820,14 @@ class DataService:
             health["components"]["cache"] = {"status": "unhealthy", "error": str(e)}
             health["status"] = "degraded"
 
+        # Check buffered weather writes
+        writer_stats = self._weather_writer.get_stats()
+        health["components"]["weather_writer"] = {
+            "status": "healthy" if not writer_stats["failed_records"] else "degraded",
+            "pending_writes": writer_stats["pending_writes"],
+            "failed_records": writer_stats["failed_records"],
+        }
+
         # Check background tasks
         active_tasks = len([t for t in self._background_tasks if not t.done()])
         health["components"]["background_tasks"] = {
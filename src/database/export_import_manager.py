@@ -1,22 +1,24 @@
 """Data export/import manager.
 
-Handles data export to JSON with validation and conflict resolution.
+Handles data export to JSON, NDJSON or CSV (optionally gzipped) and import
+with validation and conflict resolution. Exports stream tables page by page,
+so memory use does not grow with the number of rows.
 """
 
+import csv
+import gzip
 import json
 import logging
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import IO, Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, select
 
 from .backup_manager import BackupManager
 from .database_manager import DatabaseManager
-from .repositories import (
-    ActivityRepository,
-    JournalRepository,
-    PreferencesRepository,
-    WeatherRepository,
-)
+from .models import ActivityLog, JournalEntry, UserPreferences, WeatherHistory
 
 
 class ConflictResolution:
@@ -28,6 +30,51 @@ class ConflictResolution:
     PROMPT = "prompt"  # Prompt user for decision
 
 
+class ExportFormat:
+    """Export file formats."""
+
+    JSON = "json"  # One document with a record array per table, as import_data reads
+    NDJSON = "ndjson"  # A metadata line, one {"table", "record"} line per row, a statistics line
+    CSV = "csv"  # One file per table, named <export file stem>_<table>.csv
+
+
+# Exported tables: model, date column filtered by date_range, whether filtered by user_id
+EXPORT_TABLES = {
+    "weather_history": (WeatherHistory, "timestamp", False),
+    "user_preferences": (UserPreferences, None, True),
+    "activity_log": (ActivityLog, "selected_at", True),
+    "journal_entries": (JournalEntry, "date", True),
+}
+
+# Rows read per keyset page while exporting
+EXPORT_PAGE_SIZE = 1000
+
+# Table name -> its exported records, page by page
+ExportPages = Callable[[str], AsyncIterator[List[Dict[str, Any]]]]
+
+
+_json = json.JSONEncoder(default=str).encode
+
+
+def _export_records(keys: List[str], dates: List[str], rows) -> List[Dict[str, Any]]:
+    """Convert table rows to their exported form, matching the models' to_dict().
+
+    Args:
+        keys: Column names in row order
+        dates: Names of the DateTime columns, exported as ISO strings
+        rows: Row tuples
+    """
+    records = []
+    for row in rows:
+        record = dict(zip(keys, row))
+        for key in dates:
+            value = record[key]
+            if value is not None:
+                record[key] = value.isoformat()
+        records.append(record)
+    return records
+
+
 class ValidationError(Exception):
     """Data validation error."""
 
@@ -92,14 +139,18 @@ class ExportImportManager:
         tables: Optional[List[str]] = None,
         date_range: Optional[Tuple[datetime, datetime]] = None,
         user_id: Optional[str] = None,
+        export_format: str = ExportFormat.JSON,
+        compress: bool = False,
     ) -> bool:
-        """Export data to JSON file.
+        """Export data to a file, streaming each table page by page.
 
         Args:
-            export_file: Output file path
+            export_file: Output file path (the name stem for CSV exports)
             tables: Optional list of tables to export
             date_range: Optional date range filter
             user_id: Optional user ID filter
+            export_format: ExportFormat.JSON, NDJSON or CSV
+            compress: Whether to gzip the output
 
         Returns:
             bool: True if export was successful
@@ -109,101 +160,169 @@ class ExportImportManager:
             if tables is None:
                 tables = ["weather_history", "user_preferences", "activity_log", "journal_entries"]
 
-            export_data = {
-                "metadata": {
-                    "version": "1.0",
-                    "exported_at": datetime.now().isoformat(),
-                    "export_type": "selective",
-                    "tables": tables,
-                    "date_range": {
-                        "start": date_range[0].isoformat() if date_range else None,
-                        "end": date_range[1].isoformat() if date_range else None,
-                    },
-                    "user_id": user_id,
-                    "schema_version": await self._get_schema_version(),
+            metadata = {
+                "version": "1.0",
+                "exported_at": datetime.now().isoformat(),
+                "export_type": "selective",
+                "format": export_format,
+                "tables": tables,
+                "date_range": {
+                    "start": date_range[0].isoformat() if date_range else None,
+                    "end": date_range[1].isoformat() if date_range else None,
                 },
-                "data": {},
+                "user_id": user_id,
+                "schema_version": await self._get_schema_version(),
             }
 
-            # Export each table
-            for table in tables:
-                table_data = await self._export_table(table, date_range, user_id)
-                export_data["data"][table] = table_data
-
-            # Add statistics
-            export_data["metadata"]["statistics"] = {
-                table: len(data) for table, data in export_data["data"].items()
-            }
-
-            # Save to file
             export_file.parent.mkdir(parents=True, exist_ok=True)
+            pages = partial(self._export_pages, date_range=date_range, user_id=user_id)
+
+            if export_format == ExportFormat.CSV:
+                statistics = await self._write_csv(export_file, tables, pages, compress)
+            elif export_format in (ExportFormat.JSON, ExportFormat.NDJSON):
+                with self._open_export(export_file, compress) as out:
+                    if export_format == ExportFormat.JSON:
+                        statistics = await self._write_json(out, tables, pages, metadata)
+                    else:
+                        statistics = await self._write_ndjson(out, tables, pages, metadata)
+            else:
+                raise ValueError(f"Unknown export format: {export_format}")
 
-            with open(export_file, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2, default=str)
-
-            self._logger.info(f"Data exported to {export_file}")
+            self._logger.info(f"Data exported to {export_file}: {statistics}")
             return True
 
         except Exception as e:
             self._logger.error(f"Failed to export data: {e}")
             return False
 
-    async def _export_table(
+    async def _export_pages(
         self,
         table: str,
         date_range: Optional[Tuple[datetime, datetime]] = None,
         user_id: Optional[str] = None,
-    ) -> List[Dict]:
-        """Export data from a specific table.
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Read a table's exported records in primary key order, one page at a time.
+
+        Pages are read with keyset pagination (id greater than the last one
+        read), each in its own short session.
 
         Args:
             table: Table name
             date_range: Optional date range filter
             user_id: Optional user ID filter
 
-        Returns:
-            List[Dict]: Table data
+        Yields:
+            List[Dict[str, Any]]: Up to EXPORT_PAGE_SIZE records
         """
-        async with self._db_manager.get_async_session() as session:
-            weather_repo = WeatherRepository(session)
-            prefs_repo = PreferencesRepository(session)
-            activity_repo = ActivityRepository(session)
-            journal_repo = JournalRepository(session)
-
-            if table == "weather_history":
-                records = await weather_repo.get_history_range(
-                    start_date=date_range[0] if date_range else None,
-                    end_date=date_range[1] if date_range else None,
-                )
-                return [record.to_dict() for record in records]
-
-            elif table == "user_preferences":
-                if user_id:
-                    records = await prefs_repo.get_user_preferences(user_id)
-                    return [record.to_dict() for record in records]
-                else:
-                    records = await prefs_repo.get_all_preferences()
-                    return [record.to_dict() for record in records]
-
-            elif table == "activity_log":
-                records = await activity_repo.get_activities_range(
-                    user_id=user_id,
-                    start_date=date_range[0] if date_range else None,
-                    end_date=date_range[1] if date_range else None,
+        if table not in EXPORT_TABLES:
+            self._logger.warning(f"Unknown table: {table}")
+            return
+
+        model, date_column, by_user = EXPORT_TABLES[table]
+        columns = model.__table__.c
+        keys = [column.name for column in columns]
+        dates = [column.name for column in columns if isinstance(column.type, DateTime)]
+        conditions = []
+        if date_range and date_column:
+            conditions.append(columns[date_column] >= date_range[0])
+            conditions.append(columns[date_column] <= date_range[1])
+        if user_id and by_user:
+            conditions.append(columns.user_id == user_id)
+
+        last_id = 0
+        while True:
+            query = (
+                select(model.__table__)
+                .where(columns.id > last_id, *conditions)
+                .order_by(columns.id)
+                .limit(EXPORT_PAGE_SIZE)
+            )
+            async with self._db_manager.get_async_session() as session:
+                rows = (await session.execute(query)).all()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            yield _export_records(keys, dates, rows)
+            if len(rows) < EXPORT_PAGE_SIZE:
+                return
+
+    @staticmethod
+    def _open_export(path: Path, compress: bool) -> IO[str]:
+        """Open an export file for text writing, gzipped if requested."""
+        if compress:
+            return gzip.open(path, "wt", encoding="utf-8", newline="")
+        return open(path, "w", encoding="utf-8", newline="")
+
+    async def _write_json(
+        self, out: IO[str], tables: List[str], pages: ExportPages, metadata: Dict
+    ) -> Dict[str, int]:
+        """Write one JSON document with a record array per table, metadata last."""
+        statistics = {}
+        out.write('{\n"data": {')
+        for index, table in enumerate(tables):
+            out.write(f'{"," if index else ""}\n  {json.dumps(table)}: [')
+            count = 0
+            async for page in pages(table):
+                separator = "," if count else ""
+                out.write(separator + ",".join(f"\n    {_json(record)}" for record in page))
+                count += len(page)
+            out.write("\n  ]")
+            statistics[table] = count
+
+        metadata["statistics"] = statistics
+        out.write(f'\n}},\n"metadata": {json.dumps(metadata, indent=2, default=str)}\n}}\n')
+        return statistics
+
+    async def _write_ndjson(
+        self, out: IO[str], tables: List[str], pages: ExportPages, metadata: Dict
+    ) -> Dict[str, int]:
+        """Write a metadata line, one line per record and a statistics line."""
+        statistics = {}
+        out.write(json.dumps({"metadata": metadata}, default=str) + "\n")
+        for table in tables:
+            count = 0
+            async for page in pages(table):
+                out.write(
+                    "".join(
+                        _json({"table": table, "record": record}) + "\n"
+                        for record in page
+                    )
                 )
-                return [record.to_dict() for record in records]
+                count += len(page)
+            statistics[table] = count
+        out.write(json.dumps({"statistics": statistics}) + "\n")
+        return statistics
 
-            elif table == "journal_entries":
-                records = await journal_repo.get_entries_range(
-                    user_id=user_id,
-                    start_date=date_range[0] if date_range else None,
-                    end_date=date_range[1] if date_range else None,
-                )
-                return [record.to_dict() for record in records]
+    async def _write_csv(
+        self, export_file: Path, tables: List[str], pages: ExportPages, compress: bool
+    ) -> Dict[str, int]:
+        """Write one CSV file per table next to export_file; JSON columns are JSON text."""
+        stem = export_file.name
+        for suffix in (".gz", ".csv"):
+            stem = stem.removesuffix(suffix)
 
-            else:
+        statistics = {}
+        for table in tables:
+            if table not in EXPORT_TABLES:
                 self._logger.warning(f"Unknown table: {table}")
-                return []
+                continue
+            fields = [column.name for column in EXPORT_TABLES[table][0].__table__.columns]
+            path = export_file.with_name(f"{stem}_{table}.csv{'.gz' if compress else ''}")
+            count = 0
+            with self._open_export(path, compress) as out:
+                writer = csv.DictWriter(out, fieldnames=fields)
+                writer.writeheader()
+                async for page in pages(table):
+                    writer.writerows(
+                        {
+                            key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                            for key, value in record.items()
+                        }
+                        for record in page
+                    )
+                    count += len(page)
+            statistics[table] = count
+        return statistics
 
     async def import_data(
         self,
@@ -289,13 +408,34 @@ class ExportImportManager:
                 self._logger.error(f"Import file not found: {import_file}")
                 return None
 
-            with open(import_file, "r", encoding="utf-8") as f:
+            opener = gzip.open if import_file.suffix == ".gz" else open
+            with opener(import_file, "rt", encoding="utf-8") as f:
+                if ".ndjson" in import_file.suffixes:
+                    return self._read_ndjson(f)
                 return json.load(f)
 
         except Exception as e:
             self._logger.error(f"Failed to load import file: {e}")
             return None
 
+    @staticmethod
+    def _read_ndjson(lines) -> Dict:
+        """Assemble an NDJSON export into the document form import_data works on."""
+        import_data = {"metadata": {}, "data": {}}
+        for line in lines:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if "record" in item:
+                import_data["data"].setdefault(item["table"], []).append(item["record"])
+            elif "metadata" in item:
+                import_data["metadata"].update(item["metadata"])
+                for table in item["metadata"].get("tables", []):
+                    import_data["data"].setdefault(table, [])
+            elif "statistics" in item:
+                import_data["metadata"]["statistics"] = item["statistics"]
+        return import_data
+
     async def _validate_import_data(self, import_data: Dict) -> Dict[str, Any]:
         """Validate import data structure and content.
 
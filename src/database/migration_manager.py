@@ -11,7 +11,8 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .database_manager import DatabaseManager
-from .models import DatabaseMigration
+from .models import LOCATION_KEY_SQL, LOCATION_SEARCH_DDL, DatabaseMigration
+from .rollups import RESOLUTIONS, backfill_sql
 
 
 class Migration:
@@ -136,6 +137,40 @@ class MigrationManager:
             )
         )
 
+        # Migration 006: Fill the weather rollups from existing history
+        # (the tables themselves are created from the models)
+        self._migrations.append(
+            Migration(
+                version="006",
+                description="Backfill hourly, daily and monthly weather rollups",
+                sql=";".join(backfill_sql(resolution) for resolution in RESOLUTIONS),
+            )
+        )
+
+        # Migration 007: Exact location lookups on a normalized key and a
+        # trigram search table for partial names (new databases get both from the models)
+        self._migrations.append(
+            Migration(
+                version="007",
+                description="Index normalized location keys and add location search",
+                sql=f"""
+            CREATE INDEX IF NOT EXISTS idx_location_key_timestamp
+            ON weather_history({LOCATION_KEY_SQL}, timestamp);
+            {LOCATION_SEARCH_DDL};
+            INSERT INTO weather_location_search (location)
+            SELECT DISTINCT location FROM weather_history
+            EXCEPT SELECT location FROM weather_location_search;
+            """
+                + ";".join(
+                    f"""
+            CREATE INDEX IF NOT EXISTS idx_{resolution.model.__tablename__}_location_key
+            ON {resolution.model.__tablename__}({LOCATION_KEY_SQL}, bucket_start)
+            """
+                    for resolution in RESOLUTIONS
+                ),
+            )
+        )
+
     async def get_current_version(self) -> Optional[str]:
         """Get current database schema version.
 
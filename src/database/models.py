@@ -15,12 +15,31 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    event,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import declared_attr
+from sqlalchemy.schema import DDL
 from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# Normalized location identifier: trimmed and lower-cased, as SQLite's lower()
+# does it. Indexed as an expression, so existing rows need no backfill.
+LOCATION_KEY_SQL = "lower(trim(location))"
+
+# Trigram index over distinct location names for substring (fuzzy) lookups
+LOCATION_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS weather_location_search "
+    "USING fts5(location, tokenize='trigram')"
+)
+
+
+def location_key(column):
+    """Build the normalized location key expression for a location column or value."""
+    return func.lower(func.trim(column))
+
 
 class WeatherHistory(Base):
     """Historical weather data storage."""
@@ -58,6 +77,7 @@ class WeatherHistory(Base):
     # Indexes for performance
     __table_args__ = (
         Index("idx_location_timestamp", "location", "timestamp"),
+        Index("idx_location_key_timestamp", text(LOCATION_KEY_SQL), "timestamp"),
         Index("idx_coordinates", "latitude", "longitude"),
         Index("idx_timestamp_desc", "timestamp", postgresql_using="btree"),
     )
@@ -87,6 +107,86 @@ class WeatherHistory(Base):
         }
 
 
+event.listen(
+    WeatherHistory.__table__,
+    "after_create",
+    DDL(LOCATION_SEARCH_DDL).execute_if(dialect="sqlite"),
+)
+
+
+class WeatherRollupMixin:
+    """Aggregated weather observations of one location in one time bucket.
+
+    Metrics are stored as sums and counts, so buckets merge by addition and
+    averages are sum / count.
+    """
+
+    resolution = ""
+
+    location = Column(String(255), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    record_count = Column(Integer, nullable=False, default=0)
+
+    temperature_sum = Column(Float, nullable=False, default=0.0)
+    temperature_min = Column(Float)
+    temperature_max = Column(Float)
+    humidity_sum = Column(Float, nullable=False, default=0.0)
+    humidity_count = Column(Integer, nullable=False, default=0)
+    pressure_sum = Column(Float, nullable=False, default=0.0)
+    pressure_count = Column(Integer, nullable=False, default=0)
+    wind_speed_sum = Column(Float, nullable=False, default=0.0)
+    wind_speed_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    @declared_attr
+    def __table_args__(cls):
+        return (
+            Index(f"idx_{cls.__tablename__}_bucket", "bucket_start"),
+            Index(f"idx_{cls.__tablename__}_location_key", text(LOCATION_KEY_SQL), "bucket_start"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization, with averaged metrics."""
+
+        def average(total, count):
+            return total / count if count else None
+
+        return {
+            "location": self.location,
+            "resolution": self.resolution,
+            "timestamp": self.bucket_start.isoformat() if self.bucket_start else None,
+            "temperature": average(self.temperature_sum, self.record_count),
+            "temperature_min": self.temperature_min,
+            "temperature_max": self.temperature_max,
+            "humidity": average(self.humidity_sum, self.humidity_count),
+            "pressure": average(self.pressure_sum, self.pressure_count),
+            "wind_speed": average(self.wind_speed_sum, self.wind_speed_count),
+            "record_count": self.record_count,
+        }
+
+
+class WeatherRollupHourly(WeatherRollupMixin, Base):
+    """Hourly weather aggregates per location."""
+
+    __tablename__ = "weather_rollup_hourly"
+    resolution = "hourly"
+
+
+class WeatherRollupDaily(WeatherRollupMixin, Base):
+    """Daily weather aggregates per location."""
+
+    __tablename__ = "weather_rollup_daily"
+    resolution = "daily"
+
+
+class WeatherRollupMonthly(WeatherRollupMixin, Base):
+    """Monthly weather aggregates per location."""
+
+    __tablename__ = "weather_rollup_monthly"
+    resolution = "monthly"
+
+
 class UserPreferences(Base):
     """User preferences and settings storage."""
 
@@ -5,13 +5,33 @@ Implements repository pattern with async support for all data models.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from sqlalchemy import and_, desc, func
+from sqlalchemy import and_, bindparam, desc, func, text, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import select
 
-from .models import ActivityLog, JournalEntry, UserPreferences, WeatherHistory
+from . import rollups
+from .models import (
+    LOCATION_KEY_SQL,
+    ActivityLog,
+    JournalEntry,
+    UserPreferences,
+    WeatherHistory,
+    location_key,
+)
+
+_ADD_SEARCH_LOCATION = text("INSERT INTO weather_location_search (location) VALUES (:location)")
+_KNOWN_SEARCH_LOCATIONS = text(
+    "SELECT location FROM weather_location_search WHERE location IN :locations"
+).bindparams(bindparam("locations", expanding=True))
+_HAS_SEARCH_LOCATION_KEY = text(
+    "SELECT 1 FROM weather_location_search "
+    f"WHERE {LOCATION_KEY_SQL} = lower(trim(:location)) LIMIT 1"
+)
+_SEARCH_LOCATION_KEYS = text(
+    f"SELECT DISTINCT {LOCATION_KEY_SQL} FROM weather_location_search WHERE location LIKE :pattern"
+)
 
 
 class BaseRepository:
@@ -30,8 +50,69 @@ class BaseRepository:
 class WeatherRepository(BaseRepository):
     """Repository for weather history data."""
 
+    async def _location_filter(self, location: str) -> Callable[[Any], Any]:
+        """Resolve a location to its normalized keys and build a filter on them.
+
+        An exact key match is looked up among the location names of the
+        search table, which keeps every name after its raw observations are
+        purged; only when there is none are location names searched for the
+        text as a substring.
+
+        Args:
+            location: Location name or part of one
+
+        Returns:
+            Callable building the condition for a location column
+        """
+        exact = await self._session.execute(_HAS_SEARCH_LOCATION_KEY, {"location": location})
+        if exact.first() is not None:
+            keys = [location_key(location)]
+        else:
+            result = await self._session.execute(
+                _SEARCH_LOCATION_KEYS, {"pattern": f"%{location}%"}
+            )
+            keys = list(result.scalars())
+
+        if len(keys) == 1:
+            # A single key keeps ordered index scans free of a sort
+            return lambda column: location_key(column) == keys[0]
+        return lambda column: location_key(column).in_(keys)
+
+    @staticmethod
+    def _build_record(weather_data: Dict[str, Any]) -> WeatherHistory:
+        """Build a WeatherHistory record from a weather data dictionary."""
+        return WeatherHistory(
+            location=weather_data["location"],
+            latitude=weather_data.get("latitude", 0.0),
+            longitude=weather_data.get("longitude", 0.0),
+            temperature=weather_data["temperature"],
+            feels_like=weather_data.get("feels_like"),
+            humidity=weather_data.get("humidity"),
+            pressure=weather_data.get("pressure"),
+            wind_speed=weather_data.get("wind_speed"),
+            wind_direction=weather_data.get("wind_direction"),
+            visibility=weather_data.get("visibility"),
+            uv_index=weather_data.get("uv_index"),
+            condition=weather_data["condition"],
+            description=weather_data.get("description"),
+            icon=weather_data.get("icon"),
+            raw_data=weather_data.get("raw_data"),
+            timestamp=weather_data.get("timestamp", datetime.utcnow()),
+        )
+
+    async def _add_search_locations(self, locations: List[str]) -> None:
+        """Add location names not seen before to the substring search index."""
+        known = await self._session.execute(
+            _KNOWN_SEARCH_LOCATIONS, {"locations": locations}
+        )
+        new_locations = set(locations) - set(known.scalars())
+        if new_locations:
+            await self._session.execute(
+                _ADD_SEARCH_LOCATION, [{"location": location} for location in new_locations]
+            )
+
     async def save_weather_data(self, weather_data: Dict[str, Any]) -> WeatherHistory:
-        """Save weather data to database.
+        """Save weather data to database and add it to the hourly/daily/monthly rollups.
 
         Args:
             weather_data: Weather data dictionary
@@ -40,26 +121,12 @@ class WeatherRepository(BaseRepository):
             WeatherHistory: Saved weather record
         """
         try:
-            weather_record = WeatherHistory(
-                location=weather_data["location"],
-                latitude=weather_data.get("latitude", 0.0),
-                longitude=weather_data.get("longitude", 0.0),
-                temperature=weather_data["temperature"],
-                feels_like=weather_data.get("feels_like"),
-                humidity=weather_data.get("humidity"),
-                pressure=weather_data.get("pressure"),
-                wind_speed=weather_data.get("wind_speed"),
-                wind_direction=weather_data.get("wind_direction"),
-                visibility=weather_data.get("visibility"),
-                uv_index=weather_data.get("uv_index"),
-                condition=weather_data["condition"],
-                description=weather_data.get("description"),
-                icon=weather_data.get("icon"),
-                raw_data=weather_data.get("raw_data"),
-                timestamp=weather_data.get("timestamp", datetime.utcnow()),
-            )
+            weather_record = self._build_record(weather_data)
+            await self._add_search_locations([weather_record.location])
 
             self._session.add(weather_record)
+            for statement, params in rollups.upsert_statements(weather_record):
+                await self._session.execute(statement, params)
             await self._session.commit()
             await self._session.refresh(weather_record)
 
@@ -71,20 +138,56 @@ class WeatherRepository(BaseRepository):
             self._logger.error(f"Failed to save weather data: {e}")
             raise
 
+    async def save_weather_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """Save many weather observations and their rollup updates in one transaction.
+
+        Records are inserted with multi-row INSERTs and rollups updated with
+        one executemany per resolution.
+
+        Args:
+            batch: Weather data dictionaries
+
+        Returns:
+            int: Number of records saved
+        """
+        if not batch:
+            return 0
+
+        try:
+            records = [self._build_record(weather_data) for weather_data in batch]
+            await self._add_search_locations(list({record.location for record in records}))
+
+            self._session.add_all(records)
+            upserts: Dict[Any, List[Dict[str, Any]]] = {}
+            for record in records:
+                for statement, params in rollups.upsert_statements(record):
+                    upserts.setdefault(statement, []).append(params)
+            for statement, params_list in upserts.items():
+                await self._session.execute(statement, params_list)
+            await self._session.commit()
+
+            self._logger.debug(f"Saved {len(records)} weather records")
+            return len(records)
+
+        except Exception as e:
+            await self._session.rollback()
+            self._logger.error(f"Failed to save weather batch: {e}")
+            raise
+
     async def get_weather_history(
         self,
         location: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        limit: int = 100,
+        limit: Optional[int] = 100,
     ) -> List[WeatherHistory]:
         """Get weather history with optional filters.
 
         Args:
-            location: Filter by location
+            location: Filter by location (normalized name, else a part of one)
             start_date: Filter by start date
             end_date: Filter by end date
-            limit: Maximum number of records
+            limit: Maximum number of records (None for all)
 
         Returns:
             List[WeatherHistory]: Weather history records
@@ -95,7 +198,8 @@ class WeatherRepository(BaseRepository):
             # Apply filters
             conditions = []
             if location:
-                conditions.append(WeatherHistory.location.ilike(f"%{location}%"))
+                location_filter = await self._location_filter(location)
+                conditions.append(location_filter(WeatherHistory.location))
             if start_date:
                 conditions.append(WeatherHistory.timestamp >= start_date)
             if end_date:
@@ -105,7 +209,9 @@ class WeatherRepository(BaseRepository):
                 query = query.where(and_(*conditions))
 
             # Order by timestamp descending and limit
-            query = query.order_by(desc(WeatherHistory.timestamp)).limit(limit)
+            query = query.order_by(desc(WeatherHistory.timestamp))
+            if limit is not None:
+                query = query.limit(limit)
 
             result = await self._session.execute(query)
             return result.scalars().all()
@@ -124,9 +230,10 @@ class WeatherRepository(BaseRepository):
             Optional[WeatherHistory]: Latest weather record or None
         """
         try:
+            location_filter = await self._location_filter(location)
             query = (
                 select(WeatherHistory)
-                .where(WeatherHistory.location.ilike(f"%{location}%"))
+                .where(location_filter(WeatherHistory.location))
                 .order_by(desc(WeatherHistory.timestamp))
                 .limit(1)
             )
@@ -141,6 +248,9 @@ class WeatherRepository(BaseRepository):
     async def get_weather_statistics(self, location: str, days: int = 30) -> Dict[str, Any]:
         """Get weather statistics for a location.
 
+        Whole months, days and hours of the period are read from the rollups,
+        and only the partial hours at its edges from raw observations.
+
         Args:
             location: Location name
             days: Number of days to analyze
@@ -149,45 +259,107 @@ class WeatherRepository(BaseRepository):
             Dict[str, Any]: Weather statistics
         """
         try:
-            start_date = datetime.utcnow() - timedelta(days=days)
-
-            query = select(
-                func.avg(WeatherHistory.temperature).label("avg_temp"),
-                func.min(WeatherHistory.temperature).label("min_temp"),
-                func.max(WeatherHistory.temperature).label("max_temp"),
-                func.avg(WeatherHistory.humidity).label("avg_humidity"),
-                func.avg(WeatherHistory.pressure).label("avg_pressure"),
-                func.avg(WeatherHistory.wind_speed).label("avg_wind_speed"),
-                func.count(WeatherHistory.id).label("record_count"),
-            ).where(
-                and_(
-                    WeatherHistory.location.ilike(f"%{location}%"),
-                    WeatherHistory.timestamp >= start_date,
+            now = datetime.utcnow()
+            start_date = rollups.retained_start(now - timedelta(days=days), now)
+            location_filter = await self._location_filter(location)
+
+            query = union_all(
+                *(
+                    rollups.aggregate_query(segment, location_filter)
+                    for segment in rollups.plan_segments(start_date, now)
                 )
             )
-
             result = await self._session.execute(query)
-            row = result.first()
 
-            if row:
-                return {
-                    "location": location,
-                    "period_days": days,
-                    "avg_temperature": float(row.avg_temp) if row.avg_temp else None,
-                    "min_temperature": float(row.min_temp) if row.min_temp else None,
-                    "max_temperature": float(row.max_temp) if row.max_temp else None,
-                    "avg_humidity": float(row.avg_humidity) if row.avg_humidity else None,
-                    "avg_pressure": float(row.avg_pressure) if row.avg_pressure else None,
-                    "avg_wind_speed": float(row.avg_wind_speed) if row.avg_wind_speed else None,
-                    "record_count": int(row.record_count),
-                }
-
-            return {"location": location, "period_days": days, "record_count": 0}
+            # Segment rows: resolution, count, temperature sum/min/max, then sum/count pairs
+            totals = [0.0] * 8
+            min_temp = max_temp = None
+            for _, count, temp_sum, row_min, row_max, *pairs in result:
+                for i, value in enumerate((count, temp_sum, *pairs)):
+                    totals[i] += value or 0
+                if row_min is not None:
+                    min_temp = row_min if min_temp is None else min(min_temp, row_min)
+                    max_temp = row_max if max_temp is None else max(max_temp, row_max)
+
+            count, temp_sum, hum_sum, hum_count, pres_sum, pres_count, wind_sum, wind_count = totals
+            if not count:
+                return {"location": location, "period_days": days, "record_count": 0}
+
+            def average(total: float, samples: float) -> Optional[float]:
+                return total / samples if samples else None
+
+            return {
+                "location": location,
+                "period_days": days,
+                "avg_temperature": temp_sum / count,
+                "min_temperature": float(min_temp),
+                "max_temperature": float(max_temp),
+                "avg_humidity": average(hum_sum, hum_count),
+                "avg_pressure": average(pres_sum, pres_count),
+                "avg_wind_speed": average(wind_sum, wind_count),
+                "record_count": int(count),
+            }
 
         except Exception as e:
             self._logger.error(f"Failed to get weather statistics: {e}")
             raise
 
+    async def get_weather_series(
+        self,
+        location: str,
+        start_date: datetime,
+        end_date: Optional[datetime] = None,
+        resolution: Optional[str] = None,
+        max_points: int = 1000,
+    ) -> List[Any]:
+        """Get weather history for a location at a resolution suited to the range.
+
+        Args:
+            location: Filter by location
+            start_date: Start of the range
+            end_date: End of the range (default now)
+            resolution: "raw", "hourly", "daily" or "monthly"; by default the
+                finest resolution covering the range in at most max_points buckets
+            max_points: Bucket budget for choosing the resolution
+
+        Returns:
+            List of WeatherHistory records or rollup rows, newest first
+        """
+        try:
+            now = datetime.utcnow()
+            end_date = end_date or now
+            if resolution is None:
+                chosen = rollups.series_resolution(start_date, end_date, now, max_points)
+            elif resolution == "raw":
+                chosen = None
+            else:
+                chosen = rollups.RESOLUTIONS_BY_NAME[resolution]
+
+            if chosen is None:
+                return await self.get_weather_history(
+                    location=location, start_date=start_date, end_date=end_date, limit=None
+                )
+
+            model = chosen.model
+            location_filter = await self._location_filter(location)
+            query = (
+                select(model)
+                .where(
+                    and_(
+                        location_filter(model.location),
+                        model.bucket_start >= chosen.floor(start_date),
+                        model.bucket_start <= end_date,
+                    )
+                )
+                .order_by(desc(model.bucket_start))
+            )
+            result = await self._session.execute(query)
+            return result.scalars().all()
+
+        except Exception as e:
+            self._logger.error(f"Failed to get weather series: {e}")
+            raise
+
     async def get_all_history(self) -> List[WeatherHistory]:
         """Get all weather history records.
 
@@ -272,6 +444,35 @@ class WeatherRepository(BaseRepository):
             self._logger.error(f"Failed to cleanup old records: {e}")
             raise
 
+    async def cleanup_rollups(self) -> Dict[str, int]:
+        """Delete rollup buckets older than the retention of their resolution.
+
+        Returns:
+            Dict[str, int]: Number of buckets deleted per resolution
+        """
+        try:
+            now = datetime.utcnow()
+            deleted = {}
+            for resolution in rollups.RESOLUTIONS:
+                if resolution.retention is None:
+                    continue
+                result = await self._session.execute(
+                    resolution.model.__table__.delete().where(
+                        resolution.model.bucket_start < now - resolution.retention
+                    )
+                )
+                deleted[resolution.name] = result.rowcount
+            await self._session.commit()
+
+            if any(deleted.values()):
+                self._logger.info(f"Cleaned up expired rollup buckets: {deleted}")
+            return deleted
+
+        except Exception as e:
+            await self._session.rollback()
+            self._logger.error(f"Failed to cleanup rollups: {e}")
+            raise
+
 
 class PreferencesRepository(BaseRepository):
     """Repository for user preferences."""
@@ -0,0 +1,268 @@
+"""Weather history rollups.
+
+Hourly, daily and monthly aggregates of WeatherHistory, updated in the same
+transaction as each saved observation. Statistics and long history ranges
+read a few pre-aggregated rows per bucket instead of every observation.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import DateTime, bindparam, func, literal, text
+from sqlalchemy.sql import Select, select
+from sqlalchemy.sql.elements import TextClause
+
+from .models import (
+    WeatherHistory,
+    WeatherRollupDaily,
+    WeatherRollupHourly,
+    WeatherRollupMixin,
+    WeatherRollupMonthly,
+)
+
+
+def _floor_hour(moment: datetime) -> datetime:
+    """Get the start of the hour containing moment."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _floor_day(moment: datetime) -> datetime:
+    """Get the start of the day containing moment."""
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _floor_month(moment: datetime) -> datetime:
+    """Get the start of the month containing moment."""
+    return _floor_day(moment).replace(day=1)
+
+
+def _next_month(bucket_start: datetime) -> datetime:
+    """Get the start of the month after bucket_start."""
+    return (bucket_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """A rollup resolution: its table, bucket boundaries and retention."""
+
+    name: str
+    model: Type[WeatherRollupMixin]
+    floor: Callable[[datetime], datetime]
+    next: Callable[[datetime], datetime]
+    bucket: timedelta  # Nominal bucket length
+    retention: Optional[timedelta]  # None keeps buckets forever
+    sql_bucket: str  # strftime format of bucket_start, as SQLAlchemy stores DateTime
+
+    def ceil(self, moment: datetime) -> datetime:
+        """Get the first bucket boundary at or after moment."""
+        start = self.floor(moment)
+        return start if start == moment else self.next(start)
+
+
+# Finest to coarsest
+RESOLUTIONS = (
+    Resolution(
+        "hourly",
+        WeatherRollupHourly,
+        _floor_hour,
+        lambda bucket_start: bucket_start + timedelta(hours=1),
+        timedelta(hours=1),
+        timedelta(days=90),
+        "%Y-%m-%d %H:00:00.000000",
+    ),
+    Resolution(
+        "daily",
+        WeatherRollupDaily,
+        _floor_day,
+        lambda bucket_start: bucket_start + timedelta(days=1),
+        timedelta(days=1),
+        timedelta(days=730),
+        "%Y-%m-%d 00:00:00.000000",
+    ),
+    Resolution(
+        "monthly",
+        WeatherRollupMonthly,
+        _floor_month,
+        _next_month,
+        timedelta(days=30),
+        None,
+        "%Y-%m-01 00:00:00.000000",
+    ),
+)
+
+RESOLUTIONS_BY_NAME = {resolution.name: resolution for resolution in RESOLUTIONS}
+
+# Spans up to this long are answered from raw observations by history queries
+RAW_HISTORY_SPAN = timedelta(days=2)
+
+# (resolution, start, end) covering [start, end); resolution None reads raw observations
+Segment = Tuple[Optional[Resolution], datetime, datetime]
+
+
+def _upsert_sql(resolution: Resolution) -> TextClause:
+    """Build the statement adding one observation to a rollup table.
+
+    Written as text once per table, since ORM upserts are rebuilt and
+    recompiled on every save.
+    """
+    return text(
+        f"""
+        INSERT INTO {resolution.model.__tablename__} (
+            location, bucket_start, record_count,
+            temperature_sum, temperature_min, temperature_max,
+            humidity_sum, humidity_count, pressure_sum, pressure_count,
+            wind_speed_sum, wind_speed_count, updated_at
+        )
+        VALUES (
+            :location, :bucket_start, 1,
+            :temperature, :temperature, :temperature,
+            :humidity_sum, :humidity_count, :pressure_sum, :pressure_count,
+            :wind_speed_sum, :wind_speed_count, CURRENT_TIMESTAMP
+        )
+        ON CONFLICT (location, bucket_start) DO UPDATE SET
+            record_count = record_count + 1,
+            temperature_sum = temperature_sum + excluded.temperature_sum,
+            temperature_min = MIN(temperature_min, excluded.temperature_min),
+            temperature_max = MAX(temperature_max, excluded.temperature_max),
+            humidity_sum = humidity_sum + excluded.humidity_sum,
+            humidity_count = humidity_count + excluded.humidity_count,
+            pressure_sum = pressure_sum + excluded.pressure_sum,
+            pressure_count = pressure_count + excluded.pressure_count,
+            wind_speed_sum = wind_speed_sum + excluded.wind_speed_sum,
+            wind_speed_count = wind_speed_count + excluded.wind_speed_count,
+            updated_at = CURRENT_TIMESTAMP
+        """
+    ).bindparams(bindparam("bucket_start", type_=DateTime()))
+
+
+_UPSERTS = {resolution.name: _upsert_sql(resolution) for resolution in RESOLUTIONS}
+
+
+def upsert_statements(record: WeatherHistory) -> List[Tuple[TextClause, Dict[str, Any]]]:
+    """Get the statements and parameters adding one observation to every rollup."""
+    params = {
+        "location": record.location,
+        "temperature": record.temperature,
+        "humidity_sum": record.humidity or 0,
+        "humidity_count": int(record.humidity is not None),
+        "pressure_sum": record.pressure or 0.0,
+        "pressure_count": int(record.pressure is not None),
+        "wind_speed_sum": record.wind_speed or 0.0,
+        "wind_speed_count": int(record.wind_speed is not None),
+    }
+    return [
+        (_UPSERTS[resolution.name], {**params, "bucket_start": resolution.floor(record.timestamp)})
+        for resolution in RESOLUTIONS
+    ]
+
+
+def backfill_sql(resolution: Resolution) -> str:
+    """Build the SQL aggregating existing observations into an empty rollup table."""
+    return f"""
+            INSERT INTO {resolution.model.__tablename__} (
+                location, bucket_start, record_count,
+                temperature_sum, temperature_min, temperature_max,
+                humidity_sum, humidity_count, pressure_sum, pressure_count,
+                wind_speed_sum, wind_speed_count, updated_at
+            )
+            SELECT location, strftime('{resolution.sql_bucket}', timestamp), COUNT(*),
+                SUM(temperature), MIN(temperature), MAX(temperature),
+                TOTAL(humidity), COUNT(humidity), TOTAL(pressure), COUNT(pressure),
+                TOTAL(wind_speed), COUNT(wind_speed), CURRENT_TIMESTAMP
+            FROM weather_history
+            WHERE NOT EXISTS (SELECT 1 FROM {resolution.model.__tablename__})
+            GROUP BY 1, 2
+            """
+
+
+def plan_segments(start: datetime, end: datetime) -> List[Segment]:
+    """Cover [start, end) with the coarsest whole buckets, using finer ones at the edges.
+
+    A 400-day window reads about 12 monthly rows plus the daily, hourly and raw
+    rows of its partial months, days and hours.
+    """
+    segments = []
+    resolution = None
+    for coarser in RESOLUTIONS:
+        inner_start, inner_end = coarser.ceil(start), coarser.floor(end)
+        if inner_start >= inner_end:
+            break
+        segments.append((resolution, start, inner_start))
+        segments.append((resolution, inner_end, end))
+        start, end, resolution = inner_start, inner_end, coarser
+    segments.append((resolution, start, end))
+    return [segment for segment in segments if segment[1] < segment[2]]
+
+
+def retained_start(start: datetime, now: datetime) -> datetime:
+    """Widen start to the enclosing bucket of the finest resolution still retaining it."""
+    for finer, coarser in zip(RESOLUTIONS, RESOLUTIONS[1:]):
+        if finer.retention is not None and start < now - finer.retention:
+            start = coarser.floor(start)
+    return start
+
+
+def series_resolution(
+    start: datetime, end: datetime, now: datetime, max_points: int
+) -> Optional[Resolution]:
+    """Get the finest resolution that covers [start, end) in at most max_points buckets.
+
+    Returns None when the span is short enough to read raw observations.
+    """
+    if end - start <= RAW_HISTORY_SPAN:
+        return None
+    for resolution in RESOLUTIONS:
+        fits = (end - start) / resolution.bucket <= max_points
+        retained = resolution.retention is None or start >= now - resolution.retention
+        if fits and retained:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+def aggregate_query(segment: Segment, location_filter) -> Select:
+    """Build a query summing one segment into the shared aggregate columns.
+
+    Args:
+        segment: Resolution and range to read
+        location_filter: Callable building the location condition for a column
+
+    Returns:
+        Query with record_count, temperature sum/min/max and sum/count pairs
+        for humidity, pressure and wind speed
+    """
+    resolution, start, end = segment
+    if resolution is None:
+        table = WeatherHistory
+        columns = (
+            func.count(table.id),
+            func.total(table.temperature),
+            func.min(table.temperature),
+            func.max(table.temperature),
+            func.total(table.humidity),
+            func.count(table.humidity),
+            func.total(table.pressure),
+            func.count(table.pressure),
+            func.total(table.wind_speed),
+            func.count(table.wind_speed),
+        )
+        moment = table.timestamp
+    else:
+        table = resolution.model
+        columns = (
+            func.total(table.record_count),
+            func.total(table.temperature_sum),
+            func.min(table.temperature_min),
+            func.max(table.temperature_max),
+            func.total(table.humidity_sum),
+            func.total(table.humidity_count),
+            func.total(table.pressure_sum),
+            func.total(table.pressure_count),
+            func.total(table.wind_speed_sum),
+            func.total(table.wind_speed_count),
+        )
+        moment = table.bucket_start
+
+    return select(literal(resolution.name if resolution else "raw"), *columns).where(
+        location_filter(table.location), moment >= start, moment < end
+    )
@@ -0,0 +1,191 @@
+"""Write-behind buffer for weather observations.
+
+Saved observations are queued and written in batches, so a refresh across
+many locations costs one transaction instead of one commit per record.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+WeatherBatchWriter = Callable[[List[Dict[str, Any]]], Awaitable[int]]
+
+
+class WeatherWriteBuffer:
+    """Queues weather observations and writes them in batches.
+
+    A batch is written once max_batch_size observations are waiting, or
+    flush_interval seconds after the writer started waiting for them. At most
+    max_pending observations are held; put() waits for room when the buffer
+    is full, so producers slow down to the speed of the database.
+    """
+
+    def __init__(
+        self,
+        write_batch: WeatherBatchWriter,
+        max_batch_size: int = 200,
+        flush_interval: float = 2.0,
+        max_pending: int = 5000,
+        on_flush: Optional[Callable[[int], None]] = None,
+    ):
+        """Initialize the buffer.
+
+        Args:
+            write_batch: Coroutine writing a list of observations in one
+                transaction and returning the number written
+            max_batch_size: Observations that trigger an early write
+            flush_interval: Maximum seconds an observation waits before being written
+            max_pending: Queued observations at which put() starts waiting
+            on_flush: Called with the number of observations after each write
+        """
+        self._logger = logging.getLogger(__name__)
+        self._write_batch = write_batch
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._on_flush = on_flush
+
+        self._pending: List[Dict[str, Any]] = []
+        self._cond = asyncio.Condition()
+        self._writer: Optional[asyncio.Task] = None
+        self._writing = False
+        self._flush_requests = 0
+        self._closing = False
+        self._stats = {
+            "flushes": 0,
+            "records_written": 0,
+            "failed_records": 0,
+            "backpressure_waits": 0,
+            "last_flush_size": 0,
+            "max_flush_size": 0,
+            "last_flush_time": 0.0,
+            "max_flush_time": 0.0,
+            "total_flush_time": 0.0,
+        }
+
+    def _ensure_writer(self) -> None:
+        """Start the writer task on the running loop if it is not running."""
+        if self._writer is None or self._writer.done():
+            self._closing = False
+            self._writer = asyncio.create_task(self._writer_loop())
+
+    async def put(self, weather_data: Dict[str, Any]) -> None:
+        """Queue an observation, waiting while the buffer is full.
+
+        Args:
+            weather_data: Weather data dictionary as accepted by
+                WeatherRepository.save_weather_data
+        """
+        self._ensure_writer()
+        async with self._cond:
+            if len(self._pending) >= self.max_pending:
+                self._stats["backpressure_waits"] += 1
+                await self._cond.wait_for(lambda: len(self._pending) < self.max_pending)
+            self._pending.append(weather_data)
+            # Wake the writer for a new batch or a full one
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._cond.notify_all()
+
+    def _batch_ready(self) -> bool:
+        """Check whether the writer should stop collecting and write."""
+        return (
+            len(self._pending) >= self.max_batch_size
+            or self._flush_requests > 0
+            or self._closing
+        )
+
+    async def _writer_loop(self) -> None:
+        """Write batches until closed and drained."""
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(lambda: self._pending or self._closing)
+                if not self._pending:
+                    return
+                if not self._batch_ready():
+                    try:
+                        await asyncio.wait_for(
+                            self._cond.wait_for(self._batch_ready), self.flush_interval
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                batch = self._pending[: self.max_batch_size]
+                del self._pending[: self.max_batch_size]
+                self._writing = True
+                # Wake producers waiting for room
+                self._cond.notify_all()
+
+            try:
+                await self._write(batch)
+            finally:
+                async with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Write one batch, falling back to single records if the batch fails."""
+        start = time.perf_counter()
+        try:
+            written = await self._write_batch(batch)
+        except Exception as e:
+            self._logger.warning(
+                f"⚠️ Batch write of {len(batch)} observations failed, retrying one by one: {e}"
+            )
+            written = 0
+            for weather_data in batch:
+                try:
+                    written += await self._write_batch([weather_data])
+                except Exception as record_error:
+                    self._stats["failed_records"] += 1
+                    self._logger.error(
+                        f"❌ Dropped observation for {weather_data.get('location')}: "
+                        f"{record_error}"
+                    )
+        elapsed = time.perf_counter() - start
+
+        self._stats["flushes"] += 1
+        self._stats["records_written"] += written
+        self._stats["last_flush_size"] = len(batch)
+        self._stats["max_flush_size"] = max(self._stats["max_flush_size"], len(batch))
+        self._stats["last_flush_time"] = elapsed
+        self._stats["max_flush_time"] = max(self._stats["max_flush_time"], elapsed)
+        self._stats["total_flush_time"] += elapsed
+
+        if self._on_flush and written:
+            try:
+                self._on_flush(written)
+            except Exception as e:
+                self._logger.error(f"Error in write buffer flush callback: {e}")
+
+    async def flush(self) -> None:
+        """Write every queued observation now and wait until it is committed."""
+        if self._writer is None or self._writer.done():
+            return
+        async with self._cond:
+            self._flush_requests += 1
+            self._cond.notify_all()
+            try:
+                await self._cond.wait_for(lambda: not self._pending and not self._writing)
+            finally:
+                self._flush_requests -= 1
+
+    async def close(self) -> None:
+        """Write every queued observation and stop the writer."""
+        if self._writer is None:
+            return
+        async with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        await self._writer
+        self._writer = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write statistics, including flush sizes and latencies."""
+        stats = self._stats.copy()
+        flushes = stats["flushes"]
+        flushed = stats["records_written"] + stats["failed_records"]
+        stats["mean_flush_size"] = flushed / flushes if flushes else 0.0
+        stats["mean_flush_time"] = stats["total_flush_time"] / flushes if flushes else 0.0
+        stats["pending_writes"] = len(self._pending)
+        stats["max_pending"] = self.max_pending
+        return stats
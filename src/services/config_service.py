@@ -152,7 +152,10 @@ class ConfigService:
         return {
             "ttl_seconds": self._config.weather.cache_duration,
             "max_size": self._config.data.max_cache_size,
-            "cleanup_interval": 3600,  # 1 hour
+            "cleanup_interval": self._config.data.repository_purge_interval,
+            "repository_max_entries": self._config.data.repository_cache_entries,
+            "repository_memory_mb": self._config.data.repository_cache_mb,
+            "repository_sweep_interval": self._config.data.repository_cache_sweep_interval,
         }
 
     def validate_configuration(self) -> bool:
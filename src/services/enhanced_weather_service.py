@@ -4,18 +4,18 @@ Handles weather data, air quality, astronomical data, and advanced search.
 Implements robust error recovery and fallback mechanisms.
 """
 
-import json
 import logging
 import random
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from ..models.location import (
     Location,
@@ -26,6 +26,17 @@ from ..models.weather import (
     WeatherCondition,
     WeatherData,
 )
+from ..utils import astronomy
+from ..utils.api_optimizer import (
+    APIOptimizer,
+    APIRequest,
+    APIResponse,
+    CacheStrategy,
+    HTTPTransport,
+    RequestPriority,
+)
+from ..utils.cache_manager import CacheNamespace, get_cache_manager
+from ..utils.single_flight import SingleFlight
 from .config_service import ConfigService
 
 
@@ -260,12 +271,25 @@ class LocationSearchResult:
 class EnhancedWeatherService:
     """Enhanced weather service with extended capabilities."""
 
-    def __init__(self, config_service: ConfigService):
-        """Initialize enhanced weather service with robust error recovery."""
+    def __init__(
+        self,
+        config_service: ConfigService,
+        concurrent_fetch: bool = True,
+        api_optimizer: Optional[APIOptimizer] = None,
+    ):
+        """Initialize enhanced weather service with robust error recovery.
+
+        Args:
+            config_service: Application configuration service
+            concurrent_fetch: Fetch air quality and alerts in parallel
+                once the coordinates of a location are known
+            api_optimizer: Optimizer whose queue, response cache and rate limiter
+                all API calls go through; one is created when omitted
+        """
         self.config = config_service
         self.logger = logging.getLogger("weather_dashboard.enhanced_weather_service")
         self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_file = Path.cwd() / "cache" / "enhanced_weather_cache.json"
+        self._legacy_cache_file = Path.cwd() / "cache" / "enhanced_weather_cache.json"
         self._load_cache()
 
         # Offline mode detection
@@ -278,6 +302,17 @@ class EnhancedWeatherService:
         # Rate limiting with exponential backoff
         self._last_request_time = 0
         self._min_request_interval = 1.0  # 1 second between requests
+        # All API calls are queued by priority on the optimizer, whose token bucket
+        # matches the request interval and whose burst covers one enhanced lookup
+        # and its dependent sub-requests
+        self._owns_optimizer = api_optimizer is None
+        self._api_optimizer = api_optimizer or APIOptimizer(
+            requests_per_second=1.0 / self._min_request_interval,
+            burst_size=4,
+            max_concurrent=4,
+            transport=HTTPTransport(),
+        )
+        self._rate_limiter = self._api_optimizer.rate_limiter
         self._backoff_base = 1  # Start at 1 second
         self._backoff_max = 32  # Max 32 seconds
         self._backoff_multiplier = 2
@@ -289,8 +324,21 @@ class EnhancedWeatherService:
         self._api_switch_threshold = 3  # Switch after 3 consecutive failures
         self._current_api = self._primary_api
 
-        # Connection pooling and retry strategy with proper timeouts
-        self._session = self._create_session_with_retries()
+        # Identical concurrent requests share one in-flight API call
+        self._single_flight = SingleFlight()
+        self._cache_stats = {"hits": 0, "misses": 0}
+        # HTTP sends, counted once per optimizer request (coalesced callers share it)
+        self._api_calls = 0
+        self._sent_requests: "weakref.WeakSet" = weakref.WeakSet()
+        self._api_calls_lock = threading.Lock()
+
+        # Bounded pool for the dependent sub-requests of an enhanced lookup
+        self._concurrent_fetch = concurrent_fetch
+        self._fetch_timeout = 15.0  # seconds per sub-request
+        self._fetch_executor = ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="EnhancedWeatherFetch"
+        )
+        self._fetch_timings: Dict[str, Any] = {}
 
         # Enhanced caching with TTL and stale data support
         self._cache_ttl = {
@@ -300,6 +348,11 @@ class EnhancedWeatherService:
             "geocoding": 86400 * 7,  # 7 days
             "stale_acceptable": 7200,  # 2 hours for stale data
         }
+        self._endpoint_cache_types = {
+            "weather": "current_weather",
+            "forecast": "forecast",
+            "data/2.5/air_pollution": "air_quality",
+        }
 
         self.logger.info("🌐 Enhanced Weather Service initialized with robust error recovery")
 
@@ -308,25 +361,19 @@ class EnhancedWeatherService:
         self.api_key = self.config.weather.api_key
 
     def _load_cache(self) -> None:
-        """Load enhanced weather cache from file."""
-        try:
-            if self._cache_file.exists():
-                with open(self._cache_file, "r", encoding="utf-8") as f:
-                    self._cache = json.load(f)
-                self.logger.debug(f"📁 Loaded enhanced cache with {len(self._cache)} entries")
-        except Exception as e:
-            self.logger.warning(f"Failed to load enhanced cache: {e}")
-            self._cache = {}
+        """Open the enhanced weather namespace of the shared tiered cache.
 
-    def _save_cache(self) -> None:
-        """Save enhanced weather cache to file."""
+        Entries are loaded from disk on first access and each write persists only
+        the changed entry. A legacy whole-file JSON cache is imported once.
+        """
         try:
-            self._cache_file.parent.mkdir(exist_ok=True)
-            with open(self._cache_file, "w", encoding="utf-8") as f:
-                json.dump(self._cache, f, indent=2, default=str)
-            self.logger.debug("💾 Enhanced cache saved successfully")
+            # Entries are validated per data type on read; the TTL only bounds disk use
+            self._cache = get_cache_manager().namespace("enhanced_weather", default_ttl=7 * 86400)
+            self._cache.import_json(self._legacy_cache_file)
+            self.logger.debug("📁 Opened enhanced weather cache namespace")
         except Exception as e:
-            self.logger.warning(f"Failed to save enhanced cache: {e}")
+            self.logger.warning(f"Failed to open enhanced cache, using memory only: {e}")
+            self._cache = {}
 
     def _is_cache_valid(self, cache_entry: Dict[str, Any], cache_duration: int = None) -> bool:
         """Check if cache entry is still valid."""
@@ -338,57 +385,40 @@ class EnhancedWeatherService:
         except (KeyError, ValueError):
             return False
 
-    def _rate_limit(self) -> None:
-        """Implement rate limiting."""
-        current_time = datetime.now().timestamp()
-        time_since_last = current_time - self._last_request_time
-
-        if time_since_last < self._min_request_interval:
-            sleep_time = self._min_request_interval - time_since_last
-            import time
+    def _send_request(
+        self, url: str, params: Dict[str, Any], priority: RequestPriority, cache_type: str
+    ) -> APIResponse:
+        """Send a GET request through the API optimizer and wait for its response.
 
-            time.sleep(sleep_time)
-
-        self._last_request_time = datetime.now().timestamp()
-
-    def _create_session_with_retries(self) -> requests.Session:
-        """Create HTTP session with enhanced connection pooling and proper timeouts."""
-        session = requests.Session()
-
-        # Enhanced retry strategy with exponential backoff
-        retry_strategy = Retry(
-            total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-            backoff_factor=1,  # Will be handled by our custom exponential backoff
-            raise_on_status=False,
-            respect_retry_after_header=True,
-        )
+        The optimizer dispatches queued requests by priority under the shared
+        token bucket and answers repeats from its response cache.
 
-        # Enhanced HTTP adapter with proper connection pooling
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=20,
-            pool_maxsize=50,
-            pool_block=False,
+        Raises:
+            The transport exception when no HTTP response was received
+        """
+        request = APIRequest(
+            endpoint=url,
+            params=params,
+            priority=priority,
+            cache_strategy=CacheStrategy.CACHE_FIRST,
+            cache_ttl=self._cache_ttl.get(cache_type, self._cache_ttl["current_weather"]),
         )
+        future = self._api_optimizer.submit(request)
+        response = future.result()
+        if not response.cache_hit:
+            self._count_api_call(future)
+        if response.status_code is None:
+            raise response.error or WeatherServiceError("No response received")
 
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-
-        # Set proper timeouts: 3 second connect, 5 second read
-        session.timeout = (3.0, 5.0)
-
-        # Add headers for better performance
-        session.headers.update(
-            {
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "User-Agent": "WeatherDashboard/1.0",
-            }
-        )
+        self._last_request_time = datetime.now().timestamp()
+        return response
 
-        return session
+    def _count_api_call(self, future) -> None:
+        """Count the HTTP send behind an optimizer future once."""
+        with self._api_calls_lock:
+            if future not in self._sent_requests:
+                self._sent_requests.add(future)
+                self._api_calls += 1
 
     def _apply_exponential_backoff(self) -> None:
         """Apply exponential backoff for rate limiting."""
@@ -467,6 +497,12 @@ class EnhancedWeatherService:
 
     def _is_cache_valid_with_ttl(self, cache_key: str, cache_type: str) -> bool:
         """Check if cached data is still valid based on TTL."""
+        valid = self._check_cache_ttl(cache_key, cache_type)
+        self._cache_stats["hits" if valid else "misses"] += 1
+        return valid
+
+    def _check_cache_ttl(self, cache_key: str, cache_type: str) -> bool:
+        """Check a cache entry's age against the TTL for its type."""
         if cache_key not in self._cache:
             return False
 
@@ -534,7 +570,28 @@ class EnhancedWeatherService:
             self._offline_mode = True
             self.logger.warning("🔌 Entering offline mode due to connection issues")
 
-    def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _make_request(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        priority: RequestPriority = RequestPriority.HIGH,
+    ) -> Optional[Dict[str, Any]]:
+        """Make API request, sharing one in-flight call between identical concurrent requests.
+
+        Callers at different priorities are coalesced by the API optimizer instead,
+        which promotes the queued request to the higher priority.
+        """
+        request_key = f"{endpoint}_{str(sorted(params.items()))}_{priority.name}"
+        return self._single_flight.do(
+            request_key, self._perform_request, endpoint, params, priority
+        )
+
+    def _perform_request(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        priority: RequestPriority = RequestPriority.HIGH,
+    ) -> Optional[Dict[str, Any]]:
         """Make API request with robust error handling, fallback, and intelligent caching."""
         cache_key = f"{endpoint}_{str(sorted(params.items()))}"
 
@@ -555,9 +612,6 @@ class EnhancedWeatherService:
             self._switch_to_fallback_api()
 
         try:
-            # Rate limiting
-            self._rate_limit()
-
             # Configure API parameters based on current API
             if self._current_api == "openweather":
                 params.update({"appid": self.api_key, "units": self.config.weather.units})
@@ -571,15 +625,17 @@ class EnhancedWeatherService:
 
             self.logger.debug(f"🌐 Making API request to {self._current_api}: {endpoint}")
 
-            # Use session with connection pooling and retries
-            response = self._session.get(url, params=params)
+            # Queue on the API optimizer (shared pooled transport underneath)
+            response = self._send_request(
+                url, params, priority, self._endpoint_cache_types.get(endpoint, "current_weather")
+            )
 
             if response.status_code == 200:
                 # Success - reset error tracking
                 self._last_successful_request = time.time()
                 self._offline_mode = False
                 self._reset_backoff()
-                return response.json()
+                return response.data
             elif response.status_code == 429:
                 # Rate limit exceeded
                 self._consecutive_failures += 1
@@ -646,7 +702,22 @@ class EnhancedWeatherService:
             raise WeatherServiceError(f"Weather service error: {str(e)}")
 
     def _make_geocoding_request(
-        self, endpoint: str, params: Dict[str, Any]
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        priority: RequestPriority = RequestPriority.HIGH,
+    ) -> Optional[Dict[str, Any]]:
+        """Make geocoding API request, coalescing identical concurrent requests."""
+        request_key = f"geocoding_{endpoint}_{str(sorted(params.items()))}_{priority.name}"
+        return self._single_flight.do(
+            request_key, self._perform_geocoding_request, endpoint, params, priority
+        )
+
+    def _perform_geocoding_request(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        priority: RequestPriority = RequestPriority.HIGH,
     ) -> Optional[Dict[str, Any]]:
         """Make geocoding API request with robust error handling and caching."""
         cache_key = f"geocoding_{endpoint}_{str(sorted(params.items()))}"
@@ -666,9 +737,6 @@ class EnhancedWeatherService:
             self._switch_to_fallback_api()
 
         try:
-            # Rate limiting
-            self._rate_limit()
-
             # Configure API parameters based on current API
             if self._current_api == "openweather":
                 params.update({"appid": self.api_key})
@@ -681,15 +749,15 @@ class EnhancedWeatherService:
 
             self.logger.debug(f"🌐 Making geocoding request to {self._current_api}: {endpoint}")
 
-            # Use session with connection pooling and retries
-            response = self._session.get(url, params=params)
+            # Queue on the API optimizer (shared pooled transport underneath)
+            response = self._send_request(url, params, priority, "geocoding")
 
             if response.status_code == 200:
                 # Success - reset error tracking
                 self._last_successful_request = time.time()
                 self._offline_mode = False
                 self._reset_backoff()
-                return response.json()
+                return response.data
             elif response.status_code == 429:
                 # Rate limit exceeded
                 self._consecutive_failures += 1
@@ -805,7 +873,6 @@ class EnhancedWeatherService:
                 "data": [loc.to_dict() for loc in locations],
                 "timestamp": datetime.now().isoformat(),
             }
-            self._save_cache()
 
             self.logger.info(f"✅ Found {len(locations)} locations for {query}")
             return locations
@@ -1200,7 +1267,9 @@ class EnhancedWeatherService:
                 raise e
             raise Exception(f"Request failed: {str(e)}")
 
-    def get_air_quality(self, lat: float, lon: float) -> Optional[AirQualityData]:
+    def get_air_quality(
+        self, lat: float, lon: float, priority: RequestPriority = RequestPriority.HIGH
+    ) -> Optional[AirQualityData]:
         """Get air quality data for coordinates."""
         cache_key = f"air_quality_{lat}_{lon}"
 
@@ -1212,7 +1281,9 @@ class EnhancedWeatherService:
         try:
             self.logger.info(f"🌬️ Fetching air quality for {lat}, {lon}")
 
-            data = self._make_request("data/2.5/air_pollution", {"lat": lat, "lon": lon})
+            data = self._make_request(
+                "data/2.5/air_pollution", {"lat": lat, "lon": lon}, priority
+            )
 
             if not data or "list" not in data or not data["list"]:
                 self.logger.debug(f"🌬️ No air quality data available for coordinates {lat}, {lon}")
@@ -1240,7 +1311,6 @@ class EnhancedWeatherService:
                 "timestamp": datetime.now().isoformat(),
                 "ttl": self._cache_ttl["air_quality"],
             }
-            self._save_cache()
 
             self.logger.info(
                 f"✅ Air quality data retrieved: AQI {
@@ -1256,38 +1326,56 @@ class EnhancedWeatherService:
                 self.logger.warning(f"Air quality fetch failed: {e}")
             return None
 
-    def get_astronomical_data(self, lat: float, lon: float) -> Optional[AstronomicalData]:
-        """Get astronomical data for coordinates."""
-        # This would typically use a separate astronomy API
-        # For now, we'll simulate with basic sunrise/sunset from weather data
-        try:
-            data = self._make_request("weather", {"lat": lat, "lon": lon})
-
-            if not data or "sys" not in data:
-                return None
-
-            sunrise = datetime.fromtimestamp(data["sys"]["sunrise"])
-            sunset = datetime.fromtimestamp(data["sys"]["sunset"])
-            day_length = sunset - sunrise
+    def get_astronomical_data(
+        self,
+        lat: float,
+        lon: float,
+        sys_data: Optional[Dict[str, Any]] = None,
+        on_date: Optional[date] = None,
+    ) -> Optional[AstronomicalData]:
+        """Get astronomical data for coordinates.
 
-            # Simulate moon phase (in real app, use astronomy API)
-            import random
+        Computed locally by the astronomy engine, so no API request is made.
 
-            moon_phase = random.random()
+        Args:
+            lat: Latitude
+            lon: Longitude
+            sys_data: Optional ``sys`` block of a weather payload; its
+                sunrise/sunset take precedence over the computed values
+            on_date: Local date to compute for (defaults to today at the location)
+        """
+        try:
+            result = astronomy.compute_astronomy(lat, lon, on_date)
+
+            def to_local(moment: Optional[datetime]) -> Optional[datetime]:
+                return moment.astimezone().replace(tzinfo=None) if moment else None
+
+            if sys_data and sys_data.get("sunrise") and sys_data.get("sunset"):
+                sunrise = datetime.fromtimestamp(sys_data["sunrise"])
+                sunset = datetime.fromtimestamp(sys_data["sunset"])
+                day_length = sunset - sunrise
+            elif result.sunrise and result.sunset:
+                sunrise = to_local(result.sunrise)
+                sunset = to_local(result.sunset)
+                day_length = result.day_length
+            else:
+                # Polar day or night: centre the (full or empty) day on solar noon
+                noon = to_local(result.solar_noon)
+                sunrise = noon - result.day_length / 2
+                sunset = noon + result.day_length / 2
+                day_length = result.day_length
 
-            astronomical = AstronomicalData(
+            return AstronomicalData(
                 sunrise=sunrise,
                 sunset=sunset,
-                moonrise=None,  # Would need astronomy API
-                moonset=None,  # Would need astronomy API
-                moon_phase=moon_phase,
+                moonrise=to_local(result.moonrise),
+                moonset=to_local(result.moonset),
+                moon_phase=result.moon_phase,
                 day_length=day_length,
             )
 
-            return astronomical
-
         except Exception as e:
-            self.logger.warning(f"Astronomical data fetch failed: {e}")
+            self.logger.warning(f"Astronomical data calculation failed: {e}")
             return None
 
     def get_weather_alerts(self, lat: float, lon: float) -> List[WeatherAlert]:
@@ -1301,8 +1389,16 @@ class EnhancedWeatherService:
             self.logger.warning(f"Weather alerts fetch failed: {e}")
             return []
 
-    def get_enhanced_weather(self, location: str) -> EnhancedWeatherData:
-        """Get enhanced weather data with all additional information."""
+    def get_enhanced_weather(
+        self, location: str, priority: RequestPriority = RequestPriority.HIGH
+    ) -> EnhancedWeatherData:
+        """Get enhanced weather data with all additional information.
+
+        Args:
+            location: City name or query
+            priority: Queue priority of the API calls; background refreshes such
+                as city comparisons pass a lower priority than the foreground city
+        """
         # Validate and clean location input
         if not location or not isinstance(location, str):
             raise ValueError("Location must be a non-empty string")
@@ -1353,16 +1449,17 @@ class EnhancedWeatherService:
 
         # Fetch basic weather data first
         self.logger.info(f"🌤️ Fetching enhanced weather for {location}")
+        lookup_start = time.perf_counter()
 
         try:
-            data = self._make_request("weather", {"q": location})
+            data = self._make_request("weather", {"q": location}, priority)
             if not data:
                 raise WeatherServiceError("No weather data received")
         except RateLimitError as e:
             self.logger.warning(f"⏱️ Rate limited, waiting {e.retry_after} seconds")
             time.sleep(e.retry_after)
             # Try again after rate limit
-            data = self._make_request("weather", {"q": location})
+            data = self._make_request("weather", {"q": location}, priority)
             if not data:
                 raise WeatherServiceError("No weather data received after rate limit retry")
         except (NetworkError, ServiceUnavailableError) as e:
@@ -1458,11 +1555,31 @@ class EnhancedWeatherService:
         # Get coordinates for additional data
         lat = data["coord"]["lat"]
         lon = data["coord"]["lon"]
+        weather_time = time.perf_counter() - lookup_start
 
         # Fetch additional data
-        weather_data.air_quality = self.get_air_quality(lat, lon)
-        weather_data.astronomical = self.get_astronomical_data(lat, lon)
-        weather_data.alerts = self.get_weather_alerts(lat, lon)
+        supplementary, timings = self._fetch_supplementary_data(lat, lon, priority)
+        weather_data.air_quality = supplementary["air_quality"]
+        weather_data.alerts = supplementary["alerts"] or []
+
+        # Astronomy is computed locally from the payload we already have
+        astronomy_start = time.perf_counter()
+        weather_data.astronomical = self.get_astronomical_data(lat, lon, sys_data=data.get("sys"))
+        timings["astronomical"] = time.perf_counter() - astronomy_start
+
+        timings["weather"] = weather_time
+        timings["total"] = time.perf_counter() - lookup_start
+        self._fetch_timings = timings
+        self.logger.debug(
+            "⏱️ Enhanced lookup timings for %s (%s): %s",
+            location,
+            timings["mode"],
+            ", ".join(
+                f"{name}={value * 1000:.0f}ms"
+                for name, value in timings.items()
+                if isinstance(value, float)
+            ),
+        )
 
         # Cache the complete result
         cache_data = {
@@ -1482,11 +1599,95 @@ class EnhancedWeatherService:
             "timestamp": datetime.now().isoformat(),
             "ttl": self._cache_ttl["current_weather"],
         }
-        self._save_cache()
 
         self.logger.info(f"✅ Enhanced weather data retrieved for {location}")
         return weather_data
 
+    def _fetch_supplementary_data(
+        self, lat: float, lon: float, priority: RequestPriority = RequestPriority.HIGH
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Fetch air quality and alerts for known coordinates.
+
+        In concurrent mode the sub-requests run on the bounded fetch pool and
+        draw from the shared token bucket; otherwise they run one after another.
+
+        Returns:
+            Tuple of (results keyed by sub-request, per-call wall times in seconds)
+        """
+        fetchers = {
+            "air_quality": lambda lat, lon: self.get_air_quality(lat, lon, priority),
+            "alerts": self.get_weather_alerts,
+        }
+        results: Dict[str, Any] = {}
+        timings: Dict[str, Any] = {
+            "mode": "concurrent" if self._concurrent_fetch else "sequential"
+        }
+
+        def timed_fetch(name: str, fetcher) -> Any:
+            call_start = time.perf_counter()
+            try:
+                return fetcher(lat, lon)
+            finally:
+                timings[name] = time.perf_counter() - call_start
+
+        batch_start = time.perf_counter()
+        if self._concurrent_fetch:
+            futures = {
+                name: self._fetch_executor.submit(timed_fetch, name, fetcher)
+                for name, fetcher in fetchers.items()
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result(timeout=self._fetch_timeout)
+                except Exception as e:
+                    self.logger.warning(f"Concurrent {name} fetch failed: {e}")
+                    results[name] = None
+        else:
+            for name, fetcher in fetchers.items():
+                results[name] = timed_fetch(name, fetcher)
+
+        timings["supplementary_total"] = time.perf_counter() - batch_start
+        return results, timings
+
+    def get_fetch_timings(self) -> Dict[str, Any]:
+        """Get per-call timings (seconds) of the last uncached enhanced lookup."""
+        return dict(self._fetch_timings)
+
+    def get_request_stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counts and API calls saved by request coalescing.
+
+        Returns:
+            Dictionary with cache ``hits`` and ``misses``, ``api_calls`` actually
+            sent over HTTP (response cache hits and offline fallbacks excluded),
+            ``coalesced`` callers that shared an in-flight call, and
+            ``in_flight`` requests
+        """
+        flight_stats = self._single_flight.get_stats()
+        optimizer_stats = self._api_optimizer.get_statistics()
+        with self._api_calls_lock:
+            api_calls = self._api_calls
+        return {
+            "hits": self._cache_stats["hits"],
+            "misses": self._cache_stats["misses"],
+            "api_calls": api_calls,
+            "coalesced": flight_stats["coalesced"] + optimizer_stats["coalesced_requests"],
+            "in_flight": flight_stats["in_flight"],
+        }
+
+    def set_concurrent_fetch(self, enabled: bool) -> None:
+        """Enable or disable parallel fetching of enhanced lookup sub-requests."""
+        self._concurrent_fetch = enabled
+        self.logger.info(f"Concurrent sub-request fetching {'enabled' if enabled else 'disabled'}")
+
+    def shutdown(self) -> None:
+        """Release the sub-request thread pool and flush the persistent cache."""
+        self._fetch_executor.shutdown(wait=False, cancel_futures=True)
+        if self._owns_optimizer:
+            self._api_optimizer.shutdown()
+        if isinstance(self._cache, CacheNamespace):
+            self._cache.flush()
+        self.logger.debug("Enhanced weather service shut down")
+
     def _get_wind_direction(self, degrees: float) -> str:
         """Convert wind direction degrees to compass direction."""
         if degrees is None:
@@ -1520,15 +1721,20 @@ class EnhancedWeatherService:
 
         return directions[index]
 
-    def get_weather(self, location: str) -> EnhancedWeatherData:
+    def get_weather(
+        self, location: str, priority: RequestPriority = RequestPriority.HIGH
+    ) -> EnhancedWeatherData:
         """Get weather data - compatibility method that delegates to get_enhanced_weather."""
-        return self.get_enhanced_weather(location)
+        return self.get_enhanced_weather(location, priority)
 
-    def get_current_weather(self, location: str = None) -> Dict[str, Any]:
+    def get_current_weather(
+        self, location: str = None, priority: RequestPriority = RequestPriority.HIGH
+    ) -> Dict[str, Any]:
         """Get current weather data in dictionary format for compatibility.
 
         Args:
             location: Location to get weather for. If None, uses default location.
+            priority: Queue priority of the underlying API calls
 
         Returns:
             Dictionary containing current weather data
@@ -1537,7 +1743,7 @@ class EnhancedWeatherService:
             location = "London"  # Default location
 
         try:
-            enhanced_data = self.get_enhanced_weather(location)
+            enhanced_data = self.get_enhanced_weather(location, priority)
             self.logger.debug(
                 f"Enhanced data type: {
                     type(enhanced_data)}, location type: {
@@ -1546,7 +1752,7 @@ class EnhancedWeatherService:
             )
 
             # Get forecast data
-            forecast_data = self.get_forecast_data(location)
+            forecast_data = self.get_forecast_data(location, priority)
 
             # Convert to enhanced weather display format
             weather_dict = {
@@ -1607,12 +1813,15 @@ class EnhancedWeatherService:
                 "timestamp": datetime.now().isoformat(),
             }
 
-    def get_forecast_data(self, location: str) -> Optional[Dict[str, Any]]:
+    def get_forecast_data(
+        self, location: str, priority: RequestPriority = RequestPriority.HIGH
+    ) -> Optional[Dict[str, Any]]:
         """
         Get forecast data from OpenWeatherMap API.
 
         Args:
             location: Location to get forecast for
+            priority: Queue priority of the API call
 
         Returns:
             Dictionary containing forecast data in OpenWeatherMap format
@@ -1627,7 +1836,7 @@ class EnhancedWeatherService:
             # Fetch forecast data from API
             self.logger.info(f"🌤️ Fetching forecast data for {location}")
 
-            forecast_data = self._make_request("forecast", {"q": location})
+            forecast_data = self._make_request("forecast", {"q": location}, priority)
 
             if forecast_data:
                 # Cache the forecast data with TTL (1 hour)
@@ -1636,7 +1845,6 @@ class EnhancedWeatherService:
                     "timestamp": datetime.now().isoformat(),
                     "ttl": self._cache_ttl["forecast"],
                 }
-                self._save_cache()
 
                 self.logger.debug(f"✅ Forecast data retrieved for {location}")
                 return forecast_data
@@ -1670,7 +1878,6 @@ class EnhancedWeatherService:
                 "timestamp": datetime.now().isoformat(),
                 "ttl": self._cache_ttl["forecast"],
             }
-            self._save_cache()
 
             return ForecastData.from_openweather_forecast(data)
 
@@ -1681,6 +1888,5 @@ class EnhancedWeatherService:
     def clear_cache(self) -> None:
         """Clear enhanced weather cache."""
         self._cache.clear()
-        if self._cache_file.exists():
-            self._cache_file.unlink()
+        self._api_optimizer.clear_cache()
         self.logger.info("🗑️ Enhanced weather cache cleared")
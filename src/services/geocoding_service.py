@@ -6,10 +6,50 @@ from datetime import datetime, timedelta
 from typing import List, Optional
 
 import requests
-from geopy.exc import GeocoderServiceError, GeocoderTimedOut
+from geopy.adapters import AdapterHTTPError, BaseSyncAdapter
+from geopy.exc import (
+    GeocoderParseError,
+    GeocoderServiceError,
+    GeocoderTimedOut,
+    GeocoderUnavailable,
+)
 from geopy.geocoders import Nominatim
 
 from ..models.location import LocationResult
+from ..utils.cache_manager import CacheNamespace, get_cache_manager
+from ..utils.http_client import get_http_client
+
+
+class SharedTransportAdapter(BaseSyncAdapter):
+    """geopy adapter that sends geocoder requests through the shared HTTP client."""
+
+    def __init__(self, *, proxies=None, ssl_context=None):
+        super().__init__(proxies=proxies, ssl_context=ssl_context)
+        self._client = get_http_client()
+
+    def get_json(self, url, *, timeout, headers):
+        text = self.get_text(url, timeout=timeout, headers=headers)
+        try:
+            return json.loads(text)
+        except ValueError:
+            raise GeocoderParseError(f"Could not deserialize geocoder response: {text[:200]}")
+
+    def get_text(self, url, *, timeout, headers):
+        try:
+            response = self._client.get(url, timeout=timeout, headers=headers)
+        except requests.exceptions.Timeout:
+            raise GeocoderTimedOut("Service timed out")
+        except requests.exceptions.RequestException as e:
+            raise GeocoderUnavailable(str(e))
+
+        if response.status_code >= 400:
+            raise AdapterHTTPError(
+                f"Non-successful status code {response.status_code}",
+                status_code=response.status_code,
+                headers=response.headers,
+                text=response.text,
+            )
+        return response.text
 
 
 class GeocodingService:
@@ -17,9 +57,11 @@ class GeocodingService:
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.geolocator = Nominatim(user_agent="weather_dashboard_v1.0")
-        self.cache = self.load_cache()
+        self.geolocator = Nominatim(
+            user_agent="weather_dashboard_v1.0", adapter_factory=SharedTransportAdapter
+        )
         self.cache_ttl = timedelta(hours=24)  # Cache for 24 hours
+        self.cache = self.load_cache()
 
         # Regex patterns for different input types
         self.zip_patterns = {
@@ -285,7 +327,7 @@ class GeocodingService:
         """Get current location using IP geolocation."""
         try:
             # Use a free IP geolocation service
-            response = requests.get("http://ip-api.com/json/", timeout=5)
+            response = get_http_client().get("http://ip-api.com/json/", timeout=5)
             data = response.json()
 
             if data.get("status") == "success":
@@ -316,34 +358,31 @@ class GeocodingService:
             self.logger.error(f"Error getting current location: {e}")
             return None
 
-    def load_cache(self) -> dict:
-        """Load geocoding cache from file."""
-        cache_file = os.path.join("cache", "geocoding_cache.json")
+    def load_cache(self):
+        """Open the geocoding namespace of the shared tiered cache.
 
+        A legacy JSON cache file is imported once.
+        """
         try:
-            if os.path.exists(cache_file):
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+            cache = get_cache_manager().namespace(
+                "geocoding", default_ttl=int(self.cache_ttl.total_seconds())
+            )
+            cache.import_json(os.path.join("cache", "geocoding_cache.json"))
+            return cache
         except Exception as e:
             self.logger.error(f"Error loading geocoding cache: {e}")
 
         return {}
 
     def save_cache(self):
-        """Save geocoding cache to file."""
-        cache_file = os.path.join("cache", "geocoding_cache.json")
-
-        try:
-            os.makedirs("cache", exist_ok=True)
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(self.cache, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            self.logger.error(f"Error saving geocoding cache: {e}")
+        """Persist queued geocoding cache writes."""
+        if isinstance(self.cache, CacheNamespace):
+            self.cache.flush()
 
     def get_from_cache(self, key: str) -> Optional[dict]:
         """Get item from cache if not expired."""
-        if key in self.cache:
-            item = self.cache[key]
+        item = self.cache.get(key)
+        if item is not None:
             timestamp = datetime.fromisoformat(item["timestamp"])
 
             if datetime.now() - timestamp < self.cache_ttl:
@@ -355,30 +394,22 @@ class GeocodingService:
         return None
 
     def save_to_cache(self, key: str, data: dict):
-        """Save item to cache with timestamp."""
+        """Save item to cache with timestamp (persisted in the background)."""
         self.cache[key] = {"data": data, "timestamp": datetime.now().isoformat()}
 
-        # Clean up old cache entries periodically
-        if len(self.cache) > 1000:
-            self.cleanup_cache()
-
-        # Save to file
-        self.save_cache()
-
     def cleanup_cache(self):
         """Remove expired cache entries."""
-        now = datetime.now()
-        expired_keys = []
-
-        for key, item in self.cache.items():
-            timestamp = datetime.fromisoformat(item["timestamp"])
-            if now - timestamp >= self.cache_ttl:
-                expired_keys.append(key)
-
-        for key in expired_keys:
-            del self.cache[key]
+        if isinstance(self.cache, CacheNamespace):
+            removed = self.cache.cleanup_expired()
+        else:
+            now = datetime.now()
+            expired_keys = [
+                key
+                for key, item in self.cache.items()
+                if now - datetime.fromisoformat(item["timestamp"]) >= self.cache_ttl
+            ]
+            for key in expired_keys:
+                del self.cache[key]
+            removed = len(expired_keys)
 
-        self.logger.info(
-            f"Cleaned up {
-                len(expired_keys)} expired cache entries"
-        )
+        self.logger.info(f"Cleaned up {removed} expired cache entries")
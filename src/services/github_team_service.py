@@ -12,6 +12,8 @@ from typing import Any, Dict, List, Optional
 
 import requests
 
+from ..utils.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,7 +67,7 @@ class GitHubTeamService:
             if self.github_token:
                 headers["Authorization"] = f"token {self.github_token}"
 
-            response = requests.get(self.CSV_DATA_URL, headers=headers, timeout=10)
+            response = get_http_client().get(self.CSV_DATA_URL, headers=headers, timeout=10)
             response.raise_for_status()
 
             # Parse CSV data
@@ -202,6 +204,8 @@ class GitHubTeamService:
         logger.info(f"Would contribute data for {city_data.get('city', 'Unknown')}")
 
         if github_token:
+            http = get_http_client()
+
             # Create headers for GitHub API
             headers = {
                 "Authorization": f"token {github_token}",
@@ -210,19 +214,19 @@ class GitHubTeamService:
 
             # Get the current file content
             current_file_url = f"https://api.github.com/repos/StrayDogSyn/New_Team_Dashboard/contents/exports/team_weather_data.csv"
-            response = requests.get(current_file_url, headers=headers)
+            response = http.get(current_file_url, headers=headers)
             response.raise_for_status()
             current_content = response.json()
 
             # Create a new branch
             branch_name = f"weather-update-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-            main_branch = requests.get(
+            main_branch = http.get(
                 "https://api.github.com/repos/StrayDogSyn/New_Team_Dashboard/git/refs/heads/main",
                 headers=headers,
             ).json()
 
             # Create new branch reference
-            requests.post(
+            http.post(
                 "https://api.github.com/repos/StrayDogSyn/New_Team_Dashboard/git/refs",
                 headers=headers,
                 json={"ref": f"refs/heads/{branch_name}", "sha": main_branch["object"]["sha"]},
@@ -232,7 +236,7 @@ class GitHubTeamService:
             new_content = self._update_csv_content(current_content["content"], city_data)
 
             # Create commit
-            requests.put(
+            http.put(
                 current_file_url,
                 headers=headers,
                 json={
@@ -244,7 +248,7 @@ class GitHubTeamService:
             ).raise_for_status()
 
             # Create pull request
-            pr_response = requests.post(
+            pr_response = http.post(
                 "https://api.github.com/repos/StrayDogSyn/New_Team_Dashboard/pulls",
                 headers=headers,
                 json={
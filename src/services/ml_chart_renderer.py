@@ -0,0 +1,173 @@
+"""Off-UI-thread rendering of the ML comparison charts.
+
+Building and drawing a matplotlib chart on the Tk thread freezes the UI for
+the whole render. The renderer builds the chart on a worker thread, draws it
+with the Agg backend and hands back a PIL image the UI only has to display.
+Rendered images are cached by chart type, profile fingerprint, theme and
+size, so switching back to a chart is instant. A chart whose build failed is
+shown but not cached, so the next request tries again.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+from .ml_feature_store import profiles_fingerprint
+from .ml_weather_service import MLWeatherService
+
+# (chart type, profile fingerprint, theme name, (width, height) in pixels)
+ChartKey = Tuple[str, int, str, Tuple[int, int]]
+
+CHART_TYPES = ("similarity", "clusters", "radar")
+
+
+class MLChartRenderer:
+    """Renders ML charts to images on a worker thread and caches the results.
+
+    All charts are built on one worker thread. The charts share matplotlib's
+    rcParams, and one worker keeps them from interleaving. Each chart build
+    holds the service lock, so it does not interleave with analyses the UI
+    runs on the shared feature store meanwhile. Identical requests made
+    while a chart is being rendered share its future.
+    """
+
+    def __init__(self, ml_service: MLWeatherService, max_entries: int = 24, dpi: int = 100):
+        """Initialize the renderer.
+
+        Args:
+            ml_service: Service that builds the charts
+            max_entries: Rendered images kept in the cache
+            dpi: Resolution the charts are drawn at
+        """
+        self.ml_service = ml_service
+        self.max_entries = max_entries
+        self.dpi = dpi
+        self._logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="MLChartRender")
+        self._cache: "OrderedDict[ChartKey, Image.Image]" = OrderedDict()
+        self._pending: Dict[ChartKey, Future] = {}
+        self._stats = {"hits": 0, "joined": 0, "renders": 0, "failures": 0, "evictions": 0}
+
+    def chart_key(
+        self,
+        chart_type: str,
+        weather_profiles: Sequence,
+        theme_name: str,
+        size: Tuple[int, int],
+    ) -> ChartKey:
+        """Cache key of a chart of weather_profiles."""
+        return (chart_type, profiles_fingerprint(weather_profiles), theme_name, tuple(size))
+
+    def render(
+        self,
+        chart_type: str,
+        weather_profiles: Sequence,
+        size: Tuple[int, int],
+        theme: Optional[Dict[str, Any]] = None,
+        theme_name: str = "",
+    ) -> Future:
+        """Render a chart in the background.
+
+        Args:
+            chart_type: "similarity", "clusters" or "radar"
+            weather_profiles: Profiles to chart
+            size: Image width and height in pixels
+            theme: Theme colors passed to the chart
+            theme_name: Name of theme, used in the cache key
+
+        Returns:
+            Future of the rendered PIL image, already done when cached
+        """
+        if chart_type not in CHART_TYPES:
+            raise ValueError(f"Unknown chart type: {chart_type}")
+
+        # Render a snapshot, so later edits of the caller's list do not race the worker
+        profiles = list(weather_profiles)
+        key = self.chart_key(chart_type, profiles, theme_name, size)
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+                future = Future()
+                future.set_result(image)
+                return future
+
+            future = self._pending.get(key)
+            if future is not None:
+                self._stats["joined"] += 1
+                return future
+
+            future = self._executor.submit(self._render, key, profiles, theme)
+            self._pending[key] = future
+            return future
+
+    def _render(self, key: ChartKey, weather_profiles: list, theme) -> Image.Image:
+        """Build, draw and cache the chart for key; failed builds are drawn but not cached."""
+        chart_type, _, _, (width, height) = key
+        figsize = (width / self.dpi, height / self.dpi)
+        try:
+            if chart_type == "similarity":
+                fig = self.ml_service.create_similarity_heatmap(
+                    weather_profiles, figsize=figsize, theme=theme
+                )
+            elif chart_type == "clusters":
+                fig = self.ml_service.create_cluster_visualization(
+                    weather_profiles, figsize=figsize, theme=theme
+                )
+            else:
+                city_names = [profile.city_name for profile in weather_profiles]
+                fig = self.ml_service.create_radar_chart(
+                    weather_profiles, city_names, figsize=figsize, theme=theme
+                )
+
+            # Transparent background so the chart blends into the panel
+            fig.patch.set_facecolor("none")
+            fig.set_dpi(self.dpi)
+            fig.tight_layout(pad=1.0)
+            canvas = FigureCanvasAgg(fig)
+            canvas.draw()
+            image = Image.fromarray(np.asarray(canvas.buffer_rgba()))
+
+            error = getattr(fig, "chart_error", None)
+            if error is not None:
+                with self._lock:
+                    self._stats["failures"] += 1
+                self._logger.warning(f"Not caching failed {chart_type} chart: {error}")
+                return image
+
+            with self._lock:
+                self._cache[key] = image
+                self._stats["renders"] += 1
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+                    self._stats["evictions"] += 1
+            self._logger.debug(f"Rendered {chart_type} chart at {width}x{height}")
+            return image
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached image."""
+        with self._lock:
+            self._cache.clear()
+
+    def shutdown(self) -> None:
+        """Stop the worker, cancelling renders that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache and render counts."""
+        with self._lock:
+            stats = self._stats.copy()
+            stats["cached"] = len(self._cache)
+            stats["pending"] = len(self._pending)
+        return stats
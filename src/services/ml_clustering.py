@@ -0,0 +1,226 @@
+"""Warm-started weather clustering for the ML comparison panel.
+
+Fitting a fresh KMeans on every redraw is slow for thousands of cities and
+numbers the clusters differently from run to run. The streaming model keeps
+its centroids between calls, folds new observations into them with
+mini-batch updates and keeps cluster ids attached to the same centroids, so
+a cluster keeps its name across refreshes.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from sklearn.cluster import KMeans
+from sklearn.decomposition import PCA
+
+from .ml_feature_store import CLUSTER_FEATURES, WeatherFeatureStore
+
+
+class StreamingWeatherClusters:
+    """K-means over the PCA-reduced clustering features, warm-started between calls.
+
+    Centroids are kept in unscaled feature units, so they stay meaningful
+    when the scaler and the PCA projection are refitted for a new profile
+    set. On each call:
+
+    - Profiles the model has not seen (new cities or refreshed readings)
+      are folded into their nearest centroid with the mini-batch k-means
+      update, which keeps each centroid at the running mean of what it has
+      absorbed.
+    - Every profile is assigned to its nearest centroid, and lloyd_steps
+      Lloyd iterations move the centroids to their members' means.
+
+    A full KMeans fit runs on the first call, when the number of clusters
+    changes and when more than refit_share of the cities are new. When
+    the number of clusters is unchanged, its clusters are matched to the
+    previous centroids, so ids stay stable. There are never more clusters
+    than distinct feature rows, and a cluster left without members keeps
+    its centroid (or, in a full fit, is re-seeded at the farthest row), so
+    centroids never become NaN.
+    """
+
+    def __init__(
+        self,
+        max_clusters: int = 5,
+        n_components: int = 3,
+        lloyd_steps: int = 2,
+        refit_share: float = 0.5,
+        random_state: int = 42,
+    ):
+        """Initialize an unfitted model.
+
+        Args:
+            max_clusters: Clusters to find, fewer if there are fewer profiles
+            n_components: PCA components the clustering runs on
+            lloyd_steps: Lloyd iterations run from the warm centroids per call
+            refit_share: Share of new cities that triggers a full fit
+            random_state: Seed for full fits
+        """
+        self.max_clusters = max_clusters
+        self.n_components = n_components
+        self.lloyd_steps = lloyd_steps
+        self.refit_share = refit_share
+        self.random_state = random_state
+
+        self.pca: Optional[PCA] = None
+        self.kmeans: Optional[KMeans] = None
+        self._lock = threading.RLock()
+        self._centroids: Optional[np.ndarray] = None
+        self._counts: Optional[np.ndarray] = None
+        self._seen_cities: List[str] = []
+        self._seen_raw: Optional[np.ndarray] = None
+        self._stats = {"full_fits": 0, "warm_updates": 0, "minibatch_observations": 0}
+
+    @property
+    def centroids(self) -> Optional[np.ndarray]:
+        """Centroids in unscaled feature units, one row per cluster id."""
+        return None if self._centroids is None else self._centroids.copy()
+
+    def reset(self) -> None:
+        """Forget the centroids so the next call runs a full fit."""
+        with self._lock:
+            self._centroids = None
+            self._counts = None
+            self._seen_cities = []
+            self._seen_raw = None
+
+    def fit_predict(self, store: WeatherFeatureStore) -> np.ndarray:
+        """Cluster the profiles in store.
+
+        Args:
+            store: Feature store synced with the profiles to cluster
+
+        Returns:
+            Cluster id of each store row
+        """
+        with self._lock:
+            # Clustering features with missing values filled by the column mean
+            mean = store.scaler.mean_[:CLUSTER_FEATURES]
+            scale = store.scaler.scale_[:CLUSTER_FEATURES]
+            all_raw = store.raw
+            raw = all_raw[:, :CLUSTER_FEATURES]
+            features = np.where(np.isnan(raw), mean, raw)
+
+            self.pca = PCA(n_components=min(self.n_components, len(features)))
+            reduced = self.pca.fit_transform(store.scaled[:, :CLUSTER_FEATURES])
+
+            def project(points: np.ndarray) -> np.ndarray:
+                # PCA.transform without its input validation, which dominates for a few rows
+                return ((points - mean) / scale - self.pca.mean_) @ self.pca.components_.T
+
+            cities = store.city_names
+            unseen, new_cities = self._unseen(cities, all_raw)
+            n_clusters = min(self.max_clusters, len(np.unique(features, axis=0)))
+            if (
+                self._centroids is None
+                or len(self._centroids) != n_clusters
+                or new_cities > self.refit_share * len(features)
+            ):
+                labels = self._full_fit(features, reduced, n_clusters, project)
+            else:
+                labels = self._warm_update(features, reduced, unseen, project)
+            self._seen_cities = cities
+            self._seen_raw = all_raw.copy()
+            return labels
+
+    def _unseen(self, cities: List[str], raw: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Rows whose city or readings the model has not seen, and how many cities are new."""
+        if self._seen_raw is None:
+            return np.arange(len(cities)), len(cities)
+        if cities == self._seen_cities:
+            # Same cities in the same order, as on a refresh
+            previous = self._seen_raw
+            known = np.ones(len(cities), dtype=bool)
+        else:
+            positions = {}
+            for i, city in enumerate(self._seen_cities):
+                positions.setdefault(city, i)
+            rows = np.array([positions.get(city, -1) for city in cities], dtype=int)
+            known = rows >= 0
+            previous = np.full_like(raw, np.nan)
+            previous[known] = self._seen_raw[rows[known]]
+        same = ((raw == previous) | (np.isnan(raw) & np.isnan(previous))).all(axis=1)
+        return np.flatnonzero(~(known & same)), int((~known).sum())
+
+    def _full_fit(self, features, reduced, n_clusters: int, project) -> np.ndarray:
+        """Fit KMeans from scratch and keep the ids of matching previous centroids."""
+        self.kmeans = KMeans(n_clusters=n_clusters, random_state=self.random_state)
+        labels = self.kmeans.fit_predict(reduced)
+        members, sums = self._cluster_sums(labels, features, n_clusters)
+        centroids = sums / np.maximum(members, 1)[:, None]
+        empty = np.flatnonzero(members == 0)
+        if len(empty):
+            # Re-seed empty clusters at the rows farthest from an occupied centroid
+            spread = self._distances(reduced, project(centroids[members > 0])).min(axis=1)
+            centroids[empty] = features[np.argsort(-spread, kind="stable")[: len(empty)]]
+        counts = members.astype(float)
+
+        if self._centroids is not None and len(self._centroids) == n_clusters:
+            # Give each new cluster the id of the previous centroid it matches best
+            cost = self._distances(project(centroids), project(self._centroids))
+            _, ids = linear_sum_assignment(cost)
+            labels = ids[labels]
+            centroids[ids] = centroids.copy()
+            counts[ids] = counts.copy()
+
+        self._centroids = centroids
+        self._counts = counts
+        self._stats["full_fits"] += 1
+        return labels
+
+    def _warm_update(self, features, reduced, unseen, project) -> np.ndarray:
+        """Fold unseen profiles into the saved centroids and refine them."""
+        centroids = self._centroids
+        if len(unseen):
+            # Mini-batch k-means: each centroid moves to the running mean of its observations
+            nearest = self._distances(reduced[unseen], project(centroids)).argmin(axis=1)
+            batch_counts, batch_sums = self._cluster_sums(nearest, features[unseen], len(centroids))
+            counts = self._counts + batch_counts
+            moved = batch_counts > 0
+            centroids[moved] += (
+                batch_sums[moved] - batch_counts[moved, None] * centroids[moved]
+            ) / counts[moved, None]
+            self._stats["minibatch_observations"] += len(unseen)
+
+        labels = self._assign(reduced, project(centroids))
+        for _ in range(self.lloyd_steps):
+            members, sums = self._cluster_sums(labels, features, len(centroids))
+            occupied = members > 0
+            centroids[occupied] = sums[occupied] / members[occupied, None]
+            labels = self._assign(reduced, project(centroids))
+        # Weigh later observations against the current membership
+        self._counts = np.maximum(np.bincount(labels, minlength=len(centroids)), 1).astype(float)
+        self._stats["warm_updates"] += 1
+        return labels
+
+    @staticmethod
+    def _cluster_sums(
+        labels: np.ndarray, points: np.ndarray, n_clusters: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Member count and per-feature sum of the points in every cluster."""
+        counts = np.bincount(labels, minlength=n_clusters)
+        sums = np.column_stack(
+            [np.bincount(labels, weights=column, minlength=n_clusters) for column in points.T]
+        )
+        return counts, sums
+
+    @staticmethod
+    def _distances(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Squared distance from every point to every centroid."""
+        return (
+            (points**2).sum(axis=1)[:, None]
+            - 2 * points @ centroids.T
+            + (centroids**2).sum(axis=1)[None, :]
+        )
+
+    def _assign(self, reduced: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest centroid of every point."""
+        return self._distances(reduced, centroids).argmin(axis=1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fit and update counts."""
+        stats = self._stats.copy()
+        stats["clusters"] = 0 if self._centroids is None else len(self._centroids)
+        return stats
@@ -0,0 +1,311 @@
+"""Shared feature matrix for the ML weather analyses.
+
+Holds the weather profiles as one contiguous NumPy matrix with a fitted
+StandardScaler, keyed by a fingerprint of the profile set, so similarity,
+clustering and recommendations stop rebuilding a DataFrame and refitting the
+scaler on every call. Adding or removing one city updates the matrix and the
+scaler statistics in place.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+FEATURE_COLUMNS = [
+    "temperature",
+    "humidity",
+    "wind_speed",
+    "pressure",
+    "uv_index",
+    "visibility",
+]
+
+# Features used for clustering, a prefix of FEATURE_COLUMNS
+CLUSTER_FEATURES = 5
+
+ProfileKey = Tuple[Any, ...]
+
+# Called with "append", "remove" or "rebuild" and the row that changed
+StoreObserver = Callable[[str, Optional[int]], None]
+
+
+def profile_key(profile) -> ProfileKey:
+    """Identify a profile by its city and the values the analyses read."""
+    return (
+        profile.city_name,
+        profile.is_team_member,
+        *(getattr(profile, column) for column in FEATURE_COLUMNS),
+    )
+
+
+def profiles_fingerprint(weather_profiles: Sequence) -> int:
+    """Fingerprint of a profile list, equal to the store's once it is synced with them."""
+    return hash(tuple(profile_key(p) for p in weather_profiles))
+
+
+def unit_vectors(raw: np.ndarray, mean: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """Standardize raw feature rows with mean and scale and normalize them to unit length.
+
+    Missing values scale to 0. Zero vectors stay zero, so they are 0 similar
+    to everything, as with cosine_similarity.
+    """
+    scaled = np.nan_to_num((np.asarray(raw, dtype=float) - mean) / scale, nan=0.0)
+    norms = np.linalg.norm(scaled, axis=-1, keepdims=True)
+    return scaled / np.where(norms == 0, 1.0, norms)
+
+
+def scaler_drift(scaler: StandardScaler, ref_mean: np.ndarray, ref_scale: np.ndarray) -> float:
+    """Largest change in a column mean or scale of scaler, relative to ref_scale."""
+    mean_drift = np.abs(scaler.mean_ - ref_mean) / ref_scale
+    scale_drift = np.abs(scaler.scale_ / ref_scale - 1.0)
+    return float(max(mean_drift.max(), scale_drift.max()))
+
+
+class WeatherFeatureStore:
+    """Feature matrix and scaler shared by the MLWeatherService analyses.
+
+    sync() brings the store in line with a list of profiles. The same list is
+    a cache hit, one appended or removed profile is applied incrementally and
+    anything else rebuilds the matrix. Results derived from the matrix are
+    memoized until the profile set changes. Observers are told about each
+    change after the scaler is refitted, so they can follow it incrementally.
+
+    Missing values are filled with the column mean, as prepare_weather_data
+    does, so the scaler statistics match a StandardScaler fitted on the
+    filled matrix.
+    """
+
+    def __init__(self, initial_capacity: int = 64):
+        """Initialize an empty store.
+
+        Args:
+            initial_capacity: Rows allocated before the matrix first grows
+        """
+        self.scaler = StandardScaler()
+        self._logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._observers: List[StoreObserver] = []
+        self._raw = np.empty((initial_capacity, len(FEATURE_COLUMNS)))
+        self._size = 0
+        self._keys: List[ProfileKey] = []
+        self._names: List[str] = []
+        self._team: List[bool] = []
+        self._index: Dict[str, int] = {}
+
+        # Per-column count, mean and sum of squared deviations of known values
+        self._count = np.zeros(len(FEATURE_COLUMNS))
+        self._mean = np.zeros(len(FEATURE_COLUMNS))
+        self._m2 = np.zeros(len(FEATURE_COLUMNS))
+
+        self._fingerprint: Optional[int] = None
+        self._scaled: Optional[np.ndarray] = None
+        self._memo: Dict[str, Any] = {}
+        self._stats = {"hits": 0, "appends": 0, "removals": 0, "rebuilds": 0}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def fingerprint(self) -> int:
+        """Fingerprint of the profile set the store currently holds."""
+        if self._fingerprint is None:
+            self._fingerprint = hash(tuple(self._keys))
+        return self._fingerprint
+
+    @property
+    def city_names(self) -> List[str]:
+        """City names in profile order."""
+        return list(self._names)
+
+    @property
+    def team_mask(self) -> np.ndarray:
+        """Boolean mask of the rows that belong to team members."""
+        return np.array(self._team, dtype=bool)
+
+    @property
+    def raw(self) -> np.ndarray:
+        """Unscaled feature matrix, one row per profile, missing values as NaN."""
+        return self._raw[: self._size]
+
+    def sync(self, weather_profiles: Sequence) -> "WeatherFeatureStore":
+        """Bring the store in line with weather_profiles.
+
+        Args:
+            weather_profiles: WeatherProfile objects in analysis order
+
+        Returns:
+            The store, for chaining
+        """
+        keys = [profile_key(profile) for profile in weather_profiles]
+        with self._lock:
+            if keys == self._keys:
+                self._stats["hits"] += 1
+                return self
+
+            size = self._size
+            change, position = "rebuild", None
+            if len(keys) == size + 1 and keys[:size] == self._keys:
+                self._append(keys[-1], weather_profiles[-1])
+                self._stats["appends"] += 1
+                change, position = "append", size
+            elif len(keys) == size - 1 and size > 1:
+                removed = next(
+                    (i for i, key in enumerate(keys) if key != self._keys[i]), size - 1
+                )
+                if keys[removed:] == self._keys[removed + 1 :]:
+                    self._remove(removed)
+                    self._stats["removals"] += 1
+                    change, position = "remove", removed
+            if change == "rebuild":
+                self._rebuild(keys, weather_profiles)
+
+            self._changed()
+            self._notify_observers(change, position)
+            return self
+
+    def add_observer(self, callback: StoreObserver) -> None:
+        """Add a callback to be notified when the profile set changes."""
+        self._observers.append(callback)
+
+    def remove_observer(self, callback: StoreObserver) -> None:
+        """Remove a profile set observer."""
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def _notify_observers(self, change: str, position: Optional[int]) -> None:
+        """Notify all observers of a change to the profile set."""
+        for callback in self._observers:
+            try:
+                callback(change, position)
+            except Exception as e:
+                self._logger.error(f"Error notifying feature store observer: {e}")
+
+    def _row(self, profile) -> np.ndarray:
+        """Feature row for a profile, with None as NaN."""
+        return np.array(
+            [getattr(profile, column) for column in FEATURE_COLUMNS], dtype=float
+        )
+
+    def _accumulate(self, row: np.ndarray, sign: int) -> None:
+        """Add (sign 1) or remove (sign -1) a row from the running column statistics."""
+        known = ~np.isnan(row)
+        self._count += sign * known
+        delta = np.where(known, row - self._mean, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(self._count > 0, delta / self._count, 0.0)
+        self._mean = np.where(self._count > 0, self._mean + sign * step, 0.0)
+        self._m2 += sign * np.where(known, delta * (row - self._mean), 0.0)
+        self._m2 = np.where(self._count > 0, np.maximum(self._m2, 0.0), 0.0)
+
+    def _append(self, key: ProfileKey, profile) -> None:
+        """Append one profile, growing the matrix when it is full."""
+        if self._size == len(self._raw):
+            grown = np.empty((max(1, 2 * len(self._raw)), len(FEATURE_COLUMNS)))
+            grown[: self._size] = self._raw[: self._size]
+            self._raw = grown
+        row = self._row(profile)
+        self._raw[self._size] = row
+        self._size += 1
+        self._keys.append(key)
+        self._names.append(profile.city_name)
+        self._team.append(bool(profile.is_team_member))
+        self._index.setdefault(profile.city_name, self._size - 1)
+        self._accumulate(row, 1)
+
+    def _remove(self, position: int) -> None:
+        """Remove the profile at position, shifting later rows up."""
+        row = self._raw[position].copy()
+        self._raw[position : self._size - 1] = self._raw[position + 1 : self._size]
+        self._size -= 1
+        del self._keys[position]
+        del self._names[position]
+        del self._team[position]
+        self._index = {}
+        for i, name in enumerate(self._names):
+            self._index.setdefault(name, i)
+        self._accumulate(row, -1)
+
+    def _rebuild(self, keys: List[ProfileKey], weather_profiles: Sequence) -> None:
+        """Replace the matrix and statistics with weather_profiles."""
+        size = len(keys)
+        # The keys already hold the feature values, so read the matrix from them
+        raw = np.array([key[2:] for key in keys], dtype=float).reshape(
+            size, len(FEATURE_COLUMNS)
+        )
+        self._raw = np.empty((max(size, len(self._raw)), len(FEATURE_COLUMNS)))
+        self._raw[:size] = raw
+        self._size = size
+        self._keys = list(keys)
+        self._names = [p.city_name for p in weather_profiles]
+        self._team = [bool(p.is_team_member) for p in weather_profiles]
+        self._index = {}
+        for i, name in enumerate(self._names):
+            self._index.setdefault(name, i)
+
+        known = ~np.isnan(raw)
+        self._count = known.sum(axis=0).astype(float)
+        totals = np.where(known, raw, 0.0).sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._mean = np.where(self._count > 0, totals / self._count, 0.0)
+        self._m2 = np.square(np.where(known, raw - self._mean, 0.0)).sum(axis=0)
+        self._stats["rebuilds"] += 1
+
+    def _changed(self) -> None:
+        """Refit the scaler from the running statistics and drop derived results."""
+        self._fingerprint = None
+        self._scaled = None
+        self._memo.clear()
+        if not self._size:
+            self.scaler = StandardScaler()
+            return
+        # Filled values sit at the mean, so they add rows but no deviation
+        var = self._m2 / self._size
+        scale = np.sqrt(var)
+        scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+        self.scaler.mean_ = self._mean.copy()
+        self.scaler.var_ = var
+        self.scaler.scale_ = scale
+        self.scaler.n_samples_seen_ = self._size
+        self.scaler.n_features_in_ = len(FEATURE_COLUMNS)
+
+    @property
+    def scaled(self) -> np.ndarray:
+        """Standardized feature matrix, read-only, computed once per profile set."""
+        with self._lock:
+            if self._scaled is None:
+                scaled = (self.raw - self.scaler.mean_) / self.scaler.scale_
+                scaled = np.ascontiguousarray(np.nan_to_num(scaled, nan=0.0))
+                scaled.flags.writeable = False
+                self._scaled = scaled
+            return self._scaled
+
+    def filled(self, position: int) -> np.ndarray:
+        """Unscaled features of one row with missing values filled by the column mean."""
+        row = self._raw[position]
+        return np.where(np.isnan(row), self._mean, row)
+
+    def label(self, position: int) -> Tuple[str, bool]:
+        """City name and team membership of one row."""
+        return self._names[position], self._team[position]
+
+    def index_of(self, city_name: str) -> Optional[int]:
+        """Row of the first profile for city_name, or None."""
+        return self._index.get(city_name)
+
+    def memo(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Return a result derived from the current profile set, computing it once."""
+        with self._lock:
+            if name not in self._memo:
+                self._memo[name] = compute()
+            return self._memo[name]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sync statistics and the current matrix size."""
+        stats = self._stats.copy()
+        stats["rows"] = self._size
+        stats["capacity"] = len(self._raw)
+        stats["memoized"] = sorted(self._memo)
+        return stats
@@ -0,0 +1,214 @@
+"""Incremental cosine similarity over the shared ML feature store.
+
+Adding or removing a city changes one row and column of the similarity
+matrix, so the engine updates those in O(N) instead of recomputing all N×N
+pairs. Top-k and most-similar-pair queries work from the normalized feature
+vectors and never need the whole matrix.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .ml_feature_store import WeatherFeatureStore, scaler_drift, unit_vectors
+
+
+class SimilarityEngine:
+    """Cosine similarity between the scaled profiles of a WeatherFeatureStore.
+
+    Vectors are scaled with the scaler statistics of the last full
+    computation. A city added later is scaled with the same statistics and
+    compared against every other city, and a removed city just frees its
+    slot. Once the current scaler has drifted from those statistics by more
+    than drift_threshold (relative to the reference scale), the next query
+    recomputes everything with the current scaler.
+
+    Rows and columns are kept in slots that do not move when a city is
+    removed; _order maps store rows to slots.
+    """
+
+    def __init__(
+        self, store: WeatherFeatureStore, drift_threshold: float = 0.01, block_size: int = 1024
+    ):
+        """Initialize the engine and follow changes to store.
+
+        Args:
+            store: Feature store holding the profiles to compare
+            drift_threshold: Relative change in a column's mean or scale that
+                triggers a full recomputation
+            block_size: Rows compared at a time when scanning all pairs
+        """
+        self.store = store
+        self.drift_threshold = drift_threshold
+        self.block_size = block_size
+
+        self._lock = threading.RLock()
+        self._vectors = np.empty((0, 0))
+        self._matrix: Optional[np.ndarray] = None
+        self._order: List[int] = []
+        self._free: List[int] = []
+        self._ref_mean: Optional[np.ndarray] = None
+        self._ref_scale: Optional[np.ndarray] = None
+        self._stale = True
+        self._stats = {
+            "full_recomputes": 0,
+            "drift_recomputes": 0,
+            "incremental_adds": 0,
+            "incremental_removes": 0,
+        }
+
+        store.add_observer(self._on_store_changed)
+
+    def _on_store_changed(self, change: str, position: Optional[int]) -> None:
+        """Follow one change to the feature store."""
+        with self._lock:
+            if self._stale or self._ref_scale is None:
+                self._stale = True
+                return
+            if change == "append":
+                self._add(position)
+                self._stats["incremental_adds"] += 1
+            elif change == "remove":
+                self._free.append(self._order.pop(position))
+                self._stats["incremental_removes"] += 1
+            else:
+                self._stale = True
+                return
+
+            if self.drift() > self.drift_threshold:
+                self._stale = True
+                self._stats["drift_recomputes"] += 1
+
+    def drift(self) -> float:
+        """Largest relative change in a column mean or scale since the last full computation."""
+        if self._ref_scale is None or not len(self.store):
+            return 0.0
+        return scaler_drift(self.store.scaler, self._ref_mean, self._ref_scale)
+
+    def _recompute(self) -> None:
+        """Rebuild every vector with the current scaler statistics."""
+        size = len(self.store)
+        self._order = list(range(size))
+        self._free = []
+        self._matrix = None
+        if size:
+            self._ref_mean = self.store.scaler.mean_.copy()
+            self._ref_scale = self.store.scaler.scale_.copy()
+            self._vectors = unit_vectors(self.store.raw, self._ref_mean, self._ref_scale)
+        else:
+            self._ref_mean = self._ref_scale = None
+            self._vectors = np.empty((0, 0))
+        self._stale = False
+        self._stats["full_recomputes"] += 1
+
+    def _add(self, position: int) -> None:
+        """Place the store row at position in a slot and compare it with every city."""
+        vector = unit_vectors(self.store.raw[position], self._ref_mean, self._ref_scale)
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._vectors)
+            capacity = max(16, 2 * slot)
+            grown = np.zeros((capacity, self._vectors.shape[1]))
+            grown[:slot] = self._vectors
+            self._vectors = grown
+            self._free = list(range(capacity - 1, slot, -1))
+            if self._matrix is not None:
+                matrix = np.zeros((capacity, capacity))
+                matrix[:slot, :slot] = self._matrix
+                self._matrix = matrix
+        self._vectors[slot] = vector
+        self._order.insert(position, slot)
+
+        if self._matrix is not None:
+            row = self._vectors[self._order] @ vector
+            self._matrix[slot, self._order] = row
+            self._matrix[self._order, slot] = row
+
+    def _ensure_current(self) -> None:
+        """Recompute if the store changed in a way that could not be followed."""
+        if self._stale:
+            self._recompute()
+
+    def similarity(self, i: int, j: int) -> float:
+        """Cosine similarity between store rows i and j."""
+        with self._lock:
+            self._ensure_current()
+            slot_i, slot_j = self._order[i], self._order[j]
+            if self._matrix is not None:
+                return float(self._matrix[slot_i, slot_j])
+            return float(self._vectors[slot_i] @ self._vectors[slot_j])
+
+    def matrix(self) -> np.ndarray:
+        """Full similarity matrix in store row order.
+
+        The first call computes every pair; afterwards additions and removals
+        keep it current at O(N) each.
+        """
+        with self._lock:
+            self._ensure_current()
+            order = np.array(self._order, dtype=int)
+            if self._matrix is None:
+                capacity = len(self._vectors)
+                self._matrix = np.zeros((capacity, capacity))
+                vectors = self._vectors[order]
+                self._matrix[np.ix_(order, order)] = vectors @ vectors.T
+            if np.array_equal(order, np.arange(len(order))):
+                return self._matrix[: len(order), : len(order)].copy()
+            return self._matrix[np.ix_(order, order)]
+
+    def top_k(self, position: int, k: int = 5) -> List[Tuple[int, float]]:
+        """Store rows most similar to the row at position, best first.
+
+        Args:
+            position: Store row to compare against every other row
+            k: Number of rows to return
+
+        Returns:
+            List of (row, similarity) tuples, excluding position itself
+        """
+        with self._lock:
+            self._ensure_current()
+            order = self._order
+            scores = self._vectors[order] @ self._vectors[order[position]]
+            scores[position] = -np.inf
+            k = min(k, len(order) - 1)
+            if k <= 0:
+                return []
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.lexsort((best, -scores[best]))]
+            return [(int(i), float(scores[i])) for i in best]
+
+    def most_similar_pair(self) -> Optional[Tuple[int, int, float]]:
+        """Most similar pair of distinct rows, compared block by block.
+
+        Ties go to the first pair in row order, as a scan of the upper
+        triangle of the matrix would find.
+
+        Returns:
+            (row, other row, similarity), or None with fewer than two rows
+        """
+        with self._lock:
+            self._ensure_current()
+            size = len(self._order)
+            if size < 2:
+                return None
+            vectors = self._vectors[self._order]
+            best = None
+            for start in range(0, size - 1, self.block_size):
+                block = vectors[start : start + self.block_size] @ vectors.T
+                rows = np.arange(start, start + len(block))[:, None]
+                block[np.arange(size)[None, :] <= rows] = -np.inf
+                flat = int(np.argmax(block))
+                i, j = divmod(flat, size)
+                if best is None or block[i, j] > best[2]:
+                    best = (start + i, j, float(block[i, j]))
+            return best
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get recompute and incremental update counts."""
+        stats = self._stats.copy()
+        stats["rows"] = len(self._order)
+        stats["materialized"] = self._matrix is not None
+        return stats
@@ -0,0 +1,364 @@
+"""Nearest-neighbor index over scaled weather feature vectors.
+
+Recommendations used to refit NearestNeighbors on every request. The index
+keeps the scaled vectors of a city catalogue in a KD tree that is built
+once, takes inserts into a small brute-force buffer and is saved to and
+loaded from disk. Vectors are normalized to unit length, where Euclidean
+order equals cosine order, so tree results match the brute-force cosine
+search.
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+from .ml_feature_store import WeatherFeatureStore, scaler_drift, unit_vectors
+
+# (row id, cosine distance)
+Neighbor = Tuple[int, float]
+
+
+class WeatherVectorIndex:
+    """KD tree over unit-length scaled weather vectors with an insert buffer.
+
+    Rows get stable ids in insertion order. Rows from the last build live in
+    the tree, and rows inserted since then are searched brute force until
+    the buffer outgrows rebuild_ratio of the tree. Removed rows are skipped
+    at query time and dropped from the tree at the next rebuild, but keep
+    their ids.
+    """
+
+    def __init__(
+        self,
+        mean: Sequence[float],
+        scale: Sequence[float],
+        leaf_size: int = 40,
+        rebuild_ratio: float = 0.1,
+        min_buffer: int = 256,
+        scan_ratio: float = 0.1,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            mean: Column means used to standardize every vector
+            scale: Column scales used to standardize every vector
+            leaf_size: KD tree leaf size
+            rebuild_ratio: Buffered or removed rows, as a share of the tree,
+                that trigger a rebuild
+            min_buffer: Buffered rows always allowed before a rebuild
+            scan_ratio: Share of the tree below which a filtered query scans
+                the matching rows instead of searching the tree
+        """
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+        self.min_buffer = min_buffer
+        self.scan_ratio = scan_ratio
+
+        self._lock = threading.RLock()
+        self._vectors = np.empty((64, len(self.mean)))
+        self._team = np.zeros(64, dtype=bool)
+        self._alive = np.zeros(64, dtype=bool)
+        self._names: List[str] = []
+        self._size = 0
+        self._tree: Optional[KDTree] = None
+        self._tree_ids = np.empty(0, dtype=int)
+        self._tree_end = 0
+        self._tree_dead = 0
+        self._stats = {"builds": 0, "inserts": 0, "removals": 0, "queries": 0}
+
+    @classmethod
+    def build(
+        cls,
+        raw: np.ndarray,
+        names: Sequence[str],
+        team_mask: Sequence[bool],
+        mean: Sequence[float],
+        scale: Sequence[float],
+        **kwargs,
+    ) -> "WeatherVectorIndex":
+        """Build an index over raw feature rows in one pass.
+
+        Args:
+            raw: Unscaled feature rows, missing values as NaN
+            names: City name of each row
+            team_mask: Whether each row belongs to a team member
+            mean: Column means used to standardize every vector
+            scale: Column scales used to standardize every vector
+            **kwargs: Passed to WeatherVectorIndex()
+
+        Returns:
+            Index whose row ids are the positions in raw
+        """
+        index = cls(mean, scale, **kwargs)
+        index._load_rows(
+            unit_vectors(raw, index.mean, index.scale),
+            list(names),
+            np.asarray(team_mask, dtype=bool),
+            np.ones(len(names), dtype=bool),
+        )
+        return index
+
+    def __len__(self) -> int:
+        return int(self._alive[: self._size].sum())
+
+    def name_of(self, row_id: int) -> str:
+        """City name of a row."""
+        return self._names[row_id]
+
+    def _load_rows(
+        self, vectors: np.ndarray, names: List[str], team: np.ndarray, alive: np.ndarray
+    ) -> None:
+        """Replace every row and build the tree over them."""
+        size = len(names)
+        capacity = max(64, size)
+        self._vectors = np.empty((capacity, len(self.mean)))
+        self._vectors[:size] = vectors
+        self._team = np.zeros(capacity, dtype=bool)
+        self._team[:size] = team
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[:size] = alive
+        self._names = names
+        self._size = size
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Build the tree over every live row, emptying the insert buffer."""
+        self._tree_ids = np.flatnonzero(self._alive[: self._size])
+        self._tree = (
+            KDTree(self._vectors[self._tree_ids], leaf_size=self.leaf_size)
+            if len(self._tree_ids)
+            else None
+        )
+        self._tree_end = self._size
+        self._tree_dead = 0
+        self._stats["builds"] += 1
+
+    def _needs_rebuild(self) -> bool:
+        """Check whether the buffer or the removed rows outgrew the tree."""
+        limit = max(self.min_buffer, self.rebuild_ratio * len(self._tree_ids))
+        return self._size - self._tree_end > limit or self._tree_dead > limit
+
+    def add(self, raw_row: Sequence[float], name: str, is_team_member: bool = False) -> int:
+        """Insert one city.
+
+        Args:
+            raw_row: Unscaled feature row, missing values as NaN
+            name: City name
+            is_team_member: Whether the city belongs to a team member
+
+        Returns:
+            Id of the new row
+        """
+        with self._lock:
+            if self._size == len(self._vectors):
+                capacity = 2 * len(self._vectors)
+                self._vectors = np.resize(self._vectors, (capacity, len(self.mean)))
+                self._team = np.resize(self._team, capacity)
+                self._alive = np.resize(self._alive, capacity)
+            row_id = self._size
+            self._vectors[row_id] = unit_vectors(raw_row, self.mean, self.scale)
+            self._team[row_id] = is_team_member
+            self._alive[row_id] = True
+            self._names.append(name)
+            self._size += 1
+            self._stats["inserts"] += 1
+            if self._needs_rebuild():
+                self._rebuild()
+            return row_id
+
+    def remove(self, row_id: int) -> None:
+        """Remove a row so queries no longer return it."""
+        with self._lock:
+            if not self._alive[row_id]:
+                return
+            self._alive[row_id] = False
+            self._stats["removals"] += 1
+            if row_id < self._tree_end:
+                self._tree_dead += 1
+                if self._needs_rebuild():
+                    self._rebuild()
+
+    def query(
+        self, raw_vector: Sequence[float], k: int = 1, team_only: bool = False
+    ) -> List[Neighbor]:
+        """Find the k rows closest in cosine distance to an unscaled feature vector.
+
+        Args:
+            raw_vector: Unscaled features to match, in FEATURE_COLUMNS order
+            k: Number of rows to return
+            team_only: Only return rows that belong to team members
+
+        Returns:
+            List of (row id, cosine distance) tuples, closest first
+        """
+        with self._lock:
+            self._stats["queries"] += 1
+            target = unit_vectors(raw_vector, self.mean, self.scale)
+            allowed = self._alive[: self._size]
+            if team_only:
+                allowed = allowed & self._team[: self._size]
+            if not np.any(target):
+                # Every row is equally far from a zero vector
+                return [(int(i), 1.0) for i in np.flatnonzero(allowed)[:k]]
+
+            candidates = self._buffer_candidates(target, allowed)
+            candidates.extend(self._tree_candidates(target, allowed, k))
+            candidates.sort(key=lambda neighbor: (neighbor[1], neighbor[0]))
+            return candidates[:k]
+
+    def _buffer_candidates(self, target: np.ndarray, allowed: np.ndarray) -> List[Neighbor]:
+        """Brute-force distances to the rows inserted since the last build."""
+        return self._scan(target, self._tree_end + np.flatnonzero(allowed[self._tree_end :]))
+
+    def _scan(self, target: np.ndarray, ids: np.ndarray, k: Optional[int] = None):
+        """Brute-force distances to the rows in ids, keeping the k closest if k is given."""
+        distances = 1.0 - self._vectors[ids] @ target
+        if k is not None and k < len(ids):
+            best = np.argpartition(distances, k)[:k]
+            ids, distances = ids[best], distances[best]
+        return list(zip(ids.tolist(), distances.tolist()))
+
+    def _tree_candidates(self, target: np.ndarray, allowed: np.ndarray, k: int) -> List[Neighbor]:
+        """Closest allowed tree rows, asking the tree for more until k are found."""
+        if self._tree is None:
+            return []
+        tree_size = len(self._tree_ids)
+        matching = allowed[self._tree_ids]
+        matching_count = int(matching.sum())
+        if matching_count <= self.scan_ratio * tree_size:
+            # A narrow filter is cheaper to scan than to dig out of the tree
+            return self._scan(target, self._tree_ids[matching], k)
+        wanted = min(k, matching_count)
+        fetch = min(tree_size, k + self._tree_dead)
+        while True:
+            distances, positions = self._tree.query(target.reshape(1, -1), k=fetch)
+            ids = self._tree_ids[positions[0]]
+            keep = allowed[ids]
+            if keep.sum() >= wanted or fetch == tree_size:
+                break
+            fetch = min(tree_size, fetch * 4)
+        # Unit vectors: squared Euclidean distance is twice the cosine distance
+        cosine = distances[0][keep] ** 2 / 2
+        return list(zip(ids[keep].tolist(), cosine.tolist()))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the index in .npz format to path, exactly as given."""
+        with self._lock, open(path, "wb") as file:
+            size = self._size
+            # A file object keeps np.savez from appending .npz to the path
+            np.savez(
+                file,
+                mean=self.mean,
+                scale=self.scale,
+                vectors=self._vectors[:size],
+                names=np.array(self._names, dtype=str),
+                team=self._team[:size],
+                alive=self._alive[:size],
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs) -> "WeatherVectorIndex":
+        """Load an index saved with save(), rebuilding its tree.
+
+        Args:
+            path: File written by save()
+            **kwargs: Passed to WeatherVectorIndex()
+        """
+        with np.load(path, allow_pickle=False) as data:
+            index = cls(data["mean"], data["scale"], **kwargs)
+            index._load_rows(data["vectors"], data["names"].tolist(), data["team"], data["alive"])
+        return index
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get build, insert and query counts and the size of the tree and buffer."""
+        stats = self._stats.copy()
+        stats["rows"] = len(self)
+        stats["tree_rows"] = len(self._tree_ids) - self._tree_dead
+        stats["buffered_rows"] = self._size - self._tree_end
+        return stats
+
+
+class FeatureStoreIndex:
+    """WeatherVectorIndex that follows the profiles of a WeatherFeatureStore.
+
+    Appended cities are inserted and removed cities are dropped. The index
+    is rebuilt with the current scaler once its statistics drift past
+    drift_threshold, or when the store is rebuilt.
+    """
+
+    def __init__(self, store: WeatherFeatureStore, drift_threshold: float = 0.01):
+        """Initialize the index and follow changes to store.
+
+        Args:
+            store: Feature store holding the profiles to index
+            drift_threshold: Relative change in a column's mean or scale that
+                triggers a rebuild
+        """
+        self.store = store
+        self.drift_threshold = drift_threshold
+        self._lock = threading.RLock()
+        self._index: Optional[WeatherVectorIndex] = None
+        self._ids: List[int] = []
+        self._positions: Optional[Dict[int, int]] = None
+        store.add_observer(self._on_store_changed)
+
+    def _on_store_changed(self, change: str, position: Optional[int]) -> None:
+        """Follow one change to the feature store."""
+        with self._lock:
+            index = self._index
+            if index is None:
+                return
+            if change == "append":
+                name, is_team_member = self.store.label(position)
+                row_id = index.add(self.store.raw[position], name, is_team_member)
+                self._ids.append(row_id)
+                if self._positions is not None:
+                    self._positions[row_id] = position
+            elif change == "remove":
+                index.remove(self._ids.pop(position))
+                self._positions = None
+            if change == "rebuild" or scaler_drift(
+                self.store.scaler, index.mean, index.scale
+            ) > self.drift_threshold:
+                self._index = None
+
+    @property
+    def index(self) -> Optional[WeatherVectorIndex]:
+        """Index over the current profiles, built on first use; None if there are none."""
+        with self._lock:
+            if self._index is None and len(self.store):
+                scaler = self.store.scaler
+                self._index = WeatherVectorIndex.build(
+                    self.store.raw,
+                    self.store.city_names,
+                    self.store.team_mask,
+                    scaler.mean_,
+                    scaler.scale_,
+                )
+                self._ids = list(range(len(self.store)))
+                self._positions = None
+            return self._index
+
+    def query(
+        self, raw_vector: Sequence[float], k: int = 1, team_only: bool = False
+    ) -> List[Tuple[int, float]]:
+        """Find the k profiles closest to raw_vector.
+
+        Returns:
+            List of (store row, cosine distance) tuples, closest first
+        """
+        with self._lock:
+            index = self.index
+            if index is None:
+                return []
+            if self._positions is None:
+                self._positions = {row_id: i for i, row_id in enumerate(self._ids)}
+            return [
+                (self._positions[row_id], distance)
+                for row_id, distance in index.query(raw_vector, k, team_only)
+            ]
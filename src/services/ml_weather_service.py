@@ -1,25 +1,45 @@
 """Machine Learning Weather Service for advanced analytics and recommendations."""
 
+import functools
 import logging
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Visualization
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
+from matplotlib.figure import Figure
 
 # ML Libraries
-from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.neighbors import NearestNeighbors
-from sklearn.preprocessing import StandardScaler
+
+from .ml_clustering import StreamingWeatherClusters
+from .ml_feature_store import CLUSTER_FEATURES, FEATURE_COLUMNS, WeatherFeatureStore
+from .ml_similarity import SimilarityEngine
+from .ml_vector_index import FeatureStoreIndex
 
 logger = logging.getLogger(__name__)
 
 
+def _locked(method):
+    """Run a service method holding the service lock.
+
+    Analyses sync the shared feature store and then read it and the cluster
+    model, so two threads analysing different profile sets must not
+    interleave.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 @dataclass
 class WeatherProfile:
     """Weather profile for ML analysis."""
@@ -73,11 +93,21 @@ class RecommendationResult:
 class MLWeatherService:
     """Advanced ML-powered weather analysis service."""
 
-    def __init__(self):
-        self.scaler = StandardScaler()
-        self.pca = PCA(n_components=3)
-        self.kmeans = KMeans(n_clusters=5, random_state=42)
-        self.nn_model = NearestNeighbors(n_neighbors=5, metric="cosine")
+    def __init__(self, streaming_clusters: bool = True):
+        """Initialize the service.
+
+        Args:
+            streaming_clusters: Warm-start clustering from the previous
+                centroids; if False every profile set is clustered from scratch
+        """
+        # Feature matrix and scaler shared by every analysis of a profile set
+        self._lock = threading.RLock()
+        self.feature_store = WeatherFeatureStore()
+        self.scaler = self.feature_store.scaler
+        self.similarity_engine = SimilarityEngine(self.feature_store)
+        self.neighbor_index = FeatureStoreIndex(self.feature_store)
+        self.streaming_clusters = streaming_clusters
+        self.cluster_model = StreamingWeatherClusters(max_clusters=5, random_state=42)
 
         # Weather feature weights for different analysis types
         self.similarity_weights = {
@@ -153,67 +183,58 @@ class MLWeatherService:
             logger.error(f"Error preparing weather data: {e}")
             return pd.DataFrame()
 
+    @_locked
     def calculate_similarity_matrix(self, weather_profiles: List[WeatherProfile]) -> np.ndarray:
         """Calculate similarity matrix between cities using cosine similarity."""
         try:
-            df = self.prepare_weather_data(weather_profiles)
-            if df.empty:
+            store = self._sync_features(weather_profiles)
+            if not len(store):
                 return np.array([])
 
-            # Select features for similarity calculation
-            feature_columns = [
-                "temperature",
-                "humidity",
-                "wind_speed",
-                "pressure",
-                "uv_index",
-                "visibility",
-            ]
-            features = df[feature_columns].values
-
-            # Normalize features
-            features_scaled = self.scaler.fit_transform(features)
-
-            # Calculate cosine similarity
-            similarity_matrix = cosine_similarity(features_scaled)
-
-            logger.info(f"Calculated similarity matrix for {len(df)} cities")
-            return similarity_matrix
+            return store.memo("similarity_matrix", lambda: self._similarity_matrix(store))
 
         except Exception as e:
             logger.error(f"Error calculating similarity matrix: {e}")
             return np.array([])
 
+    def _sync_features(self, weather_profiles: List[WeatherProfile]) -> WeatherFeatureStore:
+        """Bring the shared feature store in line with weather_profiles."""
+        store = self.feature_store.sync(weather_profiles)
+        self.scaler = store.scaler
+        return store
+
+    def _similarity_matrix(self, store: WeatherFeatureStore) -> np.ndarray:
+        """Cosine similarity of every pair of scaled profiles."""
+        similarity_matrix = self.similarity_engine.matrix()
+        similarity_matrix.flags.writeable = False
+        logger.info(f"Calculated similarity matrix for {len(store)} cities")
+        return similarity_matrix
+
+    @_locked
     def get_city_similarity(
         self, city1: str, city2: str, weather_profiles: List[WeatherProfile]
     ) -> SimilarityResult:
         """Get detailed similarity analysis between two cities."""
         try:
-            df = self.prepare_weather_data(weather_profiles)
-            similarity_matrix = self.calculate_similarity_matrix(weather_profiles)
+            store = self._sync_features(weather_profiles)
 
-            if df.empty or similarity_matrix.size == 0:
+            if not len(store):
                 return SimilarityResult(city1, city2, 0.0, [], "Unable to calculate similarity")
 
             # Find city indices
-            city1_idx = df[df["city_name"] == city1].index
-            city2_idx = df[df["city_name"] == city2].index
+            city1_idx = store.index_of(city1)
+            city2_idx = store.index_of(city2)
 
-            if len(city1_idx) == 0 or len(city2_idx) == 0:
+            if city1_idx is None or city2_idx is None:
                 return SimilarityResult(city1, city2, 0.0, [], "Cities not found in data")
 
-            city1_idx, city2_idx = city1_idx[0], city2_idx[0]
-            similarity_score = similarity_matrix[city1_idx][city2_idx]
+            similarity_score = self.similarity_engine.similarity(city1_idx, city2_idx)
 
             # Analyze dominant factors
-            city1_data = df.iloc[city1_idx]
-            city2_data = df.iloc[city2_idx]
-
+            diffs = np.abs(store.filled(city1_idx) - store.filled(city2_idx))
             feature_diffs = {
-                "temperature": abs(city1_data["temperature"] - city2_data["temperature"]),
-                "humidity": abs(city1_data["humidity"] - city2_data["humidity"]),
-                "wind_speed": abs(city1_data["wind_speed"] - city2_data["wind_speed"]),
-                "pressure": abs(city1_data["pressure"] - city2_data["pressure"]),
+                column: diffs[FEATURE_COLUMNS.index(column)]
+                for column in ("temperature", "humidity", "wind_speed", "pressure")
             }
 
             # Find most similar factors (smallest differences)
@@ -243,124 +264,138 @@ class MLWeatherService:
             logger.error(f"Error calculating city similarity: {e}")
             return SimilarityResult(city1, city2, 0.0, [], f"Error: {str(e)}")
 
-    def perform_weather_clustering(
-        self, weather_profiles: List[WeatherProfile]
-    ) -> List[ClusterResult]:
-        """Perform K-means clustering on weather data."""
+    @_locked
+    def get_similar_cities(
+        self, city: str, weather_profiles: List[WeatherProfile], top_k: int = 5
+    ) -> List[Tuple[str, float]]:
+        """Get the cities most similar to city, best first, without the full matrix."""
         try:
-            df = self.prepare_weather_data(weather_profiles)
-            if df.empty:
+            store = self._sync_features(weather_profiles)
+            position = store.index_of(city)
+            if position is None:
                 return []
 
-            # Select features for clustering
-            feature_columns = ["temperature", "humidity", "wind_speed", "pressure", "uv_index"]
-            features = df[feature_columns].values
+            city_names = store.city_names
+            return [
+                (city_names[i], score)
+                for i, score in self.similarity_engine.top_k(position, top_k)
+            ]
 
-            # Normalize features
-            features_scaled = self.scaler.fit_transform(features)
+        except Exception as e:
+            logger.error(f"Error finding cities similar to {city}: {e}")
+            return []
 
-            # Apply PCA for dimensionality reduction if needed
-            if len(feature_columns) > 3:
-                features_pca = self.pca.fit_transform(features_scaled)
-            else:
-                features_pca = features_scaled
+    @_locked
+    def find_most_similar_pair(
+        self, weather_profiles: List[WeatherProfile]
+    ) -> Optional[Tuple[str, str, float]]:
+        """Find the two most similar cities without the full matrix.
 
-            # Perform clustering
-            n_clusters = min(5, len(df))  # Adjust clusters based on data size
-            self.kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-            cluster_labels = self.kmeans.fit_predict(features_pca)
-
-            # Analyze clusters
-            df["cluster"] = cluster_labels
-            cluster_results = []
-
-            for cluster_id in range(n_clusters):
-                cluster_cities = df[df["cluster"] == cluster_id]["city_name"].tolist()
-                cluster_data = df[df["cluster"] == cluster_id][feature_columns]
-
-                # Calculate cluster characteristics
-                characteristics = {
-                    "avg_temperature": float(cluster_data["temperature"].mean()),
-                    "avg_humidity": float(cluster_data["humidity"].mean()),
-                    "avg_wind_speed": float(cluster_data["wind_speed"].mean()),
-                    "avg_pressure": float(cluster_data["pressure"].mean()),
-                }
+        Returns:
+            (city, other city, similarity), or None if no pair is positively similar
+        """
+        try:
+            self._sync_features(weather_profiles)
+            pair = self.similarity_engine.most_similar_pair()
+            if pair is None or pair[2] <= 0:
+                return None
 
-                # Get cluster profile or create default
-                profile = self.cluster_profiles.get(
-                    cluster_id,
-                    {
-                        "name": f"Cluster {cluster_id}",
-                        "emoji": "🌤️",
-                        "desc": "Mixed weather conditions",
-                    },
-                )
+            city_names = self.feature_store.city_names
+            return city_names[pair[0]], city_names[pair[1]], pair[2]
 
-                cluster_results.append(
-                    ClusterResult(
-                        cluster_id=cluster_id,
-                        cluster_name=profile["name"],
-                        cities=cluster_cities,
-                        characteristics=characteristics,
-                        emoji=profile["emoji"],
-                        description=profile["desc"],
-                    )
-                )
+        except Exception as e:
+            logger.error(f"Error finding the most similar cities: {e}")
+            return None
+
+    @_locked
+    def perform_weather_clustering(
+        self, weather_profiles: List[WeatherProfile]
+    ) -> List[ClusterResult]:
+        """Perform K-means clustering on weather data."""
+        try:
+            store = self._sync_features(weather_profiles)
+            if not len(store):
+                return []
 
-            logger.info(f"Performed clustering analysis with {n_clusters} clusters")
-            return cluster_results
+            return list(store.memo("clusters", lambda: self._cluster_profiles(store)))
 
         except Exception as e:
             logger.error(f"Error performing weather clustering: {e}")
             return []
 
+    def _cluster_profiles(self, store: WeatherFeatureStore) -> List[ClusterResult]:
+        """Cluster the scaled profiles in the store and describe each cluster."""
+        # Cluster PCA-reduced features, starting from the previous centroids
+        if not self.streaming_clusters:
+            self.cluster_model.reset()
+        cluster_labels = self.cluster_model.fit_predict(store)
+        n_clusters = self.cluster_model.get_stats()["clusters"]
+
+        # Analyze clusters with missing values filled by the column mean
+        raw = store.raw
+        features = np.where(np.isnan(raw), store.scaler.mean_, raw)
+        city_names = store.city_names
+        cluster_results = []
+
+        for cluster_id in range(n_clusters):
+            members = np.flatnonzero(cluster_labels == cluster_id)
+            if not len(members):
+                continue
+            cluster_cities = [city_names[i] for i in members]
+            cluster_means = dict(zip(FEATURE_COLUMNS, features[members].mean(axis=0)))
+
+            # Calculate cluster characteristics
+            characteristics = {
+                "avg_temperature": float(cluster_means["temperature"]),
+                "avg_humidity": float(cluster_means["humidity"]),
+                "avg_wind_speed": float(cluster_means["wind_speed"]),
+                "avg_pressure": float(cluster_means["pressure"]),
+            }
+
+            # Get cluster profile or create default
+            profile = self.cluster_profiles.get(
+                cluster_id,
+                {
+                    "name": f"Cluster {cluster_id}",
+                    "emoji": "🌤️",
+                    "desc": "Mixed weather conditions",
+                },
+            )
+
+            cluster_results.append(
+                ClusterResult(
+                    cluster_id=cluster_id,
+                    cluster_name=profile["name"],
+                    cities=cluster_cities,
+                    characteristics=characteristics,
+                    emoji=profile["emoji"],
+                    description=profile["desc"],
+                )
+            )
+
+        logger.info(f"Performed clustering analysis with {n_clusters} clusters")
+        return cluster_results
+
+    @_locked
     def recommend_city_by_preferences(
         self, preferences: Dict[str, Any], weather_profiles: List[WeatherProfile]
     ) -> Optional[RecommendationResult]:
         """Recommend a city based on user weather preferences."""
         try:
-            df = self.prepare_weather_data(weather_profiles)
-            if df.empty:
+            store = self._sync_features(weather_profiles)
+            if not len(store):
                 return None
 
-            # Create preference vector
-            pref_vector = np.array(
-                [
-                    preferences.get("temperature", 20),
-                    preferences.get("humidity", 50),
-                    preferences.get("wind_speed", 5),
-                    preferences.get("pressure", 1013),
-                    preferences.get("uv_index", 5),
-                    preferences.get("visibility", 10),
-                ]
-            ).reshape(1, -1)
-
-            # Normalize preference vector
-            feature_columns = [
-                "temperature",
-                "humidity",
-                "wind_speed",
-                "pressure",
-                "uv_index",
-                "visibility",
-            ]
-            features = df[feature_columns].values
-            features_scaled = self.scaler.fit_transform(features)
-            pref_scaled = self.scaler.transform(pref_vector)
+            # Find the nearest city in the prebuilt index
+            best_match_idx, best_match_distance = self.neighbor_index.query(
+                self._preference_vector(preferences), k=1
+            )[0]
 
-            # Find nearest neighbors
-            self.nn_model.fit(features_scaled)
-            distances, indices = self.nn_model.kneighbors(pref_scaled)
-
-            # Get best match
-            best_match_idx = indices[0][0]
-            best_match_distance = distances[0][0]
-
-            recommended_city = df.iloc[best_match_idx]["city_name"]
+            recommended_city = store.label(best_match_idx)[0]
             match_percentage = max(0, (1 - best_match_distance) * 100)
 
             # Generate reasons
-            city_data = df.iloc[best_match_idx]
+            city_data = dict(zip(FEATURE_COLUMNS, store.filled(best_match_idx)))
             reasons = []
 
             temp_diff = abs(city_data["temperature"] - preferences.get("temperature", 20))
@@ -423,19 +458,70 @@ class MLWeatherService:
             logger.error(f"Error generating city recommendation: {e}")
             return None
 
+    @_locked
+    def find_matching_cities(
+        self,
+        preferences: Dict[str, Any],
+        weather_profiles: List[WeatherProfile],
+        top_k: int = 5,
+        team_only: bool = False,
+    ) -> List[Tuple[str, float]]:
+        """Get the cities closest to the preferences, best first.
+
+        Args:
+            preferences: Preferred weather values, as for recommend_city_by_preferences
+            weather_profiles: Cities to choose from
+            top_k: Number of cities to return
+            team_only: Only consider team member cities
+
+        Returns:
+            List of (city name, match percentage) tuples
+        """
+        try:
+            store = self._sync_features(weather_profiles)
+            matches = self.neighbor_index.query(
+                self._preference_vector(preferences), k=top_k, team_only=team_only
+            )
+            return [
+                (store.label(i)[0], max(0, (1 - distance) * 100)) for i, distance in matches
+            ]
+
+        except Exception as e:
+            logger.error(f"Error finding matching cities: {e}")
+            return []
+
+    def _preference_vector(self, preferences: Dict[str, Any]) -> np.ndarray:
+        """Preference values in feature order, with defaults for missing ones."""
+        return np.array(
+            [
+                preferences.get("temperature", 20),
+                preferences.get("humidity", 50),
+                preferences.get("wind_speed", 5),
+                preferences.get("pressure", 1013),
+                preferences.get("uv_index", 5),
+                preferences.get("visibility", 10),
+            ],
+            dtype=float,
+        )
+
+    @_locked
     def create_similarity_heatmap(
         self, weather_profiles: List[WeatherProfile], figsize=(10, 8), theme=None
     ) -> plt.Figure:
         """Create a similarity heatmap visualization with theme support."""
         try:
-            df = self.prepare_weather_data(weather_profiles)
-            similarity_matrix = self.calculate_similarity_matrix(weather_profiles)
+            store = self._sync_features(weather_profiles)
+            similarity_matrix = (
+                store.memo("similarity_matrix", lambda: self._similarity_matrix(store))
+                if len(store)
+                else np.array([])
+            )
 
             # Apply theme settings
             self._apply_chart_theme(theme)
 
-            if df.empty or similarity_matrix.size == 0:
-                fig, ax = plt.subplots(figsize=figsize)
+            if similarity_matrix.size == 0:
+                fig, ax = self._subplots(figsize)
                 ax.text(
                     0.5,
                     0.5,
@@ -449,9 +535,9 @@ class MLWeatherService:
                 return fig
 
             # Create heatmap
-            fig, ax = plt.subplots(figsize=figsize)
+            fig, ax = self._subplots(figsize)
 
-            city_names = df["city_name"].tolist()
+            city_names = store.city_names
 
             # Create custom colormap based on theme
             if theme:
@@ -493,28 +579,18 @@ class MLWeatherService:
                 "Cities", fontsize=12, color=theme.get("text", "#E0E0E0") if theme else "#E0E0E0"
             )
 
-            plt.xticks(rotation=45, ha="right")
-            plt.yticks(rotation=0)
-            plt.tight_layout()
+            plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+            plt.setp(ax.get_yticklabels(), rotation=0)
+            fig.tight_layout()
 
             logger.info("Created similarity heatmap")
             return fig
 
         except Exception as e:
             logger.error(f"Error creating similarity heatmap: {e}")
-            fig, ax = plt.subplots(figsize=figsize)
-            ax.text(
-                0.5,
-                0.5,
-                f"Error: {str(e)}",
-                ha="center",
-                va="center",
-                transform=ax.transAxes,
-                color=theme.get("text", "#E0E0E0") if theme else "#E0E0E0",
-            )
-            self._style_figure(fig, ax, theme)
-            return fig
+            return self._error_figure(figsize, theme, e)
 
+    @_locked
     def create_cluster_visualization(
         self, weather_profiles: List[WeatherProfile], figsize=(12, 8), theme=None
     ) -> plt.Figure:
@@ -525,7 +601,7 @@ class MLWeatherService:
 
             df = self.prepare_weather_data(weather_profiles)
             if df.empty:
-                fig, ax = plt.subplots(figsize=figsize)
+                fig, ax = self._subplots(figsize)
                 ax.text(
                     0.5,
                     0.5,
@@ -539,19 +615,18 @@ class MLWeatherService:
                 return fig
 
             # Perform clustering
-            clusters = self.perform_weather_clustering(weather_profiles)
+            store = self._sync_features(weather_profiles)
+            clusters = list(store.memo("clusters", lambda: self._cluster_profiles(store)))
 
             # Prepare features for PCA visualization
-            feature_columns = ["temperature", "humidity", "wind_speed", "pressure", "uv_index"]
-            features = df[feature_columns].values
-            features_scaled = self.scaler.fit_transform(features)
+            features_scaled = store.scaled[:, :CLUSTER_FEATURES]
 
             # Apply PCA for 2D visualization
             pca_2d = PCA(n_components=2)
             features_2d = pca_2d.fit_transform(features_scaled)
 
             # Create visualization
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize)
+            fig, (ax1, ax2) = self._subplots(figsize, 1, 2)
 
             # Generate theme-based colors for clusters
             if theme:
@@ -677,26 +752,16 @@ class MLWeatherService:
                     weight="bold",
                 )
 
-            plt.tight_layout()
+            fig.tight_layout()
 
             logger.info("Created cluster visualization")
             return fig
 
         except Exception as e:
             logger.error(f"Error creating cluster visualization: {e}")
-            fig, ax = plt.subplots(figsize=figsize)
-            ax.text(
-                0.5,
-                0.5,
-                f"Error: {str(e)}",
-                ha="center",
-                va="center",
-                transform=ax.transAxes,
-                color=theme.get("text", "#E0E0E0") if theme else "#E0E0E0",
-            )
-            self._style_figure(fig, ax, theme)
-            return fig
+            return self._error_figure(figsize, theme, e)
 
+    @_locked
     def create_radar_chart(
         self,
         weather_profiles: List[WeatherProfile],
@@ -711,7 +776,7 @@ class MLWeatherService:
 
             df = self.prepare_weather_data(weather_profiles)
             if df.empty:
-                fig, ax = plt.subplots(figsize=figsize)
+                fig, ax = self._subplots(figsize)
                 ax.text(
                     0.5,
                     0.5,
@@ -729,7 +794,7 @@ class MLWeatherService:
                 df = df[df["city_name"].isin(selected_cities)]
 
             if df.empty:
-                fig, ax = plt.subplots(figsize=figsize)
+                fig, ax = self._subplots(figsize)
                 ax.text(
                     0.5,
                     0.5,
@@ -764,7 +829,7 @@ class MLWeatherService:
             normalized_data["uv_index"] = df["uv_index"] / 12 * 100  # 0-12 -> 0-100
 
             # Create radar chart
-            fig, ax = plt.subplots(figsize=figsize, subplot_kw=dict(projection="polar"))
+            fig, ax = self._subplots(figsize, subplot_kw=dict(projection="polar"))
 
             # Calculate angles for each category
             angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
@@ -826,14 +891,14 @@ class MLWeatherService:
             )
             ax.grid(True, alpha=0.3, color=theme.get("text", "#E0E0E0") if theme else "#E0E0E0")
 
-            plt.title(
+            ax.set_title(
                 "🎯 Weather Profile Comparison\n(Radar Chart)",
                 size=16,
                 fontweight="bold",
                 pad=20,
                 color=theme.get("text", "#E0E0E0") if theme else "#E0E0E0",
             )
-            plt.legend(
+            ax.legend(
                 loc="upper right",
                 bbox_to_anchor=(1.3, 1.0),
                 facecolor=theme.get("card_bg", "#1E1E1E") if theme else "#1E1E1E",
@@ -846,18 +911,37 @@ class MLWeatherService:
 
         except Exception as e:
             logger.error(f"Error creating radar chart: {e}")
-            fig, ax = plt.subplots(figsize=figsize)
-            ax.text(
-                0.5,
-                0.5,
-                f"Error: {str(e)}",
-                ha="center",
-                va="center",
-                transform=ax.transAxes,
-                color=theme.get("text", "#E0E0E0") if theme else "#E0E0E0",
-            )
-            self._style_figure(fig, ax, theme)
-            return fig
+            return self._error_figure(figsize, theme, e)
+
+    @staticmethod
+    def _subplots(figsize, *grid, **kwargs):
+        """Create a figure and its axes without registering the figure with pyplot.
+
+        The figure is not tied to a GUI backend, so charts can be built and
+        rendered with Agg on a worker thread.
+        """
+        fig = Figure(figsize=figsize)
+        return fig, fig.subplots(*grid, **kwargs)
+
+    def _error_figure(self, figsize, theme, error: Exception) -> plt.Figure:
+        """Placeholder figure showing error.
+
+        The figure's chart_error attribute holds the error, so a renderer can
+        tell it from a chart and avoid caching it.
+        """
+        fig, ax = self._subplots(figsize)
+        ax.text(
+            0.5,
+            0.5,
+            f"Error: {str(error)}",
+            ha="center",
+            va="center",
+            transform=ax.transAxes,
+            color=theme.get("text", "#E0E0E0") if theme else "#E0E0E0",
+        )
+        self._style_figure(fig, ax, theme)
+        fig.chart_error = error
+        return fig
 
     def _apply_chart_theme(self, theme):
         """Apply theme settings to matplotlib."""
@@ -13,6 +13,7 @@ import customtkinter as ctk
 
 from ...services.enhanced_weather_service import EnhancedWeatherService
 from ...services.github_team_service import GitHubTeamService
+from ...utils.api_optimizer import RequestPriority
 from ..theme_manager import ThemeManager
 from .error_handler import ErrorHandler
 
@@ -2104,7 +2105,10 @@ class CityComparisonPanel(ctk.CTkFrame):
             if self.weather_service:
                 try:
                     # Use get_current_weather which returns a dictionary
-                    weather_response = self.weather_service.get_current_weather(city_name)
+                    # Comparison columns queue behind the foreground city's requests
+                    weather_response = self.weather_service.get_current_weather(
+                        city_name, priority=RequestPriority.LOW
+                    )
 
                     # Handle case where weather_response might be a list or not have 'current' key
                     if isinstance(weather_response, dict):
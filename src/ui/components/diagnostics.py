@@ -14,13 +14,14 @@ import threading
 import time
 import tkinter as tk
 import traceback
-import urllib.request
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from enum import Enum
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 from typing import Any, Callable, Dict, List
 
+from ...utils.http_client import get_http_client
+
 
 class LogLevel(Enum):
     """Log levels for user-friendly display."""
@@ -128,6 +129,7 @@ class NetworkDiagnostics:
             "api_endpoints": self._test_api_endpoints(),
             "speed": self._test_speed(),
             "system_info": self._get_network_info(),
+            "transport": get_http_client().get_host_stats(),
         }
 
         return results
@@ -177,13 +179,13 @@ class NetworkDiagnostics:
         for name, url in endpoints.items():
             try:
                 start_time = time.time()
-                response = urllib.request.urlopen(url, timeout=10)
+                response = get_http_client().get(url, timeout=10)
                 response_time = (time.time() - start_time) * 1000
 
                 results[name] = {
                     "status": "reachable",
                     "response_time_ms": round(response_time, 2),
-                    "http_status": response.getcode(),
+                    "http_status": response.status_code,
                 }
             except Exception as e:
                 results[name] = {"status": "unreachable", "error": str(e)}
@@ -197,8 +199,8 @@ class NetworkDiagnostics:
             test_url = "https://httpbin.org/bytes/1024"  # 1KB test file
 
             start_time = time.time()
-            response = urllib.request.urlopen(test_url, timeout=10)
-            data = response.read()
+            response = get_http_client().get(test_url, timeout=10)
+            data = response.content
             end_time = time.time()
 
             duration = end_time - start_time
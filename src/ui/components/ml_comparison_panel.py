@@ -9,20 +9,18 @@ from typing import Any, Dict, List, Optional
 
 import customtkinter as ctk
 
-# Matplotlib for embedding charts
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
 from ...services.enhanced_weather_service import EnhancedWeatherService
 from ...services.github_team_service import GitHubTeamService
 
 # Services
+from ...services.ml_chart_renderer import MLChartRenderer
 from ...services.ml_weather_service import (
     MLWeatherService,
     RecommendationResult,
     SimilarityResult,
     WeatherProfile,
 )
+from ...utils.api_optimizer import RequestPriority
 from ..theme_manager import ThemeManager
 from .error_handler import ErrorHandler
 
@@ -217,6 +215,7 @@ class MLComparisonPanel(ctk.CTkFrame):
         self.weather_service = weather_service
         self.github_service = github_service
         self.ml_service = MLWeatherService()
+        self.chart_renderer = MLChartRenderer(self.ml_service)
         self.theme_manager = ThemeManager()
         self.error_handler = ErrorHandler(self)
 
@@ -227,7 +226,9 @@ class MLComparisonPanel(ctk.CTkFrame):
         self.current_recommendation: Optional[RecommendationResult] = None
 
         # UI components
-        self.chart_canvas = None
+        self.chart_label = None
+        self.chart_image = None
+        self._chart_request = 0
         self.current_chart_type = "similarity"
 
         self._setup_ui()
@@ -488,7 +489,10 @@ class MLComparisonPanel(ctk.CTkFrame):
 
         # Fetch weather data
         try:
-            weather_data = self.weather_service.get_current_weather(city_name)
+            # Comparison cities queue behind the foreground city's requests
+            weather_data = self.weather_service.get_current_weather(
+                city_name, priority=RequestPriority.LOW
+            )
             if not weather_data:
                 self.error_handler.show_api_error(
                     f"Could not fetch weather data for {city_name}",
@@ -560,64 +564,75 @@ class MLComparisonPanel(ctk.CTkFrame):
         self.cities_display.configure(state="disabled")
 
     def _show_visualization(self, chart_type: str):
-        """Show the selected visualization."""
+        """Show the selected visualization, rendered off the Tk thread."""
         if len(self.weather_profiles) < 2:
             messagebox.showwarning(
                 "Insufficient Data", "Please add at least 2 cities for analysis."
             )
             return
 
+        # Title and image size in pixels of each chart
+        charts = {
+            "similarity": ("🔥 Weather Similarity Heatmap", (800, 600)),
+            "clusters": ("🎯 Weather Clusters Analysis", (1000, 600)),
+            "radar": ("📊 Weather Profile Radar Chart", (800, 800)),
+        }
+        if chart_type not in charts:
+            return
+        title, size = charts[chart_type]
+
         self.current_chart_type = chart_type
         self._clear_visualization()
 
+        # A newer request makes the result of this one stale
+        self._chart_request += 1
+        request = self._chart_request
+
         try:
             # Get current theme
             current_theme = self.theme_manager.get_current_theme() if self.theme_manager else None
+            theme_name = self.theme_manager.current_theme if self.theme_manager else ""
+
+            future = self.chart_renderer.render(
+                chart_type, self.weather_profiles, size, theme=current_theme, theme_name=theme_name
+            )
+        except Exception as e:
+            logger.error(f"Error creating {chart_type} visualization: {e}")
+            messagebox.showerror("Visualization Error", f"Error creating {chart_type}: {str(e)}")
+            self._show_placeholder()
+            return
+
+        if future.done():
+            # Cached charts are shown straight away
+            self._on_chart_rendered(request, chart_type, title, future)
+        else:
+            self.viz_title.configure(text="⏳ Rendering chart...")
+            future.add_done_callback(
+                lambda done: self.after(0, self._on_chart_rendered, request, chart_type, title, done)
+            )
+
+    def _on_chart_rendered(self, request: int, chart_type: str, title: str, future):
+        """Display a chart rendered in the background unless a newer one was requested."""
+        if request != self._chart_request or not self.winfo_exists():
+            return
+
+        try:
+            image = future.result()
 
             # Hide placeholder
             if hasattr(self, "placeholder_label"):
                 self.placeholder_label.pack_forget()
-
-            # Create the appropriate chart
-            if chart_type == "similarity":
-                fig = self.ml_service.create_similarity_heatmap(
-                    self.weather_profiles, figsize=(8, 6), theme=current_theme
-                )
-                self.viz_title.configure(text="🔥 Weather Similarity Heatmap")
-            elif chart_type == "clusters":
-                fig = self.ml_service.create_cluster_visualization(
-                    self.weather_profiles, figsize=(10, 6), theme=current_theme
-                )
-                self.viz_title.configure(text="🎯 Weather Clusters Analysis")
-            elif chart_type == "radar":
-                city_names = [profile.city_name for profile in self.weather_profiles]
-                fig = self.ml_service.create_radar_chart(
-                    self.weather_profiles, city_names, figsize=(8, 8), theme=current_theme
-                )
-                self.viz_title.configure(text="📊 Weather Profile Radar Chart")
-            else:
-                return
-
-            # Configure figure for embedding
-            fig.patch.set_facecolor("none")  # Transparent background
-            fig.tight_layout(pad=1.0)
+            self.viz_title.configure(text=title)
 
             # Create canvas frame for better control
             if not hasattr(self, "canvas_frame") or not self.canvas_frame.winfo_exists():
                 self.canvas_frame = ctk.CTkFrame(self.chart_frame, fg_color="transparent")
                 self.canvas_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
-            # Embed the chart with proper CustomTkinter integration
-            self.chart_canvas = FigureCanvasTkAgg(fig, self.canvas_frame)
-            self.chart_canvas.draw()
-
-            # Configure the tkinter widget for CustomTkinter
-            canvas_widget = self.chart_canvas.get_tk_widget()
-            canvas_widget.configure(highlightthickness=0, relief="flat")
-            canvas_widget.pack(fill="both", expand=True)
-
-            # Store figure reference for theme updates
-            self.current_figure = fig
+            # Show the rendered image; the label keeps the reference Tk needs
+            self.chart_image = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+            self.chart_label = ctk.CTkLabel(self.canvas_frame, image=self.chart_image, text="")
+            self.chart_label.pack(fill="both", expand=True)
 
             # Generate insights based on chart type
             self._generate_chart_insights(chart_type)
@@ -641,29 +656,20 @@ class MLComparisonPanel(ctk.CTkFrame):
 
     def _clear_visualization(self):
         """Clear the current visualization."""
-        # Properly cleanup matplotlib canvas
-        if hasattr(self, "chart_canvas") and self.chart_canvas:
+        # Remove the chart image
+        if self.chart_label:
             try:
-                self.chart_canvas.get_tk_widget().destroy()
-                if hasattr(self.chart_canvas, "figure"):
-                    plt.close(self.chart_canvas.figure)
-                self.chart_canvas = None
+                self.chart_label.destroy()
             except Exception as e:
-                logger.warning(f"Error cleaning up chart canvas: {e}")
+                logger.warning(f"Error cleaning up chart image: {e}")
+            self.chart_label = None
+            self.chart_image = None
 
         # Clear canvas frame
         if hasattr(self, "canvas_frame") and self.canvas_frame and self.canvas_frame.winfo_exists():
             self.canvas_frame.destroy()
             self.canvas_frame = None
 
-        # Clear current figure reference
-        if hasattr(self, "current_figure"):
-            try:
-                plt.close(self.current_figure)
-            except:
-                pass
-            self.current_figure = None
-
         # Reset title
         self.viz_title.configure(text="📊 Select a visualization type")
 
@@ -690,38 +696,22 @@ class MLComparisonPanel(ctk.CTkFrame):
             insights = []
 
             if chart_type == "similarity":
-                # Calculate similarity insights
-                similarity_matrix = self.ml_service.calculate_similarity_matrix(
-                    self.weather_profiles
-                )
-                if similarity_matrix.size > 0:
-                    # Find most similar pair
-                    max_similarity = 0
-                    most_similar_pair = None
-
-                    for i in range(len(self.weather_profiles)):
-                        for j in range(i + 1, len(self.weather_profiles)):
-                            similarity = similarity_matrix[i][j]
-                            if similarity > max_similarity:
-                                max_similarity = similarity
-                                most_similar_pair = (
-                                    self.weather_profiles[i].city_name,
-                                    self.weather_profiles[j].city_name,
-                                )
-
-                    if most_similar_pair:
-                        insights.append(
-                            f"🎯 Most Similar Cities: {most_similar_pair[0]} and {most_similar_pair[1]} ({max_similarity:.1%} similarity)"
-                        )
-
-                        # Get detailed similarity analysis
-                        similarity_result = self.ml_service.get_city_similarity(
-                            most_similar_pair[0], most_similar_pair[1], self.weather_profiles
-                        )
-                        insights.append(
-                            f"📊 Key Factors: {', '.join(similarity_result.dominant_factors)}"
-                        )
-                        insights.append(f"💡 {similarity_result.recommendation}")
+                # Find most similar pair without building the full matrix
+                most_similar = self.ml_service.find_most_similar_pair(self.weather_profiles)
+                if most_similar:
+                    city1, city2, max_similarity = most_similar
+                    insights.append(
+                        f"🎯 Most Similar Cities: {city1} and {city2} ({max_similarity:.1%} similarity)"
+                    )
+
+                    # Get detailed similarity analysis
+                    similarity_result = self.ml_service.get_city_similarity(
+                        city1, city2, self.weather_profiles
+                    )
+                    insights.append(
+                        f"📊 Key Factors: {', '.join(similarity_result.dominant_factors)}"
+                    )
+                    insights.append(f"💡 {similarity_result.recommendation}")
 
             elif chart_type == "clusters":
                 # Generate cluster insights
@@ -1071,6 +1061,9 @@ class MLComparisonPanel(ctk.CTkFrame):
         if hasattr(self, "error_handler"):
             self.error_handler.cleanup()
 
-        if self.chart_canvas:
-            self.chart_canvas.get_tk_widget().destroy()
+        # Stop rendering charts nobody will see
+        self.chart_renderer.shutdown()
+
+        if self.chart_label:
+            self.chart_label.destroy()
         super().destroy()
@@ -21,7 +21,7 @@ from src.ui.components import (
 from src.ui.theme import DataTerminalTheme
 from src.ui.theme_manager import theme_manager
 from src.utils.api_optimizer import APIOptimizer
-from src.utils.cache_manager import CacheManager
+from src.utils.cache_manager import get_cache_manager
 from src.utils.component_recycler import ComponentRecycler
 from src.utils.loading_manager import LoadingManager
 from src.utils.startup_optimizer import StartupOptimizer
@@ -71,12 +71,8 @@ class BaseDashboard(ctk.CTk):
 
     def _initialize_optimization_services(self):
         """Initialize performance optimization services."""
-        self.cache_manager = CacheManager(
-            max_size_mb=100,  # 100MB cache
-            enable_compression=True,
-            compression_threshold=1024,  # Compress items > 1KB
-            lru_factor=0.8,  # Evict when 80% full
-        )
+        # UI data lives in memory; the shared cache spills it to disk under pressure
+        self.cache_manager = get_cache_manager().namespace("dashboard", persistent=False)
         self.startup_optimizer = StartupOptimizer()
         self.component_recycler = ComponentRecycler()
         self.api_optimizer = APIOptimizer()
@@ -27,7 +27,7 @@ from src.ui.components.theme_preview_card import ThemePreviewCard
 from src.ui.theme import DataTerminalTheme
 from src.ui.theme_manager import theme_manager
 from src.utils.api_optimizer import APIOptimizer
-from src.utils.cache_manager import CacheManager
+from src.utils.cache_manager import close_cache_manager, get_cache_manager
 from src.utils.component_recycler import ComponentRecycler
 from src.utils.loading_manager import LoadingManager
 from src.utils.startup_optimizer import StartupOptimizer
@@ -50,12 +50,8 @@ class ProfessionalWeatherDashboard(ctk.CTk):
         self.logger = logging.getLogger(__name__)
 
         # Initialize performance optimization services first
-        self.cache_manager = CacheManager(
-            max_size_mb=100,  # 100MB cache
-            enable_compression=True,
-            compression_threshold=1024,  # Compress items > 1KB
-            lru_factor=0.8,  # Evict when 80% full
-        )
+        # UI data lives in memory; the shared cache spills it to disk under pressure
+        self.cache_manager = get_cache_manager().namespace("dashboard", persistent=False)
         self.startup_optimizer = StartupOptimizer()
         self.component_recycler = ComponentRecycler()
         self.api_optimizer = APIOptimizer()
@@ -3777,8 +3773,9 @@ Tech Pathways - Justice Through Code - 2025 Cohort
             self.component_recycler.shutdown()
 
         if hasattr(self, "cache_manager"):
-            # Cache manager doesn't have a stop method, just clear it
+            # Drop UI entries and persist the shared cache
             self.cache_manager.clear()
+            close_cache_manager()
 
         if hasattr(self, "loading_manager"):
             self.loading_manager.shutdown()
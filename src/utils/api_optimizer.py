@@ -2,17 +2,25 @@
 """
 API Optimizer for Weather Dashboard
 Implements intelligent API request management, caching, and rate limiting.
+
+Requests are sent through a pluggable APITransport, so services can route real
+API calls through the optimizer's priority queue, response cache and rate limiter.
 """
 
 import hashlib
+import heapq
+import itertools
 import json
 import logging
+import pickle
+import sys
 import threading
 import time
-from collections import deque
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 class RequestPriority(Enum):
@@ -49,10 +57,12 @@ class APIRequest:
     callback: Optional[Callable[[Any], None]] = None
     error_callback: Optional[Callable[[Exception], None]] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    deadline: Optional[float] = None  # Absolute dispatch deadline; defaults to submit + timeout
 
     def __post_init__(self):
         """Generate request ID after initialization."""
         self.request_id = self._generate_id()
+        self.submitted_at: Optional[float] = None
 
     def _generate_id(self) -> str:
         """Generate unique request ID based on endpoint and params."""
@@ -72,6 +82,18 @@ class APIResponse:
     response_time: float = 0.0
     timestamp: float = field(default_factory=time.time)
     cache_hit: bool = False
+    status_code: Optional[int] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    size_bytes: int = 0  # Payload size, when known to the transport
+
+
+@dataclass
+class CachedResponse:
+    """A cached response with its expiry time and accounted size."""
+
+    response: APIResponse
+    expires_at: float
+    size_bytes: int
 
 
 class RateLimiter:
@@ -102,15 +124,96 @@ class RateLimiter:
             return False
 
     def wait_time(self, tokens: int = 1) -> float:
-        """Calculate wait time for tokens."""
+        """Calculate wait time until enough tokens are available."""
         with self._lock:
-            if self.tokens >= tokens:
+            elapsed = time.time() - self.last_update
+            available = min(self.burst_size, self.tokens + elapsed * self.requests_per_second)
+            if available >= tokens:
                 return 0.0
 
-            needed_tokens = tokens - self.tokens
+            needed_tokens = tokens - available
             return needed_tokens / self.requests_per_second
 
 
+class APITransport:
+    """Sends a single API request on behalf of the optimizer."""
+
+    def send(self, request: APIRequest) -> APIResponse:
+        """Send a request and wrap the outcome.
+
+        Implementations return an unsuccessful APIResponse for error statuses and
+        raise only when no response was received (timeouts, connection errors).
+        """
+        raise NotImplementedError
+
+
+class MockTransport(APITransport):
+    """Simulated transport returning mock data after a fixed delay."""
+
+    def __init__(self, delay: float = 0.1):
+        """Initialize mock transport."""
+        self.delay = delay
+
+    def send(self, request: APIRequest) -> APIResponse:
+        """Return mock data for any request."""
+        time.sleep(self.delay)  # Simulate network delay
+        return APIResponse(
+            request_id=request.request_id,
+            data={"mock": "data", "endpoint": request.endpoint, "params": request.params},
+            success=True,
+            response_time=self.delay,
+            status_code=200,
+        )
+
+
+class HTTPTransport(APITransport):
+    """Sends GET requests through the shared pooled HTTP client.
+
+    Connect/read timeouts and retries are those of the client.
+    """
+
+    def __init__(self, base_url: str = "", client=None):
+        """Initialize HTTP transport.
+
+        Args:
+            base_url: Prefix for relative endpoints; absolute URLs are sent as-is
+            client: HTTPClient to use; defaults to the process-wide client
+        """
+        if client is None:
+            from .http_client import get_http_client
+
+            client = get_http_client()
+        self.base_url = base_url.rstrip("/")
+        self.client = client
+
+    def build_url(self, endpoint: str) -> str:
+        """Resolve an endpoint against the base URL."""
+        if endpoint.startswith(("http://", "https://")) or not self.base_url:
+            return endpoint
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def send(self, request: APIRequest) -> APIResponse:
+        """Send the request and decode a JSON body."""
+        start = time.perf_counter()
+        response = self.client.get(self.build_url(request.endpoint), params=request.params)
+        try:
+            data = response.json()
+        except ValueError:
+            data = response.text
+
+        success = response.status_code == 200
+        return APIResponse(
+            request_id=request.request_id,
+            data=data,
+            success=success,
+            error=None if success else Exception(f"HTTP {response.status_code}"),
+            response_time=time.perf_counter() - start,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            size_bytes=len(response.content),
+        )
+
+
 class APIOptimizer:
     """Main API optimization manager."""
 
@@ -120,21 +223,49 @@ class APIOptimizer:
         burst_size: int = 20,
         max_concurrent: int = 5,
         cache_size: int = 1000,
+        transport: Optional[APITransport] = None,
+        cache_max_bytes: int = 50 * 1024 * 1024,
+        cache_sweep_interval: float = 30.0,
     ):
-        """Initialize API optimizer."""
+        """Initialize API optimizer.
+
+        Args:
+            requests_per_second: Sustained dispatch rate
+            burst_size: Requests that may be dispatched back to back
+            max_concurrent: Worker threads (requests in flight)
+            cache_size: Maximum cached responses
+            transport: Transport used to send requests; defaults to MockTransport
+            cache_max_bytes: Maximum total payload size of cached responses
+            cache_sweep_interval: Seconds between background sweeps of expired responses
+        """
         self.rate_limiter = RateLimiter(requests_per_second, burst_size)
         self.max_concurrent = max_concurrent
-
-        # Request management
-        self._request_queue: deque = deque()
+        self.transport = transport or MockTransport()
+
+        # Request management: heap of (priority, deadline, sequence, request).
+        # _queued maps each queued request ID to the sequence of its live heap entry
+        # and the request; entries superseded by a promotion are skipped when popped.
+        self._request_queue: List[Tuple[int, float, int, APIRequest]] = []
+        self._sequence = itertools.count()
+        self._queued: Dict[str, Tuple[int, APIRequest]] = {}
         self._active_requests: Dict[str, APIRequest] = {}
-        self._request_cache: Dict[str, APIResponse] = {}
+        self._futures: Dict[str, Future] = {}
+
+        # Response cache: LRU order in an OrderedDict (oldest first) bounded by
+        # entry count and bytes; a min-heap of (expires_at, request_id) lets the
+        # background sweeper drop expired entries without scanning the cache
+        self._request_cache: OrderedDict[str, CachedResponse] = OrderedDict()
         self._cache_size = cache_size
+        self._cache_max_bytes = cache_max_bytes
+        self._cache_bytes = 0
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._cache_sweep_interval = cache_sweep_interval
 
         # Threading
         self._worker_threads: List[threading.Thread] = []
         self._shutdown_event = threading.Event()
         self._queue_lock = threading.Lock()
+        self._queue_cond = threading.Condition(self._queue_lock)
         self._cache_lock = threading.Lock()
 
         # Statistics
@@ -147,6 +278,9 @@ class APIOptimizer:
             "average_response_time": 0.0,
             "rate_limited_requests": 0,
             "concurrent_requests": 0,
+            "coalesced_requests": 0,
+            "cache_evictions": 0,
+            "cache_expirations": 0,
         }
 
         self.logger = logging.getLogger(__name__)
@@ -163,40 +297,101 @@ class APIOptimizer:
             worker.start()
             self._worker_threads.append(worker)
 
+        sweeper = threading.Thread(
+            target=self._sweep_loop, name="APIOptimizer-CacheSweeper", daemon=True
+        )
+        sweeper.start()
+        self._worker_threads.append(sweeper)
+
         self.logger.info(f"Started {self.max_concurrent} API optimizer worker threads")
 
     def submit_request(self, request: APIRequest) -> str:
         """Submit an API request for processing."""
-        with self._queue_lock:
-            # Check if request is already active
-            if request.request_id in self._active_requests:
-                self.logger.debug(f"Request {request.request_id} already active")
-                return request.request_id
+        self.submit(request)
+        return request.request_id
+
+    def submit(self, request: APIRequest) -> Future:
+        """Submit an API request and get a future for its response.
 
-            # Add to queue based on priority
-            self._insert_by_priority(request)
+        A request identical to one already queued or in flight shares that
+        request's future. If it has a higher priority, the queued request is
+        promoted so it is dispatched at the new priority.
+
+        Returns:
+            Future resolving to the APIResponse (never raising)
+        """
+        with self._queue_lock:
+            future = self._futures.get(request.request_id)
+            if future is not None:
+                self._stats["coalesced_requests"] += 1
+                self._promote(request)
+                self._attach_callbacks(future, request)
+                self.logger.debug(f"Request {request.request_id} already pending")
+                return future
+
+            future = Future()
+            self._futures[request.request_id] = future
+
+            # Add to queue based on priority, then earliest deadline
+            self._enqueue(request)
             self._stats["total_requests"] += 1
+            self._queue_cond.notify()
 
             self.logger.debug(
                 f"Queued request {request.request_id} with priority {request.priority.name}"
             )
-            return request.request_id
-
-    def _insert_by_priority(self, request: APIRequest) -> None:
-        """Insert request into queue based on priority."""
-        # Find insertion point based on priority
-        insert_index = 0
-        for i, queued_request in enumerate(self._request_queue):
-            if request.priority.value < queued_request.priority.value:
-                insert_index = i
-                break
-            insert_index = i + 1
-
-        # Insert at calculated position
-        if insert_index >= len(self._request_queue):
-            self._request_queue.append(request)
-        else:
-            self._request_queue.insert(insert_index, request)
+            return future
+
+    def execute(self, request: APIRequest, timeout: Optional[float] = None) -> APIResponse:
+        """Submit a request and block until its response is available.
+
+        Raises:
+            concurrent.futures.TimeoutError: If no response arrives within timeout
+        """
+        return self.submit(request).result(timeout)
+
+    def _enqueue(self, request: APIRequest) -> None:
+        """Push a request onto the priority heap in O(log n)."""
+        request.submitted_at = time.time()
+        if request.deadline is None:
+            request.deadline = request.submitted_at + request.timeout
+        self._push(request)
+
+    def _push(self, request: APIRequest) -> None:
+        """Push a heap entry for a request and mark it as the live one."""
+        sequence = next(self._sequence)
+        self._queued[request.request_id] = (sequence, request)
+        heapq.heappush(
+            self._request_queue, (request.priority.value, request.deadline, sequence, request)
+        )
+
+    def _promote(self, duplicate: APIRequest) -> None:
+        """Re-queue a pending request at a duplicate's higher priority."""
+        entry = self._queued.get(duplicate.request_id)
+        if entry is None:
+            return  # Already in flight
+
+        _, queued = entry
+        if duplicate.priority.value < queued.priority.value:
+            queued.priority = duplicate.priority
+            self._push(queued)
+            self._queue_cond.notify()
+
+    def _attach_callbacks(self, future: Future, request: APIRequest) -> None:
+        """Run a coalesced request's callbacks when the shared response arrives."""
+        if request.callback or request.error_callback:
+            future.add_done_callback(lambda f: self._dispatch_callbacks(request, f.result()))
+
+    def _dispatch_callbacks(self, request: APIRequest, response: APIResponse) -> None:
+        """Call the success or error callback of a request."""
+        try:
+            if response.success:
+                if request.callback:
+                    request.callback(response.data)
+            elif request.error_callback:
+                request.error_callback(response.error or Exception("Request failed"))
+        except Exception as e:
+            self.logger.error(f"Callback error for request {request.request_id}: {e}")
 
     def _worker_loop(self) -> None:
         """Main worker loop for processing requests."""
@@ -205,28 +400,44 @@ class APIOptimizer:
                 request = self._get_next_request()
                 if request:
                     self._process_request(request)
-                else:
-                    time.sleep(0.1)  # No requests, wait briefly
 
             except Exception as e:
                 self.logger.error(f"Worker error: {e}")
 
     def _get_next_request(self) -> Optional[APIRequest]:
-        """Get the next request from the queue."""
-        with self._queue_lock:
-            if not self._request_queue:
-                return None
-
-            # Check rate limiting
-            if not self.rate_limiter.acquire():
-                self._stats["rate_limited_requests"] += 1
-                return None
+        """Block until a request is queued and a rate limit token is available.
+
+        Returns:
+            The next request, or None on shutdown
+        """
+        with self._queue_cond:
+            while not self._shutdown_event.is_set():
+                # Drop heap entries superseded by a priority promotion
+                while self._request_queue:
+                    _, _, sequence, queued = self._request_queue[0]
+                    live = self._queued.get(queued.request_id)
+                    if live is not None and live[0] == sequence:
+                        break
+                    heapq.heappop(self._request_queue)
+
+                if not self._request_queue:
+                    self._queue_cond.wait()
+                    continue
+
+                # Sleep exactly until the next token instead of polling
+                if not self.rate_limiter.acquire():
+                    self._stats["rate_limited_requests"] += 1
+                    self._queue_cond.wait(self.rate_limiter.wait_time())
+                    continue
+
+                request = heapq.heappop(self._request_queue)[-1]
+                del self._queued[request.request_id]
+                self._active_requests[request.request_id] = request
+                self._stats["concurrent_requests"] += 1
+
+                return request
 
-            request = self._request_queue.popleft()
-            self._active_requests[request.request_id] = request
-            self._stats["concurrent_requests"] += 1
-
-            return request
+        return None
 
     def _process_request(self, request: APIRequest) -> None:
         """Process a single API request."""
@@ -252,6 +463,8 @@ class APIOptimizer:
                     response = self._get_cached_response(request)
                     if not response:
                         raise
+                if not response.success:
+                    response = self._get_cached_response(request) or response
 
             elif request.cache_strategy in [CacheStrategy.API_ONLY, CacheStrategy.REFRESH]:
                 response = self._make_api_call(request)
@@ -264,13 +477,6 @@ class APIOptimizer:
             if response.success and request.cache_strategy != CacheStrategy.API_ONLY:
                 self._cache_response(request, response)
 
-            # Call success callback
-            if request.callback:
-                try:
-                    request.callback(response.data)
-                except Exception as e:
-                    self.logger.error(f"Callback error for request {request.request_id}: {e}")
-
         except Exception as e:
             # Create error response
             response = APIResponse(
@@ -282,14 +488,6 @@ class APIOptimizer:
             )
 
             self._update_stats(response, response.response_time)
-
-            # Call error callback
-            if request.error_callback:
-                try:
-                    request.error_callback(e)
-                except Exception as callback_error:
-                    self.logger.error(f"Error callback failed: {callback_error}")
-
             self.logger.error(f"Request {request.request_id} failed: {e}")
 
         finally:
@@ -297,59 +495,132 @@ class APIOptimizer:
             with self._queue_lock:
                 self._active_requests.pop(request.request_id, None)
                 self._stats["concurrent_requests"] -= 1
+                future = self._futures.pop(request.request_id, None)
+
+        self._dispatch_callbacks(request, response)
+        if future is not None:
+            future.set_result(response)
 
     def _get_cached_response(self, request: APIRequest) -> Optional[APIResponse]:
         """Get cached response if available and valid."""
         with self._cache_lock:
-            cached = self._request_cache.get(request.request_id)
+            entry = self._request_cache.get(request.request_id)
 
-            if not cached:
+            if not entry:
                 self._stats["cache_misses"] += 1
                 return None
 
             # Check if cache is still valid
-            age = time.time() - cached.timestamp
-            if age > request.cache_ttl:
-                self._request_cache.pop(request.request_id, None)
+            now = time.time()
+            cached = entry.response
+            if now >= entry.expires_at or now - cached.timestamp > request.cache_ttl:
+                self._remove_cached(request.request_id)
                 self._stats["cache_misses"] += 1
                 return None
 
-            # Return cached response
+            # Return a copy of the cached response, marking it most recently used;
+            # the original stays as it was returned to the request that fetched it
+            self._request_cache.move_to_end(request.request_id)
             self._stats["cache_hits"] += 1
-            cached.cache_hit = True
             self.logger.debug(f"Cache hit for request {request.request_id}")
-            return cached
+            return replace(cached, cache_hit=True)
 
     def _make_api_call(self, request: APIRequest) -> APIResponse:
-        """Make actual API call (placeholder - to be implemented by subclasses)."""
-        # This is a placeholder - actual implementation would depend on the specific API
-        # For now, simulate an API call
-        time.sleep(0.1)  # Simulate network delay
-
-        # Mock successful response
-        response = APIResponse(
-            request_id=request.request_id,
-            data={"mock": "data", "endpoint": request.endpoint, "params": request.params},
-            success=True,
-            response_time=0.1,
-        )
-
-        return response
+        """Make the API call through the configured transport."""
+        return self.transport.send(request)
 
     def _cache_response(self, request: APIRequest, response: APIResponse) -> None:
-        """Cache a successful response."""
+        """Cache a successful response, evicting least recently used entries."""
+        size_bytes = self._response_size(response)
+        if size_bytes > self._cache_max_bytes:
+            return  # Would evict everything else and still not fit
+
+        expires_at = time.time() + request.cache_ttl
         with self._cache_lock:
-            # Implement LRU eviction if cache is full
-            if len(self._request_cache) >= self._cache_size:
-                # Remove oldest entry
-                oldest_key = min(
-                    self._request_cache.keys(), key=lambda k: self._request_cache[k].timestamp
-                )
-                self._request_cache.pop(oldest_key, None)
+            self._remove_cached(request.request_id)
+            self._request_cache[request.request_id] = CachedResponse(
+                response, expires_at, size_bytes
+            )
+            self._cache_bytes += size_bytes
+            heapq.heappush(self._expiry_heap, (expires_at, request.request_id))
+
+            while (
+                len(self._request_cache) > self._cache_size
+                or self._cache_bytes > self._cache_max_bytes
+            ):
+                _, evicted = self._request_cache.popitem(last=False)
+                self._cache_bytes -= evicted.size_bytes
+                self._stats["cache_evictions"] += 1
 
-            self._request_cache[request.request_id] = response
             self.logger.debug(f"Cached response for request {request.request_id}")
 
+    @staticmethod
+    def _response_size(response: APIResponse) -> int:
+        """Get the size in bytes accounted to a cached response."""
+        if response.size_bytes:
+            return response.size_bytes
+        try:
+            return len(pickle.dumps(response.data, pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(response.data)
+
+    def _remove_cached(self, request_id: str) -> Optional[CachedResponse]:
+        """Remove a cached response (caller holds the cache lock).
+
+        Its expiry heap entry is left behind and discarded by the sweeper.
+        """
+        entry = self._request_cache.pop(request_id, None)
+        if entry is not None:
+            self._cache_bytes -= entry.size_bytes
+        return entry
+
+    def _sweep_loop(self) -> None:
+        """Periodically drop expired responses until shutdown."""
+        while not self._shutdown_event.wait(self._cache_sweep_interval):
+            try:
+                self._sweep_expired()
+            except Exception as e:
+                self.logger.error(f"Cache sweep error: {e}")
+
+    def _sweep_expired(self, batch_size: int = 1000) -> int:
+        """Drop cached responses past their expiry time.
+
+        The cache lock is released between batches so lookups are never held
+        up by a large sweep.
+
+        Returns:
+            Number of responses removed
+        """
+        removed = 0
+        now = time.time()
+        more = True
+        while more:
+            with self._cache_lock:
+                heap = self._expiry_heap
+                for _ in range(batch_size):
+                    if not heap or heap[0][0] > now:
+                        more = False
+                        break
+                    expires_at, request_id = heapq.heappop(heap)
+                    entry = self._request_cache.get(request_id)
+                    # Skip heap entries of responses replaced or evicted since
+                    if entry is not None and entry.expires_at == expires_at:
+                        self._remove_cached(request_id)
+                        self._stats["cache_expirations"] += 1
+                        removed += 1
+
+        with self._cache_lock:
+            # Rebuild once superseded heap entries outnumber live ones
+            if len(self._expiry_heap) > 2 * len(self._request_cache) + 1024:
+                self._expiry_heap = [
+                    (entry.expires_at, key) for key, entry in self._request_cache.items()
+                ]
+                heapq.heapify(self._expiry_heap)
+
+        if removed:
+            self.logger.debug(f"Swept {removed} expired cached responses")
+        return removed
+
     def _update_stats(self, response: APIResponse, response_time: float) -> None:
         """Update performance statistics."""
         if response.success:
@@ -372,25 +643,26 @@ class APIOptimizer:
 
         # Check if request is in queue
         with self._queue_lock:
-            for request in self._request_queue:
-                if request.request_id == request_id:
-                    return {"status": "queued", "request": request}
+            entry = self._queued.get(request_id)
+            if entry is not None:
+                return {"status": "queued", "request": entry[1]}
 
         # Check if response is cached
         with self._cache_lock:
             if request_id in self._request_cache:
-                return {"status": "completed", "response": self._request_cache[request_id]}
+                return {"status": "completed", "response": self._request_cache[request_id].response}
 
         return None
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get performance statistics."""
         with self._queue_lock:
-            queue_size = len(self._request_queue)
+            queue_size = len(self._queued)
             active_count = len(self._active_requests)
 
         with self._cache_lock:
             cache_size = len(self._request_cache)
+            cache_bytes = self._cache_bytes
 
         stats = self._stats.copy()
         stats.update(
@@ -398,6 +670,7 @@ class APIOptimizer:
                 "queue_size": queue_size,
                 "active_requests": active_count,
                 "cache_size": cache_size,
+                "cache_bytes": cache_bytes,
                 "cache_hit_ratio": (
                     self._stats["cache_hits"]
                     / max(1, self._stats["cache_hits"] + self._stats["cache_misses"])
@@ -415,12 +688,14 @@ class APIOptimizer:
                 # Clear entries matching pattern
                 to_remove = [key for key in self._request_cache.keys() if pattern in key]
                 for key in to_remove:
-                    self._request_cache.pop(key, None)
+                    self._remove_cached(key)
                 cleared = len(to_remove)
             else:
                 # Clear all
                 cleared = len(self._request_cache)
                 self._request_cache.clear()
+                self._expiry_heap.clear()
+                self._cache_bytes = 0
 
         self.logger.info(f"Cleared {cleared} cached responses")
         return cleared
@@ -429,20 +704,38 @@ class APIOptimizer:
         """Shutdown the API optimizer."""
         self.logger.info("Shutting down API optimizer")
 
-        # Signal shutdown
+        # Signal shutdown and wake idle workers
         self._shutdown_event.set()
+        with self._queue_cond:
+            self._queue_cond.notify_all()
 
         # Wait for workers to finish
         for worker in self._worker_threads:
             worker.join(timeout=5.0)
 
-        # Clear caches and queues
+        # Clear caches and queues, failing requests that were never sent
         with self._queue_lock:
+            pending = list(self._futures.items())
             self._request_queue.clear()
+            self._queued.clear()
             self._active_requests.clear()
+            self._futures.clear()
+
+        for request_id, future in pending:
+            if not future.done():
+                future.set_result(
+                    APIResponse(
+                        request_id=request_id,
+                        data=None,
+                        success=False,
+                        error=RuntimeError("API optimizer shut down"),
+                    )
+                )
 
         with self._cache_lock:
             self._request_cache.clear()
+            self._expiry_heap.clear()
+            self._cache_bytes = 0
 
         self.logger.info("API optimizer shutdown complete")
 
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Astronomy Engine for Weather Dashboard
+Computes sun and moon rise/set times and the lunar phase locally from coordinates and date.
+
+Uses low-precision solar and lunar ephemerides (accurate to a few minutes for
+rise/set times), so astronomical data never costs an API request and is
+deterministic for a given location and date.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Tuple
+
+J2000 = 2451545.0  # Julian date of 2000-01-01 12:00 UTC
+UNIX_EPOCH_JD = 2440587.5  # Julian date of 1970-01-01 00:00 UTC
+OBLIQUITY = math.radians(23.4397)  # Obliquity of the ecliptic
+
+SUN_HORIZON = math.radians(-0.833)  # Refraction plus solar semi-diameter
+MOON_HORIZON = math.radians(0.125)  # Lunar parallax minus refraction and semi-diameter
+MOON_SAMPLE_MINUTES = 10  # Resolution of the moonrise/moonset horizon scan
+
+
+@dataclass(frozen=True)
+class AstronomyResult:
+    """Sun and moon events for one location and date (UTC datetimes)."""
+
+    sunrise: Optional[datetime]
+    sunset: Optional[datetime]
+    solar_noon: datetime
+    day_length: timedelta
+    moonrise: Optional[datetime]
+    moonset: Optional[datetime]
+    moon_phase: float  # 0-1 (0 = new moon, 0.5 = full moon)
+    polar_day: bool = False
+    polar_night: bool = False
+
+
+def julian_date(moment: datetime) -> float:
+    """Convert an aware (or naive UTC) datetime to a Julian date."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return UNIX_EPOCH_JD + (moment - datetime(1970, 1, 1)).total_seconds() / 86400.0
+
+
+def from_julian_date(jd: float) -> datetime:
+    """Convert a Julian date to an aware UTC datetime."""
+    return datetime.fromtimestamp((jd - UNIX_EPOCH_JD) * 86400.0, tz=timezone.utc)
+
+
+def local_solar_date(lon: float, moment: Optional[datetime] = None) -> date:
+    """Get the calendar date at a longitude, using mean solar time."""
+    moment = moment or datetime.now(timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment.astimezone(timezone.utc) + timedelta(hours=lon / 15.0)).date()
+
+
+def _sun_ecliptic_longitude(days: float) -> Tuple[float, float]:
+    """Get the sun's mean anomaly and ecliptic longitude (radians) for days since J2000."""
+    mean_anomaly = math.radians((357.5291 + 0.98560028 * days) % 360.0)
+    center = math.radians(
+        1.9148 * math.sin(mean_anomaly)
+        + 0.02 * math.sin(2 * mean_anomaly)
+        + 0.0003 * math.sin(3 * mean_anomaly)
+    )
+    perihelion = math.radians(102.9372)
+    return mean_anomaly, (mean_anomaly + center + perihelion + math.pi) % (2 * math.pi)
+
+
+def _moon_ecliptic_coords(days: float) -> Tuple[float, float]:
+    """Get the moon's ecliptic longitude and latitude (radians) for days since J2000."""
+    mean_longitude = math.radians(218.316 + 13.176396 * days)
+    mean_anomaly = math.radians(134.963 + 13.064993 * days)
+    mean_distance = math.radians(93.272 + 13.229350 * days)
+
+    longitude = mean_longitude + math.radians(6.289) * math.sin(mean_anomaly)
+    latitude = math.radians(5.128) * math.sin(mean_distance)
+    return longitude % (2 * math.pi), latitude
+
+
+def _equatorial(longitude: float, latitude: float) -> Tuple[float, float]:
+    """Convert ecliptic coordinates to right ascension and declination (radians)."""
+    right_ascension = math.atan2(
+        math.sin(longitude) * math.cos(OBLIQUITY) - math.tan(latitude) * math.sin(OBLIQUITY),
+        math.cos(longitude),
+    )
+    declination = math.asin(
+        math.sin(latitude) * math.cos(OBLIQUITY)
+        + math.cos(latitude) * math.sin(OBLIQUITY) * math.sin(longitude)
+    )
+    return right_ascension, declination
+
+
+def moon_altitude(jd: float, lat: float, lon: float) -> float:
+    """Get the geocentric altitude of the moon (radians) at a Julian date."""
+    days = jd - J2000
+    right_ascension, declination = _equatorial(*_moon_ecliptic_coords(days))
+    sidereal = math.radians(280.16 + 360.9856235 * days + lon)
+    hour_angle = sidereal - right_ascension
+    phi = math.radians(lat)
+    return math.asin(
+        math.sin(phi) * math.sin(declination)
+        + math.cos(phi) * math.cos(declination) * math.cos(hour_angle)
+    )
+
+
+def moon_phase(jd: float) -> float:
+    """Get the lunar phase as a 0-1 fraction of the synodic month (0 = new moon)."""
+    days = jd - J2000
+    _, sun_longitude = _sun_ecliptic_longitude(days)
+    moon_longitude, _ = _moon_ecliptic_coords(days)
+    elongation = (moon_longitude - sun_longitude) % (2 * math.pi)
+    return elongation / (2 * math.pi)
+
+
+def sun_times(
+    lat: float, lon: float, on_date: date
+) -> Tuple[Optional[float], Optional[float], float]:
+    """Compute sunrise, sunset and solar noon as Julian dates.
+
+    Returns:
+        Tuple of (sunrise, sunset, solar_noon); sunrise and sunset are None
+        during polar day or polar night.
+    """
+    day_number = (on_date - date(2000, 1, 1)).days
+    mean_solar_time = day_number + 0.0009 - lon / 360.0
+
+    mean_anomaly, ecliptic_longitude = _sun_ecliptic_longitude(mean_solar_time)
+    transit = (
+        J2000
+        + mean_solar_time
+        + 0.0053 * math.sin(mean_anomaly)
+        - 0.0069 * math.sin(2 * ecliptic_longitude)
+    )
+
+    declination = math.asin(math.sin(ecliptic_longitude) * math.sin(OBLIQUITY))
+    phi = math.radians(lat)
+    cos_hour_angle = (math.sin(SUN_HORIZON) - math.sin(phi) * math.sin(declination)) / (
+        math.cos(phi) * math.cos(declination)
+    )
+    if cos_hour_angle < -1.0 or cos_hour_angle > 1.0:
+        return None, None, transit
+
+    half_day = math.degrees(math.acos(cos_hour_angle)) / 360.0
+    return transit - half_day, transit + half_day, transit
+
+
+def moon_times(lat: float, lon: float, on_date: date) -> Tuple[Optional[float], Optional[float]]:
+    """Compute moonrise and moonset as Julian dates within the local solar day.
+
+    Scans the moon's altitude across the day and interpolates horizon crossings.
+    Either value is None when the event does not occur that day.
+    """
+    day_start = J2000 - 0.5 + (on_date - date(2000, 1, 1)).days - lon / 360.0
+    step = MOON_SAMPLE_MINUTES / 1440.0
+    samples = int(1440 / MOON_SAMPLE_MINUTES)
+
+    rise: Optional[float] = None
+    setting: Optional[float] = None
+    previous = moon_altitude(day_start, lat, lon) - MOON_HORIZON
+    for i in range(1, samples + 1):
+        jd = day_start + i * step
+        current = moon_altitude(jd, lat, lon) - MOON_HORIZON
+        if previous < 0 <= current and rise is None:
+            rise = jd - step * current / (current - previous)
+        elif previous >= 0 > current and setting is None:
+            setting = jd - step * current / (current - previous)
+        if rise is not None and setting is not None:
+            break
+        previous = current
+
+    return rise, setting
+
+
+@lru_cache(maxsize=1024)
+def _compute(lat: float, lon: float, on_date: date) -> AstronomyResult:
+    """Compute and memoize the astronomy result for rounded coordinates."""
+    sunrise, sunset, noon = sun_times(lat, lon, on_date)
+    moonrise, moonset = moon_times(lat, lon, on_date)
+
+    polar_day = polar_night = False
+    if sunrise is not None and sunset is not None:
+        day_length = timedelta(days=sunset - sunrise)
+    else:
+        # Sun never crosses the horizon: it is up all day if it is above at noon
+        _, ecliptic_longitude = _sun_ecliptic_longitude(noon - J2000)
+        declination = math.asin(math.sin(ecliptic_longitude) * math.sin(OBLIQUITY))
+        polar_day = lat * declination > 0
+        polar_night = not polar_day
+        day_length = timedelta(days=1) if polar_day else timedelta(0)
+
+    def to_datetime(jd: Optional[float]) -> Optional[datetime]:
+        return from_julian_date(jd) if jd is not None else None
+
+    return AstronomyResult(
+        sunrise=to_datetime(sunrise),
+        sunset=to_datetime(sunset),
+        solar_noon=from_julian_date(noon),
+        day_length=day_length,
+        moonrise=to_datetime(moonrise),
+        moonset=to_datetime(moonset),
+        moon_phase=round(moon_phase(noon), 4),
+        polar_day=polar_day,
+        polar_night=polar_night,
+    )
+
+
+def compute_astronomy(lat: float, lon: float, on_date: Optional[date] = None) -> AstronomyResult:
+    """Compute sun and moon events for a location.
+
+    Args:
+        lat: Latitude in degrees (north positive)
+        lon: Longitude in degrees (east positive)
+        on_date: Local calendar date; defaults to today at the given longitude
+
+    Returns:
+        AstronomyResult with UTC datetimes. Results are memoized per
+        (lat, lon, date) at ~1 km resolution.
+    """
+    on_date = on_date or local_solar_date(lon)
+    return _compute(round(lat, 2), round(lon, 2), on_date)
+
+
+def clear_cache() -> None:
+    """Clear memoized astronomy results."""
+    _compute.cache_clear()
@@ -1,32 +1,47 @@
 #!/usr/bin/env python3
 """
-Advanced Cache Manager for Weather Dashboard
-Provides intelligent caching with compression, LRU eviction, and performance tracking.
+Tiered Cache Manager for Weather Dashboard
+One cache for the whole application: an in-memory LRU (L1) bounded by entries
+and bytes, backed by an optional SQLite store (L2).
+
+Entries evicted from memory are demoted to disk and promoted back on the next
+hit. Services plug in through namespaces, which share the memory budget and one
+statistics surface. Persistent namespaces also write every entry to disk behind
+the caller, so they survive restarts; on startup only the disk index is read and
+values are deserialized on first access.
 """
 
 import gzip
 import json
 import logging
 import pickle
+import sqlite3
+import sys
 import threading
 import time
+import weakref
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+CacheKey = Tuple[str, str]  # (namespace, key)
+
+_DELETED = object()  # Pending-write marker for removed keys
+_MISSING = object()
 
 
 class CompressionType(Enum):
-    """Types of compression available."""
+    """Types of compression available for stored values."""
 
     NONE = "none"
     GZIP = "gzip"
-    PICKLE = "pickle"
 
 
 @dataclass
 class CacheEntry:
-    """Represents a cached item with metadata."""
+    """Represents an in-memory cached item with metadata."""
 
     value: Any
     created_at: float
@@ -34,13 +49,12 @@ class CacheEntry:
     access_count: int = 0
     last_accessed: float = field(default_factory=time.time)
     size_bytes: int = 0
-    compression: CompressionType = CompressionType.NONE
     tags: Set[str] = field(default_factory=set)
     priority: int = 1
 
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Check if the entry has expired."""
-        return self.expires_at is not None and time.time() > self.expires_at
+        return self.expires_at is not None and (now or time.time()) > self.expires_at
 
     def touch(self):
         """Update access time and count."""
@@ -48,13 +62,31 @@ class CacheEntry:
         self.access_count += 1
 
 
+@dataclass
+class DiskRecord:
+    """Index metadata of an entry stored on disk (read at startup without the value)."""
+
+    expires_at: Optional[float]
+    size_bytes: int
+    tags: Set[str] = field(default_factory=set)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Check if the stored entry has expired."""
+        return self.expires_at is not None and (now or time.time()) > self.expires_at
+
+
 @dataclass
 class CacheStats:
     """Cache performance statistics."""
 
     hits: int = 0
     misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
     evictions: int = 0
+    promotions: int = 0
+    demotions: int = 0
+    expirations: int = 0
     compressions: int = 0
     decompressions: int = 0
     total_size_bytes: int = 0
@@ -71,324 +103,964 @@ class CacheStats:
         return self.total_size_bytes / (1024 * 1024)
 
 
+class DiskTier:
+    """SQLite-backed second cache tier.
+
+    Writes are queued by the caller and committed in batches by a background
+    writer in WAL mode; reads see queued writes first.
+    """
+
+    def __init__(self, db_path: Path, flush_interval: float = 0.5, max_batch_size: int = 500):
+        """Initialize the disk tier.
+
+        Args:
+            db_path: SQLite database file
+            flush_interval: Maximum seconds a write waits before being committed
+            max_batch_size: Pending writes that trigger an early commit
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+
+        # (namespace, key) -> (blob, compression, expires_at, size_bytes, tags) or _DELETED
+        self._pending: Dict[CacheKey, Any] = {}
+        self._lock = threading.RLock()
+        self._pending_cond = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._shutdown = False
+        self._stats = {"flushes": 0, "last_flush_size": 0, "last_flush_time": 0.0}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._read_conn = self._connect()
+        with self._read_conn:
+            self._read_conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                "compression TEXT NOT NULL, expires_at REAL, size_bytes INTEGER NOT NULL, "
+                "tags TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self._read_conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires "
+                "ON cache_entries (expires_at)"
+            )
+
+        self._writer = threading.Thread(target=self._writer_loop, name="CacheDiskWriter", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent readers and one writer."""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def load_index(self) -> Dict[CacheKey, DiskRecord]:
+        """Read the metadata of every live entry, without loading values."""
+        with self._lock:
+            rows = self._read_conn.execute(
+                "SELECT namespace, key, expires_at, size_bytes, tags FROM cache_entries "
+                "WHERE expires_at IS NULL OR expires_at > ?",
+                (time.time(),),
+            ).fetchall()
+        return {
+            (namespace, key): DiskRecord(expires_at, size_bytes, set(json.loads(tags)))
+            for namespace, key, expires_at, size_bytes, tags in rows
+        }
+
+    def read(self, cache_key: CacheKey) -> Optional[Tuple[bytes, CompressionType]]:
+        """Read a stored value blob and its compression."""
+        with self._lock:
+            pending = self._pending.get(cache_key)
+            if pending is _DELETED:
+                return None
+            if pending is not None:
+                return pending[0], pending[1]
+
+            row = self._read_conn.execute(
+                "SELECT value, compression FROM cache_entries WHERE namespace = ? AND key = ?",
+                cache_key,
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], CompressionType(row[1])
+
+    def write(
+        self,
+        cache_key: CacheKey,
+        blob: bytes,
+        compression: CompressionType,
+        record: DiskRecord,
+    ) -> None:
+        """Queue a value for writing."""
+        with self._lock:
+            self._pending[cache_key] = (
+                blob,
+                compression,
+                record.expires_at,
+                record.size_bytes,
+                json.dumps(sorted(record.tags)),
+            )
+            if len(self._pending) >= self.max_batch_size:
+                self._pending_cond.notify()
+
+    def delete(self, cache_key: CacheKey) -> None:
+        """Queue a value for removal."""
+        with self._lock:
+            self._pending[cache_key] = _DELETED
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove every stored entry, or those of one namespace."""
+        with self._write_lock, self._lock:
+            if namespace is None:
+                self._pending.clear()
+            else:
+                for cache_key in [k for k in self._pending if k[0] == namespace]:
+                    del self._pending[cache_key]
+            with self._read_conn:
+                if namespace is None:
+                    self._read_conn.execute("DELETE FROM cache_entries")
+                else:
+                    self._read_conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ?", (namespace,)
+                    )
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from disk.
+
+        Returns:
+            Number of rows removed
+        """
+        with self._write_lock, self._lock:
+            with self._read_conn:
+                cursor = self._read_conn.execute(
+                    "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                    (time.time(),),
+                )
+            return cursor.rowcount
+
+    def _writer_loop(self) -> None:
+        """Commit pending writes in batches until shutdown."""
+        conn = self._connect()
+        try:
+            while True:
+                with self._lock:
+                    if not self._pending and not self._shutdown:
+                        self._pending_cond.wait(self.flush_interval)
+                    if self._shutdown and not self._pending:
+                        break
+                self._commit_pending(conn)
+        finally:
+            conn.close()
+
+    def _commit_pending(self, conn: sqlite3.Connection) -> None:
+        """Write all pending entries in one transaction."""
+        with self._write_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, {}
+
+            start = time.perf_counter()
+            now = time.time()
+            upserts = [
+                (namespace, key, blob, compression.value, expires_at, size, tags, now)
+                for (namespace, key), value in batch.items()
+                if value is not _DELETED
+                for blob, compression, expires_at, size, tags in (value,)
+            ]
+            deletes = [cache_key for cache_key, value in batch.items() if value is _DELETED]
+            try:
+                with conn:
+                    if upserts:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, "
+                            "compression, expires_at, size_bytes, tags, updated_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            upserts,
+                        )
+                    if deletes:
+                        conn.executemany(
+                            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", deletes
+                        )
+            except sqlite3.Error as e:
+                self.logger.warning(f"Failed to persist {len(batch)} cache entries: {e}")
+                with self._lock:
+                    # Keep newer writes that arrived meanwhile
+                    for cache_key, value in batch.items():
+                        self._pending.setdefault(cache_key, value)
+                return
+
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["last_flush_size"] = len(batch)
+                self._stats["last_flush_time"] = elapsed
+                self._pending_cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until all pending writes are committed.
+
+        Returns:
+            True if everything was committed within the timeout
+        """
+        deadline = time.time() + timeout
+        with self._lock:
+            while self._pending:
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self._writer.is_alive():
+                    return False
+                self._pending_cond.notify_all()
+                self._pending_cond.wait(min(remaining, self.flush_interval))
+        # A batch may still be mid-commit outside the lock
+        with self._write_lock:
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics."""
+        with self._lock:
+            stats = self._stats.copy()
+            stats["pending_writes"] = len(self._pending)
+        return stats
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        with self._lock:
+            self._shutdown = True
+            self._pending_cond.notify_all()
+        self._writer.join(timeout=5.0)
+        with self._lock:
+            try:
+                self._read_conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._read_conn.close()
+            except sqlite3.Error as e:
+                self.logger.debug(f"Cache disk tier close failed: {e}")
+
+
 class CacheManager:
-    """Advanced cache manager with compression and LRU eviction."""
+    """Tiered cache manager: memory LRU in front of an optional disk store."""
 
     def __init__(
         self,
-        max_size_mb: int = 100,
+        max_size_mb: float = 100,
+        max_entries: int = 10000,
         enable_compression: bool = True,
         compression_threshold: int = 1024,
-        lru_factor: float = 0.8,
+        disk_path: Optional[Path] = None,
+        flush_interval: float = 0.5,
     ):
         """
         Initialize the cache manager.
 
         Args:
-            max_size_mb: Maximum cache size in megabytes
-            enable_compression: Whether to enable automatic compression
-            compression_threshold: Size threshold for compression (bytes)
-            lru_factor: Factor for LRU eviction (0.0-1.0)
+            max_size_mb: Memory budget in megabytes
+            max_entries: Maximum entries kept in memory
+            enable_compression: Whether to gzip large values written to disk
+            compression_threshold: Serialized size above which values are compressed (bytes)
+            disk_path: SQLite file for the disk tier; memory only when omitted
+            flush_interval: Maximum seconds a disk write waits before being committed
         """
-        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_entries = max_entries
         self.enable_compression = enable_compression
         self.compression_threshold = compression_threshold
-        self.lru_factor = lru_factor
 
-        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._memory: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
         self._stats = CacheStats()
+        self._namespace_stats: Dict[str, Dict[str, int]] = {}
         self._lock = threading.RLock()
-        self._tag_index: Dict[str, Set[str]] = {}
+        self._namespaces: Dict[str, "CacheNamespace"] = {}
+
+        # namespace -> tag -> keys, covering entries in either tier
+        self._tag_index: Dict[str, Dict[str, Set[str]]] = {}
+
+        # namespace -> keys stored in either tier, expired ones included until removed
+        self._namespace_counts: Dict[str, int] = {}
 
         self.logger = logging.getLogger(__name__)
 
-    def get(self, key: str) -> Optional[Any]:
-        """Get a value from cache with LRU update."""
-        with self._lock:
-            if key not in self._cache:
-                self._stats.misses += 1
-                return None
+        # Optional background expiry sweeper
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_stop: Optional[threading.Event] = None
 
-            entry = self._cache[key]
+        # Disk tier: only the index is read at startup
+        self._disk: Optional[DiskTier] = None
+        self._disk_index: Dict[CacheKey, DiskRecord] = {}
+        if disk_path is not None:
+            self._disk = DiskTier(disk_path, flush_interval=flush_interval)
+            self._disk_index = self._disk.load_index()
+            for cache_key, record in self._disk_index.items():
+                self._index_tags(cache_key, record.tags)
+                self._adjust_count(cache_key, 1)
+            self.logger.info(f"📦 Cache index loaded: {len(self._disk_index)} entries on disk")
 
-            # Check expiration
-            if entry.is_expired():
-                self._remove_entry(key)
-                self._stats.misses += 1
-                return None
+        self._default = self.namespace("default")
 
-            # Update LRU order and access stats
-            entry.touch()
-            self._cache.move_to_end(key)
-            self._stats.hits += 1
+    # Namespaces
 
-            # Handle decompression
-            if entry.compression != CompressionType.NONE:
-                self._stats.decompressions += 1
+    def namespace(
+        self, name: str, default_ttl: Optional[int] = None, persistent: bool = True
+    ) -> "CacheNamespace":
+        """Get the view of the cache a service uses.
 
-            return self._decompress_value(entry.value, entry.compression)
+        Args:
+            name: Namespace name (keys are isolated per namespace)
+            default_ttl: TTL in seconds for entries set without one
+            persistent: Write every entry to disk so it survives restarts;
+                otherwise entries reach disk only when evicted from memory
+        """
+        with self._lock:
+            namespace = self._namespaces.get(name)
+            if namespace is None:
+                namespace = CacheNamespace(self, name, default_ttl, persistent)
+                self._namespaces[name] = namespace
+                self._namespace_stats[name] = {"hits": 0, "misses": 0}
+            return namespace
+
+    # Serialization
+
+    def _serialize(self, value: Any) -> Optional[bytes]:
+        """Pickle a value, or return None if it cannot be stored on disk."""
+        try:
+            return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return None
+
+    def _pack(self, payload: bytes) -> Tuple[bytes, CompressionType]:
+        """Compress a serialized value for disk if it is large enough."""
+        if self.enable_compression and len(payload) >= self.compression_threshold:
+            self._stats.compressions += 1
+            return gzip.compress(payload, compresslevel=5), CompressionType.GZIP
+        return payload, CompressionType.NONE
+
+    def _unpack(self, blob: bytes, compression: CompressionType) -> Any:
+        """Deserialize a value read from disk."""
+        if compression == CompressionType.GZIP:
+            self._stats.decompressions += 1
+            blob = gzip.decompress(blob)
+        return pickle.loads(blob)
+
+    # Core operations (namespaced keys)
+
+    def _count(self, namespace: str, hit: bool) -> None:
+        """Record a hit or miss globally and for a namespace."""
+        if hit:
+            self._stats.hits += 1
+            self._namespace_stats[namespace]["hits"] += 1
+        else:
+            self._stats.misses += 1
+            self._namespace_stats[namespace]["misses"] += 1
 
-    def set(
+    def _get(self, cache_key: CacheKey, default: Any = None) -> Any:
+        """Get a value, promoting it from disk on a memory miss."""
+        with self._lock:
+            now = time.time()
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                if entry.is_expired(now):
+                    self._remove(cache_key)
+                    self._stats.expirations += 1
+                    self._count(cache_key[0], False)
+                    return default
+
+                entry.touch()
+                self._memory.move_to_end(cache_key)
+                self._stats.memory_hits += 1
+                self._count(cache_key[0], True)
+                return entry.value
+
+            record = self._disk_index.get(cache_key)
+            if record is None:
+                self._count(cache_key[0], False)
+                return default
+            if record.is_expired(now):
+                self._remove(cache_key)
+                self._stats.expirations += 1
+                self._count(cache_key[0], False)
+                return default
+
+            stored = self._disk.read(cache_key)
+            try:
+                value = self._unpack(*stored) if stored else _MISSING
+            except Exception as e:
+                self.logger.warning(f"Dropping unreadable cache entry {cache_key}: {e}")
+                value = _MISSING
+            if value is _MISSING:
+                self._remove(cache_key)
+                self._count(cache_key[0], False)
+                return default
+
+            self._promote(cache_key, value, record)
+            self._stats.disk_hits += 1
+            self._count(cache_key[0], True)
+            return value
+
+    def _promote(self, cache_key: CacheKey, value: Any, record: DiskRecord) -> None:
+        """Move a value read from disk into memory."""
+        entry = CacheEntry(
+            value=value,
+            created_at=time.time(),
+            expires_at=record.expires_at,
+            size_bytes=record.size_bytes,
+            tags=set(record.tags),
+        )
+        if not self._namespaces[cache_key[0]].persistent:
+            # Memory-first namespaces keep a single copy, in the fastest tier
+            self._disk_index.pop(cache_key, None)
+            self._disk.delete(cache_key)
+        self._insert(cache_key, entry)
+        self._stats.promotions += 1
+
+    def _set(
         self,
-        key: str,
+        cache_key: CacheKey,
         value: Any,
-        ttl: Optional[int] = None,
-        tags: Optional[List[str]] = None,
-        priority: int = 1,
+        ttl: Optional[int],
+        tags: Optional[List[str]],
+        priority: int,
     ) -> bool:
-        """Set a value in cache with compression and LRU management."""
-        with self._lock:
-            # Remove existing entry if present
-            if key in self._cache:
-                self._remove_entry(key)
-
-            # Determine compression
-            compression_type = self._determine_compression(value)
-            compressed_value = self._compress_value(value, compression_type)
-
-            # Calculate size
-            size_bytes = self._calculate_size(compressed_value)
-
-            # Create entry
-            expires_at = time.time() + ttl if ttl else None
-            entry = CacheEntry(
-                value=compressed_value,
-                created_at=time.time(),
-                expires_at=expires_at,
-                size_bytes=size_bytes,
-                compression=compression_type,
-                tags=set(tags or []),
-                priority=priority,
-            )
-
-            # Ensure capacity
-            self._ensure_capacity(size_bytes)
-
-            # Add to cache
-            self._cache[key] = entry
-            self._stats.total_size_bytes += size_bytes
+        """Store a value in memory and, for persistent namespaces, on disk."""
+        payload = self._serialize(value)
+        size_bytes = len(payload) if payload is not None else sys.getsizeof(value)
+        now = time.time()
+        entry = CacheEntry(
+            value=value,
+            created_at=now,
+            expires_at=now + ttl if ttl else None,
+            size_bytes=size_bytes,
+            tags=set(tags or []),
+            priority=priority,
+        )
+        persist = (
+            self._disk is not None
+            and payload is not None
+            and self._namespaces[cache_key[0]].persistent
+        )
+        blob, compression = self._pack(payload) if persist else (None, CompressionType.NONE)
 
-            # Update tag index
-            for tag in entry.tags:
-                if tag not in self._tag_index:
-                    self._tag_index[tag] = set()
-                self._tag_index[tag].add(key)
+        with self._lock:
+            self._remove(cache_key)
+            if persist:
+                record = DiskRecord(entry.expires_at, size_bytes, entry.tags)
+                self._disk.write(cache_key, blob, compression, record)
+                self._disk_index[cache_key] = record
+            if size_bytes <= self.max_size_bytes:
+                self._insert(cache_key, entry)
+            elif not persist and not self._demote(cache_key, entry):
+                return False
+            self._index_tags(cache_key, entry.tags)
+            self._adjust_count(cache_key, 1)
+        return True
+
+    def _insert(self, cache_key: CacheKey, entry: CacheEntry) -> None:
+        """Add an entry to memory, evicting least recently used entries."""
+        self._memory[cache_key] = entry
+        self._stats.total_size_bytes += entry.size_bytes
+        self._evict_overflow(keep=1)
+
+    def _evict_overflow(self, keep: int = 0) -> None:
+        """Evict least recently used entries to disk until memory is within limits."""
+        while (
+            len(self._memory) > self.max_entries
+            or self._stats.total_size_bytes > self.max_size_bytes
+        ) and len(self._memory) > keep:
+            evicted_key, evicted = self._memory.popitem(last=False)
+            self._stats.total_size_bytes -= evicted.size_bytes
+            self._stats.evictions += 1
+            if evicted_key not in self._disk_index and not self._demote(evicted_key, evicted):
+                self._unindex_tags(evicted_key, evicted.tags)
+                self._adjust_count(evicted_key, -1)
 
-            # Update compression stats
-            if compression_type != CompressionType.NONE:
-                self._stats.compressions += 1
+    def _demote(self, cache_key: CacheKey, entry: CacheEntry) -> bool:
+        """Write an entry leaving memory to disk, if there is a disk tier.
 
-            return True
+        Returns:
+            True if the entry is now stored on disk
+        """
+        if self._disk is None or entry.is_expired():
+            return False
+        payload = self._serialize(entry.value)
+        if payload is None:
+            return False
+        blob, compression = self._pack(payload)
+        record = DiskRecord(entry.expires_at, entry.size_bytes, entry.tags)
+        self._disk.write(cache_key, blob, compression, record)
+        self._disk_index[cache_key] = record
+        self._stats.demotions += 1
+        return True
+
+    def _index_tags(self, cache_key: CacheKey, tags: Set[str]) -> None:
+        """Add a key to the tag index."""
+        if not tags:
+            return
+        by_tag = self._tag_index.setdefault(cache_key[0], {})
+        for tag in tags:
+            by_tag.setdefault(tag, set()).add(cache_key[1])
+
+    def _unindex_tags(self, cache_key: CacheKey, tags: Set[str]) -> None:
+        """Remove a key that left both tiers from the tag index."""
+        by_tag = self._tag_index.get(cache_key[0])
+        if not by_tag:
+            return
+        for tag in tags:
+            keys = by_tag.get(tag)
+            if keys is not None:
+                keys.discard(cache_key[1])
+                if not keys:
+                    del by_tag[tag]
+
+    def _remove(self, cache_key: CacheKey) -> bool:
+        """Remove an entry from both tiers (caller holds the lock)."""
+        entry = self._memory.pop(cache_key, None)
+        if entry is not None:
+            self._stats.total_size_bytes -= entry.size_bytes
+        record = self._disk_index.pop(cache_key, None)
+        if record is not None:
+            self._disk.delete(cache_key)
+
+        removed = entry or record
+        if removed is None:
+            return False
+        self._unindex_tags(cache_key, removed.tags)
+        self._adjust_count(cache_key, -1)
+        return True
+
+    def _adjust_count(self, cache_key: CacheKey, delta: int) -> None:
+        """Count a key entering (1) or leaving (-1) both tiers of its namespace."""
+        namespace = cache_key[0]
+        self._namespace_counts[namespace] = self._namespace_counts.get(namespace, 0) + delta
+
+    def _contains(self, cache_key: CacheKey) -> bool:
+        """Check if a live entry exists in either tier, without promoting it."""
+        with self._lock:
+            entry = self._memory.get(cache_key) or self._disk_index.get(cache_key)
+            return entry is not None and not entry.is_expired()
 
-    def _determine_compression(self, value: Any) -> CompressionType:
-        """Determine the best compression type for a value."""
-        if not self.enable_compression:
-            return CompressionType.NONE
+    def _keys(self, namespace: str) -> List[str]:
+        """Get live keys of a namespace across both tiers."""
+        now = time.time()
+        with self._lock:
+            keys = {
+                key
+                for (ns, key), entry in self._memory.items()
+                if ns == namespace and not entry.is_expired(now)
+            }
+            keys.update(
+                key
+                for (ns, key), record in self._disk_index.items()
+                if ns == namespace and not record.is_expired(now)
+            )
+        return list(keys)
 
-        # Estimate size
-        estimated_size = (
-            len(str(value))
-            if isinstance(value, (str, int, float))
-            else len(json.dumps(value, default=str))
-        )
+    def _count_keys(self, namespace: str) -> int:
+        """Count the keys of a namespace stored in either tier, without scanning them."""
+        with self._lock:
+            return self._namespace_counts.get(namespace, 0)
 
-        if estimated_size < self.compression_threshold:
-            return CompressionType.NONE
+    def _any_keys(self, namespace: str) -> bool:
+        """Check if a namespace has a live key, stopping at the first one found."""
+        now = time.time()
+        with self._lock:
+            if not self._namespace_counts.get(namespace):
+                return False
+            for tier in (self._memory, self._disk_index):
+                for (ns, _), entry in tier.items():
+                    if ns == namespace and not entry.is_expired(now):
+                        return True
+        return False
+
+    def _tagged_keys(self, namespace: str, tags: List[str]) -> Set[CacheKey]:
+        """Get keys of a namespace carrying any of the given tags."""
+        with self._lock:
+            by_tag = self._tag_index.get(namespace, {})
+            return {(namespace, key) for tag in set(tags) for key in by_tag.get(tag, ())}
 
-        # Use pickle for complex objects, gzip for strings/simple data
-        if isinstance(value, (dict, list, tuple)):
-            return CompressionType.PICKLE
-        else:
-            return CompressionType.GZIP
+    def _cleanup_expired(self, namespace: Optional[str] = None) -> int:
+        """Remove expired entries from both tiers."""
+        now = time.time()
+        with self._lock:
+            expired = [
+                cache_key
+                for cache_key, entry in list(self._memory.items()) + list(self._disk_index.items())
+                if (namespace is None or cache_key[0] == namespace) and entry.is_expired(now)
+            ]
+            removed = sum(1 for cache_key in set(expired) if self._remove(cache_key))
+            self._stats.expirations += removed
+        return removed
+
+    def _clear(self, namespace: Optional[str] = None) -> None:
+        """Remove all entries, or those of one namespace, from both tiers."""
+        with self._lock:
+            if namespace is None:
+                self._memory.clear()
+                self._disk_index.clear()
+                self._tag_index.clear()
+                self._namespace_counts.clear()
+                self._stats = CacheStats()
+                for stats in self._namespace_stats.values():
+                    stats.update(hits=0, misses=0)
+            else:
+                for cache_key in [k for k in self._memory if k[0] == namespace]:
+                    self._stats.total_size_bytes -= self._memory.pop(cache_key).size_bytes
+                for cache_key in [k for k in self._disk_index if k[0] == namespace]:
+                    del self._disk_index[cache_key]
+                self._tag_index.pop(namespace, None)
+                self._namespace_counts.pop(namespace, None)
+            if self._disk is not None:
+                self._disk.clear(namespace)
+
+    # Default namespace API
 
-    def _compress_value(self, value: Any, compression_type: CompressionType) -> Any:
-        """Compress a value based on compression type."""
-        if compression_type == CompressionType.NONE:
-            return value
-        elif compression_type == CompressionType.GZIP:
-            json_str = json.dumps(value, default=str)
-            return gzip.compress(json_str.encode("utf-8"))
-        elif compression_type == CompressionType.PICKLE:
-            return gzip.compress(pickle.dumps(value))
-        else:
-            return value
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value from cache with LRU update."""
+        return self._default.get(key)
 
-    def _decompress_value(self, value: Any, compression_type: CompressionType) -> Any:
-        """Decompress a value based on compression type."""
-        if compression_type == CompressionType.NONE:
-            return value
-        elif compression_type == CompressionType.GZIP:
-            decompressed = gzip.decompress(value).decode("utf-8")
-            return json.loads(decompressed)
-        elif compression_type == CompressionType.PICKLE:
-            return pickle.loads(gzip.decompress(value))
-        else:
-            return value
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        priority: int = 1,
+    ) -> bool:
+        """Set a value in cache."""
+        return self._default.set(key, value, ttl=ttl, tags=tags, priority=priority)
 
-    def _calculate_size(self, value: Any) -> int:
-        """Calculate the size of a value in bytes."""
-        if isinstance(value, bytes):
-            return len(value)
-        elif isinstance(value, str):
-            return len(value.encode("utf-8"))
-        else:
-            return len(pickle.dumps(value))
+    def delete(self, key: str) -> bool:
+        """Delete a value from cache."""
+        return self._default.delete(key)
 
-    def _ensure_capacity(self, new_size: int):
-        """Ensure cache has capacity for new entry."""
-        target_size = self.max_size_bytes - new_size
+    def get_by_tags(self, tags: List[str]) -> Dict[str, Any]:
+        """Get all cached items carrying any of the given tags."""
+        return self._default.get_by_tags(tags)
 
-        while self._stats.total_size_bytes > target_size and self._cache:
-            self._evict_lru_entries()
+    def clear_by_tags(self, tags: List[str]) -> int:
+        """Clear all cached items carrying any of the given tags."""
+        return self._default.clear_by_tags(tags)
 
-    def _evict_lru_entries(self):
-        """Evict least recently used entries."""
-        # Calculate how many entries to evict (based on LRU factor)
-        evict_count = max(1, int(len(self._cache) * (1 - self.lru_factor)))
+    def bulk_set(
+        self, items: Dict[str, Any], ttl: Optional[int] = None, tags: Optional[List[str]] = None
+    ) -> int:
+        """Set multiple items efficiently."""
+        return self._default.bulk_set(items, ttl=ttl, tags=tags)
 
-        # Get LRU entries (first items in OrderedDict)
-        lru_keys = list(self._cache.keys())[:evict_count]
+    def bulk_get(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple items efficiently."""
+        return self._default.bulk_get(keys)
 
-        for key in lru_keys:
-            self._remove_entry(key)
-            self._stats.evictions += 1
+    # Whole-cache maintenance and statistics
 
-    def _remove_entry(self, key: str):
-        """Remove an entry and update indexes."""
-        if key in self._cache:
-            entry = self._cache[key]
+    def cleanup_expired(self) -> int:
+        """Remove expired entries of every namespace.
 
-            # Update size
-            self._stats.total_size_bytes -= entry.size_bytes
+        Returns:
+            Number of entries removed
+        """
+        removed = self._cleanup_expired()
+        if self._disk is not None:
+            self._disk.purge_expired()
+        if removed:
+            self.logger.debug(f"Cleaned up {removed} expired cache entries")
+        return removed
+
+    def start_sweeper(self, interval: float) -> None:
+        """Remove expired entries every interval seconds on a background thread.
+
+        Expired entries are otherwise only dropped when read or when
+        cleanup_expired() is called. The thread holds only a weak reference,
+        so it ends on its own once the manager is garbage collected.
+        """
+        if interval <= 0:
+            raise ValueError("Sweeper interval must be positive")
+        self.stop_sweeper()
+        self._sweeper_stop = threading.Event()
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop,
+            args=(weakref.ref(self), self._sweeper_stop, interval),
+            name="CacheSweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop the background expiry sweeper if it is running."""
+        if self._sweeper_stop is not None:
+            self._sweeper_stop.set()
+        self._sweeper = None
+        self._sweeper_stop = None
+
+    @staticmethod
+    def _sweep_loop(
+        manager_ref: "weakref.ref[CacheManager]", stop: threading.Event, interval: float
+    ) -> None:
+        """Sweeper thread body."""
+        while not stop.wait(interval):
+            manager = manager_ref()
+            if manager is None:
+                return
+            try:
+                manager.cleanup_expired()
+            except Exception as e:
+                manager.logger.warning(f"Cache sweep failed: {e}")
+            del manager
 
-            # Update tag index
-            for tag in entry.tags:
-                if tag in self._tag_index:
-                    self._tag_index[tag].discard(key)
-                    if not self._tag_index[tag]:
-                        del self._tag_index[tag]
+    def optimize_memory(self) -> Dict[str, int]:
+        """Drop expired entries to free memory."""
+        return {"cleaned": self.cleanup_expired()}
 
-            # Remove from cache
-            del self._cache[key]
+    def configure(
+        self, max_size_mb: Optional[float] = None, max_entries: Optional[int] = None
+    ) -> None:
+        """Update memory limits, evicting to disk as needed."""
+        with self._lock:
+            if max_size_mb is not None:
+                self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+            if max_entries is not None:
+                self.max_entries = max_entries
+            self._evict_overflow()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive cache statistics."""
         with self._lock:
-            return {
+            disk_only = sum(1 for key in self._disk_index if key not in self._memory)
+            stats = {
                 "hit_rate": self._stats.hit_rate,
                 "hits": self._stats.hits,
                 "misses": self._stats.misses,
+                "memory_hits": self._stats.memory_hits,
+                "disk_hits": self._stats.disk_hits,
                 "evictions": self._stats.evictions,
+                "promotions": self._stats.promotions,
+                "demotions": self._stats.demotions,
+                "expirations": self._stats.expirations,
                 "compressions": self._stats.compressions,
                 "decompressions": self._stats.decompressions,
                 "total_size_mb": self._stats.total_size_mb,
-                "total_entries": len(self._cache),
+                "total_entries": len(self._memory) + disk_only,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk_index),
                 "max_size_mb": self.max_size_bytes / (1024 * 1024),
                 "utilization": (self._stats.total_size_bytes / self.max_size_bytes) * 100,
+                "namespaces": {
+                    name: namespace.get_stats(include_shared=False)
+                    for name, namespace in self._namespaces.items()
+                },
             }
-
-    def get_by_tags(self, tags: List[str]) -> Dict[str, Any]:
-        """Get all cached items with specified tags."""
+        if self._disk is not None:
+            stats["disk"] = self._disk.get_stats()
+        return stats
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until queued disk writes are committed."""
+        return self._disk.flush(timeout) if self._disk is not None else True
+
+    def close(self) -> None:
+        """Flush memory-only entries to disk and stop the sweeper and disk writer."""
+        self.stop_sweeper()
+        if self._disk is None:
+            return
         with self._lock:
-            result = {}
+            for cache_key, entry in self._memory.items():
+                if cache_key not in self._disk_index:
+                    self._demote(cache_key, entry)
+        self._disk.close()
+        self.logger.debug("Cache manager closed")
+
+    def clear(self):
+        """Clear all cached items."""
+        self._clear()
+
+    def __len__(self) -> int:
+        """Get number of cached items in the default namespace."""
+        return len(self._default)
 
-            # Find keys with matching tags
-            matching_keys = set()
-            for tag in tags:
-                if tag in self._tag_index:
-                    if not matching_keys:
-                        matching_keys = self._tag_index[tag].copy()
-                    else:
-                        matching_keys &= self._tag_index[tag]
+    def __contains__(self, key: str) -> bool:
+        """Check if key exists in the default namespace."""
+        return key in self._default
 
-            # Get values for matching keys
-            for key in matching_keys:
-                value = self.get(key)
-                if value is not None:
-                    result[key] = value
 
-            return result
+class CacheNamespace:
+    """A service's view of the shared cache.
 
-    def clear_by_tags(self, tags: List[str]) -> int:
-        """Clear all cached items with specified tags."""
-        with self._lock:
-            # Find keys with matching tags
-            matching_keys = set()
-            for tag in tags:
-                if tag in self._tag_index:
-                    matching_keys.update(self._tag_index[tag])
+    Supports the dict protocol (``in``, ``[]``, ``del``) so services can use it
+    as a drop-in replacement for a plain dict cache.
+    """
+
+    def __init__(
+        self,
+        manager: CacheManager,
+        name: str,
+        default_ttl: Optional[int] = None,
+        persistent: bool = True,
+    ):
+        """Initialize the namespace (use CacheManager.namespace)."""
+        self.manager = manager
+        self.name = name
+        self.default_ttl = default_ttl
+        self.persistent = persistent
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, promoting it from disk if needed."""
+        return self.manager._get((self.name, key), default)
 
-            # Remove matching entries
-            removed_count = 0
-            for key in list(matching_keys):
-                if key in self._cache:
-                    self._remove_entry(key)
-                    removed_count += 1
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        priority: int = 1,
+    ) -> bool:
+        """Set a value (uses the namespace default TTL when ttl is None)."""
+        return self.manager._set(
+            (self.name, key), value, ttl if ttl is not None else self.default_ttl, tags, priority
+        )
+
+    def delete(self, key: str) -> bool:
+        """Delete a value from both tiers."""
+        with self.manager._lock:
+            return self.manager._remove((self.name, key))
+
+    def exists(self, key: str) -> bool:
+        """Check if a live value exists."""
+        return self.manager._contains((self.name, key))
 
-            return removed_count
+    def keys(self) -> List[str]:
+        """Get live keys across both tiers."""
+        return self.manager._keys(self.name)
+
+    def get_by_tags(self, tags: List[str]) -> Dict[str, Any]:
+        """Get all items carrying any of the given tags."""
+        result = {}
+        for cache_key in self.manager._tagged_keys(self.name, tags):
+            value = self.manager._get(cache_key, _MISSING)
+            if value is not _MISSING:
+                result[cache_key[1]] = value
+        return result
+
+    def clear_by_tags(self, tags: List[str]) -> int:
+        """Clear all items carrying any of the given tags."""
+        with self.manager._lock:
+            return sum(
+                1
+                for cache_key in self.manager._tagged_keys(self.name, tags)
+                if self.manager._remove(cache_key)
+            )
 
     def bulk_set(
         self, items: Dict[str, Any], ttl: Optional[int] = None, tags: Optional[List[str]] = None
     ) -> int:
         """Set multiple items efficiently."""
-        success_count = 0
-        for key, value in items.items():
-            if self.set(key, value, ttl=ttl, tags=tags):
-                success_count += 1
-        return success_count
+        return sum(1 for key, value in items.items() if self.set(key, value, ttl=ttl, tags=tags))
 
     def bulk_get(self, keys: List[str]) -> Dict[str, Any]:
         """Get multiple items efficiently."""
         result = {}
         for key in keys:
-            value = self.get(key)
-            if value is not None:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
                 result[key] = value
         return result
 
-    def optimize_memory(self) -> Dict[str, int]:
-        """Optimize memory usage by recompressing and cleaning up."""
-        with self._lock:
-            stats = {"recompressed": 0, "cleaned": 0}
-
-            # Clean expired entries
-            expired_keys = []
-            for key, entry in self._cache.items():
-                if entry.is_expired():
-                    expired_keys.append(key)
-
-            for key in expired_keys:
-                self._remove_entry(key)
-                stats["cleaned"] += 1
-
-            # Recompress entries that might benefit
-            for key, entry in list(self._cache.items()):
-                if entry.compression == CompressionType.NONE:
-                    new_compression = self._determine_compression(entry.value)
-                    if new_compression != CompressionType.NONE:
-                        # Re-set with compression
-                        value = entry.value
-                        tags = list(entry.tags)
-                        ttl = int(entry.expires_at - time.time()) if entry.expires_at else None
-
-                        self._remove_entry(key)
-                        self.set(key, value, ttl=ttl, tags=tags, priority=entry.priority)
-                        stats["recompressed"] += 1
-
-            return stats
+    def cleanup_expired(self) -> int:
+        """Remove expired entries of this namespace."""
+        return self.manager._cleanup_expired(self.name)
 
-    def clear(self):
-        """Clear all cached items."""
-        with self._lock:
-            self._cache.clear()
-            self._tag_index.clear()
-            self._stats = CacheStats()
+    def clear(self) -> None:
+        """Remove every entry of this namespace."""
+        self.manager._clear(self.name)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until queued disk writes are committed."""
+        return self.manager.flush(timeout)
+
+    def configure(self, max_size: Optional[int] = None, default_ttl: Optional[int] = None):
+        """Update the namespace default TTL and the shared memory entry limit."""
+        if default_ttl is not None:
+            self.default_ttl = default_ttl
+        if max_size is not None:
+            self.manager.configure(max_entries=max_size)
+
+    def import_json(self, json_path: Path) -> int:
+        """Import a legacy whole-file JSON cache into an empty namespace.
+
+        Returns:
+            Number of entries imported
+        """
+        json_path = Path(json_path)
+        if not json_path.exists() or self.manager._any_keys(self.name):
+            return 0
+
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+            imported = self.bulk_set(legacy)
+            self.manager.logger.info(f"📦 Imported {imported} entries from {json_path.name}")
+            return imported
+        except Exception as e:
+            self.manager.logger.warning(f"Failed to import legacy cache {json_path}: {e}")
+            return 0
+
+    def get_stats(self, include_shared: bool = True) -> Dict[str, Any]:
+        """Get statistics for this namespace.
+
+        Args:
+            include_shared: Also include the statistics of the whole cache
+        """
+        with self.manager._lock:
+            counters = self.manager._namespace_stats[self.name]
+            total = counters["hits"] + counters["misses"]
+            stats = {
+                "entries": len(self),
+                "hits": counters["hits"],
+                "misses": counters["misses"],
+                "hit_rate": (counters["hits"] / total * 100) if total else 0.0,
+            }
+        if include_shared:
+            stats["shared"] = self.manager.get_stats()
+        return stats
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.exists(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
 
     def __len__(self) -> int:
-        """Get number of cached items."""
-        return len(self._cache)
+        """Count the stored keys, including expired ones not removed yet."""
+        return self.manager._count_keys(self.name)
 
-    def __contains__(self, key: str) -> bool:
-        """Check if key exists in cache."""
-        with self._lock:
-            return key in self._cache and not self._cache[key].is_expired()
+
+_shared_cache: Optional[CacheManager] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_cache_manager() -> CacheManager:
+    """Get the process-wide tiered cache, persisted under ./cache."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = CacheManager(disk_path=Path.cwd() / "cache" / "tiered_cache.db")
+        return _shared_cache
+
+
+def close_cache_manager() -> None:
+    """Flush and close the process-wide tiered cache."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is not None:
+            _shared_cache.close()
+            _shared_cache = None
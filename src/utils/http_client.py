@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client for Weather Dashboard
+Single transport layer for all outbound API calls with keep-alive pooling,
+per-host concurrency limits, timeouts, retries and per-host metrics.
+
+The sync facade wraps one requests.Session; the async facade wraps one
+httpx.AsyncClient per event loop. Both are reached through get_http_client(),
+so every service shares the same pools and TLS sessions.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+@dataclass
+class HTTPClientConfig:
+    """Transport configuration shared by the sync and async facades."""
+
+    connect_timeout: float = 3.0
+    read_timeout: float = 5.0
+    max_retries: int = 3
+    backoff_factor: float = 1.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    retry_methods: Tuple[str, ...] = ("HEAD", "GET", "OPTIONS")
+    pool_connections: int = 20  # Hosts kept in the pool manager
+    pool_maxsize: int = 50  # Keep-alive connections per host
+    per_host_limit: int = 8  # Concurrent in-flight requests per host
+    user_agent: str = "WeatherDashboard/1.0"
+
+
+@dataclass
+class HostStats:
+    """Latency and connection counters for one host."""
+
+    requests: int = 0
+    failures: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    async_streams: Set[int] = field(default_factory=set, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-friendly summary."""
+        connections = self.connections_opened + self.connections_reused
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "avg_latency_ms": round(self.total_latency / max(1, self.requests) * 1000, 2),
+            "max_latency_ms": round(self.max_latency * 1000, 2),
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / connections, 3) if connections else 0.0,
+        }
+
+
+@dataclass
+class _LoopResources:
+    """Async client and per-host limits bound to one event loop."""
+
+    client: Any
+    semaphores: Dict[str, asyncio.Semaphore] = field(default_factory=dict)
+    closer: Optional[AsyncIterator[None]] = None
+
+
+class HTTPClient:
+    """Pooled HTTP client with sync and async facades."""
+
+    def __init__(self, config: Optional[HTTPClientConfig] = None):
+        """Initialize the HTTP client."""
+        self.config = config or HTTPClientConfig()
+        self.logger = logging.getLogger(__name__)
+
+        self._session = self._create_session()
+        self._stats: Dict[str, HostStats] = {}
+        self._stats_lock = threading.Lock()
+
+        # Per-host concurrency limits
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._semaphore_lock = threading.Lock()
+
+        # One async client per event loop, dropped when the loop shuts down
+        self._loop_resources: "weakref.WeakKeyDictionary[Any, _LoopResources]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _create_session(self) -> requests.Session:
+        """Create the keep-alive session with retry policy."""
+        session = requests.Session()
+        retry_strategy = Retry(
+            total=self.config.max_retries,
+            status_forcelist=list(self.config.retry_statuses),
+            allowed_methods=list(self.config.retry_methods),
+            backoff_factor=self.config.backoff_factor,
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=False,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(
+            {
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+                "User-Agent": self.config.user_agent,
+            }
+        )
+        return session
+
+    @property
+    def default_timeout(self) -> Tuple[float, float]:
+        """Default (connect, read) timeout."""
+        return (self.config.connect_timeout, self.config.read_timeout)
+
+    @staticmethod
+    def _host_of(url: str) -> str:
+        """Get the host[:port] a URL targets."""
+        return urlsplit(url).netloc.lower()
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        """Get the in-flight limit for a host."""
+        with self._semaphore_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.config.per_host_limit)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _record(self, host: str, latency: float, success: bool) -> HostStats:
+        """Record one request outcome for a host."""
+        with self._stats_lock:
+            stats = self._stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+            if not success:
+                stats.failures += 1
+            return stats
+
+    # Sync facade
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session.
+
+        Accepts the keyword arguments of requests.Session.request. Raises the
+        usual requests exceptions so callers keep their error handling.
+        """
+        kwargs.setdefault("timeout", self.default_timeout)
+        host = self._host_of(url)
+
+        with self._host_semaphore(host):
+            start = time.perf_counter()
+            success = False
+            try:
+                response = self._session.request(method, url, **kwargs)
+                success = response.status_code < 500
+                return response
+            finally:
+                self._record(host, time.perf_counter() - start, success)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request."""
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        """Send a PUT request."""
+        return self.request("PUT", url, **kwargs)
+
+    # Async facade
+
+    def _new_async_client(self):
+        """Create an httpx client with the configured pool and timeouts."""
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self.config.read_timeout, connect=self.config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.config.pool_maxsize,
+                max_keepalive_connections=self.config.pool_connections,
+            ),
+            headers={"User-Agent": self.config.user_agent},
+            follow_redirects=True,
+        )
+
+    def _evict_closed_loops(self) -> None:
+        """Forget resources of loops that were closed without shutting down asyncgens."""
+        with self._semaphore_lock:
+            for loop in [loop for loop in list(self._loop_resources) if loop.is_closed()]:
+                self._loop_resources.pop(loop, None)
+
+    async def _close_on_shutdown(self, client) -> AsyncIterator[None]:
+        """Close a loop's client when the loop shuts down its async generators.
+
+        asyncio.run() finalizes pending async generators before closing the
+        loop, so the finally block runs while the client can still be awaited.
+        """
+        try:
+            yield
+        finally:
+            loop = asyncio.get_running_loop()
+            with self._semaphore_lock:
+                resources = self._loop_resources.get(loop)
+                if resources is not None and resources.client is client:
+                    del self._loop_resources[loop]
+            await client.aclose()
+
+    async def _loop_state(self) -> _LoopResources:
+        """Get the async client and host limits bound to the running event loop."""
+        if httpx is None:
+            raise RuntimeError("httpx is required for async HTTP requests")
+
+        loop = asyncio.get_running_loop()
+        with self._semaphore_lock:
+            resources = self._loop_resources.get(loop)
+            if resources is not None and not resources.client.is_closed:
+                return resources
+            resources = _LoopResources(client=self._new_async_client())
+            self._loop_resources[loop] = resources
+
+        self._evict_closed_loops()
+        resources.closer = self._close_on_shutdown(resources.client)
+        await resources.closer.asend(None)
+        return resources
+
+    def _async_semaphore(self, resources: _LoopResources, host: str) -> asyncio.Semaphore:
+        """Get the in-flight limit for a host on a loop."""
+        with self._semaphore_lock:
+            semaphore = resources.semaphores.get(host)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.config.per_host_limit)
+                resources.semaphores[host] = semaphore
+            return semaphore
+
+    def _retry_delay(self, attempt: int, response=None) -> float:
+        """Backoff before retry number ``attempt`` (honours Retry-After)."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        return self.config.backoff_factor * (2**attempt)
+
+    async def arequest(self, method: str, url: str, **kwargs):
+        """Send a request through the shared async pool.
+
+        Accepts the keyword arguments of httpx.AsyncClient.request and applies
+        the same retry policy as the sync facade.
+        """
+        resources = await self._loop_state()
+        client = resources.client
+        host = self._host_of(url)
+        retryable = method.upper() in self.config.retry_methods
+
+        async with self._async_semaphore(resources, host):
+            start = time.perf_counter()
+            success = False
+            try:
+                for attempt in range(self.config.max_retries + 1):
+                    last_attempt = not retryable or attempt == self.config.max_retries
+                    try:
+                        response = await client.request(method, url, **kwargs)
+                    except (httpx.TimeoutException, httpx.TransportError):
+                        if last_attempt:
+                            raise
+                        await asyncio.sleep(self._retry_delay(attempt))
+                        continue
+
+                    if response.status_code in self.config.retry_statuses and not last_attempt:
+                        await asyncio.sleep(self._retry_delay(attempt, response))
+                        continue
+
+                    success = response.status_code < 500
+                    self._record_async_stream(host, response)
+                    return response
+            finally:
+                self._record(host, time.perf_counter() - start, success)
+
+    def _record_async_stream(self, host: str, response) -> None:
+        """Count whether an async response reused a pooled connection."""
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        with self._stats_lock:
+            stats = self._stats.setdefault(host, HostStats())
+            if id(stream) in stats.async_streams:
+                stats.connections_reused += 1
+            else:
+                stats.async_streams.add(id(stream))
+                stats.connections_opened += 1
+
+    async def aget(self, url: str, **kwargs):
+        """Send an async GET request."""
+        return await self.arequest("GET", url, **kwargs)
+
+    # Metrics and lifecycle
+
+    def _sync_pool_counters(self) -> Dict[str, Tuple[int, int]]:
+        """Get (connections opened, requests sent) per host from urllib3 pools."""
+        counters: Dict[str, Tuple[int, int]] = {}
+        for adapter in set(self._session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.host}:{pool.port}" if pool.port not in (80, 443, None) else pool.host
+                opened, sent = counters.get(host, (0, 0))
+                counters[host] = (opened + pool.num_connections, sent + pool.num_requests)
+        return counters
+
+    def get_host_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-host latency and connection-reuse counters."""
+        pool_counters = self._sync_pool_counters()
+        with self._stats_lock:
+            summary = {host: stats.to_dict() for host, stats in self._stats.items()}
+
+        for host, (opened, sent) in pool_counters.items():
+            entry = summary.setdefault(host, HostStats().to_dict())
+            entry["connections_opened"] += opened
+            entry["connections_reused"] += max(0, sent - opened)
+            total = entry["connections_opened"] + entry["connections_reused"]
+            entry["reuse_ratio"] = round(entry["connections_reused"] / total, 3) if total else 0.0
+        return summary
+
+    def reset_stats(self) -> None:
+        """Reset latency counters (pool connection counters are cumulative)."""
+        with self._stats_lock:
+            self._stats.clear()
+
+    async def aclose(self) -> None:
+        """Close the async client bound to the running event loop."""
+        with self._semaphore_lock:
+            resources = self._loop_resources.pop(asyncio.get_running_loop(), None)
+        if resources is None:
+            return
+        if resources.closer is not None:
+            await resources.closer.aclose()
+        else:
+            await resources.client.aclose()
+
+    def close(self) -> None:
+        """Close the sync session and forget async clients."""
+        self._session.close()
+        with self._semaphore_lock:
+            self._loop_resources.clear()
+        self.logger.debug("Shared HTTP client closed")
+
+
+_shared_client: Optional[HTTPClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Get the process-wide HTTP client."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HTTPClient()
+        return _shared_client
+
+
+def close_http_client() -> None:
+    """Close and discard the process-wide HTTP client."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Single-Flight Request Coalescing for Weather Dashboard
+Lets concurrent callers asking for the same key share one in-flight call.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _InFlightCall:
+    """A call in progress, shared with the callers waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces duplicate concurrent calls by key."""
+
+    def __init__(self):
+        """Initialize the coalescer."""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._stats = {"executions": 0, "coalesced": 0}
+
+    def do(self, key: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``func`` once per key at a time.
+
+        The first caller for a key executes ``func``; callers arriving while it
+        is in flight block and receive the same result (or exception).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._stats["executions"] += 1
+                leader = True
+            else:
+                self._stats["coalesced"] += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Get the number of keys currently being executed."""
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get execution and coalescing counts."""
+        with self._lock:
+            stats = self._stats.copy()
+            stats["in_flight"] = len(self._calls)
+        return stats
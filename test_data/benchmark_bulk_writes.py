@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for repository bulk writes.
+Creates and then updates 5,000 activity recommendations one call at a time
+and through create_many/update_many (executemany in one transaction).
+
+Run from the project root: python test_data/benchmark_bulk_writes.py
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.async_sqlite import close_shared_connections
+from src.data.repositories import ActivityRecommendation, ActivityRepository
+
+RECORDS = 5_000
+
+
+def make_activities(suffix: str):
+    """Build activity recommendations with fixed IDs."""
+    return [
+        ActivityRecommendation(
+            id=f"activity-{i}",
+            activity_name=f"Activity {i} {suffix}",
+            equipment_needed=["shoes", "water"],
+        )
+        for i in range(RECORDS)
+    ]
+
+
+async def one_by_one(repo: ActivityRepository) -> tuple:
+    """Create and update each record with its own call and commit."""
+    start = time.perf_counter()
+    for activity in make_activities("created"):
+        await repo.create(activity)
+    created = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for activity in make_activities("updated"):
+        await repo.update(activity.id, activity)
+    return created, time.perf_counter() - start
+
+
+async def bulk(repo: ActivityRepository) -> tuple:
+    """Create and update all records through the bulk API."""
+    start = time.perf_counter()
+    await repo.create_many(make_activities("created"))
+    created = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await repo.update_many({activity.id: activity for activity in make_activities("updated")})
+    return created, time.perf_counter() - start
+
+
+async def main_async():
+    """Time both write paths against fresh databases."""
+    results = {}
+    for name, writer in (("One by one", one_by_one), ("create/update_many", bulk)):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = ActivityRepository(str(Path(tmp) / "activities.db"))
+            results[name] = await writer(repo)
+            assert await repo.count() == RECORDS
+            await close_shared_connections()
+
+    print(f"\n{RECORDS:,} activity recommendations")
+    for name, (created, updated) in results.items():
+        print(f"  {name:<18} create {created * 1000:8.1f} ms  update {updated * 1000:8.1f} ms")
+
+    base_create, base_update = results["One by one"]
+    bulk_create, bulk_update = results["create/update_many"]
+    print(
+        f"  Speedup: create {base_create / bulk_create:.1f}x, "
+        f"update {base_update / bulk_update:.1f}x"
+    )
+
+
+def main():
+    """Run the bulk write benchmark."""
+    print("Repository Bulk Write Benchmark")
+    print("=" * 50)
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
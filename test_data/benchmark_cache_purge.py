@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark for expired row maintenance of the SQLite weather cache.
+Simulates two days of hourly refreshes for rotating locations with and
+without the scheduled purge and reports the database size, then times the
+worst reader stall during one unbounded DELETE and the batched purge.
+
+Run from the project root: python test_data/benchmark_cache_purge.py
+"""
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.async_sqlite import close_shared_connections
+from src.data.repositories import WeatherRepository
+from src.models.location.location_models import Location
+from src.models.weather.current_weather import WeatherCondition, WeatherData
+
+HOURS = 48
+LOCATIONS_PER_HOUR = 2_000
+STALL_ROWS = 100_000
+
+
+def make_weather(start: int, count: int):
+    """Build current weather for count distinct locations."""
+    now = datetime.now()
+    return [
+        WeatherData(
+            location=Location(
+                name=f"City {i}", country="US", latitude=(i % 1800) * 0.1, longitude=i // 1800
+            ),
+            timestamp=now,
+            condition=WeatherCondition.CLEAR,
+            description="clear sky",
+            temperature=20.0,
+            feels_like=19.0,
+            humidity=50,
+            pressure=1013.0,
+        )
+        for i in range(start, start + count)
+    ]
+
+
+async def expire_all(repo: WeatherRepository) -> None:
+    """Age every cached row past its expiry."""
+    expired = (datetime.now() - timedelta(hours=1)).isoformat()
+    await repo._execute("UPDATE weather_cache SET expires_at = ?", (expired,))
+
+
+async def database_mb(repo: WeatherRepository) -> float:
+    """Get the allocated size of the database."""
+    row = await repo._fetchone(
+        "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+    )
+    return row[0] / 1024 / 1024
+
+
+async def uptime(repo: WeatherRepository, purge: bool) -> list:
+    """Refresh rotating locations hourly, optionally purging after each hour."""
+    purges = []
+    for hour in range(HOURS):
+        await expire_all(repo)
+        await repo.create_many(make_weather(hour * LOCATIONS_PER_HOUR, LOCATIONS_PER_HOUR))
+        if purge:
+            purges.append(await repo.purge_expired())
+    return purges
+
+
+async def worst_read_stall(repo: WeatherRepository, purge) -> tuple:
+    """Run purge while a reader polls, and return elapsed seconds and the slowest read."""
+    done = asyncio.Event()
+    latencies = []
+
+    async def reader():
+        while not done.is_set():
+            start = time.perf_counter()
+            await repo._fetchone("SELECT COUNT(*) FROM weather_cache WHERE expires_at > ?", ("",))
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(reader())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await purge()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await task
+    return elapsed, max(latencies)
+
+
+async def main_async():
+    """Compare database growth and reader stalls with and without the purge."""
+    print(f"\n{HOURS} hourly refreshes of {LOCATIONS_PER_HOUR:,} rotating locations")
+    for name, purge in (("Never purged", False), ("Purged hourly", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = WeatherRepository(str(Path(tmp) / "weather_cache.db"))
+            purges = await uptime(repo, purge)
+            rows = (await repo._fetchone("SELECT COUNT(*) FROM weather_cache"))[0]
+            print(f"  {name:<14} {rows:>8,} rows  {await database_mb(repo):7.1f} MB")
+            if purges:
+                times = [stats["elapsed_ms"] for stats in purges]
+                print(
+                    f"  {'':<14} {purges[-1]['rows_removed']:,} rows/purge, "
+                    f"{statistics.mean(times):.1f} ms mean, {max(times):.1f} ms max, "
+                    f"{sum(stats['pages_freed'] for stats in purges):,} pages freed"
+                )
+            await close_shared_connections()
+
+    print(f"\nPurging {STALL_ROWS:,} expired rows while a reader polls")
+    for name, batched in (("One DELETE", False), ("purge_expired", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = WeatherRepository(str(Path(tmp) / "weather_cache.db"))
+            await repo.create_many(make_weather(0, STALL_ROWS))
+            await expire_all(repo)
+            if batched:
+                purge = repo.purge_expired
+            else:
+                purge = lambda: repo._execute(  # noqa: E731
+                    "DELETE FROM weather_cache WHERE expires_at <= ?", (datetime.now().isoformat(),)
+                )
+            elapsed, stall = await worst_read_stall(repo, purge)
+            print(f"  {name:<14} {elapsed * 1000:8.1f} ms total  worst read {stall * 1000:7.1f} ms")
+            await close_shared_connections()
+
+
+def main():
+    """Run the cache purge benchmark."""
+    print("Cache Purge Benchmark")
+    print("=" * 50)
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
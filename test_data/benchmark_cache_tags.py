@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark for tag queries on the tiered cache.
+Fills a memory cache with 50k entries spread over 1k tags and reports the cost
+of get_by_tags and clear_by_tags through the tag index, against the previous
+scan of every entry.
+
+Run from the project root: python test_data/benchmark_cache_tags.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.cache_manager import CacheManager
+
+ENTRIES = 50_000
+TAGS = 1_000
+QUERIES = 200
+
+
+def scan_tagged_keys(cache: CacheManager, tags) -> set:
+    """The previous lookup: check the tags of every entry."""
+    wanted = set(tags)
+    return {key for key, entry in cache._memory.items() if entry.tags & wanted}
+
+
+def main():
+    """Run the tag query benchmark."""
+    print("Cache Tag Index Benchmark")
+    print("=" * 50)
+
+    cache = CacheManager(max_size_mb=512, max_entries=ENTRIES)
+    for i in range(ENTRIES):
+        cache.set(f"weather:{i}", {"temp": 20.0}, tags=[f"city:{i % TAGS}", "weather"])
+
+    rng = random.Random(42)
+    queried = [f"city:{rng.randrange(TAGS)}" for _ in range(QUERIES)]
+
+    start = time.perf_counter()
+    for tag in queried:
+        result = cache.get_by_tags([tag])
+    indexed_cost = (time.perf_counter() - start) / QUERIES
+
+    start = time.perf_counter()
+    for tag in queried[:20]:
+        scan_tagged_keys(cache, [tag])
+    scan_cost = (time.perf_counter() - start) / 20
+
+    # Per-location invalidation followed by a refresh of the same city
+    cleared = 0
+    start = time.perf_counter()
+    for tag in queried:
+        cleared += cache.clear_by_tags([tag])
+        city = int(tag.split(":")[1])
+        for i in range(city, ENTRIES, TAGS):
+            cache.set(f"weather:{i}", {"temp": 21.0}, tags=[tag, "weather"])
+    invalidate_cost = (time.perf_counter() - start) / QUERIES
+
+    # The index must agree with a full scan after all the churn
+    for tag in set(queried):
+        assert set(cache.get_by_tags([tag])) == {k[1] for k in scan_tagged_keys(cache, [tag])}
+
+    print(f"\n{ENTRIES:,} entries, {TAGS:,} tags ({len(result)} entries per tag)")
+    print(f"  get_by_tags (index):     {indexed_cost * 1e6:10.2f} µs")
+    print(f"  get_by_tags (full scan): {scan_cost * 1e6:10.2f} µs ({scan_cost / indexed_cost:.0f}x)")
+    print(f"  clear_by_tags + refresh: {invalidate_cost * 1e6:10.2f} µs ({cleared // QUERIES} keys)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark for location lookups in the weather history.
+Loads 1M observations for 500 locations, a fifth of which stopped reporting
+a year ago, and compares the previous ilike('%location%') filter with the
+normalized location key index for get_latest_weather and
+get_weather_history, plus partial-name and unknown-location lookups through
+the location search table.
+
+Run from the project root: python test_data/benchmark_location_lookup.py
+"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import desc
+from sqlalchemy.sql import select
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import WeatherHistory
+from src.database.repositories import WeatherRepository
+
+ROWS = 1_000_000
+LOCATIONS = 500
+LOOKUPS = 50
+STALE = 100  # Locations whose observations are all a year old
+
+NAMES = [f"City {i:03d}, Country {i % 40:02d}" for i in range(LOCATIONS)]
+
+
+def load_history(path: Path, now: datetime) -> None:
+    """Insert ROWS observations spread over LOCATIONS directly."""
+    rng = random.Random(5)
+    created = now.strftime("%Y-%m-%d %H:%M:%S.%f")
+    with sqlite3.connect(path) as db:
+        db.executemany(
+            "INSERT INTO weather_history (location, latitude, longitude, timestamp, "
+            "temperature, condition, created_at, updated_at) "
+            "VALUES (?, 0, 0, ?, ?, 'clear', ?, ?)",
+            (
+                (
+                    NAMES[i % LOCATIONS],
+                    (
+                        now
+                        - timedelta(minutes=i // LOCATIONS * 15)
+                        - timedelta(days=365 if i % LOCATIONS < STALE else 0)
+                    ).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                    rng.uniform(-10, 35),
+                    created,
+                    created,
+                )
+                for i in range(ROWS)
+            ),
+        )
+        db.executemany(
+            "INSERT INTO weather_location_search (location) VALUES (?)",
+            ((name,) for name in NAMES),
+        )
+        db.execute("ANALYZE")
+    db.close()
+
+
+async def ilike_latest(session, location: str):
+    """The previous get_latest_weather query."""
+    query = (
+        select(WeatherHistory)
+        .where(WeatherHistory.location.ilike(f"%{location}%"))
+        .order_by(desc(WeatherHistory.timestamp))
+        .limit(1)
+    )
+    return (await session.execute(query)).scalar_one_or_none()
+
+
+async def ilike_history(session, location: str):
+    """The previous get_weather_history query with its default limit."""
+    query = (
+        select(WeatherHistory)
+        .where(WeatherHistory.location.ilike(f"%{location}%"))
+        .order_by(desc(WeatherHistory.timestamp))
+        .limit(100)
+    )
+    return (await session.execute(query)).scalars().all()
+
+
+async def median_ms(lookup, locations) -> tuple:
+    """Run lookup for each location and return the last result and median milliseconds."""
+    times = []
+    for location in locations:
+        start = time.perf_counter()
+        result = await lookup(location)
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times) * 1000
+
+
+async def main_async():
+    """Time location lookups with and without the normalized key index."""
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "weather_dashboard.db"
+        db_manager = DatabaseManager(str(path))
+        await db_manager.initialize()
+        load_history(path, datetime.utcnow())
+
+        rng = random.Random(7)
+        active = rng.sample(NAMES[STALE:], LOOKUPS)
+        stale = rng.sample(NAMES[:STALE], LOOKUPS)
+        partial = [name.split(",")[0].lower() for name in rng.sample(NAMES, LOOKUPS)]
+        unknown = [f"Nowhere {i}" for i in range(LOOKUPS)]
+
+        print(f"\n{ROWS:,} observations for {LOCATIONS} locations, median of {LOOKUPS} lookups")
+        async with db_manager.get_async_session() as session:
+            repo = WeatherRepository(session)
+            latest, history = repo.get_latest_weather, repo.get_weather_history
+            for name, old, new, names in (
+                ("latest, active location", ilike_latest, latest, active),
+                ("latest, stale location", ilike_latest, latest, stale),
+                ("latest, partial name", ilike_latest, latest, partial),
+                ("latest, unknown location", ilike_latest, latest, unknown),
+                ("history, active location", ilike_history, history, active),
+                ("history, stale location", ilike_history, history, stale),
+            ):
+                old_result, old_ms = await median_ms(lambda loc: old(session, loc), names)
+                new_result, new_ms = await median_ms(new, names)
+                if isinstance(old_result, list):
+                    same = [r.id for r in old_result] == [r.id for r in new_result]
+                else:
+                    same = getattr(old_result, "id", None) == getattr(new_result, "id", None)
+                print(
+                    f"  {name:<26} ilike {old_ms:8.2f} ms  key {new_ms:7.2f} ms  "
+                    f"({old_ms / new_ms:6.1f}x, same rows: {same})"
+                )
+
+        await db_manager.close()
+
+
+def main():
+    """Run the location lookup benchmark."""
+    print("Location Lookup Benchmark")
+    print("=" * 50)
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark for background rendering of the ML comparison charts.
+Toggles between the similarity heatmap, the cluster chart and the radar
+chart for 12 cities. Before, every switch built the chart and drew it on the
+Tk thread (simulated here with an Agg draw, which FigureCanvasTkAgg does
+underneath). With MLChartRenderer the Tk thread only submits the request
+while the first render of each chart runs on the worker; later switches are
+cache hits.
+
+Run from the project root: python test_data/benchmark_ml_chart_renderer.py
+"""
+
+import logging
+import random
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from src.services.ml_chart_renderer import MLChartRenderer
+from src.services.ml_weather_service import MLWeatherService, WeatherProfile
+
+CITIES = 12
+TOGGLES = 4
+THEME = {
+    "bg": "#000000",
+    "card_bg": "#1E1E1E",
+    "primary": "#00FF41",
+    "secondary": "#008F11",
+    "accent": "#FF6B35",
+    "text": "#E0E0E0",
+}
+CHARTS = {
+    "similarity": (800, 600),
+    "clusters": (1000, 600),
+    "radar": (800, 800),
+}
+
+
+def make_profile(rng: random.Random, i: int) -> WeatherProfile:
+    """Build a plausible weather profile for city i."""
+    return WeatherProfile(
+        city_name=f"City {i:02d}",
+        temperature=rng.uniform(-15, 38),
+        humidity=rng.uniform(10, 100),
+        wind_speed=rng.uniform(0, 20),
+        pressure=rng.uniform(975, 1045),
+        uv_index=rng.uniform(0, 11),
+        visibility=rng.uniform(1, 10),
+        is_team_member=rng.random() < 0.3,
+    )
+
+
+def previous_show(service: MLWeatherService, chart_type: str, profiles: list) -> None:
+    """The previous panel path: build and draw the chart on the calling thread."""
+    width, height = CHARTS[chart_type]
+    figsize = (width / 100, height / 100)
+    if chart_type == "similarity":
+        fig = service.create_similarity_heatmap(profiles, figsize=figsize, theme=THEME)
+    elif chart_type == "clusters":
+        fig = service.create_cluster_visualization(profiles, figsize=figsize, theme=THEME)
+    else:
+        names = [profile.city_name for profile in profiles]
+        fig = service.create_radar_chart(profiles, names, figsize=figsize, theme=THEME)
+    fig.patch.set_facecolor("none")
+    fig.tight_layout(pad=1.0)
+    FigureCanvasAgg(fig).draw()
+
+
+def main():
+    """Compare chart switches on the calling thread with the background renderer."""
+    print("ML Chart Renderer Benchmark")
+    print("=" * 50)
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+
+    rng = random.Random(5)
+    profiles = [make_profile(rng, i) for i in range(CITIES)]
+    print(f"\n{CITIES} cities, {TOGGLES} passes over {len(CHARTS)} charts")
+
+    service = MLWeatherService()
+    previous_ms = {chart_type: [] for chart_type in CHARTS}
+    for _ in range(TOGGLES):
+        for chart_type in CHARTS:
+            start = time.perf_counter()
+            previous_show(service, chart_type, profiles)
+            previous_ms[chart_type].append((time.perf_counter() - start) * 1000)
+
+    renderer = MLChartRenderer(MLWeatherService())
+    blocked_ms = {chart_type: [] for chart_type in CHARTS}
+    first_ms = {}
+    for _ in range(TOGGLES):
+        for chart_type, size in CHARTS.items():
+            start = time.perf_counter()
+            future = renderer.render(chart_type, profiles, size, theme=THEME, theme_name="matrix")
+            blocked_ms[chart_type].append((time.perf_counter() - start) * 1000)
+            future.result()
+            first_ms.setdefault(chart_type, (time.perf_counter() - start) * 1000)
+    renderer.shutdown()
+
+    for chart_type in CHARTS:
+        print(
+            f"  {chart_type:<10}  Tk thread blocked: before "
+            f"{statistics.median(previous_ms[chart_type]):6.1f} ms  "
+            f"now {max(blocked_ms[chart_type]):6.3f} ms  "
+            f"(first background render {first_ms[chart_type]:.0f} ms, "
+            f"then cached {statistics.median(blocked_ms[chart_type][1:]):.3f} ms)"
+        )
+    print(f"  renderer: {renderer.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
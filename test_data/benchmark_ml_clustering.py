@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for streaming weather clustering.
+For thousands of cities, refreshes every reading a few times and compares
+the previous clustering (a fresh KMeans on the PCA features for every call,
+with the n_init=10 the pinned scikit-learn uses by default) with the warm
+started StreamingWeatherClusters model. It reports how many cities keep
+their cluster id across refreshes, which the previous fits did not preserve.
+
+Run from the project root: python test_data/benchmark_ml_clustering.py
+"""
+
+import dataclasses
+import logging
+import random
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.decomposition import PCA
+
+from src.services.ml_clustering import StreamingWeatherClusters
+from src.services.ml_feature_store import CLUSTER_FEATURES, WeatherFeatureStore
+from src.services.ml_weather_service import WeatherProfile
+
+SIZES = [2000, 10000, 50000]
+REFRESHES = 5
+
+
+def make_profile(rng: random.Random, i: int) -> WeatherProfile:
+    """Build a plausible weather profile for city i."""
+    return WeatherProfile(
+        city_name=f"City {i:05d}",
+        temperature=rng.uniform(-15, 38),
+        humidity=rng.uniform(10, 100),
+        wind_speed=rng.uniform(0, 20),
+        pressure=rng.uniform(975, 1045),
+        uv_index=rng.uniform(0, 11),
+        visibility=rng.uniform(1, 10),
+    )
+
+
+def refresh(rng: random.Random, profile: WeatherProfile) -> WeatherProfile:
+    """A new reading for the same city, close to the previous one."""
+    return dataclasses.replace(
+        profile,
+        temperature=profile.temperature + rng.gauss(0, 0.5),
+        humidity=min(100, max(0, profile.humidity + rng.gauss(0, 2))),
+    )
+
+
+def previous_clustering(store: WeatherFeatureStore) -> np.ndarray:
+    """The previous clustering: PCA and a fresh KMeans fit on every call."""
+    features = store.scaled[:, :CLUSTER_FEATURES]
+    reduced = PCA(n_components=min(3, len(features))).fit_transform(features)
+    return KMeans(n_clusters=5, random_state=42, n_init=10).fit_predict(reduced)
+
+
+def stability(first: np.ndarray, labels: np.ndarray) -> float:
+    """Share of cities whose cluster id is the one they had in the first run."""
+    return float((first == labels).mean())
+
+
+def run(size: int) -> None:
+    """Time REFRESHES refreshes of size cities with both clusterings."""
+    rng = random.Random(size)
+    profiles = [make_profile(rng, i) for i in range(size)]
+    store = WeatherFeatureStore()
+    model = StreamingWeatherClusters(max_clusters=5, random_state=42)
+
+    store.sync(profiles)
+    start = time.perf_counter()
+    streaming_first = model.fit_predict(store)
+    first_fit_ms = (time.perf_counter() - start) * 1000
+    previous_first = previous_clustering(store)
+
+    previous_ms, streaming_ms = [], []
+    previous_stable, streaming_stable = [], []
+    for _ in range(REFRESHES):
+        profiles = [refresh(rng, p) for p in profiles]
+        store.sync(profiles)
+
+        start = time.perf_counter()
+        labels = previous_clustering(store)
+        previous_ms.append((time.perf_counter() - start) * 1000)
+        previous_stable.append(stability(previous_first, labels))
+
+        start = time.perf_counter()
+        labels = model.fit_predict(store)
+        streaming_ms.append((time.perf_counter() - start) * 1000)
+        streaming_stable.append(stability(streaming_first, labels))
+
+    before, after = statistics.median(previous_ms), statistics.median(streaming_ms)
+    print(
+        f"  refresh   fresh KMeans {before:8.1f} ms  streaming {after:7.1f} ms  "
+        f"({before / after:5.1f}x, first fit {first_fit_ms:.1f} ms)"
+    )
+    print(
+        f"  same cluster id as the first run: fresh KMeans {min(previous_stable):.3f}  "
+        f"streaming {min(streaming_stable):.3f}"
+    )
+    print(f"  model: {model.get_stats()}")
+
+
+def main():
+    """Run the streaming clustering benchmark."""
+    print("ML Clustering Benchmark")
+    print("=" * 50)
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+    for size in SIZES:
+        print(f"\n{size:,} cities, median of {REFRESHES} refreshes")
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the shared ML feature store.
+Runs the analyses the ML comparison panel makes for 500 cities (similarity
+insights, cluster insights, a recommendation, the detailed analysis and the
+export) with the feature matrix rebuilt and the scaler refitted on every call
+as before, and with the shared feature store. It then adds one city and
+removes another and repeats the workflow, which the store applies in place.
+
+Run from the project root: python test_data/benchmark_ml_feature_store.py
+"""
+
+import logging
+import random
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.ml_feature_store import WeatherFeatureStore
+from src.services.ml_similarity import SimilarityEngine
+from src.services.ml_weather_service import MLWeatherService, WeatherProfile
+
+CITIES = 500
+ROUNDS = 5
+
+
+class RebuildingService(MLWeatherService):
+    """Rebuilds the DataFrame and refits the scaler for every analysis, as before."""
+
+    def _sync_features(self, weather_profiles):
+        self.prepare_weather_data(weather_profiles)
+        self.feature_store = WeatherFeatureStore()
+        self.similarity_engine = SimilarityEngine(self.feature_store)
+        self.feature_store.sync(weather_profiles)
+        self.scaler = self.feature_store.scaler
+        return self.feature_store
+
+
+def make_profile(rng: random.Random, i: int) -> WeatherProfile:
+    """Build a plausible weather profile for city i."""
+    return WeatherProfile(
+        city_name=f"City {i:04d}",
+        temperature=rng.uniform(-15, 38),
+        humidity=rng.uniform(10, 100),
+        wind_speed=rng.uniform(0, 20),
+        pressure=rng.uniform(975, 1045),
+        uv_index=rng.uniform(0, 11),
+        visibility=rng.uniform(1, 10),
+        is_team_member=rng.random() < 0.2,
+    )
+
+
+def panel_workflow(service: MLWeatherService, profiles: list) -> None:
+    """The service calls the panel makes across its insight, recommendation and export views."""
+    # Similarity insights
+    service.calculate_similarity_matrix(profiles)
+    service.get_city_similarity(profiles[0].city_name, profiles[1].city_name, profiles)
+    # Cluster insights
+    service.perform_weather_clustering(profiles)
+    # Recommendation
+    service.recommend_city_by_preferences({"temperature": 22, "humidity": 45}, profiles)
+    # Detailed analysis
+    service.calculate_similarity_matrix(profiles)
+    service.perform_weather_clustering(profiles)
+    # Export
+    service.calculate_similarity_matrix(profiles)
+    service.perform_weather_clustering(profiles)
+
+
+def median_ms(service: MLWeatherService, profiles: list, rng: random.Random) -> tuple:
+    """Median workflow time for the full set, after adding a city and after removing one."""
+    times = {"full set": [], "one city added": [], "one city removed": []}
+    for round_number in range(ROUNDS):
+        profiles = list(profiles)
+        for name in times:
+            if name == "one city added":
+                profiles.append(make_profile(rng, CITIES + round_number))
+            elif name == "one city removed":
+                profiles.pop(rng.randrange(len(profiles)))
+            start = time.perf_counter()
+            panel_workflow(service, profiles)
+            times[name].append(time.perf_counter() - start)
+    return {name: statistics.median(values) * 1000 for name, values in times.items()}
+
+
+def main():
+    """Compare the panel workflow with and without the shared feature store."""
+    print("ML Feature Store Benchmark")
+    print("=" * 50)
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+
+    rng = random.Random(3)
+    profiles = [make_profile(rng, i) for i in range(CITIES)]
+    print(f"\n{CITIES} cities, median of {ROUNDS} panel workflows")
+
+    before = median_ms(RebuildingService(), profiles, random.Random(4))
+    service = MLWeatherService()
+    after = median_ms(service, profiles, random.Random(4))
+    for name in before:
+        print(
+            f"  {name:<18} rebuild {before[name]:8.1f} ms  "
+            f"store {after[name]:7.1f} ms  ({before[name] / after[name]:5.1f}x)"
+        )
+    print(f"  Store syncs: {service.feature_store.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark for incremental similarity in the ML comparison panel.
+For thousands of cities, adds one city and compares recomputing the full
+cosine similarity matrix (as every visualization used to) with the
+SimilarityEngine's O(N) row and column update (including syncing the
+feature store) and copying the matrix out. It then times a top-k similar
+city query and the most-similar-pair insight against the previous Python
+scan of the full matrix.
+
+Run from the project root: python test_data/benchmark_ml_similarity.py
+"""
+
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.services.ml_weather_service import MLWeatherService, WeatherProfile
+
+SIZES = [1000, 2000, 5000]
+ADDS = 5
+LOOP_SCAN_LIMIT = 2000  # The Python pair scan is too slow to time beyond this
+
+
+def make_profile(rng: random.Random, i: int) -> WeatherProfile:
+    """Build a plausible weather profile for city i."""
+    return WeatherProfile(
+        city_name=f"City {i:05d}",
+        temperature=rng.uniform(-15, 38),
+        humidity=rng.uniform(10, 100),
+        wind_speed=rng.uniform(0, 20),
+        pressure=rng.uniform(975, 1045),
+        uv_index=rng.uniform(0, 11),
+        visibility=rng.uniform(1, 10),
+    )
+
+
+def loop_most_similar_pair(similarity_matrix: np.ndarray) -> tuple:
+    """The previous panel insight: scan every pair of the full matrix."""
+    max_similarity, pair = 0, None
+    for i in range(len(similarity_matrix)):
+        for j in range(i + 1, len(similarity_matrix)):
+            if similarity_matrix[i][j] > max_similarity:
+                max_similarity, pair = similarity_matrix[i][j], (i, j)
+    return pair
+
+
+def timed(func, *args) -> tuple:
+    """Call func and return its result and elapsed milliseconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(size: int) -> None:
+    """Time adding cities and querying similarity for size cities."""
+    rng = random.Random(size)
+    profiles = [make_profile(rng, i) for i in range(size)]
+    service = MLWeatherService()
+    service.calculate_similarity_matrix(profiles)
+
+    full_ms, update_ms, copy_ms = [], [], []
+    for i in range(ADDS):
+        profiles.append(make_profile(rng, size + i))
+        _, elapsed = timed(service.feature_store.sync, profiles)
+        update_ms.append(elapsed)
+        _, elapsed = timed(lambda: cosine_similarity(service.feature_store.scaled))
+        full_ms.append(elapsed)
+        _, elapsed = timed(service.calculate_similarity_matrix, profiles)
+        copy_ms.append(elapsed)
+
+    exact = cosine_similarity(service.feature_store.scaled)
+    error = np.abs(service.calculate_similarity_matrix(profiles) - exact).max()
+    print(
+        f"  add a city, full recompute   {statistics.median(full_ms):8.1f} ms  "
+        f"incremental {statistics.median(update_ms):7.1f} ms  (max error {error:.4f})"
+    )
+    print(f"  copy out the full matrix      {statistics.median(copy_ms):8.1f} ms")
+
+    city = profiles[0].city_name
+    _, top_ms = timed(service.get_similar_cities, city, profiles, 10)
+    print(f"  top 10 similar cities         {top_ms:8.1f} ms")
+
+    pair, pair_ms = timed(service.find_most_similar_pair, profiles)
+    if size <= LOOP_SCAN_LIMIT:
+        loop_pair, loop_ms = timed(loop_most_similar_pair, exact)
+        same = (pair[0], pair[1]) == (profiles[loop_pair[0]].city_name,
+                                      profiles[loop_pair[1]].city_name)
+        print(
+            f"  most similar pair, loop      {loop_ms:8.1f} ms  engine {pair_ms:7.1f} ms  "
+            f"(same pair: {same})"
+        )
+    else:
+        print(f"  most similar pair, engine    {pair_ms:8.1f} ms")
+    print(f"  engine: {service.similarity_engine.get_stats()}")
+
+
+def main():
+    """Run the ML similarity benchmark."""
+    print("ML Similarity Benchmark")
+    print("=" * 50)
+    logging.disable(logging.WARNING)
+    for size in SIZES:
+        print(f"\n{size:,} cities, median of {ADDS} additions")
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the weather vector index behind city recommendations.
+Builds a 100k-city catalogue and compares the previous recommendation path
+(scale the catalogue and fit NearestNeighbors(metric="cosine") for every
+request) and a NumPy brute-force scan with WeatherVectorIndex queries. It
+reports recall against the brute-force results for top-k and team-only
+queries, then times inserts and a save and load of the index.
+
+Run from the project root: python test_data/benchmark_ml_vector_index.py
+"""
+
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import StandardScaler
+
+from src.services.ml_feature_store import unit_vectors
+from src.services.ml_vector_index import WeatherVectorIndex
+
+CITIES = 100_000
+QUERIES = 50
+PREVIOUS_QUERIES = 5  # Each of these refits on the whole catalogue
+TEAM_SHARE = 0.02
+K = 10
+
+
+def make_rows(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Plausible unscaled weather features in FEATURE_COLUMNS order."""
+    return np.column_stack(
+        [
+            rng.uniform(-15, 38, count),
+            rng.uniform(10, 100, count),
+            rng.uniform(0, 20, count),
+            rng.uniform(975, 1045, count),
+            rng.uniform(0, 11, count),
+            rng.uniform(1, 10, count),
+        ]
+    )
+
+
+def previous_recommendation(raw: np.ndarray, preference: np.ndarray) -> int:
+    """Scale the catalogue and fit a cosine NearestNeighbors model for one request."""
+    scaler = StandardScaler()
+    features = scaler.fit_transform(raw)
+    model = NearestNeighbors(n_neighbors=5, metric="cosine").fit(features)
+    _, indices = model.kneighbors(scaler.transform(preference.reshape(1, -1)))
+    return int(indices[0][0])
+
+
+def brute_force(vectors: np.ndarray, target: np.ndarray, k: int, mask=None) -> list:
+    """Exact top-k cosine neighbors by scanning every vector."""
+    distances = 1.0 - vectors @ target
+    if mask is not None:
+        distances = np.where(mask, distances, np.inf)
+    best = np.argpartition(distances, k)[:k]
+    return best[np.argsort(distances[best], kind="stable")].tolist()
+
+
+def median_ms(func, args_list) -> tuple:
+    """Run func on each argument and return the results and median milliseconds."""
+    results, times = [], []
+    for args in args_list:
+        start = time.perf_counter()
+        results.append(func(*args))
+        times.append(time.perf_counter() - start)
+    return results, statistics.median(times) * 1000
+
+
+def recall(found: list, expected: list) -> float:
+    """Share of the expected neighbors that were found."""
+    hits = sum(len(set(f) & set(e)) for f, e in zip(found, expected))
+    return hits / sum(len(e) for e in expected)
+
+
+def main():
+    """Compare recommendation lookups with and without the vector index."""
+    print("Weather Vector Index Benchmark")
+    print("=" * 50)
+    logging.disable(logging.WARNING)
+
+    rng = np.random.default_rng(11)
+    raw = make_rows(rng, CITIES)
+    names = [f"City {i:06d}" for i in range(CITIES)]
+    team = rng.random(CITIES) < TEAM_SHARE
+    mean, scale = raw.mean(axis=0), raw.std(axis=0)
+    preferences = make_rows(rng, QUERIES)
+    targets = unit_vectors(preferences, mean, scale)
+    vectors = unit_vectors(raw, mean, scale)
+
+    start = time.perf_counter()
+    index = WeatherVectorIndex.build(raw, names, team, mean, scale)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"\n{CITIES:,} cities, {team.sum():,} team cities, index built in {build_ms:.0f} ms")
+
+    previous, previous_ms = median_ms(
+        lambda p: previous_recommendation(raw, p), [(p,) for p in preferences[:PREVIOUS_QUERIES]]
+    )
+    best, index_ms = median_ms(lambda p: index.query(p, 1)[0][0], [(p,) for p in preferences])
+    same = previous == best[:PREVIOUS_QUERIES]
+    print(
+        f"  best match    refit NearestNeighbors {previous_ms:8.1f} ms  "
+        f"index {index_ms:6.3f} ms  (same city: {same})"
+    )
+
+    for label, mask, team_only in (("top 10", None, False), ("top 10 team", team, True)):
+        expected, brute_ms = median_ms(
+            lambda t: brute_force(vectors, t, K, mask), [(t,) for t in targets]
+        )
+        found, index_ms = median_ms(
+            lambda p: [i for i, _ in index.query(p, K, team_only)], [(p,) for p in preferences]
+        )
+        print(
+            f"  {label:<12}  brute force            {brute_ms:8.2f} ms  "
+            f"index {index_ms:6.3f} ms  (recall {recall(found, expected):.3f})"
+        )
+
+    new_rows = make_rows(rng, 1000)
+    start = time.perf_counter()
+    for i, row in enumerate(new_rows):
+        index.add(row, f"New City {i:04d}", bool(i % 50 == 0))
+    insert_us = (time.perf_counter() - start) / len(new_rows) * 1_000_000
+    vectors = unit_vectors(np.vstack([raw, new_rows]), mean, scale)
+    expected = [brute_force(vectors, t, K) for t in targets]
+    found = [[i for i, _ in index.query(p, K)] for p in preferences]
+    print(
+        f"  1,000 inserts {insert_us:6.1f} us each, recall after inserts "
+        f"{recall(found, expected):.3f}, stats {index.get_stats()}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "city_index.npz"
+        start = time.perf_counter()
+        index.save(path)
+        save_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        loaded = WeatherVectorIndex.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+        same = all(
+            [i for i, _ in loaded.query(p, K)] == [i for i, _ in index.query(p, K)]
+            for p in preferences
+        )
+        print(
+            f"  save {save_ms:.0f} ms, load {load_ms:.0f} ms, "
+            f"{path.stat().st_size / 1024 / 1024:.1f} MB (same results: {same})"
+        )
+
+
+if __name__ == "__main__":
+    main()
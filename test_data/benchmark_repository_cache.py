@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the repository memory cache in a long-running process.
+Caches 50k distinct activity recommendations, as a kiosk cycling through
+locations for days would, and reports retained entries, traced memory and
+lookup cost for the previous unbounded dict cache and the bounded LRU.
+
+Run from the project root: python test_data/benchmark_repository_cache.py
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.repositories import ActivityRecommendation, InMemoryRepository
+
+ENTITIES = 50_000
+LOOKUPS = 100_000
+CACHE_CONFIG = {
+    "ttl_seconds": 300,
+    "repository_max_entries": 1000,
+    "repository_memory_mb": 8.0,
+}
+
+
+class LegacyDictCache:
+    """The previous cache: two dicts, expired entries kept until an explicit cleanup."""
+
+    def __init__(self):
+        self._cache = {}
+        self._cache_ttl = {}
+
+    def set(self, key, value, ttl=300):
+        self._cache[key] = value
+        self._cache_ttl[key] = datetime.now().timestamp() + ttl
+
+    def get(self, key):
+        if key in self._cache and datetime.now().timestamp() < self._cache_ttl[key]:
+            return self._cache[key]
+        return None
+
+    def __len__(self):
+        return len(self._cache)
+
+
+def make_activity(i: int) -> ActivityRecommendation:
+    """Build one activity recommendation."""
+    return ActivityRecommendation(
+        id=f"activity-{i}",
+        activity_name=f"Activity {i}",
+        description="Morning run along the river" * 4,
+        equipment_needed=["shoes", "water"],
+    )
+
+
+def run(name: str, set_item, get_item, size) -> None:
+    """Fill the cache, then look up a skewed mix of recent and old keys."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(ENTITIES):
+        set_item(f"activity-{i}", make_activity(i))
+    fill = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rng = random.Random(7)
+    # Mostly recently cached keys, with a long tail of older ones
+    keys = [
+        f"activity-{ENTITIES - 1 - int(rng.expovariate(1 / 300)) % ENTITIES}"
+        for _ in range(LOOKUPS)
+    ]
+    hits = 0
+    start = time.perf_counter()
+    for key in keys:
+        hits += get_item(key) is not None
+    lookup = time.perf_counter() - start
+
+    print(
+        f"  {name:<14} {size():>7,} entries  {current / 1024 / 1024:7.1f} MB retained  "
+        f"fill {fill * 1e6 / ENTITIES:5.1f} us/set  get {lookup * 1e6 / LOOKUPS:5.2f} us  "
+        f"hit rate {hits / LOOKUPS:6.1%}"
+    )
+
+
+def main():
+    """Run the repository cache benchmark."""
+    print("Repository Memory Cache Benchmark")
+    print("=" * 50)
+    print(f"\n{ENTITIES:,} distinct entities cached, {LOOKUPS:,} skewed lookups")
+
+    legacy = LegacyDictCache()
+    run("Unbounded dict", legacy.set, legacy.get, lambda: len(legacy))
+
+    repo = InMemoryRepository()
+    repo.configure_cache(CACHE_CONFIG)
+    run(
+        "Bounded LRU",
+        repo._set_cache,
+        repo._get_from_cache,
+        lambda: repo.get_cache_stats()["entries"],
+    )
+
+    stats = repo.get_cache_stats()
+    print(f"  Bounded LRU evictions: {stats['evictions']:,}, budget {stats['max_size_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark for repository reads on the async SQLite backend.
+Runs 10k ActivityRepository.get_by_id calls from concurrent tasks and reports
+p50/p99/max call latency, throughput and event-loop lag, against the previous
+pattern of a blocking sqlite3.connect per call.
+
+Run from the project root: python test_data/benchmark_repository_latency.py
+"""
+
+import asyncio
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.async_sqlite import close_shared_connections
+from src.data.repositories import ActivityRecommendation, ActivityRepository
+
+RECORDS = 1_000
+TASKS = 50
+CALLS_PER_TASK = 200  # 10k calls in total
+
+
+async def legacy_get_by_id(db_path: str, activity_id: str):
+    """The previous implementation: a blocking connection opened per call."""
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.execute(
+            "SELECT activity_data FROM activity_recommendations WHERE id = ?", (activity_id,)
+        )
+        row = cursor.fetchone()
+        if row:
+            return ActivityRecommendation.from_dict(json.loads(row[0]))
+    return None
+
+
+def percentile(samples, pct: float) -> float:
+    """Get a percentile of the samples."""
+    return statistics.quantiles(samples, n=100)[int(pct) - 1]
+
+
+async def run_load(get_by_id) -> dict:
+    """Issue the calls from concurrent tasks while sampling event-loop lag."""
+    latencies = []
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    async def worker(worker_id: int):
+        # Each call is timed from when its task was ready to issue it, so time
+        # spent blocked behind other tasks' calls counts as latency
+        ready = start
+        for i in range(CALLS_PER_TASK):
+            activity_id = f"activity-{(worker_id * CALLS_PER_TASK + i) % RECORDS}"
+            result = await get_by_id(activity_id)
+            now = time.perf_counter()
+            latencies.append(now - ready)
+            ready = now
+            assert result is not None
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(TASKS)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+
+    return {
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies),
+        "throughput": len(latencies) / elapsed,
+        "lag_p99": percentile(lags, 99) if len(lags) > 1 else elapsed,
+        "lag_samples": len(lags),
+    }
+
+
+def report(name: str, result: dict) -> None:
+    """Print one result line."""
+    print(
+        f"  {name:<18} p50 {result['p50'] * 1000:6.2f} ms  p99 {result['p99'] * 1000:6.2f} ms  "
+        f"max {result['max'] * 1000:8.2f} ms  {result['throughput']:6.0f} calls/s  "
+        f"loop lag p99 {result['lag_p99'] * 1000:8.2f} ms ({result['lag_samples']} ticks)"
+    )
+
+
+async def main_async():
+    """Run both backends against the same database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "activities.db")
+        repo = ActivityRepository(db_path)
+        for i in range(RECORDS):
+            await repo.create(
+                ActivityRecommendation(
+                    id=f"activity-{i}",
+                    activity_name=f"Activity {i}",
+                    equipment_needed=["shoes", "water"],
+                )
+            )
+        repo._get_from_cache = lambda key: None  # Measure the database, not the memory cache
+
+        legacy = await run_load(lambda activity_id: legacy_get_by_id(db_path, activity_id))
+        shared = await run_load(repo.get_by_id)
+        await close_shared_connections()
+
+    print(f"\n{TASKS} tasks x {CALLS_PER_TASK} get_by_id calls over {RECORDS:,} records")
+    report("Connect per call", legacy)
+    report("Shared async conn", shared)
+
+
+def main():
+    """Run the repository latency benchmark."""
+    print("Repository Latency Benchmark")
+    print("=" * 50)
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
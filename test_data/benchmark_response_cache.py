@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the APIOptimizer response cache.
+Fills the cache to capacity at 1k, 10k and 100k entries and reports the cost of
+an evicting insert, a cache hit and an expiry sweep, against the previous
+full-scan eviction.
+
+Run from the project root: python test_data/benchmark_response_cache.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.api_optimizer import APIOptimizer, APIRequest, APIResponse
+
+SIZES = (1_000, 10_000, 100_000)
+OPERATIONS = 2_000
+LEGACY_OPERATIONS = 200
+
+
+def make_entries(count: int, offset: int = 0, cache_ttl: int = 300):
+    """Build (request, response) pairs with ~200 byte payloads."""
+    entries = []
+    for i in range(offset, offset + count):
+        request = APIRequest(endpoint="weather", params={"q": f"city-{i}"}, cache_ttl=cache_ttl)
+        response = APIResponse(
+            request_id=request.request_id,
+            data={"name": f"city-{i}", "main": {"temp": 20.0}},
+            success=True,
+            size_bytes=200,
+        )
+        entries.append((request, response))
+    return entries
+
+
+def legacy_insert_cost(size: int) -> float:
+    """Time the previous min-scan eviction on a full dict of ``size`` entries."""
+    cache = {request.request_id: response for request, response in make_entries(size)}
+    new_entries = make_entries(LEGACY_OPERATIONS, offset=size)
+
+    start = time.perf_counter()
+    for request, response in new_entries:
+        if len(cache) >= size:
+            oldest_key = min(cache.keys(), key=lambda k: cache[k].timestamp)
+            cache.pop(oldest_key, None)
+        cache[request.request_id] = response
+    return (time.perf_counter() - start) / LEGACY_OPERATIONS
+
+
+def benchmark_size(size: int) -> None:
+    """Report insert, hit and sweep costs for a cache of ``size`` entries."""
+    optimizer = APIOptimizer(max_concurrent=1, cache_size=size, cache_sweep_interval=3600)
+    for request, response in make_entries(size):
+        optimizer._cache_response(request, response)
+
+    # Evicting inserts into a full cache
+    new_entries = make_entries(OPERATIONS, offset=size)
+    start = time.perf_counter()
+    for request, response in new_entries:
+        optimizer._cache_response(request, response)
+    insert_cost = (time.perf_counter() - start) / OPERATIONS
+
+    # Hits on the most recent entries
+    start = time.perf_counter()
+    for request, _ in new_entries:
+        optimizer._get_cached_response(request)
+    hit_cost = (time.perf_counter() - start) / OPERATIONS
+
+    stats = optimizer.get_statistics()
+
+    # Sweep with every entry expired
+    for request, response in make_entries(size, offset=2 * size, cache_ttl=0):
+        optimizer._cache_response(request, response)
+    start = time.perf_counter()
+    swept = optimizer._sweep_expired()
+    sweep_time = time.perf_counter() - start
+
+    legacy_cost = legacy_insert_cost(size)
+    optimizer.shutdown()
+
+    print(f"\n{size:,} entries ({stats['cache_bytes'] / 1024:.0f} KB accounted)")
+    print(f"  LRU insert+evict:   {insert_cost * 1e6:10.2f} µs")
+    print(f"  Legacy scan evict:  {legacy_cost * 1e6:10.2f} µs ({legacy_cost / insert_cost:.0f}x)")
+    print(f"  Cache hit:          {hit_cost * 1e6:10.2f} µs")
+    print(f"  Expiry sweep:       {sweep_time * 1000:10.2f} ms for {swept:,} expired entries")
+
+
+def main():
+    """Run the response cache benchmark."""
+    print("APIOptimizer Response Cache Benchmark")
+    print("=" * 50)
+    for size in SIZES:
+        benchmark_size(size)
+
+
+if __name__ == "__main__":
+    main()
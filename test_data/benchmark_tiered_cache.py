@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the tiered cache.
+Compares a cache write against the previous whole-file JSON rewrite, a warm
+restart (disk index only) against loading every value, and memory hits against
+disk hits that promote the entry back to memory.
+
+Run from the project root: python test_data/benchmark_tiered_cache.py
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.cache_manager import CacheManager
+
+ENTRIES = 5_000
+WRITES = 200
+LEGACY_WRITES = 5
+HITS = 2_000
+
+
+def make_value(i: int) -> dict:
+    """Build a ~1 KB cached weather payload."""
+    return {
+        "data": {"name": f"city-{i}", "hourly": [{"temp": 20.0 + h, "hour": h} for h in range(24)]},
+        "timestamp": time.time(),
+    }
+
+
+def legacy_write_cost(directory: Path) -> float:
+    """Time the previous pattern of rewriting the whole JSON file on every write."""
+    cache = {f"key-{i}": make_value(i) for i in range(ENTRIES)}
+    cache_file = directory / "legacy_cache.json"
+
+    start = time.perf_counter()
+    for i in range(LEGACY_WRITES):
+        cache[f"new-{i}"] = make_value(i)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    return (time.perf_counter() - start) / LEGACY_WRITES
+
+
+def main():
+    """Run the tiered cache benchmark."""
+    print("Tiered Cache Benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        db_path = directory / "tiered_cache.db"
+
+        # Fill a persistent namespace, then time writes into the full cache
+        cache = CacheManager(disk_path=db_path)
+        namespace = cache.namespace("weather")
+        for i in range(ENTRIES):
+            namespace.set(f"key-{i}", make_value(i))
+        cache.flush(timeout=30)
+
+        start = time.perf_counter()
+        for i in range(WRITES):
+            namespace.set(f"new-{i}", make_value(i))
+        write_cost = (time.perf_counter() - start) / WRITES
+        cache.close()
+
+        legacy_cost = legacy_write_cost(directory)
+
+        # Warm restart: the index is read, values stay on disk
+        start = time.perf_counter()
+        cache = CacheManager(max_entries=ENTRIES // 10, disk_path=db_path)
+        namespace = cache.namespace("weather")
+        restart_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(directory / "legacy_cache.json", "r", encoding="utf-8") as f:
+            json.load(f)
+        legacy_restart_time = time.perf_counter() - start
+
+        # Disk hits promote entries; repeating them hits memory
+        keys = [f"key-{i}" for i in range(HITS)]
+        start = time.perf_counter()
+        for key in keys[: ENTRIES // 10]:
+            namespace.get(key)
+        disk_hit_cost = (time.perf_counter() - start) / (ENTRIES // 10)
+
+        start = time.perf_counter()
+        for _ in range(HITS // (ENTRIES // 10)):
+            for key in keys[: ENTRIES // 10]:
+                namespace.get(key)
+        memory_hit_cost = (time.perf_counter() - start) / HITS
+
+        stats = cache.get_stats()
+        cache.close()
+
+    print(f"\n{ENTRIES:,} entries of ~1 KB")
+    print(f"  Cache write:          {write_cost * 1e6:10.2f} µs")
+    print(f"  Legacy JSON rewrite:  {legacy_cost * 1e6:10.2f} µs ({legacy_cost / write_cost:.0f}x)")
+    print(f"  Warm restart (index): {restart_time * 1000:10.2f} ms")
+    print(f"  Legacy full load:     {legacy_restart_time * 1000:10.2f} ms")
+    print(f"  Disk hit + promote:   {disk_hit_cost * 1e6:10.2f} µs")
+    print(f"  Memory hit:           {memory_hit_cost * 1e6:10.2f} µs")
+    print(
+        f"  Promotions: {stats['promotions']:,}  Disk hits: {stats['disk_hits']:,}  "
+        f"Memory hits: {stats['memory_hits']:,}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for batched repository writes through a UnitOfWork.
+Caches 1,000 forecasts one by one (a commit per write) and inside a single
+UnitOfWork (one transaction and one commit), under NORMAL and FULL
+synchronous settings.
+
+Run from the project root: python test_data/benchmark_unit_of_work.py
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.async_sqlite import close_shared_connections
+from src.data.database_context import DatabaseConfig, DatabaseContext
+from src.data.repositories import ForecastRepository
+from src.data.unit_of_work import UnitOfWork
+from src.models.location.location_models import Location
+from src.models.weather.forecast_models import ForecastData
+
+FORECASTS = 1_000
+
+
+def make_forecasts():
+    """Build forecasts for distinct locations."""
+    now = datetime.now()
+    return [
+        ForecastData(
+            location=Location(
+                name=f"City {i}", country="US", latitude=30 + i * 0.01, longitude=-90 - i * 0.01
+            ),
+            timestamp=now,
+        )
+        for i in range(FORECASTS)
+    ]
+
+
+async def one_by_one(db_context: DatabaseContext, forecasts) -> float:
+    """Write each forecast in its own transaction."""
+    repo = ForecastRepository(db_context.forecast_db_path)
+    start = time.perf_counter()
+    for forecast in forecasts:
+        await repo.create(forecast)
+    return time.perf_counter() - start
+
+
+async def unit_of_work(db_context: DatabaseContext, forecasts) -> float:
+    """Write all forecasts inside one UnitOfWork."""
+    start = time.perf_counter()
+    async with UnitOfWork(db_context) as uow:
+        for forecast in forecasts:
+            await uow.forecast_repository.create(forecast)
+    return time.perf_counter() - start
+
+
+async def run(synchronous: str) -> None:
+    """Time both write patterns against fresh databases."""
+    forecasts = make_forecasts()
+    results = {}
+    for name, writer in (("One by one", one_by_one), ("One UnitOfWork", unit_of_work)):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_context = DatabaseContext(DatabaseConfig(synchronous=synchronous), base_path=tmp)
+            await db_context.initialize()
+            results[name] = await writer(db_context, forecasts)
+
+            repo = ForecastRepository(db_context.forecast_db_path)
+            row = await repo._fetchone("SELECT COUNT(*) FROM forecast_cache")
+            assert row[0] == FORECASTS, f"{name}: stored {row[0]} forecasts"
+            await db_context.close()
+            await close_shared_connections()
+
+    print(f"\nsynchronous={synchronous}, {FORECASTS:,} cached forecasts")
+    for name, elapsed in results.items():
+        print(f"  {name:<16} {elapsed * 1000:8.1f} ms  {FORECASTS / elapsed:8.0f} writes/s")
+    print(f"  Speedup: {results['One by one'] / results['One UnitOfWork']:.1f}x")
+
+
+def main():
+    """Run the unit of work benchmark."""
+    print("Unit of Work Batched Write Benchmark")
+    print("=" * 50)
+    for synchronous in ("NORMAL", "FULL"):
+        asyncio.run(run(synchronous))
+
+
+if __name__ == "__main__":
+    main()
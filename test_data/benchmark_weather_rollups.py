@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the WeatherHistory rollups.
+Loads a year of 15-minute observations for 24 cities, backfills the hourly,
+daily and monthly rollups (migration 006), then compares statistics and
+history queries over raw rows with the rollup-backed repository methods,
+and the cost the rollups add to each saved observation.
+
+Run from the project root: python test_data/benchmark_weather_rollups.py
+"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import and_, func
+from sqlalchemy.sql import select
+
+from src.database.database_manager import DatabaseManager
+from src.database.migration_manager import MigrationManager
+from src.database.models import WeatherHistory
+from src.database.repositories import WeatherRepository
+
+CITIES = 24
+DAYS = 365
+INTERVAL = timedelta(minutes=15)
+SAVES = 300
+
+
+def load_history(path: Path, now: datetime) -> int:
+    """Insert a year of observations directly, as a long-running install would have."""
+    rng = random.Random(3)
+    steps = int(timedelta(days=DAYS) / INTERVAL)
+    created = now.strftime("%Y-%m-%d %H:%M:%S.%f")
+    with sqlite3.connect(path) as db:
+        for city in range(CITIES):
+            db.executemany(
+                "INSERT INTO weather_history (location, latitude, longitude, timestamp, "
+                "temperature, humidity, pressure, wind_speed, condition, created_at, updated_at) "
+                "VALUES (?, 0, 0, ?, ?, ?, ?, ?, 'clear', ?, ?)",
+                (
+                    (
+                        f"Station {city:02d}",
+                        (now - step * INTERVAL).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                        rng.uniform(-10, 35),
+                        rng.randint(20, 90),
+                        rng.uniform(990, 1030),
+                        rng.uniform(0, 12),
+                        created,
+                        created,
+                    )
+                    for step in range(steps)
+                ),
+            )
+    db.close()
+    return CITIES * steps
+
+
+async def raw_statistics(session, location: str, days: int):
+    """The previous statistics query: aggregate every raw row of the period."""
+    start_date = datetime.utcnow() - timedelta(days=days)
+    query = select(
+        func.avg(WeatherHistory.temperature),
+        func.min(WeatherHistory.temperature),
+        func.max(WeatherHistory.temperature),
+        func.avg(WeatherHistory.humidity),
+        func.avg(WeatherHistory.pressure),
+        func.avg(WeatherHistory.wind_speed),
+        func.count(WeatherHistory.id),
+    ).where(
+        and_(
+            WeatherHistory.location.ilike(f"%{location}%"),
+            WeatherHistory.timestamp >= start_date,
+        )
+    )
+    return (await session.execute(query)).first()
+
+
+async def timed(coro) -> tuple:
+    """Await a coroutine and return its result and elapsed seconds."""
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+async def main_async():
+    """Time raw and rollup-backed queries over a year of history."""
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "weather_dashboard.db"
+        db_manager = DatabaseManager(str(path))
+        await db_manager.initialize()
+
+        now = datetime.utcnow()
+        rows = load_history(path, now)
+        migrations = MigrationManager(db_manager)
+        _, backfill = await timed(migrations.apply_pending_migrations())
+        print(f"\n{rows:,} observations ({CITIES} cities, {DAYS} days every 15 minutes)")
+        print(f"  Rollup backfill (migration 006)  {backfill:8.2f} s")
+
+        async with db_manager.get_async_session() as session:
+            repo = WeatherRepository(session)
+            location = "Station 07"
+
+            print("\nget_weather_statistics")
+            for days in (7, 30, DAYS):
+                raw, raw_time = await timed(raw_statistics(session, location, days))
+                stats, rollup_time = await timed(repo.get_weather_statistics(location, days))
+                print(
+                    f"  {days:>3} days  raw {raw_time * 1000:8.1f} ms  "
+                    f"rollups {rollup_time * 1000:7.1f} ms  "
+                    f"({raw_time / rollup_time:5.1f}x, "
+                    f"{stats['record_count']:,} vs {raw[6]:,} rows)"
+                )
+
+            print("\nget_weather_series")
+            for days in (30, DAYS):
+                start_date = now - timedelta(days=days)
+                raw, raw_time = await timed(
+                    repo.get_weather_series(location, start_date, resolution="raw")
+                )
+                series, rollup_time = await timed(repo.get_weather_series(location, start_date))
+                print(
+                    f"  {days:>3} days  raw {len(raw):>6,} rows {raw_time * 1000:8.1f} ms  "
+                    f"{series[0].resolution} {len(series):>4} rows {rollup_time * 1000:7.1f} ms"
+                )
+
+            print(f"\nSaving {SAVES} observations")
+            start = time.perf_counter()
+            for i in range(SAVES):
+                record = WeatherHistory(
+                    location=location,
+                    latitude=0.0,
+                    longitude=0.0,
+                    temperature=20.0 + i % 5,
+                    condition="clear",
+                    timestamp=datetime.utcnow(),
+                )
+                session.add(record)
+                await session.commit()
+                await session.refresh(record)
+            plain = (time.perf_counter() - start) / SAVES
+
+            start = time.perf_counter()
+            for i in range(SAVES):
+                await repo.save_weather_data(
+                    {"location": location, "temperature": 20.0 + i % 5, "condition": "clear"}
+                )
+            with_rollups = (time.perf_counter() - start) / SAVES
+            print(f"  Row only            {plain * 1000:6.2f} ms/save")
+            print(f"  Row and 3 rollups   {with_rollups * 1000:6.2f} ms/save")
+
+        await db_manager.close()
+
+
+def main():
+    """Run the weather rollup benchmark."""
+    print("Weather History Rollup Benchmark")
+    print("=" * 50)
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the weather cache schema.
+Caches current weather for 50k locations in the previous JSON blob layout,
+migrates it to the typed columns, and compares get_all on both layouts with
+a single-metric projection (get_metric).
+
+Run from the project root: python test_data/benchmark_weather_schema.py
+"""
+
+import asyncio
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.async_sqlite import close_shared_connections, get_shared_connection
+from src.data.repositories import WeatherRepository
+
+LOCATIONS = 50_000
+
+
+def write_blob_database(path: str) -> None:
+    """Write LOCATIONS cached weather rows in the JSON blob layout."""
+    now = datetime.now()
+    expires_at = (now + timedelta(hours=1)).isoformat()
+    rows = []
+    for i in range(LOCATIONS):
+        latitude, longitude = 25 + (i % 250) * 0.1, -120 + (i // 250) * 0.1
+        weather = {
+            "temperature": 10 + i % 25,
+            "feels_like": 9 + i % 25,
+            "humidity": 40 + i % 50,
+            "pressure": 1000 + i % 30,
+            "wind_speed": 3.5,
+            "wind_direction": 180,
+            "visibility": 10.0,
+            "uv_index": 4.0,
+            "condition": "clear",
+            "description": "clear sky",
+            "icon": "01d",
+            "sunrise": now.isoformat(),
+            "sunset": now.isoformat(),
+            "timestamp": now.isoformat(),
+            "location": {
+                "name": f"City {i}",
+                "country": "US",
+                "state": None,
+                "latitude": latitude,
+                "longitude": longitude,
+            },
+            "alerts": [],
+        }
+        rows.append((f"{latitude:.4f},{longitude:.4f}", json.dumps(weather), expires_at))
+
+    with sqlite3.connect(path) as db:
+        db.execute(
+            "CREATE TABLE weather_cache (location_key TEXT PRIMARY KEY, "
+            "weather_data TEXT NOT NULL, cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+            "expires_at TIMESTAMP NOT NULL)"
+        )
+        db.executemany(
+            "INSERT INTO weather_cache (location_key, weather_data, expires_at) VALUES (?, ?, ?)",
+            rows,
+        )
+    db.close()
+
+
+async def blob_get_all(path: str, repo: WeatherRepository) -> list:
+    """The previous get_all: decode every row's JSON blob."""
+    shared = await get_shared_connection(path)
+    rows = await shared.db.execute_fetchall(
+        "SELECT weather_data FROM weather_cache WHERE expires_at > ? ORDER BY cached_at DESC",
+        (datetime.now().isoformat(),),
+    )
+    return [repo._dict_to_weather_data(json.loads(row[0])) for row in rows]
+
+
+async def timed(coro) -> tuple:
+    """Await a coroutine and return its result and elapsed seconds."""
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+async def main_async():
+    """Time reads before and after migrating a blob database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "weather_cache.db")
+        write_blob_database(path)
+        repo = WeatherRepository(path)
+
+        blob_rows, blob_time = await timed(blob_get_all(path, repo))
+        _, migrate_time = await timed(repo._get_connection())
+        rows, column_time = await timed(repo.get_all())
+        temperatures, metric_time = await timed(repo.get_metric("temperature"))
+        assert len(blob_rows) == len(rows) == len(temperatures) == LOCATIONS
+        await close_shared_connections()
+
+    print(f"\n{LOCATIONS:,} cached locations")
+    print(f"  Migration from blob layout  {migrate_time * 1000:8.1f} ms")
+    for name, elapsed in (
+        ("get_all, JSON blob", blob_time),
+        ("get_all, typed columns", column_time),
+        ("get_metric('temperature')", metric_time),
+    ):
+        print(f"  {name:<27} {elapsed * 1000:8.1f} ms  {LOCATIONS / elapsed:10,.0f} rows/s")
+    print(
+        f"  Speedup over blob: get_all {blob_time / column_time:.1f}x, "
+        f"get_metric {blob_time / metric_time:.1f}x"
+    )
+
+
+def main():
+    """Run the weather schema benchmark."""
+    print("Weather Cache Schema Benchmark")
+    print("=" * 50)
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
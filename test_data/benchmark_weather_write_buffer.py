@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark for buffered weather history writes.
+Saves an auto-refresh burst of observations for many cities one transaction
+per observation (the previous DataService.save_weather_data) and through the
+write-behind buffer, then checks every buffered observation reached the
+history and rollups after shutdown, and shows backpressure with a small queue.
+
+Run from the project root: python test_data/benchmark_weather_write_buffer.py
+"""
+
+import asyncio
+import logging
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.database.data_service import DataService
+from src.database.database_manager import DatabaseManager
+from src.database.repositories import WeatherRepository
+from src.database.write_buffer import WeatherWriteBuffer
+
+CITIES = 200
+REFRESHES = 10
+
+
+def observations():
+    """Build REFRESHES rounds of observations for CITIES cities."""
+    return [
+        {
+            "location": f"City {city:03d}",
+            "temperature": 15.0 + city % 10 + refresh * 0.1,
+            "conditions": "clear",
+            "humidity": 50 + city % 30,
+        }
+        for refresh in range(REFRESHES)
+        for city in range(CITIES)
+    ]
+
+
+def stored_counts(path: Path) -> tuple:
+    """Count history rows and the observations summed into the daily rollup."""
+    with sqlite3.connect(path) as db:
+        rows = db.execute("SELECT COUNT(*) FROM weather_history").fetchone()[0]
+        rolled = db.execute("SELECT TOTAL(record_count) FROM weather_rollup_daily").fetchone()[0]
+    db.close()
+    return rows, int(rolled)
+
+
+async def per_observation(path: Path, batch: list) -> float:
+    """Save each observation in its own session and transaction."""
+    db_manager = DatabaseManager(str(path))
+    await db_manager.initialize()
+    start = time.perf_counter()
+    for data in batch:
+        async with db_manager.get_async_session() as session:
+            weather_data = dict(data, condition=data["conditions"])
+            await WeatherRepository(session).save_weather_data(weather_data)
+    elapsed = time.perf_counter() - start
+    await db_manager.close()
+    return elapsed
+
+
+async def buffered(path: Path, batch: list) -> tuple:
+    """Save through DataService and its write buffer, flushing on shutdown."""
+    service = DataService(path)
+    await service.initialize()
+    start = time.perf_counter()
+    for data in batch:
+        await service.save_weather_data(**data)
+    queued = time.perf_counter() - start
+    await service.shutdown()
+    return queued, time.perf_counter() - start, service.get_write_buffer_statistics()
+
+
+async def backpressure(path: Path, batch: list) -> dict:
+    """Save with a queue smaller than the burst so producers must wait."""
+    db_manager = DatabaseManager(str(path))
+    await db_manager.initialize()
+
+    async def write_batch(records):
+        async with db_manager.get_async_session() as session:
+            return await WeatherRepository(session).save_weather_batch(records)
+
+    writer = WeatherWriteBuffer(write_batch, max_batch_size=100, max_pending=200)
+    for data in batch:
+        await writer.put(dict(data, condition=data["conditions"]))
+    await writer.close()
+    await db_manager.close()
+    return writer.get_stats()
+
+
+async def main_async():
+    """Compare per-observation and buffered weather writes."""
+    logging.disable(logging.WARNING)
+    batch = observations()
+    print(f"\n{len(batch):,} observations ({CITIES} cities x {REFRESHES} refreshes)")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "per_observation.db"
+        direct = await per_observation(path, batch)
+        print(
+            f"  One transaction each  {direct:7.2f} s  "
+            f"{len(batch) / direct:8,.0f} obs/s  stored {stored_counts(path)}"
+        )
+
+        path = Path(tmp) / "buffered.db"
+        queued, total, stats = await buffered(path, batch)
+        print(
+            f"  Write buffer          {total:7.2f} s  "
+            f"{len(batch) / total:8,.0f} obs/s  stored {stored_counts(path)}"
+        )
+        print(
+            f"    queued in {queued * 1000:.1f} ms, {stats['flushes']} flushes, "
+            f"mean {stats['mean_flush_size']:.0f} obs / {stats['mean_flush_time'] * 1000:.1f} ms, "
+            f"max {stats['max_flush_time'] * 1000:.1f} ms, failed {stats['failed_records']}"
+        )
+
+        path = Path(tmp) / "backpressure.db"
+        stats = await backpressure(path, batch)
+        print(
+            f"  Queue of 200          {stats['backpressure_waits']} producer waits, "
+            f"{stats['flushes']} flushes, stored {stored_counts(path)}"
+        )
+
+
+def main():
+    """Run the weather write buffer benchmark."""
+    print("Weather Write Buffer Benchmark")
+    print("=" * 50)
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
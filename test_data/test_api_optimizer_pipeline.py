@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Pipeline tests for the APIOptimizer HTTP transport.
+Runs real requests against a local stub server to verify priority ordering,
+cache strategies and request coalescing end to end.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.api_optimizer import (
+    APIOptimizer,
+    APIRequest,
+    CacheStrategy,
+    HTTPTransport,
+    RequestPriority,
+)
+from src.utils.http_client import HTTPClient, HTTPClientConfig
+
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    """Serves canned weather payloads and records the order of requests."""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        city = parse_qs(url.query).get("q", [""])[0]
+        self.server.log.append((url.path, city))
+
+        if url.path == "/slow":
+            time.sleep(0.3)
+        if url.path == "/missing" or (url.path == "/flaky" and self.server.failing):
+            status, body = (404 if url.path == "/missing" else 500), {"message": "error"}
+        else:
+            status, body = 200, {"name": city, "main": {"temp": 20.0}}
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    """Start the stub server on a free port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWeatherHandler)
+    server.log = []
+    server.failing = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_optimizer(server, **kwargs):
+    """Create an optimizer sending through a retry-free client to the stub server."""
+    client = HTTPClient(HTTPClientConfig(max_retries=0))
+    transport = HTTPTransport(f"http://127.0.0.1:{server.server_port}", client=client)
+    return APIOptimizer(transport=transport, **kwargs)
+
+
+def test_http_transport_and_cache_first():
+    """CACHE_FIRST answers repeats from the response cache."""
+    server = start_stub_server()
+    optimizer = make_optimizer(server)
+    try:
+        request = APIRequest(endpoint="weather", params={"q": "London"})
+        first = optimizer.execute(request, timeout=5)
+        second = optimizer.execute(APIRequest(endpoint="weather", params={"q": "London"}), 5)
+
+        assert first.success and first.status_code == 200
+        assert first.data["name"] == "London"
+        assert second.cache_hit, "Repeat request was not served from cache"
+        assert len(server.log) == 1
+
+        missing = optimizer.execute(APIRequest(endpoint="missing"), timeout=5)
+        assert not missing.success and missing.status_code == 404
+    finally:
+        optimizer.shutdown()
+        server.shutdown()
+
+
+def test_refresh_and_api_first_strategies():
+    """REFRESH bypasses the cache; API_FIRST falls back to it on errors."""
+    server = start_stub_server()
+    optimizer = make_optimizer(server)
+    try:
+        optimizer.execute(APIRequest(endpoint="flaky", params={"q": "Paris"}), timeout=5)
+        optimizer.execute(
+            APIRequest(
+                endpoint="flaky", params={"q": "Paris"}, cache_strategy=CacheStrategy.REFRESH
+            ),
+            timeout=5,
+        )
+        assert len(server.log) == 2, "REFRESH should always reach the API"
+
+        server.failing = True
+        fallback = optimizer.execute(
+            APIRequest(
+                endpoint="flaky", params={"q": "Paris"}, cache_strategy=CacheStrategy.API_FIRST
+            ),
+            timeout=5,
+        )
+        assert len(server.log) == 3
+        assert fallback.success and fallback.cache_hit, "API_FIRST did not fall back to cache"
+    finally:
+        optimizer.shutdown()
+        server.shutdown()
+
+
+def test_priority_ordering():
+    """Foreground requests are dispatched ahead of queued background ones."""
+    server = start_stub_server()
+    optimizer = make_optimizer(server, max_concurrent=1)
+    try:
+        blocker = optimizer.submit(APIRequest(endpoint="slow", params={"q": "blocker"}))
+        time.sleep(0.05)  # Let the single worker pick up the blocker
+
+        futures = [
+            optimizer.submit(
+                APIRequest(
+                    endpoint="weather", params={"q": f"bg-{i}"}, priority=RequestPriority.LOW
+                )
+            )
+            for i in range(3)
+        ]
+        futures.append(
+            optimizer.submit(
+                APIRequest(
+                    endpoint="weather", params={"q": "foreground"}, priority=RequestPriority.HIGH
+                )
+            )
+        )
+
+        blocker.result(timeout=5)
+        for future in futures:
+            assert future.result(timeout=5).success
+
+        order = [city for _, city in server.log]
+        assert order[:2] == ["blocker", "foreground"], f"Unexpected order: {order}"
+    finally:
+        optimizer.shutdown()
+        server.shutdown()
+
+
+def test_duplicate_request_is_coalesced_and_promoted():
+    """A higher-priority duplicate shares the queued request and promotes it."""
+    server = start_stub_server()
+    optimizer = make_optimizer(server, max_concurrent=1)
+    try:
+        optimizer.submit(APIRequest(endpoint="slow", params={"q": "blocker"}))
+        time.sleep(0.05)
+
+        other = optimizer.submit(
+            APIRequest(endpoint="weather", params={"q": "Rome"}, priority=RequestPriority.LOW)
+        )
+        background = optimizer.submit(
+            APIRequest(endpoint="weather", params={"q": "Oslo"}, priority=RequestPriority.LOW)
+        )
+        callback_data = []
+        foreground = optimizer.submit(
+            APIRequest(
+                endpoint="weather",
+                params={"q": "Oslo"},
+                priority=RequestPriority.HIGH,
+                callback=callback_data.append,
+            )
+        )
+
+        assert foreground is background, "Duplicate request was not coalesced"
+        assert foreground.result(timeout=5).data["name"] == "Oslo"
+        other.result(timeout=5)
+
+        order = [city for _, city in server.log]
+        assert order == ["blocker", "Oslo", "Rome"], f"Unexpected order: {order}"
+        assert callback_data and callback_data[0]["name"] == "Oslo"
+        assert optimizer.get_statistics()["coalesced_requests"] == 1
+    finally:
+        optimizer.shutdown()
+        server.shutdown()
+
+
+def main():
+    """Run the pipeline tests."""
+    print("APIOptimizer Pipeline Tests")
+    print("=" * 50)
+
+    for test in (
+        test_http_transport_and_cache_first,
+        test_refresh_and_api_first_strategies,
+        test_priority_ordering,
+        test_duplicate_request_is_coalesced_and_promoted,
+    ):
+        test()
+        print(f"✓ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()
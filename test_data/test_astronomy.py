@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the local astronomy engine.
+Pins sunrise, sunset and moon phase against published almanac values and
+checks polar day and polar night detection.
+"""
+
+import os
+import sys
+from datetime import date, datetime, timezone
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.astronomy import compute_astronomy
+
+LONDON = (51.5074, -0.1278)
+SVALBARD = (78.2232, 15.6267)
+MCMURDO = (-77.8463, 166.6682)
+
+
+def assert_near(actual: datetime, expected: datetime, minutes: float = 3) -> None:
+    """Assert two UTC datetimes agree within a few minutes."""
+    delta = abs((actual - expected).total_seconds()) / 60
+    assert delta <= minutes, f"{actual} is {delta:.1f} min from {expected}"
+
+
+def test_london_sunrise_and_sunset():
+    """London solstice rise/set times match the almanac to within a few minutes."""
+    summer = compute_astronomy(*LONDON, date(2024, 6, 21))
+    assert_near(summer.sunrise, datetime(2024, 6, 21, 3, 43, tzinfo=timezone.utc))
+    assert_near(summer.sunset, datetime(2024, 6, 21, 20, 21, tzinfo=timezone.utc))
+    assert 16.5 < summer.day_length.total_seconds() / 3600 < 16.7
+
+    winter = compute_astronomy(*LONDON, date(2024, 12, 21))
+    assert_near(winter.sunrise, datetime(2024, 12, 21, 8, 4, tzinfo=timezone.utc))
+    assert_near(winter.sunset, datetime(2024, 12, 21, 15, 53, tzinfo=timezone.utc))
+    assert not (summer.polar_day or summer.polar_night)
+
+
+def test_equinox_day_length_at_equator():
+    """Day length at the equator on the equinox is a little over 12 hours."""
+    result = compute_astronomy(0.0, 0.0, date(2024, 3, 20))
+    assert 12.0 < result.day_length.total_seconds() / 3600 < 12.2
+    assert_near(result.solar_noon, datetime(2024, 3, 20, 12, 7, tzinfo=timezone.utc))
+
+
+def test_moon_phase():
+    """Moon phase tracks the 2024-04-08 new moon through the following lunation."""
+    new_moon = compute_astronomy(40.7128, -74.0060, date(2024, 4, 8)).moon_phase
+    first_quarter = compute_astronomy(40.7128, -74.0060, date(2024, 4, 15)).moon_phase
+    full_moon = compute_astronomy(40.7128, -74.0060, date(2024, 4, 23)).moon_phase
+
+    assert new_moon < 0.02 or new_moon > 0.98
+    assert abs(first_quarter - 0.25) < 0.02
+    assert abs(full_moon - 0.5) < 0.02
+
+
+def test_polar_day_and_night():
+    """High-latitude solstices report polar day/night with no sunrise or sunset."""
+    winter = compute_astronomy(*SVALBARD, date(2024, 12, 21))
+    assert winter.polar_night and not winter.polar_day
+    assert winter.sunrise is None and winter.sunset is None
+    assert winter.day_length.total_seconds() == 0
+
+    summer = compute_astronomy(*SVALBARD, date(2024, 6, 21))
+    assert summer.polar_day and not summer.polar_night
+    assert summer.day_length.total_seconds() == 86400
+
+    southern = compute_astronomy(*MCMURDO, date(2024, 6, 21))
+    assert southern.polar_night and not southern.polar_day
+
+
+def main():
+    """Run the astronomy tests."""
+    print("Astronomy Engine Tests")
+    print("=" * 50)
+
+    for test in (
+        test_london_sunrise_and_sunset,
+        test_equinox_day_length_at_equator,
+        test_moon_phase,
+        test_polar_day_and_night,
+    ):
+        test()
+        print(f"✓ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared async SQLite connections.
+Checks that connections are closed with their event loop, that connections of
+a loop closed without cleanup are evicted, that DatabaseContext never hands
+out a connection of a finished loop, and that reads from other tasks never see
+or cache the rows of an open unit of work.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data import async_sqlite
+from src.data.async_sqlite import close_shared_connections, get_shared_connection
+from src.data.database_context import DatabaseConfig, DatabaseContext
+from src.data.repositories.preference_repository import PreferenceRepository
+from src.data.unit_of_work import UnitOfWork
+from src.models.user.preference_models import UserPreferences
+
+
+def wait_for_threads(count: int, timeout: float = 2.0) -> int:
+    """Wait until at most count threads are alive and return the live count."""
+    deadline = time.time() + timeout
+    while threading.active_count() > count and time.time() < deadline:
+        time.sleep(0.02)
+    return threading.active_count()
+
+
+def test_connections_close_with_their_loop():
+    """Each asyncio.run() opens its own connection and closes it on shutdown."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "weather.db")
+        baseline = threading.active_count()
+        opened = []
+
+        async def query():
+            shared = await get_shared_connection(db_path)
+            assert await get_shared_connection(db_path) is shared
+            opened.append(shared)
+            return (await shared.db.execute_fetchall("SELECT 1"))[0][0]
+
+        for _ in range(5):
+            assert asyncio.run(query()) == 1
+            assert len(async_sqlite._connections) == 0, "Finished loop kept its connections"
+
+        assert len(set(map(id, opened))) == 5
+        assert wait_for_threads(baseline) == baseline, "Connection threads were left running"
+
+
+def test_close_shared_connections_keeps_loop_usable():
+    """Closing a loop's connections explicitly lets it open fresh ones."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "weather.db")
+
+        async def reopen():
+            first = await get_shared_connection(db_path)
+            await close_shared_connections(db_path)
+            second = await get_shared_connection(db_path)
+            assert second is not first
+            return (await second.db.execute_fetchall("SELECT 2"))[0][0]
+
+        assert asyncio.run(reopen()) == 2
+        assert len(async_sqlite._connections) == 0
+
+
+def test_closed_loop_connections_are_evicted():
+    """Connections of a loop closed without shutdown_asyncgens() are stopped later."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "weather.db")
+        baseline = threading.active_count()
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(get_shared_connection(db_path))
+        loop.close()
+        assert loop in async_sqlite._connections
+
+        async def query():
+            shared = await get_shared_connection(db_path)
+            return (await shared.db.execute_fetchall("SELECT 3"))[0][0]
+
+        assert asyncio.run(query()) == 3
+        assert loop not in async_sqlite._connections
+        assert wait_for_threads(baseline) == baseline
+
+
+def test_database_context_reconnects_on_each_loop():
+    """A DatabaseContext used from several asyncio.run() calls gets live connections."""
+    with tempfile.TemporaryDirectory() as tmp:
+        context = DatabaseContext(DatabaseConfig(), base_path=tmp)
+
+        async def health():
+            await context.initialize()
+            status = await context.health_check()
+            async with context.async_transaction_scope():
+                conn = await context.get_connection("weather")
+                await conn.db.execute("CREATE TABLE IF NOT EXISTS t (x INTEGER)")
+                await conn.db.execute("INSERT INTO t VALUES (1)")
+            return status
+
+        for _ in range(3):
+            status = asyncio.run(health())
+            assert status["overall_healthy"], status
+            assert status["connections"] == 4, "Connections of finished loops were kept"
+
+        async def count_rows():
+            conn = await context.get_connection("weather")
+            return (await conn.db.execute_fetchall("SELECT COUNT(*) FROM t"))[0][0]
+
+        assert asyncio.run(count_rows()) == 3
+        assert len(asyncio.run(context.get_connection_info())) <= 4
+
+
+def test_reads_wait_for_another_tasks_transaction():
+    """A read from another task waits for the rollback and caches no phantom row."""
+    with tempfile.TemporaryDirectory() as tmp:
+        context = DatabaseContext(DatabaseConfig(), base_path=tmp)
+
+        async def scenario():
+            await context.initialize()
+            reader = PreferenceRepository(context.preferences_db_path, db_context=context)
+            assert await reader.get_by_id("someone") is None  # Creates the schema
+
+            written = asyncio.Event()
+            release = asyncio.Event()
+
+            async def write_then_roll_back():
+                uow = UnitOfWork(context)
+                await uow.begin_transaction()
+                try:
+                    await uow.preference_repository.create(UserPreferences(user_id="phantom"))
+                    # The task that owns the transaction reads its own writes
+                    assert await uow.preference_repository.exists("phantom")
+                    written.set()
+                    await release.wait()
+                finally:
+                    await uow.rollback()
+
+            writer = asyncio.create_task(write_then_roll_back())
+            await written.wait()
+            read = asyncio.create_task(reader.get_by_id("phantom"))
+            await asyncio.sleep(0.1)
+            assert not read.done(), "Read did not wait for the open transaction"
+
+            release.set()
+            await writer
+            assert await read is None
+            assert reader._get_from_cache("phantom") is None
+            assert not await reader.exists("phantom")
+            await context.close()
+
+        asyncio.run(scenario())
+
+
+def main():
+    """Run the async SQLite connection tests."""
+    print("Async SQLite Connection Tests")
+    print("=" * 50)
+
+    for test in (
+        test_connections_close_with_their_loop,
+        test_close_shared_connections_keeps_loop_usable,
+        test_closed_loop_connections_are_evicted,
+        test_database_context_reconnects_on_each_loop,
+        test_reads_wait_for_another_tasks_transaction,
+    ):
+        test()
+        print(f"✓ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()
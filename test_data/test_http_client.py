@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared HTTP client's async facade.
+Checks that each event loop gets its own pooled client and that clients are
+closed and forgotten once their loop shuts down.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.http_client import HTTPClient, HTTPClientConfig
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small JSON body."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        payload = json.dumps({"ok": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    """Start the stub server on a free port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_async_clients_are_closed_with_their_loop():
+    """Every asyncio.run() gets a fresh client that is closed when the run ends."""
+    server = start_stub_server()
+    client = HTTPClient(HTTPClientConfig(max_retries=0))
+    url = f"http://127.0.0.1:{server.server_port}/weather"
+    seen = []
+
+    async def fetch_twice():
+        first = await client.aget(url)
+        second = await client.aget(url)
+        seen.append(client._loop_resources[asyncio.get_running_loop()].client)
+        return first.status_code, second.status_code
+
+    try:
+        for _ in range(5):
+            assert asyncio.run(fetch_twice()) == (200, 200)
+            assert len(client._loop_resources) == 0, "Finished loop left its client behind"
+
+        assert len(set(map(id, seen))) == len(seen)
+        assert all(async_client.is_closed for async_client in seen)
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_closed_loop_is_evicted_without_asyncgen_shutdown():
+    """A loop closed without shutdown_asyncgens() is evicted on the next lookup."""
+    server = start_stub_server()
+    client = HTTPClient(HTTPClientConfig(max_retries=0))
+    url = f"http://127.0.0.1:{server.server_port}/weather"
+
+    try:
+        loop = asyncio.new_event_loop()
+        assert loop.run_until_complete(client.aget(url)).status_code == 200
+        loop.close()
+        assert loop in client._loop_resources
+
+        assert asyncio.run(client.aget(url)).status_code == 200
+        assert loop not in client._loop_resources
+        assert len(client._loop_resources) == 0
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_aclose_releases_running_loop_client():
+    """aclose() closes and forgets the running loop's client."""
+    server = start_stub_server()
+    client = HTTPClient(HTTPClientConfig(max_retries=0))
+    url = f"http://127.0.0.1:{server.server_port}/weather"
+
+    async def fetch_and_close():
+        await client.aget(url)
+        async_client = client._loop_resources[asyncio.get_running_loop()].client
+        await client.aclose()
+        return async_client
+
+    try:
+        async_client = asyncio.run(fetch_and_close())
+        assert async_client.is_closed
+        assert len(client._loop_resources) == 0
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    """Run the HTTP client tests."""
+    print("HTTP Client Tests")
+    print("=" * 50)
+
+    for test in (
+        test_async_clients_are_closed_with_their_loop,
+        test_closed_loop_is_evicted_without_asyncgen_shutdown,
+        test_aclose_releases_running_loop_client,
+    ):
+        test()
+        print(f"✓ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for location lookups in the weather history.
+Checks that an exact location name only matches that location, also after
+its raw observations were purged and only its rollups remain, and that a
+partial name still finds every matching location.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import WeatherHistory
+from src.database.repositories import WeatherRepository
+
+logging.disable(logging.WARNING)
+
+
+def observations(location: str, temperature: float, now: datetime) -> list:
+    """Five hourly observations of location, all at temperature."""
+    return [
+        {
+            "location": location,
+            "temperature": temperature,
+            "condition": "clear",
+            "timestamp": now - timedelta(days=2, hours=hour),
+        }
+        for hour in range(5)
+    ]
+
+
+async def lookup_statistics(purge_london: bool) -> dict:
+    """Statistics for London, New London and "london" with or without London's raw rows."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(str(Path(tmp) / "weather_dashboard.db"))
+        await db_manager.initialize()
+        try:
+            now = datetime.utcnow()
+            async with db_manager.get_async_session() as session:
+                repository = WeatherRepository(session)
+                await repository.save_weather_batch(
+                    observations("London", 10.0, now) + observations("New London", 30.0, now)
+                )
+                if purge_london:
+                    await session.execute(
+                        delete(WeatherHistory).where(WeatherHistory.location == "London")
+                    )
+                    await session.commit()
+
+                return {
+                    name: await repository.get_weather_statistics(name, 30)
+                    for name in (" london ", "New London", "lond")
+                }
+        finally:
+            await db_manager.close()
+
+
+def test_exact_name_matches_only_that_location():
+    """An exact name, in any case and with spaces around it, selects only that location."""
+    stats = asyncio.run(lookup_statistics(purge_london=False))
+    assert stats[" london "]["avg_temperature"] == 10.0
+    assert stats[" london "]["record_count"] == 5
+    assert stats["New London"]["avg_temperature"] == 30.0
+
+
+def test_exact_name_survives_purged_observations():
+    """Rollups of a location without raw rows left are not merged with similar names."""
+    stats = asyncio.run(lookup_statistics(purge_london=True))
+    assert stats[" london "]["avg_temperature"] == 10.0
+    assert stats[" london "]["record_count"] == 5
+    assert stats["New London"]["record_count"] == 5
+
+
+def test_partial_name_matches_every_location():
+    """A part of a name matches each location containing it."""
+    stats = asyncio.run(lookup_statistics(purge_london=True))
+    assert stats["lond"]["avg_temperature"] == 20.0
+    assert stats["lond"]["record_count"] == 10
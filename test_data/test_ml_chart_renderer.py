@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for background rendering of the ML comparison charts.
+Covers caching of rendered charts, failed builds that must not be cached and
+the service lock that keeps a chart build from interleaving with analyses of
+another profile set.
+"""
+
+import os
+import random
+import sys
+import threading
+import warnings
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.ml_chart_renderer import MLChartRenderer
+from src.services.ml_weather_service import MLWeatherService, WeatherProfile
+
+SIZE = (400, 300)
+
+
+def make_profiles(seed: int, count: int = 6) -> list:
+    """Plausible weather profiles for count cities."""
+    rng = random.Random(seed)
+    return [
+        WeatherProfile(
+            city_name=f"City {seed}-{i}",
+            temperature=rng.uniform(-15, 38),
+            humidity=rng.uniform(10, 100),
+            wind_speed=rng.uniform(0, 20),
+            pressure=rng.uniform(975, 1045),
+            uv_index=rng.uniform(0, 11),
+            visibility=rng.uniform(1, 10),
+        )
+        for i in range(count)
+    ]
+
+
+def render(renderer: MLChartRenderer, chart_type: str, profiles: list):
+    """Render a chart and wait for the image."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return renderer.render(chart_type, profiles, SIZE).result(timeout=60)
+
+
+class FlakyService(MLWeatherService):
+    """Fails the first clustering it is asked for."""
+
+    def __init__(self):
+        super().__init__()
+        self.failures_left = 1
+
+    def _cluster_profiles(self, store):
+        if self.failures_left:
+            self.failures_left -= 1
+            raise RuntimeError("clustering failed")
+        return super()._cluster_profiles(store)
+
+
+def test_rendered_charts_are_cached():
+    """A second request for the same chart is a cache hit."""
+    renderer = MLChartRenderer(MLWeatherService())
+    try:
+        profiles = make_profiles(1)
+        image = render(renderer, "similarity", profiles)
+        assert image.size == SIZE
+        assert render(renderer, "similarity", profiles) is image
+
+        stats = renderer.get_stats()
+        assert stats["renders"] == 1
+        assert stats["hits"] == 1
+    finally:
+        renderer.shutdown()
+
+
+def test_failed_builds_are_not_cached():
+    """A chart whose build failed is drawn but rendered again on the next request."""
+    service = FlakyService()
+    renderer = MLChartRenderer(service)
+    try:
+        profiles = make_profiles(2)
+        failed = render(renderer, "clusters", profiles)
+        assert failed.size == SIZE
+        stats = renderer.get_stats()
+        assert stats["failures"] == 1
+        assert stats["cached"] == 0
+
+        chart = render(renderer, "clusters", profiles)
+        assert chart is not failed
+        stats = renderer.get_stats()
+        assert stats["renders"] == 1
+        assert stats["cached"] == 1
+        assert stats["hits"] == 0
+    finally:
+        renderer.shutdown()
+
+
+def test_chart_build_holds_the_service_lock():
+    """An analysis of another profile set waits until the chart build is done."""
+    entered = threading.Event()
+    release = threading.Event()
+
+    class BlockingService(MLWeatherService):
+        def _cluster_profiles(self, store):
+            entered.set()
+            assert release.wait(timeout=30)
+            return super()._cluster_profiles(store)
+
+    service = BlockingService()
+    renderer = MLChartRenderer(service)
+    try:
+        chart_profiles = make_profiles(3)
+        other_profiles = make_profiles(4, count=8)
+        future = renderer.render("clusters", chart_profiles, SIZE)
+        assert entered.wait(timeout=30)
+
+        analysis = threading.Thread(
+            target=service.calculate_similarity_matrix, args=(other_profiles,)
+        )
+        analysis.start()
+        analysis.join(timeout=0.2)
+        assert analysis.is_alive()
+        # The chart still sees the profiles it synced
+        assert service.feature_store.city_names == [p.city_name for p in chart_profiles]
+
+        release.set()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            future.result(timeout=60)
+        analysis.join(timeout=30)
+        assert not analysis.is_alive()
+        assert service.feature_store.city_names == [p.city_name for p in other_profiles]
+        assert renderer.get_stats()["failures"] == 0
+    finally:
+        release.set()
+        renderer.shutdown()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming weather clustering.
+Covers profile sets with fewer distinct readings than clusters, which used to
+leave empty clusters with NaN centroids that swallowed every city on the next
+refresh.
+"""
+
+import dataclasses
+import os
+import random
+import sys
+import warnings
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.services.ml_clustering import StreamingWeatherClusters
+from src.services.ml_feature_store import WeatherFeatureStore
+from src.services.ml_weather_service import MLWeatherService, WeatherProfile
+
+MILD = dict(temperature=5.0, humidity=80.0, wind_speed=3.0, pressure=1010.0, uv_index=5.0)
+HOT = dict(temperature=30.0, humidity=40.0, wind_speed=3.0, pressure=1010.0, uv_index=5.0)
+
+
+def two_climates() -> list:
+    """Six cities sharing two distinct readings."""
+    return [WeatherProfile(f"City {i}", **(HOT if i % 2 else MILD)) for i in range(6)]
+
+
+def test_clusters_are_capped_at_distinct_readings():
+    """Two distinct readings give two clusters, and a small change does not collapse them."""
+    service = MLWeatherService()
+    profiles = two_climates()
+
+    clusters = service.perform_weather_clustering(profiles)
+    assert sorted(c.cities for c in clusters) == [
+        ["City 0", "City 2", "City 4"],
+        ["City 1", "City 3", "City 5"],
+    ]
+    assert np.isfinite(service.cluster_model.centroids).all()
+
+    profiles = [dataclasses.replace(p) for p in profiles]
+    profiles[0].temperature += 0.1
+    clusters = service.perform_weather_clustering(profiles)
+    assert np.isfinite(service.cluster_model.centroids).all()
+    assert all(len(c.cities) < 6 for c in clusters)
+    assert sum(len(c.cities) for c in clusters) == 6
+    hot = next(c for c in clusters if "City 1" in c.cities)
+    assert hot.cities == ["City 1", "City 3", "City 5"]
+
+
+def test_centroids_stay_finite_on_duplicate_heavy_refreshes():
+    """Refreshing readings drawn from a few values never yields NaN centroids or stray labels."""
+    rng = random.Random(24)
+    values = [MILD, HOT, dict(MILD, humidity=20.0), dict(HOT, wind_speed=15.0)]
+    model = StreamingWeatherClusters(max_clusters=5)
+    store = WeatherFeatureStore()
+
+    for _ in range(40):
+        profiles = [
+            WeatherProfile(f"City {i}", **rng.choice(values[: rng.randint(1, 4)]))
+            for i in range(rng.randint(2, 12))
+        ]
+        store.sync(profiles)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            labels = model.fit_predict(store)
+
+        centroids = model.centroids
+        distinct = len({tuple(store.raw[i]) for i in range(len(store))})
+        assert np.isfinite(centroids).all()
+        assert len(centroids) <= distinct
+        assert labels.max() < len(centroids)
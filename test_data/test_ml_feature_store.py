@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared ML feature store.
+Replays random runs of single-city additions and removals and checks that
+the incrementally maintained scaler and scaled matrix match a StandardScaler
+fitted from scratch on the same profiles.
+"""
+
+import os
+import random
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from src.services.ml_feature_store import FEATURE_COLUMNS, WeatherFeatureStore
+from src.services.ml_weather_service import WeatherProfile
+
+STEPS = 300
+
+
+def make_profile(rng: random.Random, i: int) -> WeatherProfile:
+    """Build a plausible weather profile for city i, occasionally missing a value."""
+    profile = WeatherProfile(
+        city_name=f"City {i:04d}",
+        temperature=rng.uniform(-15, 38),
+        humidity=rng.uniform(10, 100),
+        wind_speed=rng.uniform(0, 20),
+        pressure=rng.uniform(975, 1045),
+        uv_index=rng.uniform(0, 11),
+        visibility=rng.uniform(1, 10),
+        is_team_member=rng.random() < 0.2,
+    )
+    if rng.random() < 0.1:
+        setattr(profile, rng.choice(FEATURE_COLUMNS), None)
+    return profile
+
+
+def reference_scaler(profiles: list) -> tuple:
+    """StandardScaler fitted on the profiles with missing values filled by the column mean."""
+    raw = np.array(
+        [[getattr(p, column) for column in FEATURE_COLUMNS] for p in profiles], dtype=float
+    )
+    filled = np.where(np.isnan(raw), np.nanmean(raw, axis=0), raw)
+    scaler = StandardScaler().fit(filled)
+    return scaler, scaler.transform(filled)
+
+
+def test_incremental_updates_match_a_refitted_scaler():
+    """Random additions and removals keep the scaler equal to a fresh fit."""
+    rng = random.Random(21)
+    profiles = [make_profile(rng, i) for i in range(20)]
+    store = WeatherFeatureStore(initial_capacity=4)
+    store.sync(profiles)
+
+    for step in range(STEPS):
+        if len(profiles) > 2 and rng.random() < 0.45:
+            profiles.pop(rng.randrange(len(profiles)))
+        else:
+            profiles.append(make_profile(rng, 20 + step))
+        store.sync(profiles)
+
+        expected, scaled = reference_scaler(profiles)
+        np.testing.assert_allclose(store.scaler.mean_, expected.mean_, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(store.scaler.var_, expected.var_, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(store.scaler.scale_, expected.scale_, rtol=1e-9)
+        np.testing.assert_allclose(store.scaled, scaled, rtol=0, atol=1e-9)
+        assert store.city_names == [p.city_name for p in profiles]
+
+    stats = store.get_stats()
+    assert stats["rebuilds"] == 1
+    assert stats["appends"] + stats["removals"] == STEPS
+
+
+def test_constant_column_scales_like_standard_scaler():
+    """A column with one value gets unit scale and scales to zero."""
+    rng = random.Random(4)
+    profiles = [make_profile(rng, i) for i in range(5)]
+    for profile in profiles:
+        profile.uv_index = 3.0
+        profile.visibility = 10.0
+    store = WeatherFeatureStore()
+    store.sync(profiles[:4])
+    store.sync(profiles)
+
+    expected, scaled = reference_scaler(profiles)
+    np.testing.assert_allclose(store.scaler.scale_, expected.scale_)
+    np.testing.assert_allclose(store.scaled, scaled, atol=1e-9)
+    assert not store.scaled[:, 4:].any()
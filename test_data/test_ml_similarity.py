@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental similarity engine.
+Replays random runs of single-city additions and removals and checks the
+incrementally maintained matrix, top-k and most-similar-pair answers against
+sklearn's cosine_similarity computed from scratch.
+"""
+
+import os
+import random
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.services.ml_feature_store import WeatherFeatureStore
+from src.services.ml_similarity import SimilarityEngine
+from src.services.ml_weather_service import WeatherProfile
+
+STEPS = 300
+
+
+def make_profile(rng: random.Random, i: int) -> WeatherProfile:
+    """Build a plausible weather profile for city i."""
+    return WeatherProfile(
+        city_name=f"City {i:04d}",
+        temperature=rng.uniform(-15, 38),
+        humidity=rng.uniform(10, 100),
+        wind_speed=rng.uniform(0, 20),
+        pressure=rng.uniform(975, 1045),
+        uv_index=rng.uniform(0, 11),
+        visibility=rng.uniform(1, 10),
+    )
+
+
+def random_steps(rng: random.Random, profiles: list, steps: int):
+    """Add or remove one random city per step, yielding after each change."""
+    for step in range(steps):
+        if len(profiles) > 3 and rng.random() < 0.45:
+            profiles.pop(rng.randrange(len(profiles)))
+        else:
+            profiles.append(make_profile(rng, 1000 + step))
+        yield profiles
+
+
+def test_incremental_matrix_matches_cosine_similarity():
+    """Rows added and removed in place match a full cosine_similarity with the same scaling."""
+    rng = random.Random(22)
+    profiles = [make_profile(rng, i) for i in range(20)]
+    store = WeatherFeatureStore()
+    # Never recompute on drift, so every step goes through the incremental path
+    engine = SimilarityEngine(store, drift_threshold=np.inf)
+    store.sync(profiles)
+    engine.matrix()
+    mean, scale = store.scaler.mean_.copy(), store.scaler.scale_.copy()
+
+    for profiles in random_steps(rng, profiles, STEPS):
+        store.sync(profiles)
+        expected = cosine_similarity((store.raw - mean) / scale)
+
+        np.testing.assert_allclose(engine.matrix(), expected, rtol=0, atol=1e-12)
+        position = rng.randrange(len(profiles))
+        scores = expected[position].copy()
+        scores[position] = -np.inf
+        best = sorted(range(len(scores)), key=lambda i: (-scores[i], i))[:5]
+        top = engine.top_k(position, k=5)
+        assert [row for row, _ in top] == best
+        np.testing.assert_allclose([s for _, s in top], scores[best], rtol=0, atol=1e-12)
+
+    upper = np.triu(expected, k=1)
+    upper[np.tril_indices(len(expected))] = -np.inf
+    i, j = np.unravel_index(np.argmax(upper), upper.shape)
+    row, other, score = engine.most_similar_pair()
+    assert (row, other) == (i, j)
+    assert abs(score - expected[i, j]) < 1e-12
+
+    stats = engine.get_stats()
+    assert stats["full_recomputes"] == 1
+    assert stats["incremental_adds"] + stats["incremental_removes"] == STEPS
+
+
+def test_drift_recomputes_with_the_current_scaler():
+    """Once the scaler drifts the matrix matches cosine_similarity of the store's scaled matrix."""
+    rng = random.Random(7)
+    profiles = [make_profile(rng, i) for i in range(10)]
+    store = WeatherFeatureStore()
+    engine = SimilarityEngine(store, drift_threshold=0.0)
+    store.sync(profiles)
+    engine.matrix()
+
+    for profiles in random_steps(rng, profiles, 30):
+        store.sync(profiles)
+        np.testing.assert_allclose(
+            engine.matrix(), cosine_similarity(store.scaled), rtol=0, atol=1e-12
+        )
+
+    assert engine.get_stats()["drift_recomputes"] == 30
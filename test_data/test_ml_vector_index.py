@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for the weather vector index.
+Replays random runs of inserts and removals that move rows through the
+insert buffer, the KD tree and rebuilds, and checks every top-k answer
+against a brute-force cosine search over the live rows.
+"""
+
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.services.ml_feature_store import WeatherFeatureStore, unit_vectors
+from src.services.ml_vector_index import FeatureStoreIndex, WeatherVectorIndex
+from src.services.ml_weather_service import WeatherProfile
+
+STEPS = 300
+K = 5
+
+
+def make_rows(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Plausible unscaled weather features in FEATURE_COLUMNS order."""
+    return np.column_stack(
+        [
+            rng.uniform(-15, 38, count),
+            rng.uniform(10, 100, count),
+            rng.uniform(0, 20, count),
+            rng.uniform(975, 1045, count),
+            rng.uniform(0, 11, count),
+            rng.uniform(1, 10, count),
+        ]
+    )
+
+
+def brute_force(index, rows: dict, team: dict, target: np.ndarray, k: int, team_only=False):
+    """Closest live rows by cosine distance, ties broken by row id."""
+    vector = unit_vectors(target, index.mean, index.scale)
+    distances = [
+        (row_id, 1.0 - float(unit_vectors(raw, index.mean, index.scale) @ vector))
+        for row_id, raw in rows.items()
+        if team[row_id] or not team_only
+    ]
+    return sorted(distances, key=lambda neighbor: (neighbor[1], neighbor[0]))[:k]
+
+
+def assert_same_neighbors(found: list, expected: list) -> None:
+    """Same rows in the same order, with distances equal to rounding."""
+    assert [row_id for row_id, _ in found] == [row_id for row_id, _ in expected]
+    np.testing.assert_allclose(
+        [d for _, d in found], [d for _, d in expected], rtol=0, atol=1e-9
+    )
+
+
+def test_queries_match_brute_force_through_inserts_and_removals():
+    """Tree, buffer and removed rows together answer exactly like a brute-force scan."""
+    rng = np.random.default_rng(23)
+    picker = random.Random(23)
+    initial = make_rows(rng, 200)
+    team_mask = rng.random(200) < 0.3
+    index = WeatherVectorIndex.build(
+        initial,
+        [f"City {i}" for i in range(200)],
+        team_mask,
+        initial.mean(axis=0),
+        initial.std(axis=0),
+        min_buffer=8,
+        rebuild_ratio=0.05,
+    )
+    rows = {i: initial[i] for i in range(200)}
+    team = {i: bool(team_mask[i]) for i in range(200)}
+
+    for step in range(STEPS):
+        if len(rows) > K and picker.random() < 0.45:
+            row_id = picker.choice(list(rows))
+            index.remove(row_id)
+            del rows[row_id], team[row_id]
+        else:
+            raw = make_rows(rng, 1)[0]
+            is_team_member = picker.random() < 0.3
+            row_id = index.add(raw, f"City {200 + step}", is_team_member)
+            rows[row_id], team[row_id] = raw, is_team_member
+
+        target = make_rows(rng, 1)[0]
+        team_only = picker.random() < 0.3
+        assert_same_neighbors(
+            index.query(target, K, team_only),
+            brute_force(index, rows, team, target, K, team_only),
+        )
+
+    assert len(index) == len(rows)
+    assert index.get_stats()["builds"] > 1
+
+
+def test_saved_index_answers_the_same_queries():
+    """An index loaded from disk keeps removed rows out and answers like the original."""
+    rng = np.random.default_rng(5)
+    raw = make_rows(rng, 50)
+    index = WeatherVectorIndex.build(
+        raw, [f"City {i}" for i in range(50)], np.zeros(50, bool), raw.mean(0), raw.std(0)
+    )
+    index.add(make_rows(rng, 1)[0], "Late city")
+    index.remove(3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "index.npz"
+        index.save(path)
+        loaded = WeatherVectorIndex.load(path)
+
+    assert loaded.name_of(50) == "Late city"
+    for target in make_rows(rng, 10):
+        assert_same_neighbors(loaded.query(target, K), index.query(target, K))
+
+
+def test_save_and_load_use_the_path_as_given():
+    """A path without the .npz suffix is written and read back unchanged."""
+    rng = np.random.default_rng(6)
+    raw = make_rows(rng, 20)
+    index = WeatherVectorIndex.build(
+        raw, [f"City {i}" for i in range(20)], np.zeros(20, bool), raw.mean(0), raw.std(0)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index.save(Path(tmp) / "catalogue")
+        assert os.listdir(tmp) == ["catalogue"]
+        loaded = WeatherVectorIndex.load(os.path.join(tmp, "catalogue"))
+
+    target = make_rows(rng, 1)[0]
+    assert_same_neighbors(loaded.query(target, K), index.query(target, K))
+
+
+def test_feature_store_index_follows_the_store():
+    """Store rows returned by FeatureStoreIndex stay correct as cities come and go."""
+    rng = np.random.default_rng(11)
+    picker = random.Random(11)
+
+    def profile(i: int) -> WeatherProfile:
+        values = make_rows(rng, 1)[0]
+        return WeatherProfile(f"City {i:04d}", *values, is_team_member=picker.random() < 0.3)
+
+    profiles = [profile(i) for i in range(30)]
+    store = WeatherFeatureStore()
+    follower = FeatureStoreIndex(store, drift_threshold=np.inf)
+    store.sync(profiles)
+    index = follower.index
+
+    for step in range(100):
+        if len(profiles) > K and picker.random() < 0.45:
+            profiles.pop(picker.randrange(len(profiles)))
+        else:
+            profiles.append(profile(100 + step))
+        store.sync(profiles)
+
+        target = make_rows(rng, 1)[0]
+        live = {i: store.raw[i] for i in range(len(store))}
+        team = dict(enumerate(store.team_mask.tolist()))
+        assert_same_neighbors(
+            follower.query(target, K, team_only=True),
+            brute_force(index, live, team, target, K, team_only=True),
+        )
+
+    assert follower.index is index
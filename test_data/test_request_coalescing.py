@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight request coalescing.
+Checks that concurrent duplicate lookups share one call and that the weather
+service only counts requests that actually went out over HTTP.
+"""
+
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.enhanced_weather_service import EnhancedWeatherService
+from src.utils.api_optimizer import APIOptimizer, APIResponse
+from src.utils.single_flight import SingleFlight
+
+WEATHER_PAYLOAD = {
+    "name": "London",
+    "sys": {"country": "GB"},
+    "coord": {"lat": 51.51, "lon": -0.13},
+    "main": {"temp": 20.0, "feels_like": 19.0, "humidity": 50, "pressure": 1012},
+    "weather": [{"id": 800, "main": "Clear", "description": "clear sky"}],
+    "wind": {"speed": 3.0, "deg": 90},
+    "visibility": 10000,
+    "clouds": {"all": 0},
+    "dt": 1700000000,
+}
+
+
+class StubTransport:
+    """Answers every request after a short delay and records what was sent."""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, request):
+        with self._lock:
+            self.sent.append(request.endpoint)
+        time.sleep(self.delay)
+        if request.endpoint.endswith("forecast"):
+            data = {"list": [], "city": {"name": "London"}}
+        elif request.endpoint.endswith("air_pollution"):
+            data = {"list": [{"main": {"aqi": 2}, "components": {}}]}
+        else:
+            data = WEATHER_PAYLOAD
+        return APIResponse(request_id=request.request_id, data=data, success=True, status_code=200)
+
+
+class MemoryCacheWeatherService(EnhancedWeatherService):
+    """Weather service that keeps its enhanced cache in memory only."""
+
+    def _load_cache(self):
+        self._cache = {}
+
+
+def make_service(transport):
+    """Create a weather service sending through a stub transport."""
+    config = SimpleNamespace(
+        weather=SimpleNamespace(base_url="http://stub", api_key="test", units="metric"),
+        app=SimpleNamespace(cache_duration=600),
+    )
+    optimizer = APIOptimizer(
+        requests_per_second=100, burst_size=100, max_concurrent=4, transport=transport
+    )
+    return MemoryCacheWeatherService(config, api_optimizer=optimizer), optimizer
+
+
+def run_concurrently(func, count):
+    """Call func from count threads at once and collect the results."""
+    results = []
+    barrier = threading.Barrier(count)
+
+    def worker():
+        barrier.wait()
+        results.append(func())
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results
+
+
+def capture(func):
+    """Return the exception raised by func, or its result."""
+    try:
+        return func()
+    except Exception as e:
+        return e
+
+
+def test_single_flight_shares_result_and_error():
+    """Concurrent callers for one key share a single execution, result or error."""
+    flight = SingleFlight()
+    calls = []
+
+    def slow(value):
+        calls.append(value)
+        time.sleep(0.2)
+        return value * 2
+
+    results = run_concurrently(lambda: flight.do("key", slow, 21), 6)
+    assert results == [42] * 6
+    assert len(calls) == 1
+    assert flight.get_stats() == {"executions": 1, "coalesced": 5, "in_flight": 0}
+
+    def failing():
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    errors = run_concurrently(lambda: capture(lambda: flight.do("bad", failing)), 4)
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert flight.get_stats()["executions"] == 2
+
+
+def test_concurrent_lookups_share_api_calls():
+    """Six concurrent lookups for one city send each API request once."""
+    transport = StubTransport()
+    service, optimizer = make_service(transport)
+    try:
+        results = run_concurrently(lambda: service.get_current_weather("London"), 6)
+
+        assert [result["current"]["temp_c"] for result in results] == [20.0] * 6
+        assert sorted(transport.sent) == [
+            "http://stub/data/2.5/air_pollution",
+            "http://stub/forecast",
+            "http://stub/weather",
+        ]
+        stats = service.get_request_stats()
+        assert stats["api_calls"] == 3, stats
+        assert stats["coalesced"] >= 5
+        assert stats["in_flight"] == 0
+    finally:
+        service.shutdown()
+        optimizer.shutdown()
+
+
+def test_cache_hits_and_offline_fallbacks_are_not_api_calls():
+    """Response cache hits and offline fallbacks never count as API calls."""
+    transport = StubTransport(delay=0)
+    service, optimizer = make_service(transport)
+    try:
+        assert service._make_request("weather", {"q": "London"})["name"] == "London"
+        assert service._make_request("weather", {"q": "London"})["name"] == "London"
+        assert len(transport.sent) == 1, "Repeat was not served from the response cache"
+        assert service.get_request_stats()["api_calls"] == 1
+
+        service._offline_mode = True
+        fallback = service._make_request("weather", {"q": "Paris"})
+        assert fallback is not None
+        assert len(transport.sent) == 1
+        assert service.get_request_stats()["api_calls"] == 1
+    finally:
+        service.shutdown()
+        optimizer.shutdown()
+
+
+def main():
+    """Run the request coalescing tests."""
+    print("Request Coalescing Tests")
+    print("=" * 50)
+
+    for test in (
+        test_single_flight_shares_result_and_error,
+        test_concurrent_lookups_share_api_calls,
+        test_cache_hits_and_offline_fallbacks_are_not_api_calls,
+    ):
+        test()
+        print(f"✓ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming ExportImportManager export.
+Checks each output format against the stored rows and that peak memory while
+exporting a large weather history stays at the level of a small one.
+
+The large history has 50k rows by default (10x the small one, which already
+spans several export pages); set EXPORT_MEMORY_ROWS, e.g. to 1000000, for a
+longer run.
+"""
+
+import asyncio
+import csv
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.database_manager import DatabaseManager
+from src.database.export_import_manager import ExportFormat, ExportImportManager
+
+logging.disable(logging.WARNING)
+
+SMALL_EXPORT_ROWS = 5_000
+LARGE_EXPORT_ROWS = int(os.environ.get("EXPORT_MEMORY_ROWS", "50000"))
+
+
+def load_history(path: Path, rows: int) -> None:
+    """Insert rows observations, one minute apart, generated inside SQLite."""
+    with sqlite3.connect(path) as db:
+        db.execute(
+            """
+            WITH RECURSIVE seq(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM seq LIMIT ?)
+            INSERT INTO weather_history (location, latitude, longitude, timestamp,
+                temperature, humidity, condition, raw_data, created_at, updated_at)
+            SELECT 'City ' || (i % 100), 1.5, 2.5,
+                strftime('%Y-%m-%d %H:%M:%S', '2026-01-01', '-' || i || ' minutes') || '.000000',
+                i * 0.01, i % 100, 'clear',
+                CASE WHEN i % 2 THEN '{"source": "test"}' END,
+                '2026-01-01 00:00:00.000000', '2026-01-01 00:00:00.000000'
+            FROM seq
+            """,
+            (rows,),
+        )
+    db.close()
+
+
+async def export(path: Path, export_file: Path, **kwargs) -> bool:
+    """Export the database at path."""
+    db_manager = DatabaseManager(str(path))
+    await db_manager.initialize()
+    try:
+        return await ExportImportManager(db_manager).export_data(export_file, **kwargs)
+    finally:
+        await db_manager.close()
+
+
+def make_database(tmp: str, rows: int) -> Path:
+    """Create a database holding rows observations."""
+    path = Path(tmp) / "weather_dashboard.db"
+    asyncio.run(DatabaseManager(str(path)).initialize())
+    load_history(path, rows)
+    return path
+
+
+def test_export_formats_round_trip():
+    """Every format holds every row, ordered by id, with the to_dict() field values."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_database(tmp, 2500)
+        tables = ["weather_history", "journal_entries"]
+
+        json_file = Path(tmp) / "export.json.gz"
+        assert asyncio.run(export(path, json_file, tables=tables, compress=True))
+        with gzip.open(json_file, "rt", encoding="utf-8") as f:
+            document = json.load(f)
+        records = document["data"]["weather_history"]
+        assert document["metadata"]["statistics"] == {"weather_history": 2500, "journal_entries": 0}
+        assert [r["id"] for r in records] == list(range(1, 2501))
+        assert records[1]["timestamp"] == "2025-12-31T23:59:00"
+        assert records[1]["raw_data"] == {"source": "test"} and records[0]["raw_data"] is None
+
+        ndjson_file = Path(tmp) / "export.ndjson"
+        assert asyncio.run(
+            export(path, ndjson_file, tables=tables, export_format=ExportFormat.NDJSON)
+        )
+        lines = [json.loads(line) for line in ndjson_file.read_text().splitlines()]
+        assert lines[0]["metadata"]["tables"] == tables
+        assert [line["record"] for line in lines[1:-1]] == records
+        assert lines[-1] == {"statistics": {"weather_history": 2500, "journal_entries": 0}}
+
+        csv_file = Path(tmp) / "export.csv"
+        assert asyncio.run(export(path, csv_file, tables=tables, export_format=ExportFormat.CSV))
+        with open(Path(tmp) / "export_weather_history.csv", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 2500 and rows[1]["location"] == "City 1"
+        assert json.loads(rows[1]["raw_data"]) == {"source": "test"}
+        assert (Path(tmp) / "export_journal_entries.csv").exists()
+
+
+def peak_export_mb(rows: int) -> float:
+    """Peak traced memory while exporting a history of rows observations as NDJSON."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_database(tmp, rows)
+        export_file = Path(tmp) / "export.ndjson"
+        tracemalloc.start()
+        try:
+            ok = asyncio.run(
+                export(
+                    path,
+                    export_file,
+                    tables=["weather_history"],
+                    export_format=ExportFormat.NDJSON,
+                )
+            )
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert ok
+        with open(export_file, encoding="utf-8") as f:
+            assert sum(1 for _ in f) == rows + 2
+    return peak / 1024 / 1024
+
+
+def test_export_memory_does_not_grow_with_rows():
+    """Exporting a large history peaks no higher than a small one, give or take noise."""
+    small = peak_export_mb(SMALL_EXPORT_ROWS)
+    large = peak_export_mb(LARGE_EXPORT_ROWS)
+    print(
+        f"Peak export memory: {SMALL_EXPORT_ROWS:,} rows {small:.1f} MB, "
+        f"{LARGE_EXPORT_ROWS:,} rows {large:.1f} MB"
+    )
+    assert large < small * 1.5 + 2
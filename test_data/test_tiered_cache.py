@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Tests for the tiered memory/SQLite cache.
+Covers demotion of evicted entries to disk and promotion back on a hit,
+expiry in both tiers, warm restarts from the disk index, namespace isolation
+and the tag index.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cache_manager import CacheManager
+
+
+def make_cache(directory: str, **kwargs) -> CacheManager:
+    """Create a cache backed by a database in directory."""
+    return CacheManager(disk_path=Path(directory) / "cache.db", flush_interval=0.05, **kwargs)
+
+
+def test_evicted_entries_are_demoted_and_promoted():
+    """LRU entries leaving memory go to disk and come back on the next hit."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, max_entries=3)
+        try:
+            weather = cache.namespace("weather", persistent=False)
+            for i in range(5):
+                weather.set(f"city-{i}", {"temp": i})
+
+            stats = cache.get_stats()
+            assert stats["memory_entries"] == 3
+            assert stats["disk_entries"] == 2
+            assert stats["demotions"] == 2
+
+            assert weather.get("city-0") == {"temp": 0}
+            stats = cache.get_stats()
+            assert stats["disk_hits"] == 1 and stats["promotions"] == 1
+            # The promoted entry pushed the next least recently used one to disk
+            assert stats["memory_entries"] == 3
+            assert stats["disk_entries"] == 2
+            assert ("weather", "city-0") in cache._memory
+            assert ("weather", "city-2") not in cache._memory
+
+            assert weather.get("city-0") == {"temp": 0}
+            assert cache.get_stats()["memory_hits"] == 1
+            assert sorted(weather.keys()) == [f"city-{i}" for i in range(5)]
+        finally:
+            cache.close()
+
+
+def test_memory_only_cache_drops_evicted_entries():
+    """Without a disk tier, evicted entries are gone."""
+    cache = CacheManager(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+    assert cache.get_stats()["demotions"] == 0
+
+
+def test_expired_entries_are_removed_from_both_tiers():
+    """Expired entries are misses in either tier and are swept from disk."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, max_entries=1)
+        try:
+            cache.set("disk", "old", ttl=0.2)
+            cache.set("memory", "old", ttl=0.2)
+            cache.set("forever", "value")
+            assert cache.get_stats()["disk_entries"] == 3
+
+            time.sleep(0.3)
+            assert cache.get("disk") is None
+            assert "memory" not in cache
+            assert cache.cleanup_expired() == 1
+            assert cache.get("forever") == "value"
+
+            assert cache.flush()
+            stats = cache.get_stats()
+            assert stats["expirations"] == 2
+            assert stats["disk_entries"] == 1
+        finally:
+            cache.close()
+
+
+def test_warm_restart_reads_index_then_values_on_demand():
+    """A restarted cache serves persisted entries without loading them up front."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        cache.namespace("weather").set("london", {"temp": 18}, tags=["uk"])
+        cache.namespace("weather").set("stale", {"temp": 1}, ttl=0.2)
+        cache.namespace("session", persistent=False).set("token", "abc")
+        cache.close()
+        time.sleep(0.3)
+
+        restarted = make_cache(tmp)
+        try:
+            stats = restarted.get_stats()
+            assert stats["memory_entries"] == 0
+            assert stats["disk_entries"] == 2, "Expired entry was loaded into the index"
+
+            weather = restarted.namespace("weather")
+            assert weather.get("london") == {"temp": 18}
+            assert weather.get("stale") is None
+            assert weather.get_by_tags(["uk"]) == {"london": {"temp": 18}}
+            # Memory-only entries are written out on close
+            assert restarted.namespace("session", persistent=False).get("token") == "abc"
+            assert restarted.get_stats()["disk_hits"] == 2
+        finally:
+            restarted.close()
+
+
+def test_namespaces_are_isolated():
+    """Namespaces share the memory budget but not keys, clears or statistics."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        try:
+            weather = cache.namespace("weather")
+            forecast = cache.namespace("forecast", default_ttl=60)
+            weather["london"] = "sunny"
+            forecast["london"] = "rain"
+
+            assert weather["london"] == "sunny" and forecast["london"] == "rain"
+            assert cache._memory[("forecast", "london")].expires_at is not None
+            assert cache._memory[("weather", "london")].expires_at is None
+
+            forecast.clear()
+            assert "london" not in forecast
+            assert weather.get("london") == "sunny"
+            assert cache.namespace("weather") is weather
+
+            namespaces = cache.get_stats()["namespaces"]
+            assert namespaces["weather"]["hits"] == 2
+            assert namespaces["forecast"]["hits"] == 1
+            assert namespaces["forecast"]["misses"] == 0
+            assert namespaces["forecast"]["entries"] == 0
+        finally:
+            cache.close()
+
+
+def test_clear_by_tags_removes_entries_from_both_tiers():
+    """Invalidating a tag removes tagged entries in memory and on disk."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, max_entries=2)
+        try:
+            weather = cache.namespace("weather", persistent=False)
+            weather.set("london", 1, tags=["uk", "europe"])
+            weather.set("paris", 2, tags=["europe"])
+            weather.set("leeds", 3, tags=["uk"])
+            weather.set("tokyo", 4, tags=["asia"])
+            assert ("weather", "london") in cache._disk_index, "Expected london on disk"
+
+            assert weather.get_by_tags(["uk"]) == {"london": 1, "leeds": 3}
+            assert weather.clear_by_tags(["uk"]) == 2
+            assert weather.get_by_tags(["uk"]) == {}
+            assert weather.get("london") is None and weather.get("leeds") is None
+            assert weather.get_by_tags(["europe"]) == {"paris": 2}
+
+            assert weather.clear_by_tags(["europe", "asia"]) == 2
+            assert weather.keys() == []
+            assert cache._tag_index.get("weather", {}) == {}
+
+            assert cache.flush()
+            rows = cache._disk._read_conn.execute("SELECT COUNT(*) FROM cache_entries")
+            assert rows.fetchone()[0] == 0
+        finally:
+            cache.close()
+
+
+def test_overwrite_replaces_tags():
+    """Setting a key again replaces its tags instead of adding to them."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        try:
+            cache.set("london", "sunny", tags=["uk", "sunny"])
+            cache.set("london", "rain", tags=["uk", "rain"])
+
+            assert cache.get_by_tags(["sunny"]) == {}
+            assert cache.get_by_tags(["rain"]) == {"london": "rain"}
+            assert cache.clear_by_tags(["sunny"]) == 0
+            assert cache.get("london") == "rain"
+
+            cache.set("london", "cloudy")
+            assert cache.get_by_tags(["uk", "rain"]) == {}
+            assert cache.get("london") == "cloudy"
+        finally:
+            cache.close()
+
+
+def test_namespace_counts_follow_both_tiers():
+    """len() of a namespace matches its keys through sets, evictions, promotions and removals."""
+    rng = random.Random(9)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, max_entries=5)
+        try:
+            namespaces = [
+                cache.namespace("weather"),
+                cache.namespace("session", persistent=False),
+            ]
+            for _ in range(400):
+                namespace = rng.choice(namespaces)
+                key = f"key-{rng.randrange(12)}"
+                action = rng.random()
+                if action < 0.5:
+                    namespace.set(key, key, tags=[rng.choice(["a", "b"])])
+                elif action < 0.75:
+                    namespace.get(key)
+                elif action < 0.9:
+                    namespace.delete(key)
+                elif action < 0.97:
+                    namespace.clear_by_tags([rng.choice(["a", "b"])])
+                else:
+                    namespace.clear()
+                for checked in namespaces:
+                    assert len(checked) == len(checked.keys())
+        finally:
+            cache.close()
+
+        restarted = make_cache(tmp)
+        try:
+            for name in ("weather", "session"):
+                namespace = restarted.namespace(name)
+                assert len(namespace) == len(namespace.keys())
+        finally:
+            restarted.close()
+
+
+def test_import_json_only_fills_empty_namespaces():
+    """A legacy cache is imported unless the namespace has a live entry."""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / "legacy.json"
+        legacy.write_text(json.dumps({"london": "sunny", "paris": "rain"}))
+        cache = make_cache(tmp)
+        try:
+            weather = cache.namespace("weather")
+            weather.set("stale", "old", ttl=0.1)
+            time.sleep(0.2)
+            assert weather.import_json(legacy) == 2
+            assert weather.import_json(legacy) == 0
+            assert cache.namespace("forecast").import_json(legacy) == 2
+            assert weather.get("paris") == "rain"
+        finally:
+            cache.close()
+
+
+def main():
+    """Run the tiered cache tests."""
+    print("Tiered Cache Tests")
+    print("=" * 50)
+
+    for test in (
+        test_evicted_entries_are_demoted_and_promoted,
+        test_memory_only_cache_drops_evicted_entries,
+        test_expired_entries_are_removed_from_both_tiers,
+        test_warm_restart_reads_index_then_values_on_demand,
+        test_namespaces_are_isolated,
+        test_clear_by_tags_removes_entries_from_both_tiers,
+        test_overwrite_replaces_tags,
+        test_namespace_counts_follow_both_tiers,
+        test_import_json_only_fills_empty_namespaces,
+    ):
+        test()
+        print(f"✓ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind WeatherWriteBuffer.
+Uses a fake batch writer to cover batching, backpressure, flush() waiting for
+in-flight writes, close() draining the queue and the single-record fallback
+after a failed batch.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.write_buffer import WeatherWriteBuffer
+
+
+class FakeBatchWriter:
+    """Records written batches; can be held open or made to fail."""
+
+    def __init__(self, delay: float = 0.0, bad_locations=()):
+        self.delay = delay
+        self.bad_locations = set(bad_locations)
+        self.batches = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, batch):
+        await self.release.wait()
+        await asyncio.sleep(self.delay)
+        if any(record["location"] in self.bad_locations for record in batch):
+            raise ValueError("constraint failed")
+        self.batches.append([record["location"] for record in batch])
+        return len(batch)
+
+    @property
+    def written(self):
+        return [location for batch in self.batches for location in batch]
+
+
+def observation(i: int) -> dict:
+    """Build a weather observation for location i."""
+    return {"location": f"city-{i}", "temperature": 20.0 + i}
+
+
+def test_full_batches_are_written_without_waiting():
+    """max_batch_size observations are written at once; the rest on flush()."""
+
+    async def scenario():
+        writer = FakeBatchWriter()
+        buffer = WeatherWriteBuffer(writer, max_batch_size=100, flush_interval=30)
+        for i in range(250):
+            await buffer.put(observation(i))
+        await asyncio.sleep(0.05)
+        assert [len(batch) for batch in writer.batches] == [100, 100]
+
+        await buffer.flush()
+        assert [len(batch) for batch in writer.batches] == [100, 100, 50]
+        assert writer.written == [f"city-{i}" for i in range(250)]
+        await buffer.close()
+        return buffer.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["flushes"] == 3 and stats["records_written"] == 250
+    assert stats["max_flush_size"] == 100 and stats["pending_writes"] == 0
+
+
+def test_put_waits_while_buffer_is_full():
+    """Producers block at max_pending until the writer makes room."""
+
+    async def scenario():
+        writer = FakeBatchWriter()
+        writer.release.clear()
+        buffer = WeatherWriteBuffer(writer, max_batch_size=5, flush_interval=30, max_pending=5)
+
+        for i in range(5):
+            await buffer.put(observation(i))
+        await asyncio.sleep(0.05)  # Writer takes the first batch and blocks on it
+        for i in range(5, 10):
+            await buffer.put(observation(i))
+
+        blocked = asyncio.create_task(buffer.put(observation(10)))
+        await asyncio.sleep(0.05)
+        assert not blocked.done(), "put() did not wait for room"
+        assert buffer.get_stats()["backpressure_waits"] == 1
+
+        writer.release.set()
+        await asyncio.wait_for(blocked, 1)
+        await buffer.close()
+        return writer, buffer.get_stats()
+
+    writer, stats = asyncio.run(scenario())
+    assert writer.written == [f"city-{i}" for i in range(11)]
+    assert stats["records_written"] == 11 and stats["pending_writes"] == 0
+
+
+def test_flush_waits_for_in_flight_batch():
+    """flush() returns only after a batch already taken by the writer is committed."""
+
+    async def scenario():
+        writer = FakeBatchWriter(delay=0.2)
+        buffer = WeatherWriteBuffer(writer, max_batch_size=3, flush_interval=30)
+        for i in range(3):
+            await buffer.put(observation(i))
+        await asyncio.sleep(0.05)
+        assert buffer.get_stats()["pending_writes"] == 0 and not writer.batches
+
+        await buffer.flush()
+        assert writer.written == ["city-0", "city-1", "city-2"]
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_close_drains_queue_without_waiting_for_interval():
+    """close() writes every queued observation right away and stops the writer."""
+
+    async def scenario():
+        writer = FakeBatchWriter()
+        buffer = WeatherWriteBuffer(writer, max_batch_size=100, flush_interval=30)
+        for i in range(7):
+            await buffer.put(observation(i))
+
+        start = time.perf_counter()
+        await buffer.close()
+        assert time.perf_counter() - start < 1, "close() waited for the flush interval"
+        assert writer.written == [f"city-{i}" for i in range(7)]
+        assert buffer._writer is None
+
+        # The buffer restarts its writer when used again
+        await buffer.put(observation(7))
+        await buffer.close()
+        assert writer.written[-1] == "city-7"
+
+    asyncio.run(scenario())
+
+
+def test_failed_batch_falls_back_to_single_records():
+    """A failing batch is retried record by record and bad records are counted."""
+    flushed = []
+
+    async def scenario():
+        writer = FakeBatchWriter(bad_locations={"city-2"})
+        buffer = WeatherWriteBuffer(
+            writer, max_batch_size=5, flush_interval=30, on_flush=flushed.append
+        )
+        for i in range(5):
+            await buffer.put(observation(i))
+        await buffer.flush()
+        await buffer.close()
+        return writer, buffer.get_stats()
+
+    writer, stats = asyncio.run(scenario())
+    assert writer.batches == [["city-0"], ["city-1"], ["city-3"], ["city-4"]]
+    assert stats["records_written"] == 4
+    assert stats["failed_records"] == 1
+    assert stats["flushes"] == 1 and stats["mean_flush_size"] == 5
+    assert flushed == [4]
+
+
+def main():
+    """Run the write buffer tests."""
+    print("Weather Write Buffer Tests")
+    print("=" * 50)
+
+    for test in (
+        test_full_batches_are_written_without_waiting,
+        test_put_waits_while_buffer_is_full,
+        test_flush_waits_for_in_flight_batch,
+        test_close_drains_queue_without_waiting_for_interval,
+        test_failed_batch_falls_back_to_single_records,
+    ):
+        test()
+        print(f"✓ {test.__name__}")
+
+
+if __name__ == "__main__":
+    main()